@@ -5,7 +5,12 @@ from api.auth.jwt import (
     create_refresh_token,
     verify_token,
 )
-from api.auth.password import hash_password, verify_password
+from api.auth.password import (
+    hash_password,
+    password_hasher,
+    verify_and_update,
+    verify_password,
+)
 from api.auth.scopes import Scope, ROLE_SCOPES, has_scope, get_scopes_for_role
 from api.auth.dependencies import (
     CurrentUser,
@@ -23,6 +28,8 @@ __all__ = [
     # Password
     "hash_password",
     "verify_password",
+    "verify_and_update",
+    "password_hasher",
     # Scopes
     "Scope",
     "ROLE_SCOPES",
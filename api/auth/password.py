@@ -1,9 +1,155 @@
-"""Password hashing utilities using bcrypt."""
+"""Password hashing utilities using bcrypt.
+
+bcrypt is deliberately slow (~250 ms per hash at the default cost), so
+hashing runs on a small dedicated thread pool instead of whichever thread
+handles the request. The bcrypt backend releases the GIL, so the pool
+hashes in parallel without blocking other requests, and its size caps how
+many CPU cores login bursts can take. Callers wait in a bounded queue;
+when it is full, RateLimitError is raised so bursts are shed with a 429
+instead of tying up the shared request threadpool.
+
+Settings (environment variables):
+- BCRYPT_ROUNDS: bcrypt cost factor (default 12)
+- PASSWORD_HASH_WORKERS: hashing threads (default min(4, CPU count))
+- PASSWORD_HASH_MAX_QUEUE: callers allowed to wait for a worker (default 16)
+
+Hashes made with a different cost factor are upgraded on the next
+successful login (see verify_and_update).
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
 
 from passlib.context import CryptContext
 
-# Configure bcrypt context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from api.exceptions import RateLimitError
+
+try:
+    from prometheus_client import Gauge
+
+    PASSWORD_HASH_QUEUE = Gauge(
+        "password_hash_queue_depth",
+        "Password hash/verify operations waiting for or running on a worker",
+    )
+except ImportError:
+    PASSWORD_HASH_QUEUE = None
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(
+    os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1)))
+)
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "16"))
+
+# Configure bcrypt context. Hashes with other rounds report needs_update.
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS
+)
+
+
+class PasswordHasher:
+    """Bounded worker pool for bcrypt hash and verify operations."""
+
+    def __init__(
+        self,
+        context: CryptContext = pwd_context,
+        workers: int = PASSWORD_HASH_WORKERS,
+        max_queue: int = PASSWORD_HASH_MAX_QUEUE,
+    ):
+        """Initialize the hasher.
+
+        Args:
+            context: Passlib context doing the hashing
+            workers: Number of hashing threads
+            max_queue: Operations allowed to wait beyond the running ones
+        """
+        self.context = context
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="password-hash"
+        )
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def queue_depth(self) -> int:
+        """Operations currently queued or running."""
+        return self._pending
+
+    def hash(self, password: str) -> str:
+        """Hash a password (blocks the calling thread until done)."""
+        return self._submit(self.context.hash, password).result()
+
+    def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password (blocks the calling thread until done)."""
+        return self._submit(
+            self.context.verify, plain_password, hashed_password
+        ).result()
+
+    def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> tuple[bool, Optional[str]]:
+        """Verify a password and rehash it if the hash parameters changed.
+
+        Returns:
+            (matches, new_hash). new_hash is None unless the password matched
+            and the stored hash should be replaced.
+        """
+        return self._submit(
+            self.context.verify_and_update, plain_password, hashed_password
+        ).result()
+
+    async def hash_async(self, password: str) -> str:
+        """Hash a password without blocking the event loop."""
+        return await asyncio.wrap_future(self._submit(self.context.hash, password))
+
+    async def verify_async(self, plain_password: str, hashed_password: str) -> bool:
+        """Verify a password without blocking the event loop."""
+        return await asyncio.wrap_future(
+            self._submit(self.context.verify, plain_password, hashed_password)
+        )
+
+    def _submit(self, fn: Callable, *args) -> Future:
+        """Queue an operation on the pool, or shed it if the queue is full.
+
+        Raises:
+            RateLimitError: If max_queue operations are already waiting
+        """
+        with self._lock:
+            if self._pending >= self.workers + self.max_queue:
+                raise RateLimitError(
+                    "Too many concurrent sign-in attempts, please retry shortly",
+                    error_code="PASSWORD_HASHER_BUSY",
+                )
+            self._pending += 1
+        if PASSWORD_HASH_QUEUE is not None:
+            PASSWORD_HASH_QUEUE.inc()
+
+        try:
+            return self._executor.submit(self._run, fn, *args)
+        except BaseException:
+            self._done()
+            raise
+
+    def _run(self, fn: Callable, *args):
+        """Run an operation on a worker, counting it done before returning."""
+        try:
+            return fn(*args)
+        finally:
+            self._done()
+
+    def _done(self) -> None:
+        with self._lock:
+            self._pending -= 1
+        if PASSWORD_HASH_QUEUE is not None:
+            PASSWORD_HASH_QUEUE.dec()
+
+
+# Shared hasher for the API process
+password_hasher = PasswordHasher()
 
 
 def hash_password(password: str) -> str:
@@ -15,7 +161,7 @@ def hash_password(password: str) -> str:
     Returns:
         Hashed password string
     """
-    return pwd_context.hash(password)
+    return password_hasher.hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
@@ -28,4 +174,19 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches, False otherwise
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return password_hasher.verify(plain_password, hashed_password)
+
+
+def verify_and_update(
+    plain_password: str, hashed_password: str
+) -> tuple[bool, Optional[str]]:
+    """Verify a password and get a new hash if the stored one is outdated.
+
+    Args:
+        plain_password: Plain text password to verify
+        hashed_password: Stored hash to verify against
+
+    Returns:
+        (matches, new_hash); store new_hash when it is not None
+    """
+    return password_hasher.verify_and_update(plain_password, hashed_password)
@@ -0,0 +1,147 @@
+"""Short-lived cache of verified principals for AuthMiddleware.
+
+Every authenticated request used to open a database session and call
+provider.get_or_create_user() (an upsert for external providers) after
+verifying its token. The middleware now caches the detached User for a
+few seconds, keyed by (provider, subject, token id), so steady-state
+requests verify the token signature and skip the users table.
+
+Entries expire after PRINCIPAL_CACHE_TTL seconds or when the token
+expires, whichever is first, and are dropped for a user on deactivation,
+role change and session revocation (see invalidate_user). The cache is
+per process, so other API workers see such changes within the TTL.
+Set PRINCIPAL_CACHE_TTL=0 to disable caching.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+from uuid import UUID
+
+from runner.db.models import User
+
+PRINCIPAL_CACHE_TTL = float(os.getenv("PRINCIPAL_CACHE_TTL", "30"))
+PRINCIPAL_CACHE_MAX_ENTRIES = int(os.getenv("PRINCIPAL_CACHE_MAX_ENTRIES", "10000"))
+
+PrincipalKey = tuple[str, str, str]
+
+
+def principal_key(
+    provider: str, subject: Optional[str], claims: Optional[dict]
+) -> Optional[PrincipalKey]:
+    """Build the cache key for a verified token.
+
+    Args:
+        provider: Auth provider name
+        subject: Provider's user ID (the token subject)
+        claims: Verified token claims
+
+    Returns:
+        (provider, subject, jti or iat), or None if the token carries
+        neither and so can't be told apart from other tokens
+    """
+    claims = claims or {}
+    token_id = claims.get("jti") or claims.get("iat")
+    if not subject or token_id is None:
+        return None
+    return (provider, subject, str(token_id))
+
+
+class PrincipalCache:
+    """TTL cache of detached User objects by principal key."""
+
+    def __init__(
+        self,
+        ttl: float = PRINCIPAL_CACHE_TTL,
+        max_entries: int = PRINCIPAL_CACHE_MAX_ENTRIES,
+    ):
+        """Initialize the cache.
+
+        Args:
+            ttl: Seconds an entry stays valid (0 disables the cache)
+            max_entries: Entries kept before the oldest are evicted
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._entries: dict[PrincipalKey, tuple[float, User]] = {}
+        self._keys_by_user: dict[UUID, set[PrincipalKey]] = {}
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so loads that raced one aren't cached
+        self.epoch = 0
+
+    def get(self, key: PrincipalKey) -> Optional[User]:
+        """Get the cached user for a principal, if still valid."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, user = entry
+            if expires_at <= time.time():
+                self._remove(key)
+                return None
+            return user
+
+    def put(
+        self,
+        key: PrincipalKey,
+        user: User,
+        claims: Optional[dict] = None,
+        epoch: Optional[int] = None,
+    ) -> None:
+        """Cache a detached user for a principal.
+
+        Args:
+            key: Principal key from principal_key()
+            user: User detached from its session
+            claims: Token claims; an "exp" claim caps the entry lifetime
+            epoch: Value of self.epoch read before the user was loaded; the
+                user is not cached if an invalidation happened since
+        """
+        if self.ttl <= 0:
+            return
+        expires_at = time.time() + self.ttl
+        exp = (claims or {}).get("exp")
+        if isinstance(exp, (int, float)):
+            expires_at = min(expires_at, exp)
+
+        with self._lock:
+            if epoch is not None and epoch != self.epoch:
+                return
+            if key not in self._entries and len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order: evict the oldest entry
+                self._remove(next(iter(self._entries)))
+            self._entries[key] = (expires_at, user)
+            self._keys_by_user.setdefault(user.id, set()).add(key)
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        """Drop every cached principal for a user."""
+        with self._lock:
+            self.epoch += 1
+            for key in self._keys_by_user.pop(user_id, set()):
+                self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all cached principals."""
+        with self._lock:
+            self.epoch += 1
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _remove(self, key: PrincipalKey) -> None:
+        """Remove one entry (caller holds the lock)."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        keys = self._keys_by_user.get(entry[1].id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[entry[1].id]
+
+
+# Shared cache for the API process
+principal_cache = PrincipalCache()
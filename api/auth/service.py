@@ -15,7 +15,8 @@ from api.auth.jwt import (
     verify_token,
     REFRESH_TOKEN_EXPIRE_DAYS,
 )
-from api.auth.password import hash_password, verify_password
+from api.auth.password import hash_password, verify_and_update
+from api.auth.principal_cache import principal_cache
 from runner.db.models import (
     User,
     UserRole,
@@ -245,9 +246,17 @@ class AuthService:
         if not user.is_active:
             return None
 
-        if not verify_password(password, user.password_hash):
+        matches, new_hash = verify_and_update(password, user.password_hash)
+        if not matches:
             return None
 
+        if new_hash:
+            # Stored hash used other bcrypt parameters; upgrade it
+            user.password_hash = new_hash
+            self._session.add(user)
+            self._session.commit()
+            self._session.refresh(user)
+
         return user
 
     def create_session(
@@ -375,6 +384,7 @@ class AuthService:
             self._session.add(session)
 
         self._session.commit()
+        principal_cache.invalidate_user(user_id)
         return len(sessions)
 
     def get_user_by_email(self, email: str) -> Optional[User]:
@@ -510,6 +520,7 @@ class AuthService:
         self._session.add(user)
         self._session.commit()
         self._session.refresh(user)
+        principal_cache.invalidate_user(user.id)
         return user
 
     @property
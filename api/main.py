@@ -1,6 +1,7 @@
 """FastAPI backend for Workflow Orchestrator GUI."""
 
 import logging
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -40,15 +41,12 @@ from api.routes.v1 import (
 )
 from api.routes.deprecated import finished_posts as deprecated_finished_posts
 from api.middleware import (
-    UsageEnforcementMiddleware,
-    MetricsMiddleware,
+    RequestPipelineMiddleware,
     get_metrics,
     get_metrics_content_type,
-    AuthMiddleware,
-    WorkspaceMiddleware,
-    CustomDomainMiddleware,
 )
 from api.error_handlers import register_error_handlers
+from runner.observability import shutdown_tracer
 
 # Configure logging
 logging.basicConfig(
@@ -56,30 +54,25 @@ logging.basicConfig(
 )
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    # Export spans still queued from workflow runs
+    shutdown_tracer()
+
+
 app = FastAPI(
     title="Workflow Orchestrator API",
     description="API for workflow visualization and control",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Middleware is added in reverse order of execution
-# Order of execution: CORS -> CustomDomain -> Auth -> Workspace -> Metrics -> Usage -> Route
-# Therefore add_middleware calls are in reverse order
-
-# Usage enforcement middleware (closest to route handlers)
-app.add_middleware(UsageEnforcementMiddleware)
-
-# Metrics middleware (captures all request metrics)
-app.add_middleware(MetricsMiddleware)
-
-# Workspace middleware (validates workspace membership, requires Auth to run first)
-app.add_middleware(WorkspaceMiddleware)
-
-# Auth middleware (extracts user from JWT, required by Workspace middleware)
-app.add_middleware(AuthMiddleware)
-
-# Custom domain middleware (handles white-label domain routing)
-app.add_middleware(CustomDomainMiddleware)
+# Order of execution: CORS -> RequestPipeline -> Route
+# RequestPipeline runs CustomDomain -> Auth -> Workspace -> Metrics -> Usage
+# in one pass (see api/middleware/pipeline.py)
+app.add_middleware(RequestPipelineMiddleware)
 
 # CORS for React dev server (outermost - handles preflight requests)
 app.add_middleware(
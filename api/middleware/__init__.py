@@ -13,6 +13,7 @@ from api.middleware.custom_domain import (
     get_custom_domain_workspace_id,
 )
 from api.middleware.usage import UsageEnforcementMiddleware
+from api.middleware.pipeline import RequestPipelineMiddleware
 
 __all__ = [
     "AuthMiddleware",
@@ -24,4 +25,5 @@ __all__ = [
     "get_custom_domain",
     "get_custom_domain_workspace_id",
     "UsageEnforcementMiddleware",
+    "RequestPipelineMiddleware",
 ]
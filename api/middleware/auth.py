@@ -4,7 +4,9 @@ Extracts JWT from Authorization header and injects user into request.state.
 Runs before WorkspaceMiddleware and route handlers.
 
 Uses the configured auth provider (local or external like Clerk) to verify
-tokens and load users.
+tokens and load users. Loaded users are kept briefly in the principal cache
+(api.auth.principal_cache), so repeat requests with the same token don't
+touch the users table.
 """
 
 from typing import Set
@@ -14,6 +16,7 @@ from sqlmodel import Session
 from starlette.middleware.base import BaseHTTPMiddleware, RequestResponseEndpoint
 from starlette.responses import Response
 
+from api.auth.principal_cache import principal_cache, principal_key
 from api.auth.providers import get_provider
 from runner.db.engine import engine
 from runner.db.models import User
@@ -46,7 +49,7 @@ class AuthMiddleware(BaseHTTPMiddleware):
     For authenticated requests, this middleware:
     1. Extracts JWT from Authorization: Bearer header
     2. Verifies token using configured auth provider
-    3. Loads/creates user from database
+    3. Loads/creates user from database (or the principal cache)
     4. Injects user, auth result, and provider name into request.state
 
     Public routes (login, register, health, etc.) are passed through
@@ -60,6 +63,15 @@ class AuthMiddleware(BaseHTTPMiddleware):
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
     ) -> Response:
+        await self.resolve(request)
+        return await call_next(request)
+
+    async def resolve(self, request: Request) -> None:
+        """Resolve the authenticated user (if any) onto request.state.
+
+        Args:
+            request: The incoming request
+        """
         # Initialize request state
         request.state.user = None
         request.state.jwt_claims = None
@@ -70,14 +82,14 @@ class AuthMiddleware(BaseHTTPMiddleware):
 
         # Skip authentication for public routes
         if self._is_public_route(request.url.path):
-            return await call_next(request)
+            return
 
         # Extract token from Authorization header
         token = self._extract_token(request)
         if not token:
             # No token - continue without user context
             # Individual routes will enforce auth as needed
-            return await call_next(request)
+            return
 
         # Get the configured auth provider
         provider = get_provider()
@@ -87,21 +99,29 @@ class AuthMiddleware(BaseHTTPMiddleware):
         if not auth_result.valid:
             # Invalid token - continue without user context
             # Routes requiring auth will reject the request
-            return await call_next(request)
+            return
 
         # Store auth info
         request.state.jwt_claims = auth_result.raw_claims
         request.state.auth_provider = provider.name
 
+        key = principal_key(provider.name, auth_result.user_id, auth_result.raw_claims)
+        if key is not None:
+            user = principal_cache.get(key)
+            if user is not None:
+                request.state.user = user
+                return
+
         # Load or create user using the provider
+        epoch = principal_cache.epoch
         with Session(engine) as session:
             user = await provider.get_or_create_user(auth_result, session)
             if user:
                 # Detach from session for use outside
                 session.expunge(user)
                 request.state.user = user
-
-        return await call_next(request)
+                if key is not None:
+                    principal_cache.put(key, user, auth_result.raw_claims, epoch)
 
     def _is_public_route(self, path: str) -> bool:
         """Check if route is public (no auth required).
@@ -63,17 +63,32 @@ class CustomDomainMiddleware(BaseHTTPMiddleware):
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
     ) -> Response:
+        response = await self.resolve(request)
+        if response is not None:
+            return response
+        return await call_next(request)
+
+    async def resolve(self, request: Request) -> Optional[Response]:
+        """Resolve custom domain context for a request.
+
+        Args:
+            request: The incoming request
+
+        Returns:
+            A 404 response for unknown custom domains, otherwise None
+            (context, if any, is set on request.state)
+        """
         # Extract host from request (without port)
         host = self._extract_host(request)
 
         if not host:
             # No host header, pass through
-            return await call_next(request)
+            return None
 
         # Check if this is a default domain
         if self._is_default_domain(host):
             # Normal request, pass through
-            return await call_next(request)
+            return None
 
         # This is a potential custom domain - look up workspace
         workspace_id = await self._lookup_workspace_by_domain(host)
@@ -91,8 +106,7 @@ class CustomDomainMiddleware(BaseHTTPMiddleware):
         # Inject workspace context from custom domain
         request.state.custom_domain = host
         request.state.custom_domain_workspace_id = workspace_id
-
-        return await call_next(request)
+        return None
 
     def _extract_host(self, request: Request) -> Optional[str]:
         """Extract the host from the request, stripping port if present.
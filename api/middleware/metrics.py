@@ -4,6 +4,15 @@ Tracks:
 - request_count: Counter by method, path, status
 - request_latency: Histogram by method, path
 - active_requests: Gauge of currently processing requests
+- middleware_duration: Histogram of per-stage middleware self-time
+
+Per-model agent metrics (latency quantiles, calls, errors, cost, tokens)
+from runner.observability are registered alongside and served by the
+same endpoint.
+
+Paths are labelled with the matched route template, read from
+scope["route"] once the router has run. Starlette records the route it
+dispatched to there, so no per-request scan of app.routes is needed.
 """
 
 import time
@@ -11,7 +20,9 @@ from typing import Callable
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.routing import Match
+from starlette.types import Scope
+
+from runner.observability.prometheus import register_model_metrics
 
 try:
     from prometheus_client import (
@@ -47,6 +58,15 @@ if PROMETHEUS_AVAILABLE:
         "Number of active HTTP requests",
     )
 
+    MIDDLEWARE_DURATION = Histogram(
+        "http_middleware_duration_seconds",
+        "Time spent in each middleware stage, excluding the route handler",
+        ["stage"],
+        buckets=[0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05],
+    )
+
+    register_model_metrics()
+
 
 class MetricsMiddleware(BaseHTTPMiddleware):
     """Middleware to collect Prometheus metrics for HTTP requests.
@@ -68,8 +88,6 @@ class MetricsMiddleware(BaseHTTPMiddleware):
         if not PROMETHEUS_AVAILABLE:
             return await call_next(request)
 
-        # Get normalized path (use route pattern, not actual path with IDs)
-        path = self._get_path_template(request)
         method = request.method
 
         # Track active requests
@@ -83,45 +101,72 @@ class MetricsMiddleware(BaseHTTPMiddleware):
             status_code = 500
             raise
         finally:
-            # Record metrics
-            duration = time.time() - start_time
             ACTIVE_REQUESTS.dec()
+            duration = time.time() - start_time
+            record_start = time.perf_counter()
+            # Routing has run by now, so the matched route is in the scope
+            path = route_template(request.scope)
+            record_request(method, path, status_code, duration)
+            record_stage("metrics", time.perf_counter() - record_start)
 
-            # Only record metrics for non-metrics endpoints
-            if path != "/metrics" and path != "/api/metrics":
-                REQUEST_COUNT.labels(
-                    method=method,
-                    path=path,
-                    status=str(status_code),
-                ).inc()
+        return response
 
-                REQUEST_LATENCY.labels(
-                    method=method,
-                    path=path,
-                ).observe(duration)
 
-        return response
+def route_template(scope: Scope) -> str:
+    """Get the route pattern instead of actual path.
 
-    def _get_path_template(self, request: Request) -> str:
-        """Get the route pattern instead of actual path.
+    This normalizes paths like /api/users/123 to /api/users/{user_id}
+    to prevent high cardinality in metrics labels. Must be called after
+    the router has handled the request.
 
-        This normalizes paths like /api/users/123 to /api/users/{user_id}
-        to prevent high cardinality in metrics labels.
+    Args:
+        scope: ASGI scope of a routed request
 
-        Args:
-            request: HTTP request
+    Returns:
+        Route template pattern or actual path if no route matched
+    """
+    route = scope.get("route")
+    path = getattr(route, "path", None)
+    if path is not None:
+        return path
 
-        Returns:
-            Route template pattern or actual path if no match
-        """
-        # Try to match against app routes
-        for route in request.app.routes:
-            match, _ = route.matches(request.scope)
-            if match == Match.FULL:
-                return route.path
-
-        # Fall back to actual path if no route match
-        return request.url.path
+    # Fall back to actual path if no route match
+    return scope["path"]
+
+
+def record_request(method: str, path: str, status_code: int, duration: float) -> None:
+    """Record one finished request in the request count and latency metrics.
+
+    Args:
+        method: HTTP method
+        path: Route template (see route_template)
+        status_code: Response status code
+        duration: Request duration in seconds
+    """
+    # Only record metrics for non-metrics endpoints
+    if path == "/metrics" or path == "/api/metrics":
+        return
+
+    REQUEST_COUNT.labels(
+        method=method,
+        path=path,
+        status=str(status_code),
+    ).inc()
+
+    REQUEST_LATENCY.labels(
+        method=method,
+        path=path,
+    ).observe(duration)
+
+
+def record_stage(stage: str, duration: float) -> None:
+    """Record the self-time of one middleware stage.
+
+    Args:
+        stage: Stage name (domain, auth, workspace, usage, metrics)
+        duration: Time spent in the stage in seconds
+    """
+    MIDDLEWARE_DURATION.labels(stage=stage).observe(duration)
 
 
 def get_metrics() -> bytes:
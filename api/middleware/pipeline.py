@@ -0,0 +1,132 @@
+"""Single-pass request pipeline middleware.
+
+Replaces the stack of CustomDomain, Auth, Workspace, Metrics and
+UsageEnforcement BaseHTTPMiddleware layers with one pure ASGI middleware.
+Each BaseHTTPMiddleware layer wrapped the downstream app in its own task
+and response stream, built its own Request, and buffered streaming
+responses. The pipeline builds one Request per HTTP request and runs the
+same stages against it in order:
+
+    domain -> auth -> workspace -> metrics( usage -> route )
+
+Stages share request.state (scope["state"]), so route handlers and
+dependencies see the same attributes as before. The responses are
+streamed straight through to the server.
+
+The stage logic lives on the original middleware classes (resolve() /
+check()), which can still be mounted individually. With prometheus_client
+installed, each stage's self-time is recorded in
+http_middleware_duration_seconds.
+"""
+
+import time
+from typing import Optional
+
+from fastapi import HTTPException, Request
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.error_handlers import http_exception_handler
+from api.middleware.auth import AuthMiddleware
+from api.middleware.custom_domain import CustomDomainMiddleware
+from api.middleware import metrics
+from api.middleware.metrics import record_request, record_stage, route_template
+from api.middleware.usage import UsageEnforcementMiddleware
+from api.middleware.workspace import WorkspaceMiddleware
+from api.services.usage_service import UsageService
+
+
+class RequestPipelineMiddleware:
+    """Pure ASGI middleware running all per-request resolution in one pass.
+
+    Non-HTTP scopes (websocket, lifespan) are passed through unchanged, as
+    they were by the BaseHTTPMiddleware layers.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        usage_service: Optional[UsageService] = None,
+        allowed_default_domains: Optional[set[str]] = None,
+    ):
+        """Initialize the pipeline.
+
+        Args:
+            app: The downstream ASGI application
+            usage_service: Usage service for limit checks
+            allowed_default_domains: Domains handled without custom domain
+                lookup (defaults to custom_domain.DEFAULT_DOMAINS)
+        """
+        self.app = app
+        self.domain = CustomDomainMiddleware(None, allowed_default_domains)
+        self.auth = AuthMiddleware(None)
+        self.workspace = WorkspaceMiddleware(None)
+        self.usage = UsageEnforcementMiddleware(None, usage_service=usage_service)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # One Request (and one request.state) shared by every stage
+        request = Request(scope, receive)
+
+        stage_start = time.perf_counter()
+        try:
+            response = await self.domain.resolve(request)
+            stage_start = _stage_done("domain", stage_start)
+            if response is None:
+                await self.auth.resolve(request)
+                stage_start = _stage_done("auth", stage_start)
+                await self.workspace.resolve(request)
+                stage_start = _stage_done("workspace", stage_start)
+        except HTTPException as exc:
+            response = await http_exception_handler(request, exc)
+
+        if response is not None:
+            await response(scope, receive, send)
+            return
+
+        if not metrics.PROMETHEUS_AVAILABLE:
+            await self._usage_then_route(request, scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        metrics.ACTIVE_REQUESTS.inc()
+        start_time = time.time()
+        try:
+            await self._usage_then_route(request, scope, receive, send_with_status)
+        finally:
+            metrics.ACTIVE_REQUESTS.dec()
+            duration = time.time() - start_time
+            stage_start = time.perf_counter()
+            # The router stored the matched route in the scope
+            path = route_template(scope)
+            record_request(scope["method"], path, status_code, duration)
+            _stage_done("metrics", stage_start)
+
+    async def _usage_then_route(
+        self, request: Request, scope: Scope, receive: Receive, send: Send
+    ) -> None:
+        """Run the usage check, then the route unless a limit was hit."""
+        stage_start = time.perf_counter()
+        response = await self.usage.check(request)
+        _stage_done("usage", stage_start)
+        if response is not None:
+            await response(scope, receive, send)
+            return
+        await self.app(scope, receive, send)
+
+
+def _stage_done(stage: str, stage_start: float) -> float:
+    """Record a stage's self-time and return the start time of the next."""
+    now = time.perf_counter()
+    if metrics.PROMETHEUS_AVAILABLE:
+        record_stage(stage, now - stage_start)
+    return now
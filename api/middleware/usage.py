@@ -1,7 +1,7 @@
 """FastAPI middleware for usage enforcement."""
 
 import logging
-from typing import Callable
+from typing import Callable, Optional
 from uuid import UUID
 
 from fastapi import Request, Response
@@ -37,21 +37,31 @@ class UsageEnforcementMiddleware(BaseHTTPMiddleware):
         self.usage_service = usage_service or UsageService()
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
-        """Check usage limits before processing request.
+        """Check usage limits before processing request."""
+        response = await self.check(request)
+        if response is not None:
+            return response
+        return await call_next(request)
+
+    async def check(self, request: Request) -> Optional[Response]:
+        """Check usage limits for a request.
 
         For workspace-scoped routes that create resources, verifies
         the workspace has available credits before proceeding.
+
+        Returns:
+            A 402 response if a limit is exceeded, otherwise None
         """
         # Only check mutating methods
         if request.method not in ("POST", "PUT", "PATCH"):
-            return await call_next(request)
+            return None
 
         # Extract workspace ID from path if present
         path = request.url.path
         workspace_id = self._extract_workspace_id(path)
 
         if not workspace_id:
-            return await call_next(request)
+            return None
 
         # Check if this route consumes post credits
         if self._matches_route(path, request.method, POST_CONSUMING_ROUTES):
@@ -110,7 +120,7 @@ class UsageEnforcementMiddleware(BaseHTTPMiddleware):
                         str(e),
                     )
 
-        return await call_next(request)
+        return None
 
     def _extract_workspace_id(self, path: str) -> UUID | None:
         """Extract workspace ID from path like /api/v1/w/{workspace_id}/...
@@ -37,12 +37,24 @@ class WorkspaceMiddleware(BaseHTTPMiddleware):
     async def dispatch(
         self, request: Request, call_next: RequestResponseEndpoint
     ) -> Response:
+        await self.resolve(request)
+        return await call_next(request)
+
+    async def resolve(self, request: Request) -> None:
+        """Resolve workspace context onto request.state.
+
+        Args:
+            request: The incoming request
+
+        Raises:
+            HTTPException 401/403/404: See _load_workspace_context
+        """
         # Extract workspace_id from URL if present
         workspace_id = self._extract_workspace_id(request.url.path)
 
         if workspace_id is None:
             # Not a workspace-scoped route, pass through
-            return await call_next(request)
+            return
 
         # Require authentication for workspace routes
         user = getattr(request.state, "user", None)
@@ -62,8 +74,6 @@ class WorkspaceMiddleware(BaseHTTPMiddleware):
         request.state.membership = membership
         request.state.workspace_id = workspace_id
 
-        return await call_next(request)
-
     def _extract_workspace_id(self, path: str) -> Optional[UUID]:
         """Extract workspace_id from URL path.
 
@@ -39,6 +39,20 @@ class StateLogEntry(BaseModel):
     error: Optional[str] = None
 
 
+class StateLogPage(BaseModel):
+    """State log entries after a cursor, plus the cursor to resume from."""
+
+    entries: list[StateLogEntry]
+    cursor: int  # byte offset into state_log.jsonl
+
+
+class DevLogPage(BaseModel):
+    """Dev (LLM message) log entries after a cursor."""
+
+    entries: list[dict[str, Any]]
+    cursor: int  # byte offset into dev_logs/llm_messages.jsonl
+
+
 class TokenBreakdown(BaseModel):
     """Token usage breakdown."""
 
@@ -9,6 +9,7 @@ from pydantic import BaseModel, EmailStr, Field
 from sqlmodel import Session
 
 from api.auth.jwt import verify_token
+from api.auth.principal_cache import principal_cache
 from api.auth.providers import get_provider
 from api.auth.service import AuthService
 from api.services.email_service import email_service
@@ -448,6 +449,7 @@ def update_user_role(
     auth_service.session.add(target_user)
     auth_service.session.commit()
     auth_service.session.refresh(target_user)
+    principal_cache.invalidate_user(target_user.id)
 
     return UserRead(
         id=target_user.id,
@@ -1,18 +1,21 @@
 """API routes for workflow runs."""
 
 import os
-from typing import Annotated
+from typing import Annotated, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import StreamingResponse
 
 from api.auth.dependencies import CurrentUser, get_current_user
 from api.models.api_models import (
+    DevLogPage,
     RunSummary,
     StateLogEntry,
+    StateLogPage,
     TokenBreakdown,
     ArtifactInfo,
 )
-from api.services.run_service import RunService
+from api.services.run_service import DEV_LOG, STATE_LOG, RunService
 from runner.config import WORKING_DIR
 
 router = APIRouter()
@@ -23,9 +26,19 @@ run_service = RunService(runs_dir=os.path.join(WORKING_DIR, "runs"))
 @router.get("", response_model=list[RunSummary])
 async def list_runs(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    story: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    offset: int = Query(0, ge=0),
 ):
-    """List all workflow runs for the current user."""
-    return run_service.list_runs(str(current_user.user_id))
+    """List workflow runs for the current user, newest first."""
+    return run_service.list_runs(
+        str(current_user.user_id),
+        limit=limit,
+        story=story,
+        status=status,
+        offset=offset,
+    )
 
 
 @router.get("/{run_id}", response_model=RunSummary)
@@ -52,6 +65,77 @@ async def get_state_log(
     return run_service.get_state_log(run_id)
 
 
+@router.get("/{run_id}/states/tail", response_model=StateLogPage)
+async def tail_state_log(
+    run_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    cursor: int = Query(0, ge=0),
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """Get state log entries after a cursor (pass back the returned cursor)."""
+    run = run_service.get_run_for_user(run_id, str(current_user.user_id))
+    if not run:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+    return run_service.tail_state_log(run_id, cursor, since, limit)
+
+
+@router.get("/{run_id}/states/stream")
+async def stream_state_log(
+    run_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    cursor: int = Query(0, ge=0),
+    since: Optional[str] = None,
+    last_event_id: Optional[int] = Header(None),
+):
+    """Follow the state log as server-sent events."""
+    run = run_service.get_run_for_user(run_id, str(current_user.user_id))
+    if not run:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+    return _event_stream(run_id, STATE_LOG, last_event_id or cursor, since)
+
+
+@router.get("/{run_id}/dev-logs/tail", response_model=DevLogPage)
+async def tail_dev_log(
+    run_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    cursor: int = Query(0, ge=0),
+    since: Optional[str] = None,
+    limit: Optional[int] = Query(None, ge=1),
+):
+    """Get LLM message log entries after a cursor (DEV_MODE runs only)."""
+    run = run_service.get_run_for_user(run_id, str(current_user.user_id))
+    if not run:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+    return run_service.tail_dev_log(run_id, cursor, since, limit)
+
+
+@router.get("/{run_id}/dev-logs/stream")
+async def stream_dev_log(
+    run_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    cursor: int = Query(0, ge=0),
+    since: Optional[str] = None,
+    last_event_id: Optional[int] = Header(None),
+):
+    """Follow the LLM message log as server-sent events."""
+    run = run_service.get_run_for_user(run_id, str(current_user.user_id))
+    if not run:
+        raise HTTPException(status_code=404, detail=f"Run not found: {run_id}")
+    return _event_stream(run_id, DEV_LOG, last_event_id or cursor, since)
+
+
+def _event_stream(
+    run_id: str, log: str, cursor: int, since: Optional[str]
+) -> StreamingResponse:
+    """Wrap a run log follower in an SSE response."""
+    return StreamingResponse(
+        run_service.stream_log(run_id, log, cursor=cursor, since=since),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/{run_id}/summary")
 async def get_summary(
     run_id: str,
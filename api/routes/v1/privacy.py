@@ -12,6 +12,7 @@ from pydantic import BaseModel, Field
 from sqlmodel import Session
 
 from api.auth.dependencies import get_current_user, CurrentUser
+from api.auth.principal_cache import principal_cache
 from runner.db.engine import get_session_dependency
 from runner.db.models import User
 
@@ -215,6 +216,7 @@ async def delete_user_account(
     user.is_active = False
     session.add(user)
     session.commit()
+    principal_cache.invalidate_user(user.id)
 
     # In production, also:
     # 1. Revoke all active sessions
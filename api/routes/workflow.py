@@ -1,6 +1,6 @@
 """API routes for workflow execution."""
 
-from typing import Annotated
+from typing import Annotated, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 
@@ -91,6 +91,20 @@ async def resume_workflow(
     return await workflow_service.resume()
 
 
+@router.post("/runs/{run_id}/resume")
+async def resume_workflow_run(
+    run_id: str,
+    current_user: Annotated[CurrentUser, Depends(get_current_user)],
+    config: Optional[str] = None,
+):
+    """Resume an interrupted run from its last checkpoint."""
+    return await workflow_service.resume_run(
+        run_id,
+        user_id=str(current_user.user_id),
+        config=config,
+    )
+
+
 @router.get("/runs")
 async def get_workflow_runs(
     current_user: Annotated[CurrentUser, Depends(get_current_user)],
@@ -13,6 +13,8 @@ from uuid import UUID
 import stripe
 from sqlmodel import Session, select
 
+from api.services.tier_service import tier_service
+from api.services.usage_meter import usage_meter
 from runner.db.engine import engine
 from runner.db.models import (
     AccountSubscription,
@@ -336,6 +338,7 @@ class BillingService:
             )
         session.add(subscription)
         session.commit()
+        self._invalidate_workspace(workspace_id)
 
         return {"status": "subscription_created", "workspace_id": str(workspace_id)}
 
@@ -391,6 +394,7 @@ class BillingService:
         )
         session.add(invoice)
         session.commit()
+        self._invalidate_workspace(subscription.workspace_id)
 
         return {
             "status": "invoice_recorded",
@@ -410,6 +414,7 @@ class BillingService:
             subscription.status = SubscriptionStatus.past_due
             session.add(subscription)
             session.commit()
+            self._invalidate_workspace(subscription.workspace_id)
 
         return {"status": "marked_past_due", "customer_id": customer_id}
 
@@ -448,6 +453,7 @@ class BillingService:
 
         session.add(subscription)
         session.commit()
+        self._invalidate_workspace(subscription.workspace_id)
 
         return {
             "status": "subscription_updated",
@@ -468,6 +474,7 @@ class BillingService:
         subscription.canceled_at = datetime.utcnow()
         session.add(subscription)
         session.commit()
+        self._invalidate_workspace(subscription.workspace_id)
 
         return {
             "status": "subscription_canceled",
@@ -506,6 +513,11 @@ class BillingService:
             "workspace_id": str(subscription.workspace_id),
         }
 
+    def _invalidate_workspace(self, workspace_id: UUID) -> None:
+        """Drop cached entitlements and usage counters after a billing change."""
+        tier_service.invalidate_workspace(workspace_id)
+        usage_meter.invalidate(workspace_id)
+
     def get_invoices(self, workspace_id: UUID) -> list[Invoice]:
         """Get all invoices for a workspace.
 
@@ -8,7 +8,7 @@ from pydantic import BaseModel, Field
 
 from api.services.config_service import ConfigService
 from api.services.content_service import ContentService
-from runner.agents import create_agent
+from runner.agents import agent_pool
 from runner.content.models import CONTENT_STYLES
 
 
@@ -243,8 +243,8 @@ class OnboardingService:
         prompt_sections.append("Respond as the assistant.")
         prompt = "\n\n".join(prompt_sections)
 
-        agent = create_agent(self.agent_type, self.agent_config)
-        result = agent.invoke(prompt)
+        with agent_pool.checkout(self.agent_type, self.agent_config) as agent:
+            result = agent.invoke(prompt)
         if not result.success:
             raise RuntimeError(f"LLM request failed: {result.error or 'unknown error'}")
         return result.content.strip()
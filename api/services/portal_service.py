@@ -406,7 +406,7 @@ class PortalService:
         Returns:
             Dict with user info and workspace access, or None if auth fails
         """
-        from api.auth.password import verify_password
+        from api.auth.password import verify_and_update
 
         # Find user by email
         user = session.exec(select(User).where(User.email == email)).first()
@@ -417,9 +417,16 @@ class PortalService:
         if not user.password_hash or not user.is_active:
             return None
 
-        if not verify_password(password, user.password_hash):
+        matches, new_hash = verify_and_update(password, user.password_hash)
+        if not matches:
             return None
 
+        if new_hash:
+            # Stored hash used other bcrypt parameters; upgrade it
+            user.password_hash = new_hash
+            session.add(user)
+            session.commit()
+
         # Check workspace membership
         membership = session.exec(
             select(WorkspaceMembership).where(
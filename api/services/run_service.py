@@ -8,13 +8,15 @@ import json
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional
 
 import yaml
 
 from api.models.api_models import (
+    DevLogPage,
     RunSummary,
     StateLogEntry,
+    StateLogPage,
     TokenBreakdown,
     ArtifactInfo,
 )
@@ -22,9 +24,15 @@ from api.utils.credits import cost_to_credits
 from runner.content.ids import normalize_user_id
 from runner.content.workflow_store import WorkflowStore
 from runner.db.models import WorkflowRun, WorkflowOutput
+from runner.logging.log_tail import follow, read_page
+from runner.run_index import RunIndex
 
 logger = logging.getLogger(__name__)
 
+# Run log files, relative to the run directory
+STATE_LOG = "state_log.jsonl"
+DEV_LOG = "dev_logs/llm_messages.jsonl"
+
 
 class RunService:
     """Service for accessing workflow run data."""
@@ -35,9 +43,17 @@ class RunService:
         store: Optional[WorkflowStore] = None,
     ):
         self.runs_dir = Path(runs_dir)
+        self.run_index = RunIndex(runs_dir)
         self.store = store or WorkflowStore()
 
-    def list_runs(self, user_id: str, limit: int = 50) -> list[RunSummary]:
+    def list_runs(
+        self,
+        user_id: str,
+        limit: int = 50,
+        story: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
+    ) -> list[RunSummary]:
         """List all runs for a user, sorted by newest first.
 
         Only returns database runs that belong to the user.
@@ -46,25 +62,24 @@ class RunService:
         Args:
             user_id: User ID (required for multi-tenancy)
             limit: Maximum number of runs to return
+            story: Only runs for this story
+            status: Only runs with this status
+            offset: Number of matching runs to skip (for paging)
         """
-        runs = []
-
         # Get runs from database (properly filtered by user_id)
         uid = normalize_user_id(user_id)
         if not uid:
             return []  # Invalid user_id, return empty list
 
-        db_runs = self.store.get_workflow_runs_for_user(uid, limit=limit)
-        for run in db_runs:
-            runs.append(self._db_run_to_summary(run))
-
         # NOTE: Filesystem scan removed for security.
         # Legacy runs on filesystem are not associated with users and
         # should only be accessible to the system owner via direct DB query.
 
-        # Sort by start time descending
-        runs.sort(key=lambda r: r.started_at or datetime.min, reverse=True)
-        return runs[:limit]
+        # Filtering, ordering and paging happen in the query
+        db_runs = self.store.get_workflow_runs_for_user(
+            uid, limit=limit, story=story, status=status, offset=offset
+        )
+        return [self._db_run_to_summary(run) for run in db_runs]
 
     def get_run(self, run_id: str) -> Optional[RunSummary]:
         """Get a specific run by ID (no auth check - use get_run_for_user instead)."""
@@ -73,7 +88,11 @@ class RunService:
         if db_run:
             return self._db_run_to_summary(db_run)
 
-        # Fallback to filesystem (legacy runs - no user filtering)
+        # Fallback to the manifest index (legacy runs - no user filtering)
+        manifest = self.run_index.get(run_id)
+        if manifest:
+            return self._manifest_to_summary(manifest, run_id)
+
         run_dir = self.runs_dir / run_id
         if run_dir.exists():
             return self._load_manifest_from_filesystem(run_dir)
@@ -111,21 +130,119 @@ class RunService:
 
         Reads from JSONL file (detailed event log).
         """
-        log_path = self.runs_dir / run_id / "state_log.jsonl"
-        if not log_path.exists():
-            return []
-
-        entries = []
-        with open(log_path) as f:
-            for line in f:
-                line = line.strip()
-                if line:
-                    try:
-                        data = json.loads(line)
-                        entries.append(StateLogEntry(**data))
-                    except (json.JSONDecodeError, ValueError):
-                        continue
-        return entries
+        return self.tail_state_log(run_id).entries
+
+    def tail_state_log(
+        self,
+        run_id: str,
+        cursor: int = 0,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> StateLogPage:
+        """Get state log entries appended after a cursor or timestamp.
+
+        Args:
+            run_id: Run identifier
+            cursor: Byte offset returned by the previous call (0 = start)
+            since: Only return entries with a later timestamp
+            limit: Maximum number of entries to return
+
+        Returns:
+            StateLogPage with the entries and the cursor to resume from
+        """
+        page = read_page(self._log_path(run_id, STATE_LOG), cursor, since, limit)
+        return StateLogPage(
+            entries=self._to_state_entries(page.entries), cursor=page.cursor
+        )
+
+    def tail_dev_log(
+        self,
+        run_id: str,
+        cursor: int = 0,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> DevLogPage:
+        """Get dev (LLM message) log entries appended after a cursor.
+
+        Args:
+            run_id: Run identifier
+            cursor: Byte offset returned by the previous call (0 = start)
+            since: Only return entries with a later timestamp
+            limit: Maximum number of entries to return
+
+        Returns:
+            DevLogPage with the entries and the cursor to resume from
+        """
+        page = read_page(self._log_path(run_id, DEV_LOG), cursor, since, limit)
+        return DevLogPage(entries=page.entries, cursor=page.cursor)
+
+    async def stream_log(
+        self,
+        run_id: str,
+        log: str = STATE_LOG,
+        cursor: int = 0,
+        since: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """Follow a run log as server-sent events.
+
+        Each event carries a batch of new entries and uses the cursor as its
+        id, so a reconnecting client can resume via Last-Event-ID. The stream
+        ends once the run's manifest records it as finished or the log goes
+        quiet.
+
+        Args:
+            run_id: Run identifier
+            log: STATE_LOG or DEV_LOG
+            cursor: Byte offset to start from
+            since: Only send entries with a later timestamp
+
+        Yields:
+            SSE-formatted event strings
+        """
+        manifest_path = self.runs_dir / run_id / "run_manifest.yaml"
+        async for page in follow(
+            self._log_path(run_id, log),
+            cursor=cursor,
+            since=since,
+            done=lambda: self._run_finished(manifest_path),
+        ):
+            entries = page.entries
+            if log == STATE_LOG:
+                entries = [
+                    e.model_dump(mode="json") for e in self._to_state_entries(entries)
+                ]
+            yield f"id: {page.cursor}\nevent: entries\ndata: {json.dumps(entries)}\n\n"
+        yield "event: end\ndata: {}\n\n"
+
+    @staticmethod
+    def _run_finished(manifest_path: Path) -> bool:
+        """Check whether a run's manifest records it as finished.
+
+        A resumed run's manifest says "running" until it finishes again.
+        """
+        if not manifest_path.exists():
+            return False
+        try:
+            with open(manifest_path) as f:
+                data = yaml.safe_load(f)
+        except (OSError, yaml.YAMLError):
+            return False
+        return not isinstance(data, dict) or data.get("status") != "running"
+
+    def _log_path(self, run_id: str, log: str) -> str:
+        """Get the path of a run log file."""
+        return str(self.runs_dir / run_id / log)
+
+    @staticmethod
+    def _to_state_entries(entries: list[dict]) -> list[StateLogEntry]:
+        """Convert raw state log dicts, skipping malformed entries."""
+        parsed = []
+        for data in entries:
+            try:
+                parsed.append(StateLogEntry(**data))
+            except (TypeError, ValueError):
+                continue
+        return parsed
 
     def get_outputs(self, run_id: str) -> list[WorkflowOutput]:
         """Get all outputs for a run from database."""
@@ -233,8 +350,9 @@ class RunService:
         seen_names = set()
         run_path = self.runs_dir / run_id
 
-        # Get artifacts from database (preferred, takes priority)
-        db_outputs = self.store.get_workflow_outputs(run_id)
+        # Get artifacts from database (preferred, takes priority).
+        # Metadata only: sizes are computed in the database, bodies stay there.
+        db_outputs = self.store.get_workflow_output_metadata(run_id)
         for output in db_outputs:
             name = f"{output.state_name}_{output.output_type}.md"
             if name not in seen_names:
@@ -244,7 +362,7 @@ class RunService:
                         path=f"db://{run_id}/{output.state_name}/{output.output_type}",
                         name=name,
                         type=output.output_type,
-                        size_bytes=len(output.content.encode("utf-8")),
+                        size_bytes=output.size_bytes or 0,
                         modified_at=output.created_at or datetime.now(),
                     )
                 )
@@ -290,10 +408,9 @@ class RunService:
             parts = path[5:].split("/")
             if len(parts) >= 3:
                 _, state_name, output_type = parts[0], parts[1], parts[2]
-                outputs = self.store.get_workflow_outputs_by_type(run_id, output_type)
-                for output in outputs:
-                    if output.state_name == state_name:
-                        return output.content
+                output = self.store.get_workflow_output(run_id, state_name, output_type)
+                if output:
+                    return output.content
             return None
 
         # Filesystem path
@@ -342,7 +459,14 @@ class RunService:
         try:
             with open(manifest_path) as f:
                 data = yaml.safe_load(f)
+        except Exception as e:
+            logger.warning(f"Failed to load manifest from {manifest_path}: {e}")
+            return None
+        return self._manifest_to_summary(data, run_dir.name)
 
+    def _manifest_to_summary(self, data: dict, run_id: str) -> Optional[RunSummary]:
+        """Convert a run manifest dict to a RunSummary."""
+        try:
             # Parse datetime strings
             started_at = data.get("started_at")
             if isinstance(started_at, str):
@@ -356,7 +480,7 @@ class RunService:
 
             cost_usd = data.get("total_cost_usd", 0.0)
             return RunSummary(
-                run_id=data.get("run_id", run_dir.name),
+                run_id=data.get("run_id", run_id),
                 story=data.get("story", ""),
                 status=data.get("status", "unknown"),
                 started_at=started_at or datetime.now(),
@@ -368,5 +492,5 @@ class RunService:
                 config_hash=data.get("config_hash"),
             )
         except Exception as e:
-            logger.warning(f"Failed to load manifest from {manifest_path}: {e}")
+            logger.warning(f"Failed to read manifest for {run_id}: {e}")
             return None
@@ -5,6 +5,9 @@ and determine workflow config based on subscription tier.
 """
 
 import math
+import threading
+import time
+from dataclasses import dataclass, field
 from typing import Optional
 from uuid import UUID
 
@@ -18,6 +21,10 @@ from runner.db.models import (
     SubscriptionStatus,
 )
 
+# Safety net for changes made by other processes (e.g. another API worker
+# handling the Stripe webhook). In-process changes invalidate immediately.
+ENTITLEMENT_CACHE_TTL = 300  # 5 minutes in seconds
+
 
 class FeatureNotAvailable(Exception):
     """Raised when a feature is not available for the current tier."""
@@ -32,6 +39,20 @@ class FeatureNotAvailable(Exception):
         )
 
 
+@dataclass(frozen=True)
+class EntitlementSnapshot:
+    """Tier and feature flags resolved for one workspace.
+
+    Snapshots are immutable; a subscription or tier change replaces the
+    snapshot rather than mutating it.
+    """
+
+    version: tuple[int, int]
+    loaded_at: float
+    tier: Optional[SubscriptionTier]
+    features: dict[str, tuple[bool, Optional[dict]]] = field(default_factory=dict)
+
+
 class TierService:
     """Service for tier-based feature management.
 
@@ -40,6 +61,10 @@ class TierService:
     - Get feature configuration (e.g., text limits)
     - Determine which workflow config to use
     - Calculate credit costs from USD amounts
+
+    Entitlements are cached per workspace. Call invalidate_workspace() after
+    changing a subscription and invalidate_all() after editing tier
+    definitions.
     """
 
     # Feature to minimum tier mapping for upgrade CTAs
@@ -61,15 +86,78 @@ class TierService:
         "max": 100000,
     }
 
-    def get_tier_for_workspace(self, workspace_id: UUID) -> Optional[SubscriptionTier]:
-        """Get the subscription tier for a workspace.
+    def __init__(self, cache_ttl: float = ENTITLEMENT_CACHE_TTL):
+        """Initialize TierService.
+
+        Args:
+            cache_ttl: Seconds before a cached snapshot is reloaded
+        """
+        self.cache_ttl = cache_ttl
+        self._snapshots: dict[UUID, EntitlementSnapshot] = {}
+        # Snapshots are tagged (generation, workspace version); invalidate_all
+        # bumps the generation, invalidate_workspace only that workspace
+        self._generation = 0
+        self._workspace_versions: dict[UUID, int] = {}
+        self._lock = threading.Lock()
+
+    def invalidate_workspace(self, workspace_id: UUID) -> None:
+        """Drop the cached entitlements for a workspace.
+
+        Other workspaces keep their snapshots.
+
+        Args:
+            workspace_id: Workspace UUID
+        """
+        with self._lock:
+            self._workspace_versions[workspace_id] = (
+                self._workspace_versions.get(workspace_id, 0) + 1
+            )
+            self._snapshots.pop(workspace_id, None)
+
+    def invalidate_all(self) -> None:
+        """Drop all cached entitlements (e.g. after a tier definition change)."""
+        with self._lock:
+            self._generation += 1
+            self._workspace_versions.clear()
+            self._snapshots.clear()
+
+    def _version(self, workspace_id: UUID) -> tuple[int, int]:
+        """Current cache version for a workspace (caller holds the lock)."""
+        return self._generation, self._workspace_versions.get(workspace_id, 0)
+
+    def get_entitlements(self, workspace_id: UUID) -> EntitlementSnapshot:
+        """Get the entitlement snapshot for a workspace.
+
+        Served from the in-process cache when fresh, otherwise loaded with a
+        single session.
 
         Args:
             workspace_id: Workspace UUID
 
         Returns:
-            SubscriptionTier if found, None for free tier
+            EntitlementSnapshot for the workspace
         """
+        with self._lock:
+            snapshot = self._snapshots.get(workspace_id)
+            version = self._version(workspace_id)
+        if (
+            snapshot
+            and snapshot.version == version
+            and time.monotonic() - snapshot.loaded_at < self.cache_ttl
+        ):
+            return snapshot
+
+        snapshot = self._load_entitlements(workspace_id, version)
+        with self._lock:
+            # Don't store a snapshot that was loaded across an invalidation
+            if self._version(workspace_id) == version:
+                self._snapshots[workspace_id] = snapshot
+        return snapshot
+
+    def _load_entitlements(
+        self, workspace_id: UUID, version: tuple[int, int]
+    ) -> EntitlementSnapshot:
+        """Load tier and features for a workspace from the database."""
         with Session(engine) as session:
             sub_statement = select(AccountSubscription).where(
                 AccountSubscription.workspace_id == workspace_id,
@@ -86,9 +174,30 @@ class TierService:
             else:
                 tier = session.get(SubscriptionTier, subscription.tier_id)
 
+            features = {}
             if tier:
+                statement = select(TierFeature).where(TierFeature.tier_id == tier.id)
+                for tf in session.exec(statement).all():
+                    features[tf.feature_key] = (tf.enabled, tf.config)
                 session.expunge(tier)
-            return tier
+
+        return EntitlementSnapshot(
+            version=version,
+            loaded_at=time.monotonic(),
+            tier=tier,
+            features=features,
+        )
+
+    def get_tier_for_workspace(self, workspace_id: UUID) -> Optional[SubscriptionTier]:
+        """Get the subscription tier for a workspace.
+
+        Args:
+            workspace_id: Workspace UUID
+
+        Returns:
+            SubscriptionTier if found, None for free tier
+        """
+        return self.get_entitlements(workspace_id).tier
 
     def get_tier_slug(self, workspace_id: UUID) -> str:
         """Get the tier slug for a workspace.
@@ -112,17 +221,12 @@ class TierService:
         Returns:
             True if feature is enabled, False otherwise
         """
-        tier = self.get_tier_for_workspace(workspace_id)
-        if not tier:
+        snapshot = self.get_entitlements(workspace_id)
+        if not snapshot.tier:
             return False
 
-        with Session(engine) as session:
-            statement = select(TierFeature).where(
-                TierFeature.tier_id == tier.id,
-                TierFeature.feature_key == feature_key,
-            )
-            feature = session.exec(statement).first()
-            return feature.enabled if feature else False
+        feature = snapshot.features.get(feature_key)
+        return feature[0] if feature else False
 
     def require_feature(self, workspace_id: UUID, feature_key: str) -> None:
         """Require a feature, raising an error if not available.
@@ -152,17 +256,14 @@ class TierService:
         Returns:
             Feature config dict, or None if feature not found
         """
-        tier = self.get_tier_for_workspace(workspace_id)
-        if not tier:
+        snapshot = self.get_entitlements(workspace_id)
+        if not snapshot.tier:
             return None
 
-        with Session(engine) as session:
-            statement = select(TierFeature).where(
-                TierFeature.tier_id == tier.id,
-                TierFeature.feature_key == feature_key,
-            )
-            feature = session.exec(statement).first()
-            return feature.config if feature else None
+        feature = snapshot.features.get(feature_key)
+        if not feature or feature[1] is None:
+            return None
+        return dict(feature[1])
 
     def get_text_limit(self, workspace_id: UUID) -> int:
         """Get the text character limit for a workspace.
@@ -210,7 +311,8 @@ class TierService:
         Returns:
             Dict of feature_key -> {enabled, config}
         """
-        tier = self.get_tier_for_workspace(workspace_id)
+        snapshot = self.get_entitlements(workspace_id)
+        tier = snapshot.tier
         tier_slug = tier.slug if tier else "free"
         tier_id = tier.id if tier else None
 
@@ -232,15 +334,11 @@ class TierService:
             }
             return features
 
-        with Session(engine) as session:
-            statement = select(TierFeature).where(TierFeature.tier_id == tier_id)
-            tier_features = session.exec(statement).all()
-
-            for tf in tier_features:
-                features[tf.feature_key] = {
-                    "enabled": tf.enabled,
-                    "config": tf.config or {},
-                }
+        for feature_key, (enabled, config) in snapshot.features.items():
+            features[feature_key] = {
+                "enabled": enabled,
+                "config": dict(config or {}),
+            }
 
         return features
 
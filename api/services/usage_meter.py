@@ -0,0 +1,140 @@
+"""In-process usage counters for fast limit checks.
+
+The database stays the source of truth: every reservation is enforced with a
+single guarded UPDATE in UsageService. The meter mirrors the counters returned
+by those statements so read-only checks (middleware, estimates) never touch
+the database in steady state. Entries are reconciled from the database after
+RECONCILE_INTERVAL seconds or when the billing period rolls over.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Callable, Optional
+from uuid import UUID
+
+# Maximum age of a cached entry before it is reloaded from the database.
+# Bounds drift from other API workers writing to the same usage row.
+RECONCILE_INTERVAL = 30  # seconds
+
+# resource_type -> (usage column, limit column) on UsageTracking
+RESOURCE_COLUMNS = {
+    "post": ("posts_created", "posts_limit"),
+    "storage": ("storage_used_bytes", "storage_limit_bytes"),
+    "api_call": ("api_calls", "api_calls_limit"),
+}
+
+
+@dataclass
+class MeterEntry:
+    """Cached usage counters for one workspace's current billing period."""
+
+    usage_id: UUID
+    period_end: datetime
+    used: dict[str, int] = field(default_factory=dict)
+    limits: dict[str, int] = field(default_factory=dict)
+    overage_enabled: bool = False
+    loaded_at: float = field(default_factory=time.monotonic)
+
+
+class UsageMeter:
+    """Thread-safe cache of per-workspace usage counters.
+
+    Loading is delegated to a callable so the meter has no database
+    dependency of its own.
+    """
+
+    def __init__(self, reconcile_interval: float = RECONCILE_INTERVAL):
+        self.reconcile_interval = reconcile_interval
+        self._entries: dict[UUID, MeterEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(
+        self, workspace_id: UUID, loader: Callable[[UUID], MeterEntry]
+    ) -> MeterEntry:
+        """Get the entry for a workspace, reloading it if stale.
+
+        Args:
+            workspace_id: Workspace UUID
+            loader: Called with the workspace ID to build a fresh entry
+
+        Returns:
+            MeterEntry for the current billing period
+        """
+        with self._lock:
+            entry = self._entries.get(workspace_id)
+        if entry and not self._is_stale(entry):
+            return entry
+
+        entry = loader(workspace_id)
+        with self._lock:
+            self._entries[workspace_id] = entry
+        return entry
+
+    def check(
+        self,
+        workspace_id: UUID,
+        resource_type: str,
+        amount: int,
+        loader: Callable[[UUID], MeterEntry],
+    ) -> tuple[bool, int, int]:
+        """Check a resource against its limit using cached counters.
+
+        Args:
+            workspace_id: Workspace UUID
+            resource_type: 'post', 'storage', or 'api_call'
+            amount: Amount to check against limit
+            loader: Called to build the entry on a cache miss
+
+        Returns:
+            Tuple of (within_limit, current_usage, limit)
+        """
+        if resource_type not in RESOURCE_COLUMNS:
+            return (True, 0, 0)  # Unknown resource type, allow
+
+        entry = self.get(workspace_id, loader)
+        with self._lock:
+            current = entry.used.get(resource_type, 0)
+            limit = entry.limits.get(resource_type, 0)
+
+        # 0 limit means unlimited
+        if limit == 0:
+            return (True, current, limit)
+
+        return (current + amount <= limit, current, limit)
+
+    def record(self, workspace_id: UUID, resource_type: str, current: int) -> None:
+        """Record an authoritative counter value returned by the database.
+
+        Args:
+            workspace_id: Workspace UUID
+            resource_type: 'post', 'storage', or 'api_call'
+            current: Counter value after the update
+        """
+        with self._lock:
+            entry = self._entries.get(workspace_id)
+            if entry:
+                entry.used[resource_type] = current
+
+    def invalidate(self, workspace_id: Optional[UUID] = None) -> None:
+        """Drop cached counters for a workspace, or for all workspaces.
+
+        Args:
+            workspace_id: Workspace UUID, or None to clear everything
+        """
+        with self._lock:
+            if workspace_id is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(workspace_id, None)
+
+    def _is_stale(self, entry: MeterEntry) -> bool:
+        """Check whether an entry needs reconciling with the database."""
+        if time.monotonic() - entry.loaded_at >= self.reconcile_interval:
+            return True
+        return datetime.utcnow() >= entry.period_end
+
+
+# Singleton instance shared by all UsageService instances in the process
+usage_meter = UsageMeter()
@@ -9,8 +9,12 @@ from typing import Optional
 from uuid import UUID
 import uuid
 
+from sqlalchemy import and_, case, or_, update
+from sqlalchemy.exc import IntegrityError
 from sqlmodel import Session, select
 
+from api.services.tier_service import tier_service
+from api.services.usage_meter import RESOURCE_COLUMNS, MeterEntry, usage_meter
 from runner.db.engine import engine
 from runner.db.models import (
     SubscriptionTier,
@@ -37,6 +41,11 @@ class UsageService:
 
     Provides methods to check limits, reserve credits, and confirm usage
     with idempotency support.
+
+    Reservations are charged against the usage counter up front with a
+    single guarded UPDATE, so concurrent requests cannot overshoot a limit.
+    Releasing or expiring a reservation refunds it. Read-only checks are
+    served from the process-wide usage meter.
     """
 
     def get_subscription(self, workspace_id: UUID) -> Optional[AccountSubscription]:
@@ -202,25 +211,40 @@ class UsageService:
         Returns:
             Tuple of (within_limit, current_usage, limit)
         """
-        usage = self.get_or_create_usage_period(workspace_id)
+        return usage_meter.check(
+            workspace_id, resource_type, amount, self._load_meter_entry
+        )
 
-        if resource_type == "post":
-            current = usage.posts_created
-            limit = usage.posts_limit
-        elif resource_type == "storage":
-            current = usage.storage_used_bytes
-            limit = usage.storage_limit_bytes
-        elif resource_type == "api_call":
-            current = usage.api_calls
-            limit = usage.api_calls_limit
-        else:
-            return (True, 0, 0)  # Unknown resource type, allow
+    def _load_meter_entry(self, workspace_id: UUID) -> MeterEntry:
+        """Build a usage meter entry from the database.
 
-        # 0 limit means unlimited
-        if limit == 0:
-            return (True, current, limit)
+        Expired reservations are refunded first so the counters reflect
+        only live holds.
+
+        Args:
+            workspace_id: Workspace UUID
 
-        return (current + amount <= limit, current, limit)
+        Returns:
+            MeterEntry for the current billing period
+        """
+        self.expire_reservations(workspace_id)
+        usage = self.get_or_create_usage_period(workspace_id)
+        subscription = self.get_subscription(workspace_id)
+        tier = self.get_tier(subscription.tier_id) if subscription else None
+
+        return MeterEntry(
+            usage_id=usage.id,
+            period_end=usage.period_end,
+            used={
+                resource_type: getattr(usage, column)
+                for resource_type, (column, _) in RESOURCE_COLUMNS.items()
+            },
+            limits={
+                resource_type: getattr(usage, limit_column)
+                for resource_type, (_, limit_column) in RESOURCE_COLUMNS.items()
+            },
+            overage_enabled=bool(tier and tier.overage_enabled),
+        )
 
     def reserve_credit(
         self,
@@ -250,78 +274,84 @@ class UsageService:
         Raises:
             UsageLimitExceeded: If reservation would exceed limit
         """
-        with Session(engine) as session:
-            # Check for existing reservation with same key
-            existing_statement = select(CreditReservation).where(
-                CreditReservation.idempotency_key == idempotency_key
-            )
-            existing = session.exec(existing_statement).first()
-            if existing:
-                session.expunge(existing)
-                return existing
-
-            # Get usage tracking
-            usage = self.get_or_create_usage_period(workspace_id)
-
-            # Check limit (including pending reservations)
-            pending_statement = select(CreditReservation).where(
-                CreditReservation.workspace_id == workspace_id,
-                CreditReservation.usage_tracking_id == usage.id,
-                CreditReservation.resource_type == resource_type,
-                CreditReservation.status == ReservationStatus.pending,
-                CreditReservation.expires_at > datetime.utcnow(),
-            )
-            pending = session.exec(pending_statement).all()
-            pending_amount = sum(r.amount for r in pending)
-
-            # Check subscription for overage
-            sub_statement = select(AccountSubscription).where(
-                AccountSubscription.workspace_id == workspace_id,
-            )
-            subscription = session.exec(sub_statement).first()
+        existing = self._get_reservation(idempotency_key)
+        if existing:
+            return existing
 
-            tier = None
-            if subscription:
-                tier = session.get(SubscriptionTier, subscription.tier_id)
+        entry = usage_meter.get(workspace_id, self._load_meter_entry)
+        current = None
 
-            # Get current and limit
-            if resource_type == "post":
-                current = usage.posts_created + pending_amount
-                limit = usage.posts_limit
-            elif resource_type == "storage":
-                current = usage.storage_used_bytes + pending_amount
-                limit = usage.storage_limit_bytes
-            elif resource_type == "api_call":
-                current = usage.api_calls + pending_amount
-                limit = usage.api_calls_limit
-            else:
-                current = 0
-                limit = 0
-
-            # Check if within limit (0 = unlimited)
-            if limit > 0 and current + amount > limit:
-                # Check if overage is allowed
-                if tier and tier.overage_enabled:
-                    pass  # Allow overage
-                else:
+        with Session(engine) as session:
+            columns = RESOURCE_COLUMNS.get(resource_type)
+            if columns:
+                # Charge the counter atomically; the WHERE clause is the limit check
+                column = getattr(UsageTracking, columns[0])
+                limit_column = getattr(UsageTracking, columns[1])
+                statement = update(UsageTracking).where(
+                    UsageTracking.id == entry.usage_id
+                )
+                if not entry.overage_enabled:
+                    statement = statement.where(
+                        or_(limit_column == 0, column + amount <= limit_column)
+                    )
+                statement = statement.values({columns[0]: column + amount}).returning(
+                    column
+                )
+                row = session.execute(statement).first()
+                if row is None:
+                    session.rollback()
+                    usage_meter.invalidate(workspace_id)
+                    _, current, limit = self.check_limit(
+                        workspace_id, resource_type, amount
+                    )
                     raise UsageLimitExceeded(resource_type, limit, current)
+                current = row[0]
 
-            # Create reservation
             reservation = CreditReservation(
                 id=uuid.uuid4(),
                 workspace_id=workspace_id,
-                usage_tracking_id=usage.id,
+                usage_tracking_id=entry.usage_id,
                 resource_type=resource_type,
                 resource_id=resource_id,
                 amount=amount,
                 status=ReservationStatus.pending,
                 idempotency_key=idempotency_key,
                 expires_at=datetime.utcnow() + timedelta(minutes=expires_minutes),
+                charged=current is not None,
             )
             session.add(reservation)
-            session.commit()
+            try:
+                session.commit()
+            except IntegrityError:
+                # Lost a race on the same idempotency key; the charge rolls back
+                session.rollback()
+                existing = self._get_reservation(idempotency_key)
+                if existing:
+                    return existing
+                raise
             session.refresh(reservation)
             session.expunge(reservation)
+
+        if current is not None:
+            usage_meter.record(workspace_id, resource_type, current)
+        return reservation
+
+    def _get_reservation(self, idempotency_key: str) -> Optional[CreditReservation]:
+        """Get a reservation by idempotency key.
+
+        Args:
+            idempotency_key: The reservation's idempotency key
+
+        Returns:
+            CreditReservation if found, None otherwise
+        """
+        with Session(engine) as session:
+            statement = select(CreditReservation).where(
+                CreditReservation.idempotency_key == idempotency_key
+            )
+            reservation = session.exec(statement).first()
+            if reservation:
+                session.expunge(reservation)
             return reservation
 
     def confirm_usage(self, idempotency_key: str) -> bool:
@@ -334,38 +364,60 @@ class UsageService:
             True if confirmed, False if not found or already processed
         """
         with Session(engine) as session:
-            statement = select(CreditReservation).where(
-                CreditReservation.idempotency_key == idempotency_key,
-                CreditReservation.status == ReservationStatus.pending,
-            )
-            reservation = session.exec(statement).first()
+            row = session.execute(
+                update(CreditReservation)
+                .where(
+                    CreditReservation.idempotency_key == idempotency_key,
+                    CreditReservation.status == ReservationStatus.pending,
+                )
+                .values(status=ReservationStatus.confirmed)
+                .returning(
+                    CreditReservation.workspace_id,
+                    CreditReservation.usage_tracking_id,
+                    CreditReservation.resource_type,
+                    CreditReservation.amount,
+                    CreditReservation.charged,
+                )
+            ).first()
 
-            if not reservation:
+            if row is None:
                 return False
 
-            # Update reservation status
-            reservation.status = ReservationStatus.confirmed
-            session.add(reservation)
+            workspace_id, usage_tracking_id, resource_type, amount, charged = row
+            current = None
+            columns = RESOURCE_COLUMNS.get(resource_type)
+            if columns and not charged:
+                # Reserved before counters were charged up front; charge now
+                column = getattr(UsageTracking, columns[0])
+                current = session.execute(
+                    update(UsageTracking)
+                    .where(UsageTracking.id == usage_tracking_id)
+                    .values({columns[0]: column + amount})
+                    .returning(column)
+                ).scalar()
 
-            # Update usage tracking
-            usage = session.get(UsageTracking, reservation.usage_tracking_id)
-            if usage:
-                if reservation.resource_type == "post":
-                    usage.posts_created += reservation.amount
-                    # Check for overage
-                    if (
-                        usage.posts_limit > 0
-                        and usage.posts_created > usage.posts_limit
-                    ):
-                        usage.overage_posts = usage.posts_created - usage.posts_limit
-                elif reservation.resource_type == "storage":
-                    usage.storage_used_bytes += reservation.amount
-                elif reservation.resource_type == "api_call":
-                    usage.api_calls += reservation.amount
-                session.add(usage)
+            if resource_type == "post":
+                # Check for overage
+                over_limit = and_(
+                    UsageTracking.posts_limit > 0,
+                    UsageTracking.posts_created > UsageTracking.posts_limit,
+                )
+                overage = UsageTracking.posts_created - UsageTracking.posts_limit
+                session.execute(
+                    update(UsageTracking)
+                    .where(UsageTracking.id == usage_tracking_id)
+                    .values(
+                        overage_posts=case(
+                            (over_limit, overage), else_=UsageTracking.overage_posts
+                        )
+                    )
+                )
 
             session.commit()
-            return True
+
+        if current is not None:
+            usage_meter.record(workspace_id, resource_type, current)
+        return True
 
     def release_reservation(self, idempotency_key: str) -> bool:
         """Release a pending reservation without using the credit.
@@ -377,19 +429,102 @@ class UsageService:
             True if released, False if not found or already processed
         """
         with Session(engine) as session:
-            statement = select(CreditReservation).where(
-                CreditReservation.idempotency_key == idempotency_key,
+            rows = session.execute(
+                update(CreditReservation)
+                .where(
+                    CreditReservation.idempotency_key == idempotency_key,
+                    CreditReservation.status == ReservationStatus.pending,
+                )
+                .values(status=ReservationStatus.released)
+                .returning(
+                    CreditReservation.workspace_id,
+                    CreditReservation.usage_tracking_id,
+                    CreditReservation.resource_type,
+                    CreditReservation.amount,
+                    CreditReservation.charged,
+                )
+            ).all()
+
+            if not rows:
+                return False
+
+            refunded = self._refund(session, rows)
+            session.commit()
+
+        self._record_refunds(refunded)
+        return True
+
+    def expire_reservations(self, workspace_id: Optional[UUID] = None) -> int:
+        """Mark lapsed pending reservations as expired and refund them.
+
+        Args:
+            workspace_id: Limit the sweep to one workspace, or None for all
+
+        Returns:
+            Number of reservations expired
+        """
+        with Session(engine) as session:
+            statement = update(CreditReservation).where(
                 CreditReservation.status == ReservationStatus.pending,
+                CreditReservation.expires_at <= datetime.utcnow(),
             )
-            reservation = session.exec(statement).first()
+            if workspace_id is not None:
+                statement = statement.where(
+                    CreditReservation.workspace_id == workspace_id
+                )
+            rows = session.execute(
+                statement.values(status=ReservationStatus.expired).returning(
+                    CreditReservation.workspace_id,
+                    CreditReservation.usage_tracking_id,
+                    CreditReservation.resource_type,
+                    CreditReservation.amount,
+                    CreditReservation.charged,
+                )
+            ).all()
 
-            if not reservation:
-                return False
+            if not rows:
+                return 0
 
-            reservation.status = ReservationStatus.released
-            session.add(reservation)
+            refunded = self._refund(session, rows)
             session.commit()
-            return True
+
+        self._record_refunds(refunded)
+        return len(rows)
+
+    def _refund(self, session: Session, rows) -> list[tuple[UUID, str, int]]:
+        """Return reserved amounts to their usage counters.
+
+        Reservations that never charged their counter refund nothing.
+
+        Args:
+            session: Database session (caller commits)
+            rows: (workspace_id, usage_tracking_id, resource_type, amount,
+                charged) rows
+
+        Returns:
+            (workspace_id, resource_type, counter) for each refunded counter,
+            to record in the usage meter once the caller has committed
+        """
+        refunded = []
+        for workspace_id, usage_tracking_id, resource_type, amount, charged in rows:
+            columns = RESOURCE_COLUMNS.get(resource_type)
+            if not columns or not charged:
+                continue
+            column = getattr(UsageTracking, columns[0])
+            current = session.execute(
+                update(UsageTracking)
+                .where(UsageTracking.id == usage_tracking_id)
+                .values({columns[0]: column - amount})
+                .returning(column)
+            ).scalar()
+            if current is not None:
+                refunded.append((workspace_id, resource_type, current))
+        return refunded
+
+    def _record_refunds(self, refunded: list[tuple[UUID, str, int]]) -> None:
+        """Record committed refunds in the usage meter."""
+        for workspace_id, resource_type, current in refunded:
+            usage_meter.record(workspace_id, resource_type, current)
 
     def get_usage_summary(self, workspace_id: UUID) -> dict:
         """Get a summary of current usage for a workspace.
@@ -591,4 +726,7 @@ class UsageService:
             session.commit()
             session.refresh(subscription)
             session.expunge(subscription)
-            return subscription
+
+        tier_service.invalidate_workspace(workspace_id)
+        usage_meter.invalidate(workspace_id)
+        return subscription
@@ -10,7 +10,7 @@ from pydantic import BaseModel
 logger = logging.getLogger(__name__)
 
 from api.services.content_service import ContentService
-from runner.agents.factory import create_agent
+from runner.agents.factory import agent_pool
 from runner.content.models import VOICE_PROMPTS
 
 
@@ -173,16 +173,15 @@ class VoiceService:
         default_model = model_defaults.get(self.llm_provider, "llama3.2")
         self.model = os.environ.get(env_var, default_model)
 
-        self.agent = create_agent(
-            self.llm_provider,
-            {
-                "name": "voice-analyzer",
-                "model": self.model,
-                "max_tokens": 4096,
-                "timeout": self.timeout,
-                "type": "api",  # Prefer API mode for direct SDK calls
-            },
-        )
+        # Agents come from the shared pool on each call, so service
+        # instances share SDK clients instead of building their own
+        self.agent_config = {
+            "name": "voice-analyzer",
+            "model": self.model,
+            "max_tokens": 4096,
+            "timeout": self.timeout,
+            "type": "api",  # Prefer API mode for direct SDK calls
+        }
 
     def _call_llm(self, prompt: str, system_prompt: str = None) -> str:
         """Call LLM using the configured agent."""
@@ -192,10 +191,11 @@ class VoiceService:
             full_prompt = f"{system_prompt}\n\n{prompt}"
 
         # Use invoke_json if available (Groq), otherwise regular invoke
-        if hasattr(self.agent, 'invoke_json'):
-            result = self.agent.invoke_json(prompt, system_prompt=system_prompt)
-        else:
-            result = self.agent.invoke(full_prompt)
+        with agent_pool.checkout(self.llm_provider, self.agent_config) as agent:
+            if hasattr(agent, 'invoke_json'):
+                result = agent.invoke_json(prompt, system_prompt=system_prompt)
+            else:
+                result = agent.invoke(full_prompt)
 
         self.last_result = result  # Store for token tracking
 
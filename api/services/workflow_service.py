@@ -4,7 +4,7 @@ import asyncio
 import logging
 import os
 from datetime import datetime
-from typing import Optional, Any
+from typing import Any, Callable, Optional
 from threading import Thread
 from uuid import UUID
 
@@ -138,6 +138,120 @@ class WorkflowService:
                 )
                 input_path = None  # File write failed, but database has content
 
+        # Broadcast start event
+        await manager.broadcast(
+            {
+                "type": "workflow:started",
+                "run_id": self.current_run_id,
+                "story": story,
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+            self.current_run_id,
+        )
+
+        # Run in background thread (sync code)
+        run_id = self.current_run_id
+        self._start_run_thread(
+            main_loop,
+            lambda approval_callback, log_callback: runner.run(
+                story,
+                input_path=input_path,
+                run_id=run_id,
+                approval_callback=approval_callback,
+                log_callback=log_callback,
+            ),
+        )
+
+        return {"run_id": self.current_run_id, "status": "started"}
+
+    async def resume_run(
+        self,
+        run_id: str,
+        user_id: str,
+        config: Optional[str] = None,
+    ) -> dict:
+        """Resume an interrupted workflow run from its last checkpoint.
+
+        For runs cut short by an API restart: states that completed before
+        the restart are not run again.
+
+        Args:
+            run_id: Run to resume
+            user_id: User ID who owns the run
+            config: Optional workflow config slug the run was started with
+        """
+        if self.running:
+            return {"error": "Workflow already running", "run_id": self.current_run_id}
+
+        uid = normalize_user_id(user_id)
+        if not uid:
+            return {"error": "Invalid user ID"}
+        store = WorkflowStore(uid)
+        run = store.get_workflow_run(run_id)
+        if not run or str(run.user_id) != str(uid):
+            return {"error": "Run not found"}
+
+        from runner.runner import WorkflowRunner
+        from runner.config import resolve_workflow_config
+
+        config_path = resolve_workflow_config(config) if config else self.config_path
+        runner = WorkflowRunner(config_path, working_dir=WORKING_DIR)
+        checkpoint = runner.get_checkpoint(run_id)
+        if checkpoint is None:
+            return {"error": "Run has no checkpoint to resume from", "run_id": run_id}
+
+        self.current_run_id = run_id
+        self.current_story = checkpoint.story or run.story
+        self.current_user_id = user_id
+        self.current_workspace_id = run.workspace_id
+        self._store = store
+        self.started_at = datetime.utcnow()
+        self.running = True
+        self._state_machine = None
+        self._approval_content = None
+        store.update_workflow_run(run_id, status="running", error=None)
+
+        main_loop = asyncio.get_running_loop()
+
+        await manager.broadcast(
+            {
+                "type": "workflow:resumed_from_checkpoint",
+                "run_id": run_id,
+                "story": self.current_story,
+                "current_state": checkpoint.next_state,
+                "timestamp": datetime.utcnow().isoformat(),
+            },
+            run_id,
+        )
+
+        self._start_run_thread(
+            main_loop,
+            lambda approval_callback, log_callback: runner.resume(
+                run_id,
+                approval_callback=approval_callback,
+                log_callback=log_callback,
+            ),
+        )
+
+        return {
+            "run_id": run_id,
+            "status": "resumed",
+            "current_state": checkpoint.next_state,
+        }
+
+    def _start_run_thread(
+        self,
+        main_loop: asyncio.AbstractEventLoop,
+        invoke: Callable[[Callable, Callable], dict],
+    ) -> None:
+        """Run a workflow in a background thread, broadcasting its events.
+
+        Args:
+            main_loop: Event loop to broadcast WebSocket events on
+            invoke: Called with (approval_callback, log_callback) in the
+                thread; runs the workflow and returns the run result
+        """
+
         # Create approval callback that broadcasts to WebSocket
         def approval_callback(approval_info: dict):
             self.awaiting_approval = True
@@ -160,18 +274,6 @@ class WorkflowService:
                 main_loop, manager.broadcast(broadcast_data, self.current_run_id)
             )
 
-        # Broadcast start event
-        await manager.broadcast(
-            {
-                "type": "workflow:started",
-                "run_id": self.current_run_id,
-                "story": story,
-                "timestamp": datetime.utcnow().isoformat(),
-            },
-            self.current_run_id,
-        )
-
-        # Run in background thread (sync code)
         run_id = self.current_run_id
         service = self  # Capture for closure
 
@@ -387,13 +489,7 @@ class WorkflowService:
 
                 StateMachine.initialize = capturing_init
                 try:
-                    result = runner.run(
-                        story,
-                        input_path=input_path,
-                        run_id=run_id,
-                        approval_callback=approval_callback,
-                        log_callback=log_callback,
-                    )
+                    result = invoke(approval_callback, log_callback)
                 finally:
                     StateMachine.initialize = original_init
 
@@ -404,8 +500,6 @@ class WorkflowService:
         self._thread = Thread(target=run_workflow, daemon=True)
         self._thread.start()
 
-        return {"run_id": self.current_run_id, "status": "started"}
-
     async def execute_step(
         self, story: str, step: str, run_id: Optional[str] = None
     ) -> dict:
@@ -59,7 +59,12 @@ except ImportError:
     pass
 
 # Factory function (must be imported after agent classes are defined)
-from runner.agents.factory import create_agent, get_available_agents  # noqa: E402
+from runner.agents.factory import (  # noqa: E402
+    AgentPool,
+    agent_pool,
+    create_agent,
+    get_available_agents,
+)
 
 # Legacy registry for backwards compatibility
 AGENT_REGISTRY = {
@@ -88,6 +93,8 @@ __all__ = [
     # Factory
     "create_agent",
     "get_available_agents",
+    "AgentPool",
+    "agent_pool",
     # Legacy
     "AGENT_REGISTRY",
 ]
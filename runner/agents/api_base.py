@@ -3,10 +3,43 @@
 import os
 import time
 from abc import abstractmethod
+from contextlib import nullcontext
 from typing import Optional
 
 from runner.agents.base import BaseAgent
+from runner.metrics.costs import with_cache_rates
 from runner.models import AgentResult, TokenUsage
+from runner.observability.tracer import SPAN_KIND_HTTP, current_tracer
+
+# Section headings that start the per-invocation part of a StateMachine
+# prompt. Everything before the first one (preamble + persona) is identical
+# across invocations of a state and can be served from a provider cache.
+PROMPT_VARIABLE_MARKERS = (
+    "## Context",
+    "## Input Files",
+    "## Reviewer Context",
+    "## USER FEEDBACK",
+)
+
+
+def split_cacheable_prefix(prompt: str) -> tuple[str, str]:
+    """Split a prompt into its stable prefix and variable remainder.
+
+    Args:
+        prompt: Full prompt text
+
+    Returns:
+        Tuple of (prefix, remainder). prefix is empty when no marker is found.
+    """
+    positions = [
+        idx
+        for idx in (prompt.find(f"\n{marker}") for marker in PROMPT_VARIABLE_MARKERS)
+        if idx > 0
+    ]
+    if not positions:
+        return "", prompt
+    idx = min(positions)
+    return prompt[:idx].strip(), prompt[idx:].strip()
 
 
 class APIAgent(BaseAgent):
@@ -26,8 +59,17 @@ class APIAgent(BaseAgent):
     RETRY_BACKOFF_BASE = 2  # seconds
     RETRY_BACKOFF_MAX = 60  # max backoff seconds
 
+    # Providers that cache prompt prefixes send the stable part of one-shot
+    # prompts as a system message so it lines up across invocations
+    PREFIX_CACHING = False
+    CACHE_READ_MULTIPLIER = 1.0  # cache read price relative to input
+    CACHE_WRITE_MULTIPLIER = 1.0  # cache write price relative to input
+
     def __init__(self, config: dict):
         super().__init__(config)
+        self.cost_per_1k = with_cache_rates(
+            self.cost_per_1k, self.CACHE_READ_MULTIPLIER, self.CACHE_WRITE_MULTIPLIER
+        )
         self.api_key = config.get("api_key") or self._get_api_key_from_env()
         self.model = config.get("model")
         self.model_id = self._resolve_model_id()
@@ -69,11 +111,41 @@ class APIAgent(BaseAgent):
     def invoke(
         self, prompt: str, input_files: Optional[list[str]] = None
     ) -> AgentResult:
-        """One-shot invocation (no history)."""
+        """One-shot invocation (no history).
+
+        For PREFIX_CACHING providers the stable prompt prefix is sent as a
+        leading system message; _call_api marks it cacheable.
+        """
         full_prompt = self._build_prompt(prompt, input_files)
-        messages = [{"role": "user", "content": full_prompt}]
+        messages = self._build_messages(full_prompt)
         return self._execute(messages)
 
+    def warm_prompt_cache(self, prompt: str) -> Optional[TokenUsage]:
+        """Write the prompt's cacheable prefix to the provider cache.
+
+        Called once before parallel invocations that share a prefix so they
+        read the cache instead of each paying full prefill. Providers without
+        explicit cache writes (automatic prefix caching) do nothing.
+
+        Args:
+            prompt: Prompt that will be sent by invoke()
+
+        Returns:
+            TokenUsage of the warm-up call, or None if none was made
+        """
+        return None
+
+    def _build_messages(self, full_prompt: str) -> list[dict]:
+        """Build one-shot messages, splitting off the cacheable prefix."""
+        if self.PREFIX_CACHING:
+            prefix, remainder = split_cacheable_prefix(full_prompt)
+            if prefix:
+                return [
+                    {"role": "system", "content": prefix},
+                    {"role": "user", "content": remainder},
+                ]
+        return [{"role": "user", "content": full_prompt}]
+
     def invoke_with_session(
         self, session_id: str, prompt: str, input_files: Optional[list[str]] = None
     ) -> AgentResult:
@@ -114,7 +186,10 @@ class APIAgent(BaseAgent):
 
         for attempt in range(self.MAX_RETRIES + 1):
             try:
-                content, tokens = self._call_api(messages)
+                with self._trace_http(attempt) as span:
+                    content, tokens = self._call_api(messages)
+                    if span is not None:
+                        span.set_tokens(tokens.input_tokens, tokens.output_tokens)
                 duration = time.time() - start_time
 
                 return AgentResult(
@@ -157,6 +232,23 @@ class APIAgent(BaseAgent):
             error=last_error or "Rate limit retries exhausted",
         )
 
+    def _trace_http(self, attempt: int):
+        """Span for one provider call, nested in the caller's open span.
+
+        Calls made outside a traced agent invocation aren't traced.
+        """
+        tracer = current_tracer()
+        if tracer is None:
+            return nullcontext()
+        return tracer.trace_call(
+            self.model_id or self.name,
+            "",
+            operation="http",
+            kind=SPAN_KIND_HTTP,
+            name=f"{self.name} http",
+            attempt=attempt + 1,
+        )
+
     def extract_tokens(self, raw_response: str) -> TokenUsage:
         """Extract token counts from raw response.
 
@@ -179,6 +271,18 @@ class APIAgent(BaseAgent):
         self.messages = []
 
 
+def usage_count(usage, field: str) -> int:
+    """Read an optional token count from an SDK usage object (None -> 0)."""
+    value = getattr(usage, field, None)
+    return value if isinstance(value, int) else 0
+
+
+def cached_prompt_tokens(usage) -> int:
+    """Get prompt tokens served from cache from an OpenAI-style usage object."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return usage_count(details, "cached_tokens") if details else 0
+
+
 class RateLimitError(Exception):
     """Raised when API returns a rate limit error."""
 
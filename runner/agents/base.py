@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from typing import Optional, TYPE_CHECKING
 
+from runner.metrics.costs import calculate_cost
+from runner.metrics.estimate import estimate_tokens
 from runner.models import AgentResult, TokenUsage
 
 if TYPE_CHECKING:
@@ -12,6 +14,11 @@ if TYPE_CHECKING:
 class BaseAgent(ABC):
     """Abstract base for all agent implementations."""
 
+    # Tokenizer used for pre-flight prompt estimates (runner.metrics.estimate)
+    TOKENIZER_FAMILY = "generic"
+    # Reply tokens reserved in the context window when max_tokens isn't set
+    DEFAULT_OUTPUT_RESERVE = 4096
+
     def __init__(self, config: dict):
         self.config = config
         self.name = config.get("name", "unknown")
@@ -77,10 +84,24 @@ class BaseAgent(ABC):
         pass
 
     def calculate_cost(self, tokens: TokenUsage) -> float:
-        """Calculate cost in USD."""
-        input_cost = (tokens.input_tokens / 1000) * self.cost_per_1k["input"]
-        output_cost = (tokens.output_tokens / 1000) * self.cost_per_1k["output"]
-        return input_cost + output_cost
+        """Calculate cost in USD, including prompt-cache rates if set."""
+        return calculate_cost(tokens, self.cost_per_1k)
+
+    def estimate_tokens(self, text: str) -> int:
+        """Estimate the tokens this agent's model uses for a text."""
+        return estimate_tokens(text, self.TOKENIZER_FAMILY)
+
+    def prompt_token_budget(self) -> int:
+        """Tokens a prompt may use: the context window minus room for the reply.
+
+        The reply reserve is max_tokens from the agent config, or
+        DEFAULT_OUTPUT_RESERVE capped at a quarter of the context window so
+        small local models keep most of it for the prompt.
+        """
+        reserve = self.config.get("max_tokens") or min(
+            self.DEFAULT_OUTPUT_RESERVE, self.context_window // 4
+        )
+        return max(0, self.context_window - reserve)
 
     def calculate_context_usage(self, tokens: TokenUsage) -> dict:
         """Calculate context window usage."""
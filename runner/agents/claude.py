@@ -9,6 +9,8 @@ from runner.models import TokenUsage
 class ClaudeAgent(CLIAgent):
     """Agent that uses the Claude CLI."""
 
+    TOKENIZER_FAMILY = "claude"
+
     # Pricing per 1k tokens by model
     MODEL_PRICING = {
         "opus": {"input": 0.015, "output": 0.075},  # Claude 3 Opus
@@ -1,10 +1,11 @@
 """Claude API agent using the Anthropic SDK."""
 
 import os
+from typing import Optional
 
 from anthropic import Anthropic, RateLimitError as AnthropicRateLimitError
 
-from runner.agents.api_base import APIAgent, RateLimitError
+from runner.agents.api_base import APIAgent, RateLimitError, usage_count
 from runner.models import TokenUsage
 
 
@@ -17,6 +18,8 @@ class ClaudeAPIAgent(APIAgent):
         - haiku: claude-3-5-haiku-20241022
     """
 
+    TOKENIZER_FAMILY = "claude"
+
     MODEL_MAP = {
         "opus": "claude-opus-4-20250514",
         "sonnet": "claude-sonnet-4-20250514",
@@ -27,6 +30,11 @@ class ClaudeAPIAgent(APIAgent):
         "claude-3-haiku": "claude-3-5-haiku-20241022",
     }
 
+    # Prompt caching: reads bill at 10% of input, 5-minute writes at 125%
+    PREFIX_CACHING = True
+    CACHE_READ_MULTIPLIER = 0.1
+    CACHE_WRITE_MULTIPLIER = 1.25
+
     def __init__(self, config: dict):
         super().__init__(config)
         self.client = Anthropic(api_key=self.api_key)
@@ -40,17 +48,65 @@ class ClaudeAPIAgent(APIAgent):
         """Convert model alias to actual model ID."""
         return self.MODEL_MAP.get(self.model, self.model)
 
+    def warm_prompt_cache(self, prompt: str) -> Optional[TokenUsage]:
+        """Write the prompt prefix to Anthropic's cache with a 1-token call."""
+        messages = self._build_messages(prompt)
+        if messages[0]["role"] != "system":
+            return None
+        try:
+            response = self.client.messages.create(
+                model=self.model_id,
+                max_tokens=1,
+                system=self._system_blocks(messages),
+                messages=[{"role": "user", "content": "."}],
+            )
+        except Exception:
+            return None
+        return self._extract_usage(response.usage)
+
+    def _extract_usage(self, usage) -> TokenUsage:
+        """Build TokenUsage from an Anthropic usage object.
+
+        Anthropic reports cached tokens separately from input_tokens;
+        TokenUsage counts them as part of the input.
+        """
+        cache_read = usage_count(usage, "cache_read_input_tokens")
+        cache_write = usage_count(usage, "cache_creation_input_tokens")
+        return TokenUsage(
+            input_tokens=usage.input_tokens + cache_read + cache_write,
+            output_tokens=usage.output_tokens,
+            cache_read_tokens=cache_read,
+            cache_write_tokens=cache_write,
+        )
+
+    def _system_blocks(self, messages: list[dict]) -> list[dict]:
+        """Build system blocks with a cache breakpoint on the last one."""
+        system_texts = [self.system_prompt] if self.system_prompt else []
+        system_texts += [m["content"] for m in messages if m["role"] == "system"]
+        if not system_texts:
+            return []
+
+        blocks = [{"type": "text", "text": text} for text in system_texts]
+        blocks[-1]["cache_control"] = {"type": "ephemeral"}
+        return blocks
+
     def _call_api(self, messages: list[dict]) -> tuple[str, TokenUsage]:
-        """Make API call to Claude and return (content, tokens)."""
+        """Make API call to Claude and return (content, tokens).
+
+        System messages (the configured system prompt and any cacheable
+        prompt prefix) are sent as system blocks, with a cache breakpoint on
+        the last one so repeat invocations only prefill the user turn.
+        """
         try:
             kwargs = {
                 "model": self.model_id,
                 "max_tokens": self.max_tokens,
-                "messages": messages,
+                "messages": [m for m in messages if m["role"] != "system"],
             }
 
-            if self.system_prompt:
-                kwargs["system"] = self.system_prompt
+            system_blocks = self._system_blocks(messages)
+            if system_blocks:
+                kwargs["system"] = system_blocks
 
             response = self.client.messages.create(**kwargs)
 
@@ -61,10 +117,7 @@ class ClaudeAPIAgent(APIAgent):
                     content += block.text
 
             # Extract token usage
-            tokens = TokenUsage(
-                input_tokens=response.usage.input_tokens,
-                output_tokens=response.usage.output_tokens,
-            )
+            tokens = self._extract_usage(response.usage)
 
             return content, tokens
 
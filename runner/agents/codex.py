@@ -9,6 +9,8 @@ from runner.models import TokenUsage
 class CodexAgent(CLIAgent):
     """Agent that uses the Codex/OpenAI CLI."""
 
+    TOKENIZER_FAMILY = "openai"
+
     def __init__(self, config: dict, session_dir: str = "workflow/sessions"):
         config.setdefault("name", "codex")
         config.setdefault("context_window", 128000)
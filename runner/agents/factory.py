@@ -8,8 +8,18 @@ Usage:
 
     # Will use CLI or API based on AGENT_MODE config
     agent = create_agent("claude", {"model": "sonnet"})
+
+    # Reuse an agent (and its SDK client) across calls
+    with agent_pool.checkout("claude", {"model": "sonnet"}) as agent:
+        result = agent.invoke(prompt)
 """
 
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
 from runner.agents.base import BaseAgent
 from runner.config import AGENT_MODE
 
@@ -181,3 +191,123 @@ def get_available_agents(mode: str | None = None) -> list[str]:
         return list(API_AGENT_REGISTRY.keys())
     else:
         return list(CLI_AGENT_REGISTRY.keys())
+
+
+class AgentPool:
+    """Process-wide pool of idle agents, keyed by their construction inputs.
+
+    Constructing an agent imports its SDK, builds a new HTTP client (and for
+    Ollama probes the GPU), so services that create one per call pay that on
+    every message. The pool hands out an existing idle agent built from the
+    same (name, mode, model, config) instead.
+
+    Checkout is exclusive: an agent is used by one caller at a time, so
+    per-agent state (API message history, dev logger, CLI subprocess) is
+    never shared. Released agents have that state cleared before reuse.
+    """
+
+    def __init__(self, max_idle_per_key: int = 4):
+        self.max_idle_per_key = max_idle_per_key
+        self._idle: dict[tuple, list[BaseAgent]] = {}
+        self._leased: dict[int, tuple] = {}
+        self._lock = threading.Lock()
+
+    def acquire(
+        self,
+        name: str,
+        config: dict,
+        session_dir: str = "workflow/sessions",
+        mode: str | None = None,
+    ) -> BaseAgent:
+        """Check out an agent, creating one if none is idle.
+
+        Arguments are the same as create_agent(). The agent must be given
+        back with release().
+        """
+        key = pool_key(name, config, session_dir, mode)
+        with self._lock:
+            idle = self._idle.get(key)
+            agent = idle.pop() if idle else None
+        if agent is None:
+            agent = create_agent(name, config, session_dir, mode)
+        with self._lock:
+            self._leased[id(agent)] = key
+        return agent
+
+    def release(self, agent: BaseAgent) -> None:
+        """Return a checked-out agent to the pool."""
+        with self._lock:
+            key = self._leased.pop(id(agent), None)
+        if key is None:
+            return
+
+        agent.clear_dev_logger()
+        if hasattr(agent, "clear_session"):
+            agent.clear_session()
+
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self.max_idle_per_key:
+                idle.append(agent)
+
+    def discard(self, agent: BaseAgent) -> None:
+        """End a checkout without returning the agent to the pool.
+
+        For agents a caller may still be using (e.g. a cancelled fan-out
+        thread that is still running), which must never be handed out again.
+        """
+        with self._lock:
+            self._leased.pop(id(agent), None)
+
+    @contextmanager
+    def checkout(
+        self,
+        name: str,
+        config: dict,
+        session_dir: str = "workflow/sessions",
+        mode: str | None = None,
+    ) -> Iterator[BaseAgent]:
+        """Check out an agent for the duration of a with block."""
+        agent = self.acquire(name, config, session_dir, mode)
+        try:
+            yield agent
+        finally:
+            self.release(agent)
+
+    def clear(self) -> None:
+        """Drop all idle agents (e.g. after API keys change)."""
+        with self._lock:
+            self._idle.clear()
+
+    def idle_count(self) -> int:
+        """Get the number of idle agents across all keys."""
+        with self._lock:
+            return sum(len(idle) for idle in self._idle.values())
+
+
+def pool_key(
+    name: str,
+    config: dict,
+    session_dir: str = "workflow/sessions",
+    mode: str | None = None,
+) -> tuple:
+    """Get the pool key for create_agent() arguments.
+
+    Agents are interchangeable when they were built from the same name,
+    effective mode and config. CLI agents also keep session files under
+    session_dir, so it is part of their key.
+    """
+    _lazy_load_registries()
+    effective_mode = mode or config.get("type") or AGENT_MODE
+    if effective_mode != "cli" and _get_base_agent(name, API_AGENT_REGISTRY):
+        kind = ("api", None)
+    else:
+        kind = ("cli", session_dir)
+    config_hash = hashlib.sha256(
+        json.dumps(config, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return (name, *kind, config.get("model"), config_hash)
+
+
+# Shared pool for services and workflow runs
+agent_pool = AgentPool()
@@ -9,6 +9,8 @@ from runner.models import TokenUsage
 class GeminiAgent(CLIAgent):
     """Agent that uses the Gemini CLI."""
 
+    TOKENIZER_FAMILY = "gemini"
+
     # Pricing per 1k tokens by model family
     # Gemini Pro has tiered pricing: $2/$12 (<=200k) and $4/$18 (>200k) - using average
     MODEL_PRICING = {
@@ -20,6 +20,8 @@ class GeminiAPIAgent(APIAgent):
         - flash-2: gemini-2.0-flash
     """
 
+    TOKENIZER_FAMILY = "gemini"
+
     MODEL_MAP = {
         "pro": "gemini-1.5-pro",
         "flash": "gemini-1.5-flash",
@@ -1,11 +1,29 @@
-"""GPU detection for Ollama model tier selection."""
+"""GPU detection for Ollama model tier selection.
 
+Probing shells out to nvidia-smi / rocm-smi / sysctl, so the result is
+memoized per process: callers should use get_hardware_profile() rather
+than detect_gpu(). The profile can be pinned without probing:
+
+- GPU_VRAM_GB (and optionally GPU_VENDOR, GPU_NAME) environment variables
+- GPU_PROFILE_FILE: path to a JSON file {"vendor", "vram_gb", "name"}
+
+Environment variables take precedence over the file. Call
+refresh_hardware_profile() after changing either, or when hardware
+changes (e.g. a GPU is attached to a running container).
+"""
+
+import json
+import logging
+import os
 import platform
 import re
 import subprocess
+import threading
 from dataclasses import dataclass
 from typing import Optional
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class GPUInfo:
@@ -45,6 +63,64 @@ def detect_gpu() -> GPUInfo:
     return GPUInfo(vendor="none", vram_gb=0.0)
 
 
+_profile: Optional[GPUInfo] = None
+_profile_lock = threading.Lock()
+
+
+def get_hardware_profile() -> GPUInfo:
+    """Get the GPU profile for this process, detecting it on first use."""
+    global _profile
+    if _profile is None:
+        with _profile_lock:
+            if _profile is None:
+                _profile = _load_override() or detect_gpu()
+    return _profile
+
+
+def refresh_hardware_profile() -> GPUInfo:
+    """Re-read overrides and re-probe the GPU.
+
+    Returns:
+        The new profile
+    """
+    global _profile
+    with _profile_lock:
+        _profile = _load_override() or detect_gpu()
+    return _profile
+
+
+def _load_override() -> Optional[GPUInfo]:
+    """Get a pinned profile from GPU_* env vars or GPU_PROFILE_FILE."""
+    vram = os.environ.get("GPU_VRAM_GB")
+    if vram:
+        try:
+            vram_gb = float(vram)
+        except ValueError:
+            logger.warning("Ignoring invalid GPU_VRAM_GB=%r", vram)
+        else:
+            return GPUInfo(
+                vendor=os.environ.get(
+                    "GPU_VENDOR", "none" if vram_gb == 0 else "override"
+                ),
+                vram_gb=vram_gb,
+                name=os.environ.get("GPU_NAME"),
+            )
+
+    path = os.environ.get("GPU_PROFILE_FILE")
+    if path:
+        try:
+            with open(path) as f:
+                data = json.load(f)
+            return GPUInfo(
+                vendor=str(data.get("vendor", "override")),
+                vram_gb=float(data.get("vram_gb", 0.0)),
+                name=data.get("name"),
+            )
+        except (OSError, ValueError, TypeError, AttributeError) as e:
+            logger.warning("Ignoring unreadable GPU_PROFILE_FILE %s: %s", path, e)
+    return None
+
+
 def _detect_nvidia() -> Optional[GPUInfo]:
     """Detect NVIDIA GPU using nvidia-smi.
 
@@ -128,9 +204,11 @@ def _detect_apple_metal() -> Optional[GPUInfo]:
     return None
 
 
-def get_model_tier(gpu_info: GPUInfo) -> str:
+def get_model_tier(gpu_info: Optional[GPUInfo] = None) -> str:
     """Determine model tier based on VRAM.
 
+    Uses the process hardware profile when gpu_info is not given.
+
     Tiers are defined in workflows/configs/ollama.yaml with these ranges:
     - tier_cpu: 0-6 GB (or no GPU)
     - tier_8gb: 6-10 GB
@@ -138,6 +216,8 @@ def get_model_tier(gpu_info: GPUInfo) -> str:
     - tier_24gb: 20-26 GB
     - tier_48gb: 40+ GB
     """
+    if gpu_info is None:
+        gpu_info = get_hardware_profile()
     vram = gpu_info.vram_gb
 
     if vram >= 40:
@@ -157,7 +237,7 @@ def get_gpu_summary() -> dict:
 
     Useful for diagnostics and display.
     """
-    gpu = detect_gpu()
+    gpu = get_hardware_profile()
     tier = get_model_tier(gpu)
 
     return {
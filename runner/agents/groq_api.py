@@ -5,7 +5,7 @@ from typing import Optional
 
 from groq import Groq, RateLimitError as GroqRateLimitError
 
-from runner.agents.api_base import APIAgent, RateLimitError
+from runner.agents.api_base import APIAgent, RateLimitError, cached_prompt_tokens
 from runner.models import TokenUsage
 
 
@@ -22,6 +22,8 @@ class GroqAPIAgent(APIAgent):
         - whisper-turbo: whisper-large-v3-turbo
     """
 
+    TOKENIZER_FAMILY = "llama"
+
     MODEL_MAP = {
         # Production models only
         "llama-8b": "llama-3.1-8b-instant",
@@ -51,6 +53,10 @@ class GroqAPIAgent(APIAgent):
         "whisper-large-v3-turbo": 4.0,
     }
 
+    # Automatic prefix caching on supported models; cached input bills at 50%
+    PREFIX_CACHING = True
+    CACHE_READ_MULTIPLIER = 0.5
+
     def __init__(self, config: dict):
         # Auto-set pricing based on model before calling super().__init__
         model_alias = config.get("model", "llama-70b")
@@ -109,6 +115,7 @@ class GroqAPIAgent(APIAgent):
             tokens = TokenUsage(
                 input_tokens=response.usage.prompt_tokens,
                 output_tokens=response.usage.completion_tokens,
+                cache_read_tokens=cached_prompt_tokens(response.usage),
             )
             return content, tokens
 
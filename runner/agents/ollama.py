@@ -7,7 +7,7 @@ from typing import Optional, TYPE_CHECKING
 import requests
 
 from runner.agents.base import BaseAgent
-from runner.agents.gpu_detect import detect_gpu, get_model_tier
+from runner.agents.gpu_detect import get_hardware_profile, get_model_tier
 from runner.models import AgentResult, TokenUsage
 from runner.sessions.file_based import FileBasedSessionManager
 
@@ -81,6 +81,8 @@ class OllamaAgent(BaseAgent):
     - Persona-aware model selection (writer vs auditor vs coder)
     """
 
+    TOKENIZER_FAMILY = "llama"
+
     def __init__(
         self,
         config: dict,
@@ -97,8 +99,8 @@ class OllamaAgent(BaseAgent):
         self.timeout = config.get("timeout", 300)
         self.cost_per_1k = {"input": 0.0, "output": 0.0}  # Local = free
 
-        # GPU detection and tier selection
-        self.gpu_info = detect_gpu()
+        # GPU profile (detected once per process) and tier selection
+        self.gpu_info = get_hardware_profile()
         self.tier = get_model_tier(self.gpu_info)
         self.tier_config = MODEL_TIERS.get(self.tier, MODEL_TIERS["tier_cpu"])
 
@@ -4,7 +4,7 @@ import os
 
 from openai import OpenAI, RateLimitError as OpenAIRateLimitError
 
-from runner.agents.api_base import APIAgent, RateLimitError
+from runner.agents.api_base import APIAgent, RateLimitError, cached_prompt_tokens
 from runner.models import TokenUsage
 
 
@@ -20,6 +20,8 @@ class OpenAIAPIAgent(APIAgent):
         - o3-mini: o3-mini
     """
 
+    TOKENIZER_FAMILY = "openai"
+
     MODEL_MAP = {
         "gpt4": "gpt-4-turbo",
         "gpt4o": "gpt-4o",
@@ -29,6 +31,11 @@ class OpenAIAPIAgent(APIAgent):
         "o3-mini": "o3-mini",
     }
 
+    # Automatic prefix caching for prompts over 1024 tokens; cached input
+    # bills at 50% and there is no write surcharge
+    PREFIX_CACHING = True
+    CACHE_READ_MULTIPLIER = 0.5
+
     def __init__(self, config: dict):
         super().__init__(config)
         self.client = OpenAI(api_key=self.api_key)
@@ -74,6 +81,7 @@ class OpenAIAPIAgent(APIAgent):
             tokens = TokenUsage(
                 input_tokens=response.usage.prompt_tokens,
                 output_tokens=response.usage.completion_tokens,
+                cache_read_tokens=cached_prompt_tokens(response.usage),
             )
 
             return content, tokens
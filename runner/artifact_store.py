@@ -0,0 +1,312 @@
+"""Content-addressed storage for workflow output bodies.
+
+Every agent output used to be stored in full in workflow_outputs.content,
+once per retry and once per run, even when the text was identical. With an
+artifact store configured (see ARTIFACT_STORE in runner.config), output
+bodies larger than ARTIFACT_INLINE_MAX_BYTES are written once as blobs
+keyed by their SHA-256, and the row keeps only a "sha256:<hex>" reference
+plus the original size. Identical outputs share one blob.
+
+Blobs are optionally zstd-compressed (when the zstandard package is
+installed). Compressed blobs are recognized by the zstd frame magic, so a
+store can mix compressed and raw blobs and the setting can change at any
+time.
+
+Backends:
+- LocalArtifactStore: files under a directory, sharded by digest prefix
+- S3ArtifactStore: any S3-compatible bucket (boto3, or an injected client)
+
+Blobs are never deleted when rows are; they may be shared with other runs.
+"""
+
+import hashlib
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from sqlalchemy.orm.attributes import set_committed_value
+
+from runner.config import (
+    ARTIFACT_COMPRESSION,
+    ARTIFACT_INLINE_MAX_BYTES,
+    ARTIFACT_S3_BUCKET,
+    ARTIFACT_S3_ENDPOINT_URL,
+    ARTIFACT_S3_PREFIX,
+    ARTIFACT_STORE,
+    ARTIFACT_STORE_DIR,
+)
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+REF_PREFIX = "sha256:"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+ZSTD_LEVEL = 3
+
+
+def make_ref(data: bytes) -> str:
+    """Get the content reference for a blob."""
+    return REF_PREFIX + hashlib.sha256(data).hexdigest()
+
+
+def parse_ref(ref: str) -> str:
+    """Get the hex digest from a content reference.
+
+    Raises:
+        ValueError: If ref is not a sha256 reference
+    """
+    digest = ref[len(REF_PREFIX) :] if ref.startswith(REF_PREFIX) else ""
+    if len(digest) != 64 or not all(c in "0123456789abcdef" for c in digest):
+        raise ValueError(f"Invalid artifact reference: {ref}")
+    return digest
+
+
+class ArtifactStore(ABC):
+    """Write-once blob store keyed by SHA-256 of the uncompressed content."""
+
+    def __init__(self, compress: bool = True):
+        self.compress = compress and zstandard is not None
+
+    def put(self, data: bytes) -> str:
+        """Store a blob unless an identical one already exists.
+
+        Args:
+            data: Uncompressed content
+
+        Returns:
+            Content reference ("sha256:<hex>")
+        """
+        ref = make_ref(data)
+        digest = parse_ref(ref)
+        if not self._exists(digest):
+            self._write(digest, self._encode(data))
+        return ref
+
+    def get(self, ref: str) -> bytes:
+        """Read a blob by reference.
+
+        Raises:
+            KeyError: If no blob exists for the reference
+        """
+        return self._decode(self._read(parse_ref(ref)))
+
+    def exists(self, ref: str) -> bool:
+        """Check whether a blob exists for a reference."""
+        return self._exists(parse_ref(ref))
+
+    def put_text(self, text: str) -> str:
+        """Store UTF-8 text; see put()."""
+        return self.put(text.encode("utf-8"))
+
+    def get_text(self, ref: str) -> str:
+        """Read UTF-8 text; see get()."""
+        return self.get(ref).decode("utf-8")
+
+    def _encode(self, data: bytes) -> bytes:
+        if not self.compress:
+            return data
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(data)
+        # Tiny or incompressible blobs are stored raw
+        return compressed if len(compressed) < len(data) else data
+
+    @staticmethod
+    def _decode(blob: bytes) -> bytes:
+        if not blob.startswith(ZSTD_MAGIC):
+            return blob
+        if zstandard is None:
+            raise RuntimeError(
+                "Artifact is zstd-compressed but zstandard is not installed"
+            )
+        return zstandard.ZstdDecompressor().decompress(blob)
+
+    @abstractmethod
+    def _exists(self, digest: str) -> bool:
+        """Check for a stored blob."""
+
+    @abstractmethod
+    def _read(self, digest: str) -> bytes:
+        """Read a stored blob. Raises KeyError if missing."""
+
+    @abstractmethod
+    def _write(self, digest: str, blob: bytes) -> None:
+        """Write a blob (must be atomic: readers never see partial blobs)."""
+
+
+class LocalArtifactStore(ArtifactStore):
+    """Blobs stored as files under root/<first 2 hex chars>/<digest>."""
+
+    def __init__(self, root: str, compress: bool = True):
+        super().__init__(compress=compress)
+        self.root = root
+
+    def _path(self, digest: str) -> str:
+        return os.path.join(self.root, digest[:2], digest)
+
+    def _exists(self, digest: str) -> bool:
+        return os.path.exists(self._path(digest))
+
+    def _read(self, digest: str) -> bytes:
+        try:
+            with open(self._path(digest), "rb") as f:
+                return f.read()
+        except FileNotFoundError:
+            raise KeyError(digest) from None
+
+    def _write(self, digest: str, blob: bytes) -> None:
+        path = self._path(digest)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+
+class S3ArtifactStore(ArtifactStore):
+    """Blobs stored as objects in an S3-compatible bucket."""
+
+    def __init__(
+        self,
+        bucket: str,
+        prefix: str = "artifacts/",
+        client: Any = None,
+        endpoint_url: Optional[str] = None,
+        compress: bool = True,
+    ):
+        super().__init__(compress=compress)
+        if client is None:
+            try:
+                import boto3
+            except ImportError:
+                raise RuntimeError(
+                    "S3 artifact store requires boto3. Install with: pip install boto3"
+                ) from None
+            client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = prefix
+
+    def _key(self, digest: str) -> str:
+        return f"{self.prefix}{digest[:2]}/{digest}"
+
+    def _exists(self, digest: str) -> bool:
+        # list_objects_v2 reports a miss without raising, unlike head_object
+        response = self.client.list_objects_v2(
+            Bucket=self.bucket, Prefix=self._key(digest), MaxKeys=1
+        )
+        return response.get("KeyCount", 0) > 0
+
+    def _read(self, digest: str) -> bytes:
+        try:
+            response = self.client.get_object(Bucket=self.bucket, Key=self._key(digest))
+        except Exception as e:
+            if _s3_error_code(e) in ("NoSuchKey", "404"):
+                raise KeyError(digest) from None
+            raise
+        return response["Body"].read()
+
+    def _write(self, digest: str, blob: bytes) -> None:
+        # Single PUTs are atomic in S3
+        self.client.put_object(Bucket=self.bucket, Key=self._key(digest), Body=blob)
+
+
+def _s3_error_code(error: Exception) -> Optional[str]:
+    """Error code of a botocore ClientError (matched by shape so botocore stays optional)."""
+    response = getattr(error, "response", None)
+    if not isinstance(response, dict):
+        return None
+    return response.get("Error", {}).get("Code")
+
+
+_store: Optional[ArtifactStore] = None
+_configured = False
+_lock = threading.Lock()
+
+
+def get_artifact_store() -> Optional[ArtifactStore]:
+    """Get the configured artifact store, or None if outputs stay inline."""
+    global _store, _configured
+    if not _configured:
+        with _lock:
+            if not _configured:
+                _store = _build_store()
+                _configured = True
+    return _store
+
+
+def set_artifact_store(store: Optional[ArtifactStore]) -> None:
+    """Override the configured artifact store (None = keep outputs inline)."""
+    global _store, _configured
+    with _lock:
+        _store = store
+        _configured = True
+
+
+def _build_store() -> Optional[ArtifactStore]:
+    compress = ARTIFACT_COMPRESSION == "zstd"
+    if ARTIFACT_STORE == "local":
+        return LocalArtifactStore(ARTIFACT_STORE_DIR, compress=compress)
+    if ARTIFACT_STORE == "s3":
+        if not ARTIFACT_S3_BUCKET:
+            raise ValueError("ARTIFACT_STORE=s3 requires ARTIFACT_S3_BUCKET")
+        return S3ArtifactStore(
+            ARTIFACT_S3_BUCKET,
+            prefix=ARTIFACT_S3_PREFIX,
+            endpoint_url=ARTIFACT_S3_ENDPOINT_URL,
+            compress=compress,
+        )
+    if ARTIFACT_STORE:
+        raise ValueError(f"Unknown ARTIFACT_STORE: {ARTIFACT_STORE}")
+    return None
+
+
+def externalize_content(content: str) -> tuple[str, Optional[str], Optional[int]]:
+    """Move an output body to the artifact store if one is configured.
+
+    Args:
+        content: Output text
+
+    Returns:
+        (content to store inline, content_ref, size_bytes). Inline content
+        is "" when the body was moved to the store.
+    """
+    store = get_artifact_store()
+    data = content.encode("utf-8")
+    if store is None or len(data) <= ARTIFACT_INLINE_MAX_BYTES:
+        return content, None, None
+    return "", store.put(data), len(data)
+
+
+def resolve_content(rows: list) -> list:
+    """Fill in content for rows that hold an artifact reference.
+
+    Values are set as already-committed state, so loaded rows are not
+    marked dirty and the body is never written back to the database.
+
+    Args:
+        rows: Objects with content and content_ref attributes
+
+    Returns:
+        The same rows
+    """
+    pending = [row for row in rows if row is not None and row.content_ref]
+    if not pending:
+        return rows
+
+    store = get_artifact_store()
+    if store is None:
+        raise RuntimeError(
+            "Workflow outputs reference an artifact store but ARTIFACT_STORE "
+            "is not configured"
+        )
+    for row in pending:
+        set_committed_value(row, "content", store.get_text(row.content_ref))
+    return rows
@@ -0,0 +1,56 @@
+"""Durable run checkpoints.
+
+StateMachine.run keeps the run's progress in memory: the current state,
+retry feedback, circuit breaker counters and token totals. If the process
+restarts mid-run, all of it was lost and the run had to be redone from
+the start, paying again for every completed agent call.
+
+After each state transition the state machine now writes a compact
+RunCheckpoint to <run_dir>/checkpoint.json (atomic replace, a few KB).
+WorkflowRunner.resume() loads it and restarts the run at the state after
+the last completed one; outputs of completed states are read from the
+run directory as usual. The checkpoint is removed when the run reaches a
+non-error terminal state.
+"""
+
+import os
+from typing import Optional
+
+from runner.models import RunCheckpoint
+
+CHECKPOINT_FILE = "checkpoint.json"
+
+
+def checkpoint_path(run_dir: str) -> str:
+    """Path of the checkpoint file for a run directory."""
+    return os.path.join(run_dir, CHECKPOINT_FILE)
+
+
+def save_checkpoint(run_dir: str, checkpoint: RunCheckpoint) -> None:
+    """Atomically write a run's checkpoint."""
+    path = checkpoint_path(run_dir)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        f.write(checkpoint.model_dump_json())
+    os.replace(tmp_path, path)
+
+
+def load_checkpoint(run_dir: str) -> Optional[RunCheckpoint]:
+    """Load a run's checkpoint.
+
+    Returns:
+        The checkpoint, or None if the run has none (or it is unreadable)
+    """
+    try:
+        with open(checkpoint_path(run_dir)) as f:
+            return RunCheckpoint.model_validate_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+
+def clear_checkpoint(run_dir: str) -> None:
+    """Remove a run's checkpoint, if any."""
+    try:
+        os.remove(checkpoint_path(run_dir))
+    except FileNotFoundError:
+        pass
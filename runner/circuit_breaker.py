@@ -1,5 +1,6 @@
 """Circuit breaker for preventing infinite loops and runaway costs."""
 
+import threading
 import time
 from collections import defaultdict
 
@@ -9,6 +10,11 @@ class CircuitBreaker:
 
     Tracks state visits, transitions, time, and cost.
     Triggers a break when any rule condition is met.
+
+    Cost is updated from fan-out worker threads, so update_cost() is atomic
+    and hard_cost_limit_reached() can be read mid-state; the other rules
+    (including the overridable cost_limit) are only checked by the main
+    loop at transitions.
     """
 
     def __init__(self, config: dict):
@@ -36,6 +42,7 @@ class CircuitBreaker:
         self.transition_count = 0
         self.start_time = time.time()
         self.total_cost = 0.0
+        self._cost_lock = threading.Lock()
 
     def check(self, from_state: str, to_state: str) -> dict:
         """Check rules. Returns break info if triggered."""
@@ -101,9 +108,42 @@ class CircuitBreaker:
             "total_cost_usd": self.total_cost,
         }
 
-    def update_cost(self, cost_usd: float):
-        """Call after each agent invocation with the cost."""
-        self.total_cost += cost_usd
+    def restore(self, context: dict):
+        """Restore counters saved with get_context() (e.g. from a checkpoint).
+
+        The timeout clock resumes from the saved elapsed time, so time the
+        run spent stopped doesn't count against it.
+        """
+        self.state_visits.clear()
+        self.state_visits.update(context.get("state_visits", {}))
+        self.transition_history = [
+            tuple(pair) for pair in context.get("transition_history", [])
+        ]
+        self.transition_count = context.get("transition_count", 0)
+        self.start_time = time.time() - context.get("elapsed_s", 0.0)
+        with self._cost_lock:
+            self.total_cost = context.get("total_cost_usd", 0.0)
+
+    def update_cost(self, cost_usd: float) -> float:
+        """Call after each agent invocation with the cost.
+
+        Safe to call from concurrent fan-out agents.
+
+        Returns:
+            The run's total cost including this invocation
+        """
+        with self._cost_lock:
+            self.total_cost += cost_usd
+            return self.total_cost
+
+    def hard_cost_limit_reached(self) -> bool:
+        """Check the hard cost limit between transitions (e.g. before an agent call).
+
+        The soft cost_limit rule is left to check(): it raises a circuit
+        break the run can auto-proceed past or the user can approve, so it
+        must not block the calls made after that override.
+        """
+        return self.total_cost >= self.safety_limits.get("max_cost_hard", 10.00)
 
     def check_safety_limits(self) -> dict:
         """Check hard limits that orchestrator can't override.
@@ -147,4 +187,5 @@ class CircuitBreaker:
         self.transition_history.clear()
         self.transition_count = 0
         self.start_time = time.time()
-        self.total_cost = 0.0
+        with self._cost_lock:
+            self.total_cost = 0.0
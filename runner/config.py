@@ -31,6 +31,26 @@ WORKING_DIR = os.environ.get(
     "WORKFLOW_WORKING_DIR", str(PROJECT_ROOT / "workflow" / "data")
 )
 
+# =============================================================================
+# Artifact Store (content-addressed workflow outputs)
+# =============================================================================
+
+# Where workflow output bodies live: "" keeps them inline in the database,
+# "local" uses ARTIFACT_STORE_DIR, "s3" uses an S3-compatible bucket.
+ARTIFACT_STORE = os.environ.get("ARTIFACT_STORE", "").lower()
+ARTIFACT_STORE_DIR = os.environ.get(
+    "ARTIFACT_STORE_DIR", os.path.join(WORKING_DIR, "artifacts")
+)
+ARTIFACT_S3_BUCKET = os.environ.get("ARTIFACT_S3_BUCKET", "")
+ARTIFACT_S3_PREFIX = os.environ.get("ARTIFACT_S3_PREFIX", "artifacts/")
+ARTIFACT_S3_ENDPOINT_URL = os.environ.get("ARTIFACT_S3_ENDPOINT_URL") or None
+
+# "zstd" compresses blobs when the zstandard package is installed
+ARTIFACT_COMPRESSION = os.environ.get("ARTIFACT_COMPRESSION", "zstd").lower()
+
+# Outputs at or below this size stay inline (saves a round trip per read)
+ARTIFACT_INLINE_MAX_BYTES = int(os.environ.get("ARTIFACT_INLINE_MAX_BYTES", "1024"))
+
 # =============================================================================
 # Agent Mode Configuration (Phase 0A - API-Based Agents)
 # =============================================================================
@@ -13,11 +13,14 @@ Usage:
         users = repo.list_all()
 """
 
+from datetime import datetime
 from typing import Optional, TypeVar, Generic
 from uuid import UUID
 
+from sqlalchemy import delete, func
 from sqlmodel import Session, select
 
+from runner.artifact_store import resolve_content
 from runner.db.models import (
     # Core
     User,
@@ -46,6 +49,8 @@ from runner.db.models import (
     WorkflowSessionCreate,
     WorkflowStateMetric,
     WorkflowStateMetricCreate,
+    LLMResponseCache,
+    LLMResponseCacheCreate,
     # History
     RunRecord,
     RunRecordCreate,
@@ -417,17 +422,31 @@ class WorkflowRunRepository(BaseRepository[WorkflowRun, WorkflowRunCreate]):
         return self.session.exec(statement).first()
 
     def list_by_user(
-        self, user_id: UUID, limit: int = 50, workspace_id: Optional[UUID] = None
+        self,
+        user_id: UUID,
+        limit: int = 50,
+        workspace_id: Optional[UUID] = None,
+        story: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
     ) -> list[WorkflowRun]:
-        """List recent workflow runs for a user, optionally filtered by workspace."""
+        """List recent workflow runs for a user, newest first.
+
+        Served by the (user_id, started_at) index; story/status narrow it.
+        """
         statement = (
             select(WorkflowRun)
             .where(WorkflowRun.user_id == user_id)
             .order_by(WorkflowRun.started_at.desc())
+            .offset(offset)
             .limit(limit)
         )
         if workspace_id is not None:
             statement = statement.where(WorkflowRun.workspace_id == workspace_id)
+        if story is not None:
+            statement = statement.where(WorkflowRun.story == story)
+        if status is not None:
+            statement = statement.where(WorkflowRun.status == status)
         return list(self.session.exec(statement).all())
 
     def list_by_workspace(
@@ -508,7 +527,7 @@ class WorkflowOutputRepository(BaseRepository[WorkflowOutput, WorkflowOutputCrea
             .where(WorkflowOutput.run_id == run_id)
             .order_by(WorkflowOutput.created_at)
         )
-        return list(self.session.exec(statement).all())
+        return resolve_content(list(self.session.exec(statement).all()))
 
     def list_by_type(self, run_id: str, output_type: str) -> list[WorkflowOutput]:
         """List all outputs for a workflow run by output type."""
@@ -520,8 +539,45 @@ class WorkflowOutputRepository(BaseRepository[WorkflowOutput, WorkflowOutputCrea
             )
             .order_by(WorkflowOutput.created_at)
         )
+        return resolve_content(list(self.session.exec(statement).all()))
+
+    def list_metadata_by_run(self, run_id: str) -> list:
+        """List output metadata for a run without loading content.
+
+        Returns rows with state_name, output_type, size_bytes (computed by
+        the database) and created_at, ordered like list_by_run.
+        """
+        statement = (
+            select(
+                WorkflowOutput.state_name,
+                WorkflowOutput.output_type,
+                func.coalesce(
+                    WorkflowOutput.size_bytes,
+                    func.octet_length(WorkflowOutput.content),
+                ).label("size_bytes"),
+                WorkflowOutput.created_at,
+            )
+            .where(WorkflowOutput.run_id == run_id)
+            .order_by(WorkflowOutput.created_at)
+        )
         return list(self.session.exec(statement).all())
 
+    def get_by_state_and_type(
+        self, run_id: str, state_name: str, output_type: str
+    ) -> Optional[WorkflowOutput]:
+        """Get the first output for a (state, output type) pair in a run."""
+        statement = (
+            select(WorkflowOutput)
+            .where(
+                WorkflowOutput.run_id == run_id,
+                WorkflowOutput.state_name == state_name,
+                WorkflowOutput.output_type == output_type,
+            )
+            .order_by(WorkflowOutput.created_at)
+            .limit(1)
+        )
+        return resolve_content([self.session.exec(statement).first()])[0]
+
     def get_latest_by_state(
         self, run_id: str, state_name: str
     ) -> Optional[WorkflowOutput]:
@@ -533,7 +589,7 @@ class WorkflowOutputRepository(BaseRepository[WorkflowOutput, WorkflowOutputCrea
             )
             .order_by(WorkflowOutput.created_at.desc())
         )
-        return self.session.exec(statement).first()
+        return resolve_content([self.session.exec(statement).first()])[0]
 
 
 class WorkflowPersonaRepository(BaseRepository[WorkflowPersona, WorkflowPersonaCreate]):
@@ -635,6 +691,45 @@ class WorkflowSessionRepository(BaseRepository[WorkflowSession, WorkflowSessionC
         return True
 
 
+class LLMResponseCacheRepository(
+    BaseRepository[LLMResponseCache, LLMResponseCacheCreate]
+):
+    """Repository for LLMResponseCache operations."""
+
+    model = LLMResponseCache
+
+    def get_fresh(self, cache_key: str, now: datetime) -> Optional[LLMResponseCache]:
+        """Get a cached response by key if it has not expired."""
+        statement = select(LLMResponseCache).where(
+            LLMResponseCache.cache_key == cache_key,
+            LLMResponseCache.expires_at > now,
+        )
+        return self.session.exec(statement).first()
+
+    def upsert(self, data: LLMResponseCacheCreate) -> LLMResponseCache:
+        """Create or replace the cached response for a key."""
+        statement = select(LLMResponseCache).where(
+            LLMResponseCache.cache_key == data.cache_key
+        )
+        existing = self.session.exec(statement).first()
+        if not existing:
+            return self.create(data)
+
+        for key, value in data.model_dump().items():
+            setattr(existing, key, value)
+        self.session.add(existing)
+        self.session.commit()
+        self.session.refresh(existing)
+        return existing
+
+    def delete_expired(self, now: datetime) -> int:
+        """Delete expired entries and return how many were removed."""
+        statement = delete(LLMResponseCache).where(LLMResponseCache.expires_at <= now)
+        result = self.session.exec(statement)
+        self.session.commit()
+        return result.rowcount
+
+
 class WorkflowStateMetricRepository(
     BaseRepository[WorkflowStateMetric, WorkflowStateMetricCreate]
 ):
@@ -2,12 +2,16 @@
 
 from __future__ import annotations
 
+from datetime import datetime
 from typing import Optional, Union
 from uuid import UUID
 
 from sqlalchemy import text
+from sqlalchemy.orm.attributes import set_committed_value
 
+from runner.artifact_store import externalize_content
 from runner.db.engine import get_session
+from runner.db.models import LLMResponseCacheCreate
 from runner.content.ids import normalize_user_id
 from runner.content.repository import (
     WorkflowRunRepository,
@@ -15,6 +19,7 @@ from runner.content.repository import (
     WorkflowPersonaRepository,
     WorkflowSessionRepository,
     WorkflowStateMetricRepository,
+    LLMResponseCacheRepository,
 )
 
 
@@ -60,10 +65,23 @@ class WorkflowStore:
             repo = WorkflowRunRepository(session)
             return repo.get_by_run_id(run_id)
 
-    def get_workflow_runs_for_user(self, user_id, limit: int = 50):
+    def get_workflow_runs_for_user(
+        self,
+        user_id,
+        limit: int = 50,
+        story: Optional[str] = None,
+        status: Optional[str] = None,
+        offset: int = 0,
+    ):
         with get_session() as session:
             repo = WorkflowRunRepository(session)
-            return repo.list_by_user(normalize_user_id(user_id), limit=limit)
+            return repo.list_by_user(
+                normalize_user_id(user_id),
+                limit=limit,
+                story=story,
+                status=status,
+                offset=offset,
+            )
 
     def get_latest_workflow_run_for_story(self, user_id, story: str):
         """Get the latest workflow run for a story."""
@@ -88,19 +106,27 @@ class WorkflowStore:
         content: str,
         agent: Optional[str] = None,
     ):
+        # Large bodies go to the artifact store (if configured); the row
+        # keeps a content reference
+        inline, content_ref, size_bytes = externalize_content(content)
         with get_session() as session:
             repo = WorkflowOutputRepository(session)
-            return repo.create(
+            output = repo.create(
                 repo.model.model_validate(
                     {
                         "run_id": run_id,
                         "state_name": state_name,
                         "output_type": output_type,
-                        "content": content,
+                        "content": inline,
+                        "content_ref": content_ref,
+                        "size_bytes": size_bytes,
                         "agent": agent,
                     }
                 )
             )
+            # Hand back the full body without re-reading the blob
+            set_committed_value(output, "content", content)
+            return output
 
     def get_workflow_outputs(self, run_id: str):
         with get_session() as session:
@@ -112,6 +138,18 @@ class WorkflowStore:
             repo = WorkflowOutputRepository(session)
             return repo.list_by_type(run_id, output_type)
 
+    def get_workflow_output_metadata(self, run_id: str):
+        """List (state_name, output_type, size_bytes, created_at) rows for a run."""
+        with get_session() as session:
+            repo = WorkflowOutputRepository(session)
+            return repo.list_metadata_by_run(run_id)
+
+    def get_workflow_output(self, run_id: str, state_name: str, output_type: str):
+        """Get the output for a (state, output type) pair in a run."""
+        with get_session() as session:
+            repo = WorkflowOutputRepository(session)
+            return repo.get_by_state_and_type(run_id, state_name, output_type)
+
     # ---------------------------------------------------------------------
     # Workflow state metrics
     # ---------------------------------------------------------------------
@@ -237,6 +275,48 @@ class WorkflowStore:
                 run_id=run_id,
             )
 
+    # ---------------------------------------------------------------------
+    # LLM response cache
+    # ---------------------------------------------------------------------
+    def get_cached_response(self, cache_key: str):
+        """Get an unexpired cached LLM response by key."""
+        with get_session() as session:
+            repo = LLMResponseCacheRepository(session)
+            return repo.get_fresh(cache_key, datetime.utcnow())
+
+    def save_cached_response(
+        self,
+        cache_key: str,
+        model: str,
+        content: str,
+        expires_at: datetime,
+        state_name: Optional[str] = None,
+        tokens_input: int = 0,
+        tokens_output: int = 0,
+        cost_usd: float = 0.0,
+    ):
+        """Store an LLM response, replacing any entry with the same key."""
+        with get_session() as session:
+            repo = LLMResponseCacheRepository(session)
+            return repo.upsert(
+                LLMResponseCacheCreate(
+                    cache_key=cache_key,
+                    model=model,
+                    state_name=state_name,
+                    content=content,
+                    tokens_input=tokens_input,
+                    tokens_output=tokens_output,
+                    cost_usd=cost_usd,
+                    expires_at=expires_at,
+                )
+            )
+
+    def purge_expired_cached_responses(self) -> int:
+        """Delete expired cached LLM responses."""
+        with get_session() as session:
+            repo = LLMResponseCacheRepository(session)
+            return repo.delete_expired(datetime.utcnow())
+
     # ---------------------------------------------------------------------
     # Personas
     # ---------------------------------------------------------------------
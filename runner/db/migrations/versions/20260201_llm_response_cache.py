@@ -0,0 +1,55 @@
+"""Add llm_response_cache table.
+
+Revision ID: llm_response_cache
+Revises: add_external_auth_fields
+Create Date: 2026-02-01
+
+Adds:
+- llm_response_cache: provider responses keyed by a hash of model, prompt
+  and generation params, used by states that opt in with `cache:` in the
+  workflow YAML.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "llm_response_cache"
+down_revision = "add_external_auth_fields"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "llm_response_cache",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("cache_key", sa.String(), nullable=False),
+        sa.Column("model", sa.String(), nullable=False),
+        sa.Column("state_name", sa.String(), nullable=True),
+        sa.Column("content", sa.Text(), nullable=False),
+        sa.Column("tokens_input", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tokens_output", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("expires_at", sa.DateTime(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_llm_response_cache_id", "llm_response_cache", ["id"])
+    op.create_index(
+        "ix_llm_response_cache_cache_key",
+        "llm_response_cache",
+        ["cache_key"],
+        unique=True,
+    )
+    op.create_index(
+        "ix_llm_response_cache_expires_at", "llm_response_cache", ["expires_at"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_llm_response_cache_expires_at", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_cache_key", table_name="llm_response_cache")
+    op.drop_index("ix_llm_response_cache_id", table_name="llm_response_cache")
+    op.drop_table("llm_response_cache")
@@ -0,0 +1,31 @@
+"""Add (user_id, started_at) index on workflow_runs.
+
+Revision ID: workflow_runs_user_started_idx
+Revises: llm_response_cache
+Create Date: 2026-02-02
+
+Adds:
+- ix_workflow_runs_user_id_started_at: serves the runs page query
+  (runs for a user, newest first, paged) without sorting all of the
+  user's runs.
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "workflow_runs_user_started_idx"
+down_revision = "llm_response_cache"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_workflow_runs_user_id_started_at",
+        "workflow_runs",
+        ["user_id", "started_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_workflow_runs_user_id_started_at", table_name="workflow_runs")
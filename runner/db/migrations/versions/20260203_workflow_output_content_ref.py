@@ -0,0 +1,41 @@
+"""Add artifact store references to workflow_outputs.
+
+Revision ID: workflow_output_content_ref
+Revises: workflow_runs_user_started_idx
+Create Date: 2026-02-03
+
+Adds:
+- workflow_outputs.content_ref: "sha256:<hex>" reference to a blob in the
+  artifact store; content is "" when set.
+- workflow_outputs.size_bytes: size of the referenced body, so listings
+  don't need to fetch it.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "workflow_output_content_ref"
+down_revision = "workflow_runs_user_started_idx"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "workflow_outputs", sa.Column("content_ref", sa.String(), nullable=True)
+    )
+    op.add_column(
+        "workflow_outputs", sa.Column("size_bytes", sa.Integer(), nullable=True)
+    )
+    op.create_index(
+        "ix_workflow_outputs_content_ref", "workflow_outputs", ["content_ref"]
+    )
+
+
+def downgrade() -> None:
+    # Rows with a content_ref have content == ""; copy bodies back from the
+    # artifact store before downgrading or they are lost.
+    op.drop_index("ix_workflow_outputs_content_ref", table_name="workflow_outputs")
+    op.drop_column("workflow_outputs", "size_bytes")
+    op.drop_column("workflow_outputs", "content_ref")
@@ -0,0 +1,197 @@
+"""Add daily rollup tables for history evaluation queries.
+
+Revision ID: history_daily_rollups
+Revises: workflow_output_content_ref
+Create Date: 2026-02-04
+
+Adds:
+- agent_daily_rollups: invocation and audit score sums per
+  user/day/agent/state
+- run_daily_rollups: completed run sums per user/day
+
+Both are backfilled from the existing history records, and HistoryService
+keeps them current on insert. To recompute them later (e.g. after records
+were written without HistoryService):
+    python -m runner.history.eval --query rebuild_rollups
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "history_daily_rollups"
+down_revision = "workflow_output_content_ref"
+branch_labels = None
+depends_on = None
+
+SCORE_PREFIXES = ("score", "hook", "specifics", "voice", "structure")
+
+# Rollup column prefix -> audit_score_records column
+SCORE_COLUMNS = {
+    prefix: "overall_score" if prefix == "score" else f"{prefix}_score"
+    for prefix in SCORE_PREFIXES
+}
+
+INVOCATION_COLUMNS = (
+    "invocations",
+    "successes",
+    "input_tokens",
+    "output_tokens",
+    "total_tokens",
+    "cost_usd",
+    "duration_s",
+)
+
+# Same day as runner.history.rollups: the run's start date, today if unset
+RUN_DAY = "COALESCE(r.started_at, now() AT TIME ZONE 'utc')::date"
+
+
+def _timestamps() -> list[sa.Column]:
+    return [
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    ]
+
+
+def upgrade() -> None:
+    score_columns = []
+    for prefix in SCORE_PREFIXES:
+        score_columns += [
+            sa.Column(
+                f"{prefix}_count", sa.Integer(), nullable=False, server_default="0"
+            ),
+            sa.Column(f"{prefix}_sum", sa.Float(), nullable=False, server_default="0"),
+        ]
+
+    op.create_table(
+        "agent_daily_rollups",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("agent", sa.String(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("invocations", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("successes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("input_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("output_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("cost_usd", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("duration_s", sa.Float(), nullable=False, server_default="0"),
+        *score_columns,
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "user_id", "day", "agent", "state", name="uq_agent_daily_rollups_key"
+        ),
+    )
+    op.create_index("ix_agent_daily_rollups_id", "agent_daily_rollups", ["id"])
+    op.create_index(
+        "ix_agent_daily_rollups_user_id", "agent_daily_rollups", ["user_id"]
+    )
+    op.create_index("ix_agent_daily_rollups_day", "agent_daily_rollups", ["day"])
+
+    op.create_table(
+        "run_daily_rollups",
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("user_id", sa.Uuid(), nullable=False),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("runs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("scored_runs", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("score_sum", sa.Float(), nullable=False, server_default="0"),
+        sa.Column("total_tokens", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("total_cost_usd", sa.Float(), nullable=False, server_default="0"),
+        *_timestamps(),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"]),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint("user_id", "day", name="uq_run_daily_rollups_key"),
+    )
+    op.create_index("ix_run_daily_rollups_id", "run_daily_rollups", ["id"])
+    op.create_index("ix_run_daily_rollups_user_id", "run_daily_rollups", ["user_id"])
+    op.create_index("ix_run_daily_rollups_day", "run_daily_rollups", ["day"])
+
+    _backfill_run_rollups()
+    _backfill_agent_rollups()
+
+
+def _backfill_run_rollups() -> None:
+    op.execute("""
+        INSERT INTO run_daily_rollups (
+            id, user_id, day, runs, scored_runs, score_sum, total_tokens,
+            total_cost_usd, created_at
+        )
+        SELECT
+            gen_random_uuid(),
+            user_id,
+            started_at::date,
+            count(*),
+            count(final_score),
+            COALESCE(sum(final_score), 0),
+            COALESCE(sum(total_tokens), 0),
+            COALESCE(sum(total_cost_usd), 0),
+            now()
+        FROM run_records
+        WHERE status = 'complete' AND started_at IS NOT NULL
+        GROUP BY user_id, started_at::date
+    """)
+
+
+def _backfill_agent_rollups() -> None:
+    """Merge per-day invocation and audit score aggregates into one row per key."""
+    score_columns = [
+        f"{prefix}_{suffix}" for prefix in SCORE_PREFIXES for suffix in ("count", "sum")
+    ]
+    zero_scores = ", ".join(f"0 AS {column}" for column in score_columns)
+    zero_invocations = ", ".join(f"0 AS {column}" for column in INVOCATION_COLUMNS)
+    score_aggregates = ", ".join(
+        f"count(a.{column}) AS {prefix}_count, "
+        f"COALESCE(sum(a.{column}), 0) AS {prefix}_sum"
+        for prefix, column in SCORE_COLUMNS.items()
+    )
+    columns = INVOCATION_COLUMNS + tuple(score_columns)
+
+    op.execute(f"""
+        INSERT INTO agent_daily_rollups (
+            id, user_id, day, agent, state, {", ".join(columns)}, created_at
+        )
+        SELECT
+            gen_random_uuid(), user_id, day, agent, state,
+            {", ".join(f"sum({column})" for column in columns)},
+            now()
+        FROM (
+            SELECT
+                r.user_id, {RUN_DAY} AS day, i.agent, i.state,
+                count(*) AS invocations,
+                sum(CASE WHEN i.success THEN 1 ELSE 0 END) AS successes,
+                sum(i.input_tokens) AS input_tokens,
+                sum(i.output_tokens) AS output_tokens,
+                sum(i.total_tokens) AS total_tokens,
+                sum(i.cost_usd) AS cost_usd,
+                COALESCE(sum(i.duration_s), 0) AS duration_s,
+                {zero_scores}
+            FROM invocation_records i
+            JOIN run_records r ON r.run_id = i.run_id
+            GROUP BY 1, 2, 3, 4
+            UNION ALL
+            SELECT
+                r.user_id, {RUN_DAY} AS day, a.target_agent, a.state,
+                {zero_invocations},
+                {score_aggregates}
+            FROM audit_score_records a
+            JOIN run_records r ON r.run_id = a.run_id
+            WHERE a.target_agent IS NOT NULL AND a.overall_score IS NOT NULL
+            GROUP BY 1, 2, 3, 4
+        ) AS aggregates
+        GROUP BY user_id, day, agent, state
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index("ix_run_daily_rollups_day", table_name="run_daily_rollups")
+    op.drop_index("ix_run_daily_rollups_user_id", table_name="run_daily_rollups")
+    op.drop_index("ix_run_daily_rollups_id", table_name="run_daily_rollups")
+    op.drop_table("run_daily_rollups")
+    op.drop_index("ix_agent_daily_rollups_day", table_name="agent_daily_rollups")
+    op.drop_index("ix_agent_daily_rollups_user_id", table_name="agent_daily_rollups")
+    op.drop_index("ix_agent_daily_rollups_id", table_name="agent_daily_rollups")
+    op.drop_table("agent_daily_rollups")
@@ -0,0 +1,32 @@
+"""Track whether a credit reservation charged its usage counter.
+
+Revision ID: credit_reservation_charged
+Revises: history_daily_rollups
+Create Date: 2026-02-05
+
+Adds:
+- credit_reservations.charged: True when the usage_tracking counter was
+  charged at reservation time. Reservations made before counters were
+  charged up front default to False, so confirming them charges the
+  counter and releasing or expiring them refunds nothing.
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = "credit_reservation_charged"
+down_revision = "history_daily_rollups"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "credit_reservations",
+        sa.Column("charged", sa.Boolean(), nullable=False, server_default=sa.false()),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("credit_reservations", "charged")
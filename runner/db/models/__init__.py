@@ -8,7 +8,8 @@ Model Categories:
 - Voice: WritingSample, VoiceProfile
 - Image: ImagePrompt, ImageConfigSet, ImageScene, ImagePose, ImageOutfit, ImageProp
 - Character: CharacterTemplate, OutfitPart, Outfit, Character
-- Workflow: WorkflowRun, WorkflowOutput, WorkflowSession, WorkflowStateMetric, WorkflowPersona
+- Workflow: WorkflowRun, WorkflowOutput, WorkflowSession, WorkflowStateMetric, WorkflowPersona,
+  LLMResponseCache
 - Analytics: AnalyticsImport, PostMetric, DailyMetric, FollowerMetric
 """
 
@@ -75,6 +76,8 @@ from runner.db.models.workflow import (
     WorkflowPersona,
     WorkflowPersonaCreate,
     WorkflowPersonaRead,
+    LLMResponseCache,
+    LLMResponseCacheCreate,
 )
 
 # Image models
@@ -149,6 +152,8 @@ from runner.db.models.history import (
     AuditScoreRecordCreate,
     PostIterationRecord,
     PostIterationRecordCreate,
+    AgentDailyRollup,
+    RunDailyRollup,
 )
 
 # Subscription models
@@ -361,6 +366,8 @@ __all__ = [
     "WorkflowPersona",
     "WorkflowPersonaCreate",
     "WorkflowPersonaRead",
+    "LLMResponseCache",
+    "LLMResponseCacheCreate",
     # Image
     "ImagePrompt",
     "ImagePromptCreate",
@@ -423,6 +430,8 @@ __all__ = [
     "AuditScoreRecordCreate",
     "PostIterationRecord",
     "PostIterationRecordCreate",
+    "AgentDailyRollup",
+    "RunDailyRollup",
     # Subscription
     "BillingPeriod",
     "SubscriptionStatus",
@@ -2,12 +2,17 @@
 
 These models track historical data for workflow runs, agent invocations,
 and audit scores for analytics and evaluation purposes.
+
+AgentDailyRollup and RunDailyRollup hold per-day sums of those records,
+maintained by HistoryService as records are written, so evaluation
+queries read a few rows per day instead of every record.
 """
 
-from datetime import datetime
+from datetime import date, datetime
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 from runner.db.models.base import UUIDModel, TimestampMixin
@@ -154,3 +159,66 @@ class PostIterationRecordCreate(PostIterationRecordBase):
     """Schema for creating a new post iteration record."""
 
     run_id: str
+
+
+# =============================================================================
+# Daily rollups
+# =============================================================================
+
+
+class AgentDailyRollup(UUIDModel, TimestampMixin, table=True):
+    """AgentDailyRollup table - per user/day/agent/state sums.
+
+    Invocation columns sum InvocationRecords run by the agent in the state;
+    score columns sum AuditScoreRecords targeting the agent, given in the
+    state. Averages are sum / count. `day` is the run's start date.
+    """
+
+    __tablename__ = "agent_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint(
+            "user_id", "day", "agent", "state", name="uq_agent_daily_rollups_key"
+        ),
+    )
+
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    day: date = Field(index=True)
+    agent: str
+    state: str
+
+    invocations: int = Field(default=0)
+    successes: int = Field(default=0)
+    input_tokens: int = Field(default=0)
+    output_tokens: int = Field(default=0)
+    total_tokens: int = Field(default=0)
+    cost_usd: float = Field(default=0.0)
+    duration_s: float = Field(default=0.0)
+
+    score_count: int = Field(default=0)
+    score_sum: float = Field(default=0.0)
+    hook_count: int = Field(default=0)
+    hook_sum: float = Field(default=0.0)
+    specifics_count: int = Field(default=0)
+    specifics_sum: float = Field(default=0.0)
+    voice_count: int = Field(default=0)
+    voice_sum: float = Field(default=0.0)
+    structure_count: int = Field(default=0)
+    structure_sum: float = Field(default=0.0)
+
+
+class RunDailyRollup(UUIDModel, TimestampMixin, table=True):
+    """RunDailyRollup table - per user/day sums of completed runs."""
+
+    __tablename__ = "run_daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("user_id", "day", name="uq_run_daily_rollups_key"),
+    )
+
+    user_id: UUID = Field(foreign_key="users.id", index=True)
+    day: date = Field(index=True)
+
+    runs: int = Field(default=0)
+    scored_runs: int = Field(default=0)
+    score_sum: float = Field(default=0.0)
+    total_tokens: int = Field(default=0)
+    total_cost_usd: float = Field(default=0.0)
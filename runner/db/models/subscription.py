@@ -221,6 +221,10 @@ class CreditReservation(UUIDModel, CreditReservationBase, TimestampMixin, table=
     workspace_id: UUID = Field(foreign_key="workspaces.id", index=True)
     usage_tracking_id: UUID = Field(foreign_key="usage_tracking.id", index=True)
 
+    # Whether the usage counter was charged when the credit was reserved
+    # (False for reservations made before counters were charged up front)
+    charged: bool = Field(default=False)
+
 
 class CreditReservationRead(CreditReservationBase):
     """Schema for reading credit reservation data."""
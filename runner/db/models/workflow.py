@@ -34,6 +34,9 @@ class WorkflowRun(UUIDModel, WorkflowRunBase, table=True):
 
     __tablename__ = "workflow_runs"
 
+    # Note: composite index created in Alembic migration:
+    # Index('ix_workflow_runs_user_id_started_at', 'user_id', 'started_at')
+
     user_id: UUID = Field(foreign_key="users.id", index=True)
 
     # Multi-tenancy: workspace_id is nullable for migration compatibility
@@ -73,6 +76,9 @@ class WorkflowOutputBase(SQLModel):
     agent: Optional[str] = None
     output_type: str
     content: str
+    # Set when the body lives in the artifact store (content is then "")
+    content_ref: Optional[str] = Field(default=None, index=True)
+    size_bytes: Optional[int] = None
 
 
 class WorkflowOutput(UUIDModel, WorkflowOutputBase, TimestampMixin, table=True):
@@ -206,3 +212,33 @@ class WorkflowPersonaRead(WorkflowPersonaBase):
     voice_profile_id: Optional[UUID]
     created_at: datetime
     updated_at: Optional[datetime]
+
+
+# =============================================================================
+# LLMResponseCache
+# =============================================================================
+
+
+class LLMResponseCacheBase(SQLModel):
+    """Base cached LLM response fields."""
+
+    cache_key: str = Field(unique=True, index=True)
+    model: str
+    state_name: Optional[str] = None
+    content: str
+    tokens_input: int = Field(default=0)
+    tokens_output: int = Field(default=0)
+    cost_usd: float = Field(default=0.0)
+    expires_at: datetime = Field(index=True)
+
+
+class LLMResponseCache(UUIDModel, LLMResponseCacheBase, TimestampMixin, table=True):
+    """LLMResponseCache table - provider responses keyed by prompt hash."""
+
+    __tablename__ = "llm_response_cache"
+
+
+class LLMResponseCacheCreate(LLMResponseCacheBase):
+    """Schema for creating a cached LLM response."""
+
+    pass
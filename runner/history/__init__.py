@@ -21,10 +21,12 @@ from runner.history.models import (
     PostIteration,
 )
 from runner.history.queries import HistoryQueries
+from runner.history.rollups import HistoryRollups
 
 __all__ = [
     "HistoryService",
     "HistoryQueries",
+    "HistoryRollups",
     "RunRecord",
     "InvocationRecord",
     "AuditScoreRecord",
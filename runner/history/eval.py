@@ -6,6 +6,7 @@ Usage:
     python -m runner.history.eval --query quality_trend
     python -m runner.history.eval --query post_iterations --story post_03
     python -m runner.history.eval --query weekly_summary
+    python -m runner.history.eval --query rebuild_rollups
 """
 
 import argparse
@@ -13,7 +14,10 @@ import csv
 import json
 import sys
 from pathlib import Path
+
+from runner.db.engine import get_session
 from runner.history.queries import HistoryQueries
+from runner.history.rollups import HistoryRollups
 
 
 def print_agent_comparison(results: list, days: int) -> None:
@@ -131,6 +135,7 @@ def main() -> int:
             "post_iterations",
             "weekly_summary",
             "best_agent",
+            "rebuild_rollups",
         ],
         help="Query to run",
     )
@@ -152,6 +157,12 @@ def main() -> int:
     if args.db:
         print("Warning: --db is deprecated; using DATABASE_URL", file=sys.stderr)
 
+    if args.query == "rebuild_rollups":
+        with get_session() as session:
+            HistoryRollups(session).rebuild()
+        print("Rebuilt daily rollups from history records.")
+        return 0
+
     queries = HistoryQueries()
 
     # Run requested query
@@ -1,20 +1,28 @@
-"""Evaluation queries against history records (SQLModel)."""
+"""Evaluation queries against history records (SQLModel).
+
+Aggregates are computed in SQL. Dashboard queries (agent performance,
+cost, weekly and daily trends) read the daily rollup tables maintained by
+HistoryService (see rollups.py), so their cost grows with the number of
+days in the window, not the number of records.
+"""
 
 from __future__ import annotations
 
-from collections import defaultdict
 from datetime import datetime, timedelta
 from typing import Optional
 from uuid import UUID
 
+from sqlalchemy import and_, func
 from sqlmodel import select
 
 from runner.db.engine import get_session
 from runner.db.models import (
-    RunRecord,
-    InvocationRecord,
+    AgentDailyRollup,
     AuditScoreRecord,
+    InvocationRecord,
     PostIterationRecord,
+    RunDailyRollup,
+    RunRecord,
 )
 from runner.history.models import (
     AgentPerformance,
@@ -30,134 +38,126 @@ class HistoryQueries:
     def __init__(self, user_id: Optional[UUID] = None):
         self.user_id = user_id
 
-    def _run_ids_since(self, since: datetime) -> list[str]:
-        """Return run_ids for runs after `since`, optionally filtered by user."""
-        with get_session() as session:
-            statement = select(RunRecord).where(RunRecord.started_at >= since)
-            if self.user_id:
-                statement = statement.where(RunRecord.user_id == self.user_id)
-            runs = session.exec(statement).all()
-            return [r.run_id for r in runs if r.run_id]
-
-    def _runs_for_user(self) -> list[RunRecord]:
-        """Return all runs for user (or all if user_id is None)."""
-        with get_session() as session:
-            statement = select(RunRecord)
-            if self.user_id:
-                statement = statement.where(RunRecord.user_id == self.user_id)
-            return list(session.exec(statement).all())
+    def _for_user(self, statement, model):
+        """Filter a statement by user (no-op when user_id is None)."""
+        if self.user_id:
+            statement = statement.where(model.user_id == self.user_id)
+        return statement
 
     def agent_performance(self, days: int = 30) -> list[AgentPerformance]:
         """Get agent performance comparison over last N days."""
-        since = datetime.utcnow() - timedelta(days=days)
-        run_ids = set(self._run_ids_since(since))
-        if not run_ids:
-            return []
-
+        since = (datetime.utcnow() - timedelta(days=days)).date()
+        rollup = AgentDailyRollup
+        statement = (
+            select(
+                rollup.agent,
+                func.sum(rollup.score_count),
+                func.sum(rollup.score_sum),
+                func.sum(rollup.hook_count),
+                func.sum(rollup.hook_sum),
+                func.sum(rollup.specifics_count),
+                func.sum(rollup.specifics_sum),
+                func.sum(rollup.voice_count),
+                func.sum(rollup.voice_sum),
+                func.sum(rollup.structure_count),
+                func.sum(rollup.structure_sum),
+            )
+            .where(rollup.day >= since)
+            .group_by(rollup.agent)
+            .having(func.sum(rollup.score_count) > 0)
+        )
         with get_session() as session:
-            scores = session.exec(
-                select(AuditScoreRecord).where(AuditScoreRecord.run_id.in_(run_ids))
-            ).all()
-
-        grouped = defaultdict(list)
-        for score in scores:
-            if not score.target_agent or score.overall_score is None:
-                continue
-            grouped[score.target_agent].append(score)
-
-        results = []
-        for agent, items in grouped.items():
-            sample_size = len(items)
-            results.append(
-                AgentPerformance(
-                    agent=agent,
-                    avg_score=sum(s.overall_score or 0 for s in items) / sample_size
-                    if sample_size
-                    else 0.0,
-                    avg_hook=_avg_optional(items, "hook_score"),
-                    avg_specifics=_avg_optional(items, "specifics_score"),
-                    avg_voice=_avg_optional(items, "voice_score"),
-                    avg_structure=_avg_optional(items, "structure_score"),
-                    sample_size=sample_size,
-                )
+            rows = session.exec(self._for_user(statement, rollup)).all()
+
+        results = [
+            AgentPerformance(
+                agent=agent,
+                avg_score=_ratio(score_sum, sample_size),
+                avg_hook=_ratio(hook_sum, hook_count),
+                avg_specifics=_ratio(specifics_sum, specifics_count),
+                avg_voice=_ratio(voice_sum, voice_count),
+                avg_structure=_ratio(structure_sum, structure_count),
+                sample_size=sample_size,
             )
-
+            for (
+                agent,
+                sample_size,
+                score_sum,
+                hook_count,
+                hook_sum,
+                specifics_count,
+                specifics_sum,
+                voice_count,
+                voice_sum,
+                structure_count,
+                structure_sum,
+            ) in rows
+        ]
         return sorted(results, key=lambda r: r.avg_score or 0, reverse=True)
 
     def cost_by_agent(self) -> list[CostBreakdown]:
         """Get cost breakdown by agent across all runs."""
+        rollup = AgentDailyRollup
+        statement = (
+            select(
+                rollup.agent,
+                func.sum(rollup.invocations),
+                func.sum(rollup.total_tokens),
+                func.sum(rollup.cost_usd),
+            )
+            .group_by(rollup.agent)
+            .having(func.sum(rollup.invocations) > 0)
+        )
         with get_session() as session:
-            statement = select(InvocationRecord)
-            if self.user_id:
-                run_ids = {r.run_id for r in self._runs_for_user()}
-                if not run_ids:
-                    return []
-                statement = statement.where(InvocationRecord.run_id.in_(run_ids))
-            invocations = session.exec(statement).all()
-
-        grouped = defaultdict(list)
-        for inv in invocations:
-            grouped[inv.agent].append(inv)
-
-        results = []
-        for agent, items in grouped.items():
-            total_tokens = sum(i.total_tokens or 0 for i in items)
-            total_cost = sum(i.cost_usd or 0 for i in items)
-            invocations_count = len(items)
-            results.append(
-                CostBreakdown(
-                    agent=agent,
-                    invocations=invocations_count,
-                    total_tokens=total_tokens,
-                    total_cost=total_cost,
-                    avg_cost=total_cost / invocations_count
-                    if invocations_count
-                    else 0.0,
-                )
+            rows = session.exec(self._for_user(statement, rollup)).all()
+
+        results = [
+            CostBreakdown(
+                agent=agent,
+                invocations=invocations,
+                total_tokens=total_tokens or 0,
+                total_cost=total_cost or 0.0,
+                avg_cost=_ratio(total_cost or 0.0, invocations) or 0.0,
             )
+            for agent, invocations, total_tokens, total_cost in rows
+        ]
         return sorted(results, key=lambda r: r.total_cost or 0, reverse=True)
 
     def weekly_summary(self, weeks: int = 12) -> list[WeeklySummary]:
         """Get weekly summary of runs, cost, and quality."""
         since = datetime.utcnow() - timedelta(weeks=weeks)
-        runs = [
-            run
-            for run in self._runs_for_user()
-            if run.status == "complete" and run.started_at and run.started_at >= since
-        ]
-
-        grouped: dict[str, list[RunRecord]] = defaultdict(list)
-        for run in runs:
-            week_key = run.started_at.strftime("%Y-%W")
-            grouped[week_key].append(run)
 
-        results = []
-        for week, items in grouped.items():
-            runs_count = len(items)
-            avg_quality = _avg_optional(items, "final_score")
-            total_cost = sum(r.total_cost_usd or 0 for r in items)
-            total_tokens = sum(r.total_tokens or 0 for r in items)
-            results.append(
-                WeeklySummary(
-                    week=week,
-                    runs=runs_count,
-                    avg_quality=avg_quality,
-                    total_cost=total_cost,
-                    total_tokens=total_tokens,
-                )
+        grouped: dict[str, dict] = {}
+        for day in self._daily_runs(since):
+            week = grouped.setdefault(
+                day["day"].strftime("%Y-%W"),
+                {"runs": 0, "scored": 0, "score_sum": 0.0, "cost": 0.0, "tokens": 0},
             )
+            for key in week:
+                week[key] += day[key]
+
+        results = [
+            WeeklySummary(
+                week=week,
+                runs=totals["runs"],
+                avg_quality=_ratio(totals["score_sum"], totals["scored"]),
+                total_cost=totals["cost"],
+                total_tokens=totals["tokens"],
+            )
+            for week, totals in grouped.items()
+        ]
         return sorted(results, key=lambda r: r.week)
 
     def post_iterations(self, story: str) -> list[PostIteration]:
         """Get iteration history for a specific post/story."""
+        statement = select(PostIterationRecord).where(
+            PostIterationRecord.story == story
+        )
+        if self.user_id:
+            statement = statement.join(
+                RunRecord, RunRecord.run_id == PostIterationRecord.run_id
+            ).where(RunRecord.user_id == self.user_id)
         with get_session() as session:
-            statement = select(PostIterationRecord).where(
-                PostIterationRecord.story == story
-            )
-            if self.user_id:
-                run_ids = {r.run_id for r in self._runs_for_user()}
-                if run_ids:
-                    statement = statement.where(PostIterationRecord.run_id.in_(run_ids))
             records = session.exec(
                 statement.order_by(PostIterationRecord.iteration)
             ).all()
@@ -174,81 +174,111 @@ class HistoryQueries:
         ]
 
     def best_agent_for_task(self, state: str) -> list[AgentPerformance]:
-        """Get which agent performs best for a given state (draft, audit, etc)."""
-        run_ids = {r.run_id for r in self._runs_for_user()} if self.user_id else None
-        with get_session() as session:
-            inv_statement = select(InvocationRecord).where(
-                InvocationRecord.state == state
+        """Get which agent performs best for a given state (draft, audit, etc).
+
+        Averages the audit scores each agent received in runs where it was
+        invoked in `state`.
+        """
+        invoked = (
+            select(InvocationRecord.run_id, InvocationRecord.agent)
+            .where(InvocationRecord.state == state)
+            .distinct()
+            .subquery()
+        )
+        score = AuditScoreRecord
+        statement = (
+            select(
+                score.target_agent,
+                func.count(),
+                func.avg(score.overall_score),
+                func.avg(score.hook_score),
+                func.avg(score.specifics_score),
+                func.avg(score.voice_score),
+                func.avg(score.structure_score),
             )
-            if run_ids:
-                inv_statement = inv_statement.where(
-                    InvocationRecord.run_id.in_(run_ids)
-                )
-            invocations = session.exec(inv_statement).all()
-
-            score_statement = select(AuditScoreRecord)
-            if run_ids:
-                score_statement = score_statement.where(
-                    AuditScoreRecord.run_id.in_(run_ids)
-                )
-            scores = session.exec(score_statement).all()
-
-        scores_by_run_agent = defaultdict(list)
-        for score in scores:
-            if score.target_agent:
-                scores_by_run_agent[(score.run_id, score.target_agent)].append(score)
-
-        grouped = defaultdict(list)
-        for inv in invocations:
-            key = (inv.run_id, inv.agent)
-            for score in scores_by_run_agent.get(key, []):
-                if score.overall_score is None:
-                    continue
-                grouped[inv.agent].append(score)
-
-        results = []
-        for agent, items in grouped.items():
-            sample_size = len(items)
-            results.append(
-                AgentPerformance(
-                    agent=agent,
-                    avg_score=sum(s.overall_score or 0 for s in items) / sample_size
-                    if sample_size
-                    else 0.0,
-                    avg_hook=_avg_optional(items, "hook_score"),
-                    avg_specifics=_avg_optional(items, "specifics_score"),
-                    avg_voice=_avg_optional(items, "voice_score"),
-                    avg_structure=_avg_optional(items, "structure_score"),
-                    sample_size=sample_size,
-                )
+            .join(
+                invoked,
+                and_(
+                    invoked.c.run_id == score.run_id,
+                    invoked.c.agent == score.target_agent,
+                ),
             )
+            .where(score.overall_score.is_not(None))
+            .group_by(score.target_agent)
+        )
+        if self.user_id:
+            statement = statement.join(
+                RunRecord, RunRecord.run_id == score.run_id
+            ).where(RunRecord.user_id == self.user_id)
+        with get_session() as session:
+            rows = session.exec(statement).all()
+
+        results = [
+            AgentPerformance(
+                agent=agent,
+                avg_score=avg_score,
+                avg_hook=avg_hook,
+                avg_specifics=avg_specifics,
+                avg_voice=avg_voice,
+                avg_structure=avg_structure,
+                sample_size=sample_size,
+            )
+            for (
+                agent,
+                sample_size,
+                avg_score,
+                avg_hook,
+                avg_specifics,
+                avg_voice,
+                avg_structure,
+            ) in rows
+        ]
         return sorted(results, key=lambda r: r.avg_score or 0, reverse=True)
 
     def quality_trend(self, days: int = 30) -> list[dict]:
         """Get daily quality trend over the last N days."""
         since = datetime.utcnow() - timedelta(days=days)
-        runs = [
-            run
-            for run in self._runs_for_user()
-            if run.status == "complete" and run.started_at and run.started_at >= since
+        return [
+            {
+                "day": day["day"].isoformat(),
+                "runs": day["runs"],
+                "avg_score": _ratio(day["score_sum"], day["scored"]),
+                "total_cost": day["cost"],
+            }
+            for day in self._daily_runs(since)
         ]
 
-        grouped = defaultdict(list)
-        for run in runs:
-            day_key = run.started_at.date().isoformat()
-            grouped[day_key].append(run)
-
-        results = []
-        for day, items in sorted(grouped.items()):
-            results.append(
-                {
-                    "day": day,
-                    "runs": len(items),
-                    "avg_score": _avg_optional(items, "final_score"),
-                    "total_cost": sum(r.total_cost_usd or 0 for r in items),
-                }
+    def _daily_runs(self, since: datetime) -> list[dict]:
+        """Completed-run totals per day since `since`, oldest first."""
+        rollup = RunDailyRollup
+        statement = (
+            select(
+                rollup.day,
+                func.sum(rollup.runs),
+                func.sum(rollup.scored_runs),
+                func.sum(rollup.score_sum),
+                func.sum(rollup.total_cost_usd),
+                func.sum(rollup.total_tokens),
             )
-        return results
+            .where(rollup.day >= since.date())
+            .group_by(rollup.day)
+            .having(func.sum(rollup.runs) > 0)
+            .order_by(rollup.day)
+        )
+        with get_session() as session:
+            rows = session.exec(self._for_user(statement, rollup)).all()
+
+        return [
+            {
+                "day": day,
+                "runs": runs,
+                "scored": scored,
+                "score_sum": score_sum,
+                "cost": cost,
+                "tokens": tokens,
+            }
+            for day, runs, scored, score_sum, cost, tokens in rows
+        ]
 
     def runs_for_story(self, story: str, limit: int = 10) -> list[dict]:
         """Get recent runs for a specific story."""
@@ -273,11 +303,8 @@ class HistoryQueries:
             ]
 
 
-def _avg_optional(items, field: str) -> Optional[float]:
-    """Average numeric field across records."""
-    values = [
-        getattr(item, field) for item in items if getattr(item, field) is not None
-    ]
-    if not values:
+def _ratio(total: Optional[float], count: Optional[int]) -> Optional[float]:
+    """Average from a sum and a count (None when nothing was counted)."""
+    if not count:
         return None
-    return sum(values) / len(values)
+    return total / count
@@ -0,0 +1,329 @@
+"""Daily rollups for history evaluation queries.
+
+HistoryService writes each record's contribution into the daily rollup
+tables in the same transaction as the record itself:
+- agent_daily_rollups: invocations and audit scores per
+  user/day/agent/state
+- run_daily_rollups: completed runs per user/day
+
+Rows are bumped with INSERT ... ON CONFLICT DO UPDATE, so concurrent
+writers add to the same row without losing updates. HistoryQueries then
+aggregates a handful of rollup rows per day instead of scanning records.
+
+`day` is the run's start date (today for a run without one), matching how
+the queries window records by their run's started_at. An invocation or
+score is keyed by its run, so the run must be inserted first; one that
+arrives before its run is left out of the rollups (and logged) and the
+foreign key rejects the record itself.
+
+Usage:
+    with Session(engine) as session:
+        HistoryRollups(session).add_invocation(record)
+        session.commit()
+
+    # Backfill or repair from the record tables
+    HistoryRollups(session).rebuild()
+"""
+
+import logging
+from datetime import date, datetime
+from typing import Optional
+from uuid import UUID, uuid4
+
+from sqlalchemy import case, delete, func
+from sqlalchemy.dialects.postgresql import insert
+from sqlmodel import Session, select
+
+from runner.db.models import (
+    AgentDailyRollup,
+    AuditScoreRecord,
+    InvocationRecord,
+    RunDailyRollup,
+    RunRecord,
+)
+
+logger = logging.getLogger(__name__)
+
+AGENT_ROLLUP_KEY = ("user_id", "day", "agent", "state")
+RUN_ROLLUP_KEY = ("user_id", "day")
+
+# Score columns on AuditScoreRecord -> rollup column prefix
+SCORE_FIELDS = {
+    "hook_score": "hook",
+    "specifics_score": "specifics",
+    "voice_score": "voice",
+    "structure_score": "structure",
+}
+
+
+class HistoryRollups:
+    """Maintains the daily rollup tables.
+
+    Methods add to the session without committing; the caller commits
+    together with the record being written.
+    """
+
+    def __init__(self, session: Session):
+        self.session = session
+
+    # ==========================================================================
+    # INCREMENTAL UPDATES
+    # ==========================================================================
+
+    def add_run(
+        self,
+        user_id: UUID,
+        started_at: Optional[datetime],
+        status: str,
+        total_tokens: int,
+        total_cost_usd: float,
+        final_score: Optional[float],
+        sign: int = 1,
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) a run's contribution.
+
+        Only completed runs with a start time are counted, as in the
+        weekly summary and quality trend.
+        """
+        if status != "complete" or started_at is None:
+            return
+        scored = final_score is not None
+        self._bump(
+            RunDailyRollup,
+            {"user_id": user_id, "day": started_at.date()},
+            {
+                "runs": sign,
+                "scored_runs": sign if scored else 0,
+                "score_sum": sign * final_score if scored else 0.0,
+                "total_tokens": sign * (total_tokens or 0),
+                "total_cost_usd": sign * (total_cost_usd or 0.0),
+            },
+            RUN_ROLLUP_KEY,
+        )
+
+    def add_invocation(self, record) -> None:
+        """Add an invocation's tokens, cost and timing."""
+        run = self._run_key(record.run_id, "invocation")
+        if run is None:
+            return
+        user_id, run_started_at = run
+        self._bump(
+            AgentDailyRollup,
+            {
+                "user_id": user_id,
+                "day": _day(run_started_at),
+                "agent": record.agent,
+                "state": record.state,
+            },
+            {
+                "invocations": 1,
+                "successes": 1 if record.success else 0,
+                "input_tokens": record.input_tokens or 0,
+                "output_tokens": record.output_tokens or 0,
+                "total_tokens": record.total_tokens or 0,
+                "cost_usd": record.cost_usd or 0.0,
+                "duration_s": record.duration_s or 0.0,
+            },
+            AGENT_ROLLUP_KEY,
+        )
+
+    def add_audit_score(self, record) -> None:
+        """Add an audit score to the rollup of the agent it targets.
+
+        Scores without a target or an overall score are left out, as
+        agent_performance always has.
+        """
+        if not record.target_agent or record.overall_score is None:
+            return
+        run = self._run_key(record.run_id, "audit score")
+        if run is None:
+            return
+        user_id, run_started_at = run
+
+        values = {"score_count": 1, "score_sum": record.overall_score}
+        for field, prefix in SCORE_FIELDS.items():
+            score = getattr(record, field)
+            values[f"{prefix}_count"] = 0 if score is None else 1
+            values[f"{prefix}_sum"] = score or 0.0
+
+        self._bump(
+            AgentDailyRollup,
+            {
+                "user_id": user_id,
+                "day": _day(run_started_at),
+                "agent": record.target_agent,
+                "state": record.state,
+            },
+            values,
+            AGENT_ROLLUP_KEY,
+        )
+
+    # ==========================================================================
+    # REBUILD
+    # ==========================================================================
+
+    def rebuild(self, user_id: Optional[UUID] = None) -> None:
+        """Recompute rollups from the record tables and commit.
+
+        Used to backfill existing history and to repair drift (e.g. records
+        written without HistoryService).
+
+        Args:
+            user_id: Rebuild one user's rollups (all users if None)
+        """
+        for model in (AgentDailyRollup, RunDailyRollup):
+            statement = delete(model)
+            if user_id:
+                statement = statement.where(model.user_id == user_id)
+            self.session.exec(statement)
+
+        runs = select(
+            RunRecord.user_id,
+            RunRecord.started_at,
+            RunRecord.total_tokens,
+            RunRecord.total_cost_usd,
+            RunRecord.final_score,
+        ).where(RunRecord.status == "complete", RunRecord.started_at.is_not(None))
+        if user_id:
+            runs = runs.where(RunRecord.user_id == user_id)
+        for run_user_id, started_at, tokens, cost, score in self.session.exec(runs):
+            self.add_run(run_user_id, started_at, "complete", tokens, cost, score)
+
+        self._rebuild_invocations(user_id)
+        self._rebuild_scores(user_id)
+        self.session.commit()
+
+    def _rebuild_invocations(self, user_id: Optional[UUID]) -> None:
+        statement = (
+            select(
+                RunRecord.user_id,
+                RunRecord.started_at,
+                InvocationRecord.agent,
+                InvocationRecord.state,
+                func.count(),
+                func.sum(case((InvocationRecord.success, 1), else_=0)),
+                func.sum(InvocationRecord.input_tokens),
+                func.sum(InvocationRecord.output_tokens),
+                func.sum(InvocationRecord.total_tokens),
+                func.sum(InvocationRecord.cost_usd),
+                func.coalesce(func.sum(InvocationRecord.duration_s), 0.0),
+            )
+            .join(RunRecord, RunRecord.run_id == InvocationRecord.run_id)
+            .group_by(
+                RunRecord.user_id,
+                RunRecord.started_at,
+                InvocationRecord.agent,
+                InvocationRecord.state,
+            )
+        )
+        if user_id:
+            statement = statement.where(RunRecord.user_id == user_id)
+
+        columns = (
+            "invocations",
+            "successes",
+            "input_tokens",
+            "output_tokens",
+            "total_tokens",
+            "cost_usd",
+            "duration_s",
+        )
+        for row in self.session.exec(statement):
+            run_user_id, started_at, agent, state, *sums = row
+            self._bump(
+                AgentDailyRollup,
+                {
+                    "user_id": run_user_id,
+                    "day": _day(started_at),
+                    "agent": agent,
+                    "state": state,
+                },
+                dict(zip(columns, sums)),
+                AGENT_ROLLUP_KEY,
+            )
+
+    def _rebuild_scores(self, user_id: Optional[UUID]) -> None:
+        aggregates = [func.count(), func.sum(AuditScoreRecord.overall_score)]
+        for field in SCORE_FIELDS:
+            column = getattr(AuditScoreRecord, field)
+            aggregates += [func.count(column), func.coalesce(func.sum(column), 0.0)]
+
+        statement = (
+            select(
+                RunRecord.user_id,
+                RunRecord.started_at,
+                AuditScoreRecord.target_agent,
+                AuditScoreRecord.state,
+                *aggregates,
+            )
+            .join(RunRecord, RunRecord.run_id == AuditScoreRecord.run_id)
+            .where(
+                AuditScoreRecord.target_agent.is_not(None),
+                AuditScoreRecord.overall_score.is_not(None),
+            )
+            .group_by(
+                RunRecord.user_id,
+                RunRecord.started_at,
+                AuditScoreRecord.target_agent,
+                AuditScoreRecord.state,
+            )
+        )
+        if user_id:
+            statement = statement.where(RunRecord.user_id == user_id)
+
+        columns = ["score_count", "score_sum"]
+        for prefix in SCORE_FIELDS.values():
+            columns += [f"{prefix}_count", f"{prefix}_sum"]
+        for row in self.session.exec(statement):
+            run_user_id, started_at, agent, state, *sums = row
+            self._bump(
+                AgentDailyRollup,
+                {
+                    "user_id": run_user_id,
+                    "day": _day(started_at),
+                    "agent": agent,
+                    "state": state,
+                },
+                dict(zip(columns, sums)),
+                AGENT_ROLLUP_KEY,
+            )
+
+    # ==========================================================================
+    # HELPERS
+    # ==========================================================================
+
+    def _run_key(
+        self, run_id: str, kind: str
+    ) -> Optional[tuple[UUID, Optional[datetime]]]:
+        """Get (user_id, started_at) for a run, or None if it isn't recorded."""
+        run = self.session.exec(
+            select(RunRecord.user_id, RunRecord.started_at).where(
+                RunRecord.run_id == run_id
+            )
+        ).first()
+        if run is None:
+            logger.warning(
+                "Run %s not recorded yet; %s left out of history rollups",
+                run_id,
+                kind,
+            )
+        return run
+
+    def _bump(self, model, key: dict, values: dict, key_columns: tuple) -> None:
+        """Add `values` to the rollup row at `key`, creating it if needed."""
+        now = datetime.utcnow()
+        statement = insert(model).values(id=uuid4(), created_at=now, **key, **values)
+        table = model.__table__
+        statement = statement.on_conflict_do_update(
+            index_elements=list(key_columns),
+            set_={
+                **{name: table.c[name] + statement.excluded[name] for name in values},
+                "updated_at": now,
+            },
+        )
+        self.session.exec(statement)
+
+
+def _day(started_at: Optional[datetime]) -> date:
+    """Rollup day for a run start time (today if unknown)."""
+    return (started_at or datetime.utcnow()).date()
@@ -3,6 +3,9 @@
 Provides the same API as HistoryDatabase but uses PostgreSQL via SQLModel.
 This is a drop-in replacement for the legacy SQLite-based HistoryDatabase.
 
+Inserts also update the daily rollup tables (see rollups.py) in the same
+transaction, which keeps HistoryQueries dashboards current.
+
 Usage:
     from runner.history.service import HistoryService
 
@@ -30,6 +33,7 @@ from runner.content.repository import (
     AuditScoreRecordRepository,
     PostIterationRecordRepository,
 )
+from runner.history.rollups import HistoryRollups
 from runner.history.models import (
     RunRecord as LegacyRunRecord,
     InvocationRecord as LegacyInvocationRecord,
@@ -82,6 +86,14 @@ class HistoryService:
                 final_post_path=record.final_post_path,
                 final_score=record.final_score,
             )
+            HistoryRollups(session).add_run(
+                self._user_id,
+                create_data.started_at,
+                create_data.status,
+                create_data.total_tokens,
+                create_data.total_cost_usd,
+                create_data.final_score,
+            )
             repo.create(create_data)
 
     def update_run_complete(
@@ -98,6 +110,27 @@ class HistoryService:
         """Update run with completion data."""
         with self._get_session() as session:
             repo = RunRecordRepository(session)
+            rollups = HistoryRollups(session)
+            existing = repo.get_by_run_id(run_id)
+            if existing:
+                # Swap the run's old rollup contribution for the new one
+                rollups.add_run(
+                    existing.user_id,
+                    existing.started_at,
+                    existing.status,
+                    existing.total_tokens,
+                    existing.total_cost_usd,
+                    existing.final_score,
+                    sign=-1,
+                )
+                rollups.add_run(
+                    existing.user_id,
+                    existing.started_at,
+                    status,
+                    total_tokens,
+                    total_cost_usd,
+                    final_score,
+                )
             repo.update_complete(
                 run_id=run_id,
                 completed_at=completed_at,
@@ -165,6 +198,7 @@ class HistoryService:
                 cost_usd=record.cost_usd or 0.0,
                 output_word_count=record.output_word_count,
             )
+            HistoryRollups(session).add_invocation(create_data)
             repo.create(create_data)
             return 0  # Legacy API returned auto-increment ID
 
@@ -212,6 +246,7 @@ class HistoryService:
                 structure_score=record.structure_score,
                 feedback=record.feedback,
             )
+            HistoryRollups(session).add_audit_score(create_data)
             repo.create(create_data)
             return 0  # Legacy API returned auto-increment ID
 
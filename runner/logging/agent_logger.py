@@ -5,6 +5,7 @@ import os
 from datetime import datetime
 from typing import Optional
 
+from runner.logging.jsonl_sink import run_log_sink
 from runner.models import TokenUsage
 
 
@@ -53,8 +54,7 @@ class AgentLogger:
             entry["command"] = command
 
         log_file = self._get_log_file(agent, state)
-        with open(log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        run_log_sink.write(log_file, entry)
 
     def log_complete(
         self,
@@ -103,12 +103,12 @@ class AgentLogger:
             entry["error"] = error
 
         log_file = self._get_log_file(agent, state)
-        with open(log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        run_log_sink.write(log_file, entry)
 
     def read_agent_log(self, agent: str, state: str) -> list[dict]:
         """Read log entries for a specific agent/state."""
         log_file = self._get_log_file(agent, state)
+        run_log_sink.flush(log_file)
         if not os.path.exists(log_file):
             return []
 
@@ -9,6 +9,9 @@ import os
 from datetime import datetime
 from typing import Callable, Optional
 
+from runner.logging.jsonl_sink import run_log_sink
+from runner.logging.log_tail import LogPage, read_page
+
 
 class DevLogger:
     """Logs detailed LLM request/response for debugging.
@@ -211,8 +214,7 @@ class DevLogger:
             return
 
         try:
-            with open(self.log_file, "a") as f:
-                f.write(json.dumps(entry) + "\n")
+            run_log_sink.write(self.log_file, entry, index=True)
         except Exception:
             # Don't let logging failures break the workflow
             pass
@@ -227,6 +229,7 @@ class DevLogger:
         Returns:
             List of log entries
         """
+        run_log_sink.flush(log_file)
         if not os.path.exists(log_file):
             return []
 
@@ -236,3 +239,23 @@ class DevLogger:
                 if line.strip():
                     entries.append(json.loads(line))
         return entries
+
+    @staticmethod
+    def tail_log(
+        log_file: str,
+        cursor: int = 0,
+        since: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> LogPage:
+        """Read dev log entries appended after a cursor or timestamp.
+
+        Args:
+            log_file: Path to llm_messages.jsonl
+            cursor: Byte offset returned by the previous call
+            since: Only return entries with a later "ts"
+            limit: Maximum number of entries to return
+
+        Returns:
+            LogPage with the new entries and the next cursor
+        """
+        return read_page(log_file, cursor=cursor, since=since, limit=limit)
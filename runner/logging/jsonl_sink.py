@@ -0,0 +1,235 @@
+"""Shared, buffered JSONL writer for run logs.
+
+StateLogger, AgentLogger and DevLogger all append one JSON object per line.
+Instead of opening, writing and closing the file for every event, they write
+through a process-wide sink that keeps one handle per file and batches
+writes:
+
+- Entries are buffered per file and flushed when the buffer reaches
+  FLUSH_BYTES, by a background thread every FLUSH_INTERVAL seconds, or
+  explicitly via flush().
+- sync() flushes and fsyncs; loggers call it on terminal events
+  (workflow complete, error, circuit break) so those survive a crash.
+- close_dir() releases every handle under a run directory once the run
+  is done; close_all() runs at interpreter exit so buffered lines aren't
+  lost when a process ends mid-run.
+- Files written with index=True also get a sparse "<path>.idx" sidecar:
+  one {"offset", "ts"} line every INDEX_EVERY entries, so readers can
+  seek close to a timestamp instead of scanning the whole log (see
+  runner.logging.log_tail).
+
+Readers in the same process should call flush(path) before reading.
+"""
+
+import atexit
+import json
+import os
+import threading
+from typing import Optional
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+FLUSH_BYTES = 64 * 1024  # flush a file's buffer once it reaches 64 KiB
+FLUSH_INTERVAL = 0.5  # seconds between background flushes
+MAX_OPEN_FILES = 256  # least recently used handles are closed beyond this
+INDEX_EVERY = 64  # entries between sparse index points
+INDEX_SUFFIX = ".idx"
+
+
+def encode_line(entry: dict) -> bytes:
+    """Serialize an entry as one UTF-8 JSONL line.
+
+    Uses orjson when installed and falls back to the stdlib encoder.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            pass  # e.g. non-str keys or big ints; let json decide
+    return (json.dumps(entry) + "\n").encode("utf-8")
+
+
+class _LogFile:
+    """Open handle and pending bytes for one log file."""
+
+    __slots__ = (
+        "path",
+        "handle",
+        "buffer",
+        "size",
+        "lock",
+        "offset",
+        "count",
+        "index",
+        "index_handle",
+    )
+
+    def __init__(self, path: str):
+        self.path = path
+        self.handle = open(path, "ab")
+        self.buffer: list[bytes] = []
+        self.size = 0
+        self.lock = threading.Lock()
+        # Byte offset the next line will start at
+        self.offset = self.handle.tell()
+        self.count = 0
+        self.index: list[bytes] = []
+        self.index_handle = None
+
+    def append(self, line: bytes, ts: Optional[str] = None) -> None:
+        """Buffer a line, recording an index point if one is due.
+
+        Caller holds self.lock. ts is only passed for indexed files.
+        """
+        if ts is not None and self.count % INDEX_EVERY == 0:
+            self.index.append(encode_line({"offset": self.offset, "ts": ts}))
+        self.count += 1
+        self.offset += len(line)
+        self.buffer.append(line)
+        self.size += len(line)
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write pending bytes. Caller holds self.lock."""
+        if self.buffer:
+            self.handle.write(b"".join(self.buffer))
+            self.buffer.clear()
+            self.size = 0
+        self.handle.flush()
+        # Index points go out after the lines they point at
+        if self.index:
+            if self.index_handle is None:
+                self.index_handle = open(self.path + INDEX_SUFFIX, "ab")
+            self.index_handle.write(b"".join(self.index))
+            self.index.clear()
+            self.index_handle.flush()
+        if fsync:
+            os.fsync(self.handle.fileno())
+
+    def close(self) -> None:
+        """Close both handles. Caller holds self.lock."""
+        self.handle.close()
+        if self.index_handle is not None:
+            self.index_handle.close()
+
+
+class JsonlSink:
+    """Process-wide buffered writer shared by all run loggers."""
+
+    def __init__(
+        self,
+        flush_bytes: int = FLUSH_BYTES,
+        flush_interval: float = FLUSH_INTERVAL,
+        max_open_files: int = MAX_OPEN_FILES,
+    ):
+        self.flush_bytes = flush_bytes
+        self.flush_interval = flush_interval
+        self.max_open_files = max_open_files
+        self._files: dict[str, _LogFile] = {}
+        self._lock = threading.Lock()
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def write(self, path: str, entry: dict, index: bool = False) -> None:
+        """Append an entry to a JSONL file.
+
+        Args:
+            path: Log file path (parent directory must exist)
+            entry: JSON-serializable dict
+            index: Maintain a sparse offset/timestamp index for the file
+        """
+        line = encode_line(entry)
+        ts = (entry.get("ts") or "") if index else None
+        log_file = self._get(path)
+        with log_file.lock:
+            log_file.append(line, ts)
+            if log_file.size >= self.flush_bytes:
+                log_file.flush()
+
+    def flush(self, path: Optional[str] = None) -> None:
+        """Write buffered entries for one file, or for all files."""
+        for log_file in self._select(path):
+            with log_file.lock:
+                log_file.flush()
+
+    def sync(self, path: Optional[str] = None) -> None:
+        """Flush and fsync one file, or all files."""
+        for log_file in self._select(path):
+            with log_file.lock:
+                log_file.flush(fsync=True)
+
+    def close_dir(self, directory: str) -> None:
+        """Flush, fsync and close every file under a directory.
+
+        Args:
+            directory: Run directory whose logs are finished
+        """
+        prefix = os.path.join(os.path.abspath(directory), "")
+        with self._lock:
+            paths = [p for p in self._files if p.startswith(prefix)]
+            closing = [self._files.pop(p) for p in paths]
+        for log_file in closing:
+            self._close(log_file)
+
+    def close_all(self) -> None:
+        """Flush, fsync and close every open file."""
+        with self._lock:
+            closing = list(self._files.values())
+            self._files.clear()
+        for log_file in closing:
+            self._close(log_file)
+
+    def _get(self, path: str) -> _LogFile:
+        """Get or open the handle for a path, evicting the LRU if needed."""
+        key = os.path.abspath(path)
+        evicted = None
+        with self._lock:
+            log_file = self._files.pop(key, None)
+            if log_file is None:
+                log_file = _LogFile(key)
+                if len(self._files) >= self.max_open_files:
+                    evicted = self._files.pop(next(iter(self._files)))
+            # Re-insert so dict order tracks recency
+            self._files[key] = log_file
+            self._ensure_flusher()
+        if evicted:
+            self._close(evicted)
+        return log_file
+
+    def _select(self, path: Optional[str]) -> list[_LogFile]:
+        with self._lock:
+            if path is None:
+                return list(self._files.values())
+            log_file = self._files.get(os.path.abspath(path))
+            return [log_file] if log_file else []
+
+    @staticmethod
+    def _close(log_file: _LogFile) -> None:
+        with log_file.lock:
+            try:
+                log_file.flush(fsync=True)
+            finally:
+                log_file.close()
+
+    def _ensure_flusher(self) -> None:
+        """Start the background flush thread. Caller holds self._lock."""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(
+                target=self._flush_loop, name="jsonl-sink-flush", daemon=True
+            )
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception:
+                # Don't let logging failures kill the flusher
+                pass
+
+
+# Singleton shared by all loggers in the process
+run_log_sink = JsonlSink()
+atexit.register(run_log_sink.close_all)
@@ -0,0 +1,165 @@
+"""Incremental reads over JSONL run logs.
+
+Live log viewers used to re-read and re-parse the whole file on every poll.
+read_page() instead resumes from a byte cursor returned by the previous call,
+so each poll costs O(new lines). A `since` timestamp can be used in place of a
+cursor; the sparse index written by the JSONL sink narrows the scan to the
+entries around that time.
+
+Cursors are plain byte offsets into the log file and always land on a line
+boundary. A trailing line without a newline (a write in progress from
+another process) is left for the next read.
+"""
+
+import asyncio
+import bisect
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, Callable, Optional
+
+from runner.logging.jsonl_sink import INDEX_SUFFIX, run_log_sink
+
+FOLLOW_POLL_INTERVAL = 0.5  # seconds between checks for new lines
+FOLLOW_IDLE_TIMEOUT = 300.0  # stop following after this long without data
+
+
+@dataclass
+class LogPage:
+    """Entries read from a log plus the cursor to resume from."""
+
+    entries: list[dict] = field(default_factory=list)
+    cursor: int = 0
+
+
+def read_index(path: str) -> list[tuple[int, str]]:
+    """Read the sparse (offset, ts) index for a log file.
+
+    Args:
+        path: Log file path (the index lives at path + ".idx")
+
+    Returns:
+        Index points in file order; empty if there is no index
+    """
+    points = []
+    try:
+        with open(path + INDEX_SUFFIX, "rb") as f:
+            for line in f:
+                try:
+                    point = json.loads(line)
+                    points.append((int(point["offset"]), point.get("ts") or ""))
+                except (ValueError, KeyError, TypeError):
+                    continue
+    except FileNotFoundError:
+        pass
+    return points
+
+
+def offset_for_since(path: str, since: str) -> int:
+    """Find a byte offset at or before the first entry newer than since.
+
+    Timestamps are ISO-8601 strings in UTC, so they compare lexically.
+
+    Args:
+        path: Log file path
+        since: Timestamp to resume after
+
+    Returns:
+        Byte offset to start scanning from (0 without an index)
+    """
+    points = read_index(path)
+    i = bisect.bisect_right([ts for _, ts in points], since) - 1
+    return points[i][0] if i >= 0 else 0
+
+
+def read_page(
+    path: str,
+    cursor: int = 0,
+    since: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> LogPage:
+    """Read complete entries from a JSONL log starting at a byte cursor.
+
+    Args:
+        path: Log file path
+        cursor: Byte offset returned by a previous read (0 = start)
+        since: Only return entries with a later "ts"
+        limit: Maximum number of entries to return
+
+    Returns:
+        LogPage with the entries read and the cursor after the last one
+    """
+    # Entries written by this process may still be buffered
+    run_log_sink.flush(path)
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return LogPage(cursor=cursor)
+
+    if cursor > size:
+        # Log was truncated or replaced; start over
+        cursor = 0
+    if since and cursor == 0:
+        cursor = min(offset_for_since(path, since), size)
+
+    entries = []
+    with open(path, "rb") as f:
+        f.seek(cursor)
+        while limit is None or len(entries) < limit:
+            line = f.readline()
+            if not line.endswith(b"\n"):
+                break
+            cursor += len(line)
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            if since and str(entry.get("ts", "")) <= since:
+                continue
+            entries.append(entry)
+    return LogPage(entries=entries, cursor=cursor)
+
+
+async def follow(
+    path: str,
+    cursor: int = 0,
+    since: Optional[str] = None,
+    done: Optional[Callable[[], bool]] = None,
+    poll_interval: float = FOLLOW_POLL_INTERVAL,
+    idle_timeout: float = FOLLOW_IDLE_TIMEOUT,
+) -> AsyncIterator[LogPage]:
+    """Yield pages of new entries as they are appended to a log.
+
+    Args:
+        path: Log file path
+        cursor: Byte offset to start from
+        since: Only return entries with a later "ts"
+        done: Called when there is no new data; returning True ends the
+            stream (e.g. the run has finished)
+        poll_interval: Seconds between checks for new lines
+        idle_timeout: Seconds without new data before giving up
+
+    Yields:
+        Non-empty LogPages in file order
+    """
+    last_data = time.monotonic()
+    while True:
+        page = await asyncio.to_thread(read_page, path, cursor, since)
+        # The cursor alone tracks progress from here on
+        cursor, since = page.cursor, None
+        if page.entries:
+            last_data = time.monotonic()
+            yield page
+            continue
+        if done and done():
+            # Pick up anything written between the last read and finishing
+            page = await asyncio.to_thread(read_page, path, cursor)
+            if page.entries:
+                yield page
+            return
+        if time.monotonic() - last_data > idle_timeout:
+            return
+        await asyncio.sleep(poll_interval)
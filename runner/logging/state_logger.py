@@ -10,6 +10,7 @@ if TYPE_CHECKING:
     from runner.content.workflow_store import WorkflowStore
 
 from runner.content.ids import normalize_user_id
+from runner.logging.jsonl_sink import run_log_sink
 
 
 class StateLogger:
@@ -44,8 +45,7 @@ class StateLogger:
             "run_id": self.run_id,
             **event,
         }
-        with open(self.log_file, "a") as f:
-            f.write(json.dumps(entry) + "\n")
+        run_log_sink.write(self.log_file, entry, index=True)
 
     def log_start(self, story: str, config_hash: Optional[str] = None):
         """Log workflow start."""
@@ -178,6 +178,7 @@ class StateLogger:
                 "context": context,
             }
         )
+        run_log_sink.sync(self.log_file)
 
         # Update database with aborted status
         if self.db:
@@ -200,6 +201,7 @@ class StateLogger:
                 "error": error,
             }
         )
+        run_log_sink.sync(self.log_file)
 
         # Update database with error status
         if self.db:
@@ -222,6 +224,7 @@ class StateLogger:
                 "duration_s": round(total_duration_s, 2),
             }
         )
+        run_log_sink.sync(self.log_file)
 
         # Update database with completion
         if self.db:
@@ -268,6 +271,7 @@ class StateLogger:
 
     def read_log(self) -> list[dict]:
         """Read all log entries from JSONL."""
+        run_log_sink.flush(self.log_file)
         if not os.path.exists(self.log_file):
             return []
 
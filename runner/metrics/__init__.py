@@ -2,6 +2,7 @@
 
 from runner.metrics.tokens import (
     TokenRecord,
+    PromptEstimate,
     SessionTokens,
     RunTokenSummary,
     TokenTracker,
@@ -11,10 +12,13 @@ from runner.metrics.costs import (
     get_default_cost,
     format_cost,
     estimate_run_cost,
+    with_cache_rates,
 )
+from runner.metrics.estimate import estimate_tokens
 
 __all__ = [
     "TokenRecord",
+    "PromptEstimate",
     "SessionTokens",
     "RunTokenSummary",
     "TokenTracker",
@@ -22,4 +26,6 @@ __all__ = [
     "get_default_cost",
     "format_cost",
     "estimate_run_cost",
+    "with_cache_rates",
+    "estimate_tokens",
 ]
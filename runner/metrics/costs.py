@@ -10,12 +10,48 @@ DEFAULT_COSTS = {
 
 
 def calculate_cost(tokens: TokenUsage, cost_per_1k: dict[str, float]) -> float:
-    """Calculate cost in USD for given token usage."""
-    input_cost = (tokens.input_tokens / 1000) * cost_per_1k.get("input", 0)
+    """Calculate cost in USD for given token usage.
+
+    Prompt-cache reads and writes are billed at the optional "cache_read" and
+    "cache_write" rates, falling back to the input rate when not set.
+    """
+    input_rate = cost_per_1k.get("input", 0)
+    cached = tokens.cache_read_tokens + tokens.cache_write_tokens
+    uncached_input = max(0, tokens.input_tokens - cached)
+
+    input_cost = (uncached_input / 1000) * input_rate
+    input_cost += (tokens.cache_read_tokens / 1000) * cost_per_1k.get(
+        "cache_read", input_rate
+    )
+    input_cost += (tokens.cache_write_tokens / 1000) * cost_per_1k.get(
+        "cache_write", input_rate
+    )
     output_cost = (tokens.output_tokens / 1000) * cost_per_1k.get("output", 0)
     return input_cost + output_cost
 
 
+def with_cache_rates(
+    cost_per_1k: dict[str, float], read_multiplier: float, write_multiplier: float
+) -> dict[str, float]:
+    """Fill in prompt-cache rates as multiples of the input rate.
+
+    Explicit "cache_read" / "cache_write" entries are kept as configured.
+
+    Args:
+        cost_per_1k: Rates per 1k tokens with at least "input" and "output"
+        read_multiplier: Cache read price relative to input
+        write_multiplier: Cache write price relative to input
+
+    Returns:
+        New rates dict including cache_read and cache_write
+    """
+    rates = dict(cost_per_1k)
+    input_rate = rates.get("input", 0)
+    rates.setdefault("cache_read", input_rate * read_multiplier)
+    rates.setdefault("cache_write", input_rate * write_multiplier)
+    return rates
+
+
 def get_default_cost(agent: str) -> dict[str, float]:
     """Get default cost per 1k tokens for an agent."""
     return DEFAULT_COSTS.get(agent, {"input": 0, "output": 0})
@@ -0,0 +1,79 @@
+"""Pre-flight prompt token estimates.
+
+Providers only report token counts after a call, so an oversized prompt is
+uploaded in full before it fails (or, on small Ollama tiers, is silently
+truncated by the server). estimate_tokens() sizes text before the call
+with a tokenizer for the agent's model family:
+
+- openai: o200k_base (GPT-4o and later)
+- claude, llama, gemini, generic: cl100k_base scaled by a safety factor,
+  since their own tokenizers aren't available offline and produce
+  somewhat more tokens for the same text
+
+tiktoken downloads its encodings on first use. If it isn't installed, the
+download fails, or TOKEN_ESTIMATOR=heuristic, a character count is used
+instead (CHARS_PER_TOKEN, which errs on the high side).
+"""
+
+import math
+import os
+import threading
+from typing import Optional
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+TOKEN_ESTIMATOR = os.getenv("TOKEN_ESTIMATOR", "tiktoken")
+
+CHARS_PER_TOKEN = 3.5
+
+# Tokenizer family -> (tiktoken encoding, safety factor)
+TOKENIZER_ENCODINGS = {
+    "openai": ("o200k_base", 1.0),
+    "claude": ("cl100k_base", 1.15),
+    "llama": ("cl100k_base", 1.1),
+    "gemini": ("cl100k_base", 1.1),
+    "generic": ("cl100k_base", 1.1),
+}
+
+_encodings: dict[str, Optional[object]] = {}
+_encodings_lock = threading.Lock()
+
+
+def _get_encoding(name: str):
+    """Load a tiktoken encoding once per process (None if unavailable)."""
+    if name in _encodings:
+        return _encodings[name]
+    with _encodings_lock:
+        if name not in _encodings:
+            encoding = None
+            if tiktoken is not None and TOKEN_ESTIMATOR == "tiktoken":
+                try:
+                    encoding = tiktoken.get_encoding(name)
+                except Exception:
+                    encoding = None  # offline or unknown encoding
+            _encodings[name] = encoding
+    return _encodings[name]
+
+
+def estimate_tokens(text: str, family: str = "generic") -> int:
+    """Estimate how many tokens a model family uses for a text.
+
+    Args:
+        text: Prompt text
+        family: Tokenizer family (see TOKENIZER_ENCODINGS)
+
+    Returns:
+        Estimated token count, rounded up
+    """
+    if not text:
+        return 0
+    encoding_name, factor = TOKENIZER_ENCODINGS.get(
+        family, TOKENIZER_ENCODINGS["generic"]
+    )
+    encoding = _get_encoding(encoding_name)
+    if encoding is None:
+        return math.ceil(len(text) / CHARS_PER_TOKEN)
+    return math.ceil(len(encoding.encode_ordinary(text)) * factor)
@@ -1,5 +1,7 @@
 """Token tracking and aggregation."""
 
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
@@ -18,6 +20,7 @@ class TokenRecord:
     cost_usd: float
     context_window_max: int
     context_used_percent: float
+    cached: bool = False  # Served from the response cache, no provider call
 
 
 @dataclass
@@ -32,6 +35,9 @@ class SessionTokens:
     total_cost_usd: float = 0.0
     context_window_max: int = 100000
     history: list[TokenRecord] = field(default_factory=list)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
 
     @property
     def cumulative_total(self) -> int:
@@ -48,27 +54,44 @@ class SessionTokens:
         return max(0, self.context_window_max - self.cumulative_total)
 
     def add_invocation(
-        self, tokens: TokenUsage, cost: float, state: str
+        self, tokens: TokenUsage, cost: float, state: str, cached: bool = False
     ) -> TokenRecord:
         """Record a new invocation."""
-        self.invocations += 1
-        self.cumulative_input += tokens.input_tokens
-        self.cumulative_output += tokens.output_tokens
-        self.total_cost_usd += cost
-
-        record = TokenRecord(
-            timestamp=datetime.utcnow(),
-            agent=self.agent,
-            state=state,
-            tokens=tokens,
-            cost_usd=cost,
-            context_window_max=self.context_window_max,
-            context_used_percent=self.context_used_percent,
-        )
-        self.history.append(record)
+        with self._lock:
+            self.invocations += 1
+            self.cumulative_input += tokens.input_tokens
+            self.cumulative_output += tokens.output_tokens
+            self.total_cost_usd += cost
+
+            record = TokenRecord(
+                timestamp=datetime.utcnow(),
+                agent=self.agent,
+                state=state,
+                tokens=tokens,
+                cost_usd=cost,
+                context_window_max=self.context_window_max,
+                context_used_percent=self.context_used_percent,
+                cached=cached,
+            )
+            self.history.append(record)
         return record
 
 
+@dataclass
+class PromptEstimate:
+    """Pre-flight size estimate of a prompt, made before the call."""
+
+    agent: str
+    state: str
+    estimated_tokens: int
+    budget: int  # prompt tokens the agent's context window allows
+    trimmed_sections: list[str] = field(default_factory=list)
+
+    @property
+    def fits(self) -> bool:
+        return self.estimated_tokens <= self.budget
+
+
 @dataclass
 class RunTokenSummary:
     """Full run token summary."""
@@ -77,6 +100,9 @@ class RunTokenSummary:
     total_input_tokens: int = 0
     total_output_tokens: int = 0
     total_cost_usd: float = 0.0
+    cache_hits: int = 0
+    prompts_trimmed: int = 0  # prompts cut down to fit the context window
+    prompts_over_budget: int = 0  # prompts too large to send at all
     by_agent: dict[str, SessionTokens] = field(default_factory=dict)
     by_state: dict[str, int] = field(default_factory=dict)
 
@@ -89,6 +115,8 @@ class RunTokenSummary:
         self.total_input_tokens += record.tokens.input_tokens
         self.total_output_tokens += record.tokens.output_tokens
         self.total_cost_usd += record.cost_usd
+        if record.cached:
+            self.cache_hits += 1
 
         if record.state not in self.by_state:
             self.by_state[record.state] = 0
@@ -96,24 +124,43 @@ class RunTokenSummary:
 
 
 class TokenTracker:
-    """Central token tracking for a workflow run."""
+    """Central token tracking for a workflow run.
+
+    Fan-out agents record from worker threads. Each session (one per agent)
+    accumulates its own counters under its own lock, so parallel agents
+    don't contend; their records are queued and folded into the run
+    summary by merge(). The state machine merges at state boundaries, and
+    get_summary() and snapshot() merge before reading. For the running
+    cost mid-state, read CircuitBreaker.total_cost.
+    """
 
     def __init__(self, run_id: str):
         self.run_id = run_id
         self.summary = RunTokenSummary(run_id=run_id)
         self.sessions: dict[str, SessionTokens] = {}
+        # Latest pre-flight estimate per (agent, state)
+        self.estimates: dict[tuple[str, str], PromptEstimate] = {}
+        # Records not yet added to the summary (deque appends are atomic)
+        self._pending: deque[TokenRecord] = deque()
+        self._sessions_lock = threading.Lock()
+        self._summary_lock = threading.Lock()
 
     def get_or_create_session(
         self, agent: str, session_id: Optional[str] = None, context_window: int = 100000
     ) -> SessionTokens:
         """Get existing session or create new one."""
         key = session_id or agent
-        if key not in self.sessions:
-            self.sessions[key] = SessionTokens(
-                session_id=key, agent=agent, context_window_max=context_window
-            )
-            self.summary.by_agent[agent] = self.sessions[key]
-        return self.sessions[key]
+        session = self.sessions.get(key)
+        if session is None:
+            with self._sessions_lock:
+                session = self.sessions.get(key)
+                if session is None:
+                    session = SessionTokens(
+                        session_id=key, agent=agent, context_window_max=context_window
+                    )
+                    self.sessions[key] = session
+                    self.summary.by_agent[agent] = session
+        return session
 
     def record(
         self,
@@ -123,15 +170,104 @@ class TokenTracker:
         cost: float,
         session_id: Optional[str] = None,
         context_window: int = 100000,
+        cached: bool = False,
     ) -> TokenRecord:
-        """Record token usage for an invocation."""
+        """Record token usage for an invocation.
+
+        Cache hits are recorded with cached=True and zero tokens and cost.
+        """
         session = self.get_or_create_session(agent, session_id, context_window)
-        record = session.add_invocation(tokens, cost, state)
-        self.summary.add_record(record)
+        record = session.add_invocation(tokens, cost, state, cached=cached)
+        self._pending.append(record)
         return record
 
+    def merge(self) -> None:
+        """Fold records made since the last merge into the run summary."""
+        with self._summary_lock:
+            while True:
+                try:
+                    record = self._pending.popleft()
+                except IndexError:
+                    break
+                self.summary.add_record(record)
+
+    def record_estimate(
+        self,
+        agent: str,
+        state: str,
+        estimated_tokens: int,
+        budget: int,
+        trimmed_sections: Optional[list[str]] = None,
+    ) -> PromptEstimate:
+        """Record the pre-flight estimate of a prompt about to be sent."""
+        estimate = PromptEstimate(
+            agent=agent,
+            state=state,
+            estimated_tokens=estimated_tokens,
+            budget=budget,
+            trimmed_sections=list(trimmed_sections or []),
+        )
+        self.estimates[(agent, state)] = estimate
+        with self._summary_lock:
+            if estimate.trimmed_sections:
+                self.summary.prompts_trimmed += 1
+            if not estimate.fits:
+                self.summary.prompts_over_budget += 1
+        return estimate
+
+    def get_estimate(self, agent: str, state: str) -> Optional[PromptEstimate]:
+        """Get the latest pre-flight estimate for an agent in a state."""
+        return self.estimates.get((agent, state))
+
+    def snapshot(self) -> dict:
+        """Get the run totals and per-session counters as plain data.
+
+        Per-invocation history is left out to keep checkpoints small.
+        """
+        self.merge()
+        return {
+            "total_input_tokens": self.summary.total_input_tokens,
+            "total_output_tokens": self.summary.total_output_tokens,
+            "total_cost_usd": self.summary.total_cost_usd,
+            "cache_hits": self.summary.cache_hits,
+            "prompts_trimmed": self.summary.prompts_trimmed,
+            "prompts_over_budget": self.summary.prompts_over_budget,
+            "by_state": dict(self.summary.by_state),
+            "sessions": {
+                key: {
+                    "agent": session.agent,
+                    "invocations": session.invocations,
+                    "cumulative_input": session.cumulative_input,
+                    "cumulative_output": session.cumulative_output,
+                    "total_cost_usd": session.total_cost_usd,
+                    "context_window_max": session.context_window_max,
+                }
+                for key, session in self.sessions.items()
+            },
+        }
+
+    def restore(self, data: dict) -> None:
+        """Restore totals saved with snapshot()."""
+        self._pending.clear()
+        self.summary = RunTokenSummary(
+            run_id=self.run_id,
+            total_input_tokens=data.get("total_input_tokens", 0),
+            total_output_tokens=data.get("total_output_tokens", 0),
+            total_cost_usd=data.get("total_cost_usd", 0.0),
+            cache_hits=data.get("cache_hits", 0),
+            prompts_trimmed=data.get("prompts_trimmed", 0),
+            prompts_over_budget=data.get("prompts_over_budget", 0),
+            by_state=dict(data.get("by_state", {})),
+        )
+        self.sessions = {}
+        for key, fields in data.get("sessions", {}).items():
+            session = SessionTokens(session_id=key, **fields)
+            self.sessions[key] = session
+            self.summary.by_agent[session.agent] = session
+
     def get_summary(self) -> RunTokenSummary:
         """Get the current run summary."""
+        self.merge()
         return self.summary
 
     def check_context_health(self, agent: str) -> dict:
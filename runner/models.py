@@ -10,6 +10,9 @@ class TokenUsage(BaseModel):
 
     input_tokens: int = Field(ge=0)
     output_tokens: int = Field(ge=0)
+    # Portions of input_tokens read from / written to the provider prompt cache
+    cache_read_tokens: int = Field(default=0, ge=0)
+    cache_write_tokens: int = Field(default=0, ge=0)
 
     @property
     def total(self) -> int:
@@ -64,7 +67,7 @@ class FanOutResult(BaseModel):
     """Result from a fan-out state execution."""
 
     agent: str
-    status: Literal["success", "failed", "timeout"]
+    status: Literal["success", "failed", "timeout", "cancelled"]
     output_path: Optional[str] = None
     content: Optional[str] = None
     tokens: Optional[TokenUsage] = None
@@ -96,3 +99,19 @@ class RunManifest(BaseModel):
     total_tokens: int = 0
     total_cost_usd: float = 0.0
     config_hash: Optional[str] = None
+
+
+class RunCheckpoint(BaseModel):
+    """Resumable state of a workflow run, saved after each transition."""
+
+    run_id: str
+    story: Optional[str] = None
+    started_at: datetime
+    saved_at: datetime
+    next_state: str
+    retry_feedback: dict[str, str] = Field(default_factory=dict)
+    last_audit_score: Optional[int] = None
+    circuit_breaker: dict = Field(default_factory=dict)  # CircuitBreaker context
+    tokens: dict = Field(default_factory=dict)  # TokenTracker snapshot
+    # Latest output file per completed state and agent
+    outputs: dict[str, dict[str, str]] = Field(default_factory=dict)
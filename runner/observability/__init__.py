@@ -5,6 +5,7 @@ This module provides:
 - Metrics tracking (latency, cost, tokens)
 - Quality monitoring (voice drift, consistency)
 - Alerting on anomalies
+- Span export in OTLP/JSON format (run -> state -> agent -> http)
 
 Usage:
     from runner.observability import AgentTracer, MetricsCollector
@@ -25,11 +26,20 @@ from runner.observability.tracer import (
     AgentTracer,
     Span,
     SpanContext,
+    current_span,
+    get_tracer,
+    shutdown_tracer,
+)
+from runner.observability.export import (
+    BatchSpanProcessor,
+    InMemorySpanExporter,
+    OTLPJsonFileExporter,
 )
 from runner.observability.metrics import (
     MetricsCollector,
     MetricsSummary,
 )
+from runner.observability.sketch import QuantileSketch
 from runner.observability.quality import (
     QualityMonitor,
     QualityScore,
@@ -39,8 +49,15 @@ __all__ = [
     "AgentTracer",
     "Span",
     "SpanContext",
+    "current_span",
+    "get_tracer",
+    "shutdown_tracer",
+    "BatchSpanProcessor",
+    "InMemorySpanExporter",
+    "OTLPJsonFileExporter",
     "MetricsCollector",
     "MetricsSummary",
+    "QuantileSketch",
     "QualityMonitor",
     "QualityScore",
 ]
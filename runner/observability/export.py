@@ -0,0 +1,248 @@
+"""Batched span export in OTLP/JSON format.
+
+AgentTracer hands finished spans to a BatchSpanProcessor, which queues
+them and exports batches from a background thread, so agent calls never
+wait on I/O. When the queue is full new spans are dropped (and counted)
+rather than blocking the caller.
+
+Exporters:
+- OTLPJsonFileExporter: appends one OTLP ExportTraceServiceRequest per
+  batch as a JSON line; readable by the OpenTelemetry Collector's
+  file receiver or any OTLP/JSON tooling
+- InMemorySpanExporter: keeps exported spans in a list (an in-process
+  collector, used by tests)
+
+Usage:
+    exporter = OTLPJsonFileExporter("traces.jsonl")
+    tracer = AgentTracer(exporter=exporter)
+    ...
+    tracer.shutdown()  # flush what's queued
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "postmagiq-runner"
+SCOPE_NAME = "runner.observability"
+
+# OTLP span kinds and status codes
+OTLP_KIND_INTERNAL = 1
+OTLP_KIND_CLIENT = 3
+OTLP_STATUS_OK = 1
+OTLP_STATUS_ERROR = 2
+
+# Tracer span kinds that are outbound calls
+CLIENT_SPAN_KINDS = ("http",)
+
+_SHUTDOWN = object()
+
+
+def _attribute(key: str, value: Any) -> dict:
+    """Encode one OTLP attribute."""
+    if isinstance(value, bool):
+        encoded = {"boolValue": value}
+    elif isinstance(value, int):
+        encoded = {"intValue": str(value)}
+    elif isinstance(value, float):
+        encoded = {"doubleValue": value}
+    else:
+        encoded = {"stringValue": str(value)}
+    return {"key": key, "value": encoded}
+
+
+def span_to_otlp(span) -> dict:
+    """Convert a tracer Span to an OTLP/JSON span."""
+    start_ns = span.start_unix_ns
+    end_ns = start_ns + int(span.duration_ms * 1_000_000)
+
+    attributes = {"span.kind": span.kind, "operation": span.operation}
+    if span.model:
+        attributes["gen_ai.request.model"] = span.model
+    if span.input_tokens or span.output_tokens:
+        attributes["gen_ai.usage.input_tokens"] = span.input_tokens
+        attributes["gen_ai.usage.output_tokens"] = span.output_tokens
+    if span.cost:
+        attributes["cost_usd"] = span.cost
+    for key, value in span.metadata.items():
+        if value is not None:
+            attributes[key] = value
+
+    status = {"code": OTLP_STATUS_OK}
+    if span.status == "error":
+        status = {"code": OTLP_STATUS_ERROR, "message": span.error_message or ""}
+
+    otlp = {
+        "traceId": span.trace_id,
+        "spanId": span.span_id,
+        "name": span.name or f"{span.kind} {span.model}".strip(),
+        "kind": OTLP_KIND_CLIENT
+        if span.kind in CLIENT_SPAN_KINDS
+        else OTLP_KIND_INTERNAL,
+        "startTimeUnixNano": str(start_ns),
+        "endTimeUnixNano": str(end_ns),
+        "attributes": [_attribute(k, v) for k, v in attributes.items()],
+        "status": status,
+    }
+    if span.parent_span_id:
+        otlp["parentSpanId"] = span.parent_span_id
+    return otlp
+
+
+def spans_to_otlp_request(spans: list, service_name: str = SERVICE_NAME) -> dict:
+    """Wrap spans in an OTLP ExportTraceServiceRequest."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {"attributes": [_attribute("service.name", service_name)]},
+                "scopeSpans": [
+                    {
+                        "scope": {"name": SCOPE_NAME},
+                        "spans": [span_to_otlp(s) for s in spans],
+                    }
+                ],
+            }
+        ]
+    }
+
+
+class OTLPJsonFileExporter:
+    """Appends OTLP/JSON export requests to a file, one batch per line."""
+
+    def __init__(self, path: str, service_name: str = SERVICE_NAME):
+        self.path = path
+        self.service_name = service_name
+
+    def export(self, spans: list) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        line = json.dumps(spans_to_otlp_request(spans, self.service_name))
+        with open(self.path, "a") as f:
+            f.write(line + "\n")
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter:
+    """Keeps exported spans in memory."""
+
+    def __init__(self):
+        self.spans: list = []
+        self.batches = 0
+
+    def export(self, spans: list) -> None:
+        self.spans.extend(spans)
+        self.batches += 1
+
+    def shutdown(self) -> None:
+        pass
+
+
+class BatchSpanProcessor:
+    """Queues finished spans and exports them in batches off the hot path."""
+
+    def __init__(
+        self,
+        exporter,
+        max_queue_size: int = 2048,
+        max_batch_size: int = 256,
+        schedule_delay_s: float = 2.0,
+    ):
+        """Initialize the processor.
+
+        Args:
+            exporter: Object with export(spans) and shutdown()
+            max_queue_size: Spans held before new ones are dropped
+            max_batch_size: Spans per export call
+            schedule_delay_s: Longest a span waits before export
+        """
+        self.exporter = exporter
+        self.max_batch_size = max_batch_size
+        self.schedule_delay_s = schedule_delay_s
+        self.dropped = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+
+    def on_end(self, span) -> None:
+        """Queue a finished span (never blocks)."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1
+
+    def force_flush(self, timeout: float = 5.0) -> bool:
+        """Export everything queued so far.
+
+        Returns:
+            True if the export finished within the timeout
+        """
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """Flush queued spans and stop the export thread."""
+        if self._thread is not None:
+            self._queue.put(_SHUTDOWN)
+            self._thread.join(timeout)
+            self._thread = None
+        self.exporter.shutdown()
+
+    def _ensure_started(self) -> None:
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._worker, name="span-exporter", daemon=True
+                )
+                self._thread.start()
+
+    def _worker(self) -> None:
+        batch: list = []
+        deadline = None  # when the oldest span in the batch is due
+        while True:
+            timeout = self.schedule_delay_s
+            if deadline is not None:
+                timeout = max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is None or item is _SHUTDOWN or isinstance(item, threading.Event):
+                self._export(batch)
+                batch, deadline = [], None
+                if isinstance(item, threading.Event):
+                    item.set()
+                if item is _SHUTDOWN:
+                    return
+                continue
+
+            batch.append(item)
+            if deadline is None:
+                deadline = time.monotonic() + self.schedule_delay_s
+            if len(batch) >= self.max_batch_size:
+                self._export(batch)
+                batch, deadline = [], None
+
+    def _export(self, batch: list) -> None:
+        if not batch:
+            return
+        try:
+            self.exporter.export(batch)
+        except Exception as e:
+            # Tracing must never take a run down
+            logger.warning(f"Span export failed ({len(batch)} spans): {e}")
@@ -6,6 +6,12 @@ Collects and aggregates metrics across agent calls:
 - Token usage trends
 - Error rates
 
+Memory is fixed: latencies go into per-model quantile sketches (see
+sketch.py) held in a ring of time buckets, and costs, tokens and call
+counts are running totals. Recording is O(1); a summary merges one
+sketch per bucket. Latency percentiles cover the rolling window; cost,
+token and call totals cover the collector's lifetime.
+
 Usage:
     metrics = MetricsCollector()
 
@@ -17,12 +23,14 @@ Usage:
     print(f"p95 latency: {summary.latency_p95}ms")
 """
 
-import statistics
-from collections import defaultdict
-from dataclasses import dataclass, field
+import threading
+from collections import defaultdict, deque
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timedelta
 from typing import Optional
 
+from runner.observability.sketch import QuantileSketch
+
 
 @dataclass
 class MetricsSummary:
@@ -58,19 +66,32 @@ class MetricBucket:
     """A time-bucketed collection of metrics."""
 
     timestamp: datetime
-    latencies: list[float] = field(default_factory=list)
-    costs: list[float] = field(default_factory=list)
-    input_tokens: list[int] = field(default_factory=list)
-    output_tokens: list[int] = field(default_factory=list)
+    latencies: dict[str, QuantileSketch] = field(default_factory=dict)
+    cost: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
     error_count: int = 0
     call_count: int = 0
 
 
+@dataclass
+class ModelTotals:
+    """Lifetime totals for one model."""
+
+    cost: float = 0.0
+    input_tokens: int = 0
+    output_tokens: int = 0
+    calls: int = 0
+    errors: int = 0
+    latency_count: int = 0
+    latency_sum: float = 0.0
+
+
 class MetricsCollector:
     """Collects and aggregates metrics.
 
     Maintains rolling time windows for metrics and provides
-    percentile calculations.
+    percentile calculations. Safe to record from several threads.
 
     Usage:
         metrics = MetricsCollector(window_minutes=60)
@@ -91,27 +112,26 @@ class MetricsCollector:
         self,
         window_minutes: int = 60,
         bucket_size_minutes: int = 5,
+        relative_accuracy: float = 0.01,
     ):
         """Initialize metrics collector.
 
         Args:
             window_minutes: How long to keep metrics (default 60 min)
             bucket_size_minutes: Size of time buckets (default 5 min)
+            relative_accuracy: Maximum relative error of latency percentiles
         """
         self.window_minutes = window_minutes
         self.bucket_size_minutes = bucket_size_minutes
+        self.relative_accuracy = relative_accuracy
 
-        # Metrics by model
-        self._latencies: dict[str, list[float]] = defaultdict(list)
-        self._costs: dict[str, list[float]] = defaultdict(list)
-        self._input_tokens: dict[str, list[int]] = defaultdict(list)
-        self._output_tokens: dict[str, list[int]] = defaultdict(list)
-        self._error_counts: dict[str, int] = defaultdict(int)
-        self._call_counts: dict[str, int] = defaultdict(int)
+        # Lifetime totals by model
+        self._totals: dict[str, ModelTotals] = defaultdict(ModelTotals)
 
-        # Time-bucketed metrics for trends
-        self._buckets: list[MetricBucket] = []
-        self._last_bucket_time: Optional[datetime] = None
+        # Ring of time buckets for percentiles and trends
+        max_buckets = max(1, -(-window_minutes // bucket_size_minutes)) + 1
+        self._buckets: deque[MetricBucket] = deque(maxlen=max_buckets)
+        self._lock = threading.Lock()
 
     def record_latency(self, model: str, latency_ms: float) -> None:
         """Record a latency measurement.
@@ -120,8 +140,18 @@ class MetricsCollector:
             model: Model name
             latency_ms: Latency in milliseconds
         """
-        self._latencies[model].append(latency_ms)
-        self._ensure_bucket().latencies.append(latency_ms)
+        with self._lock:
+            totals = self._totals[model]
+            totals.latency_count += 1
+            totals.latency_sum += latency_ms
+
+            bucket = self._ensure_bucket()
+            sketch = bucket.latencies.get(model)
+            if sketch is None:
+                sketch = bucket.latencies[model] = QuantileSketch(
+                    self.relative_accuracy
+                )
+            sketch.add(latency_ms)
 
     def record_cost(self, model: str, cost: float) -> None:
         """Record a cost.
@@ -130,8 +160,9 @@ class MetricsCollector:
             model: Model name
             cost: Cost in USD
         """
-        self._costs[model].append(cost)
-        self._ensure_bucket().costs.append(cost)
+        with self._lock:
+            self._totals[model].cost += cost
+            self._ensure_bucket().cost += cost
 
     def record_tokens(
         self,
@@ -146,12 +177,14 @@ class MetricsCollector:
             input_tokens: Number of input tokens
             output_tokens: Number of output tokens
         """
-        self._input_tokens[model].append(input_tokens)
-        self._output_tokens[model].append(output_tokens)
+        with self._lock:
+            totals = self._totals[model]
+            totals.input_tokens += input_tokens
+            totals.output_tokens += output_tokens
 
-        bucket = self._ensure_bucket()
-        bucket.input_tokens.append(input_tokens)
-        bucket.output_tokens.append(output_tokens)
+            bucket = self._ensure_bucket()
+            bucket.input_tokens += input_tokens
+            bucket.output_tokens += output_tokens
 
     def record_call(self, model: str, success: bool = True) -> None:
         """Record a call (for error rate tracking).
@@ -160,13 +193,15 @@ class MetricsCollector:
             model: Model name
             success: Whether the call succeeded
         """
-        self._call_counts[model] += 1
-        bucket = self._ensure_bucket()
-        bucket.call_count += 1
+        with self._lock:
+            totals = self._totals[model]
+            totals.calls += 1
+            bucket = self._ensure_bucket()
+            bucket.call_count += 1
 
-        if not success:
-            self._error_counts[model] += 1
-            bucket.error_count += 1
+            if not success:
+                totals.errors += 1
+                bucket.error_count += 1
 
     def record_error(self, model: str) -> None:
         """Record an error.
@@ -185,55 +220,96 @@ class MetricsCollector:
         Returns:
             MetricsSummary with aggregated metrics
         """
-        self._cleanup_old_buckets()
+        with self._lock:
+            self._cleanup_old_buckets()
+            sketch = self._merged_latencies(model)
+            totals = {m: replace(t) for m, t in self._totals.items()}
+            if self._buckets:
+                start_time = self._buckets[0].timestamp
+                end_time = self._buckets[-1].timestamp
+            else:
+                start_time = end_time = None
 
         if model:
-            latencies = self._latencies.get(model, [])
-            costs = self._costs.get(model, [])
-            input_tokens = self._input_tokens.get(model, [])
-            output_tokens = self._output_tokens.get(model, [])
-            errors = self._error_counts.get(model, 0)
-            calls = self._call_counts.get(model, 0)
+            selected = [totals[model]] if model in totals else []
         else:
-            latencies = [lat for ls in self._latencies.values() for lat in ls]
-            costs = [c for cs in self._costs.values() for c in cs]
-            input_tokens = [t for ts in self._input_tokens.values() for t in ts]
-            output_tokens = [t for ts in self._output_tokens.values() for t in ts]
-            errors = sum(self._error_counts.values())
-            calls = sum(self._call_counts.values())
+            selected = list(totals.values())
 
         summary = MetricsSummary()
 
-        if latencies:
-            sorted_latencies = sorted(latencies)
-            summary.latency_avg = statistics.mean(latencies)
-            summary.latency_p50 = self._percentile(sorted_latencies, 50)
-            summary.latency_p95 = self._percentile(sorted_latencies, 95)
-            summary.latency_p99 = self._percentile(sorted_latencies, 99)
+        if sketch.count:
+            summary.latency_avg = sketch.mean
+            summary.latency_p50 = sketch.quantile(0.50)
+            summary.latency_p95 = sketch.quantile(0.95)
+            summary.latency_p99 = sketch.quantile(0.99)
 
-        summary.total_cost = sum(costs)
-        summary.cost_by_model = {m: sum(cs) for m, cs in self._costs.items()}
+        summary.total_cost = sum(t.cost for t in selected)
+        summary.cost_by_model = {m: t.cost for m, t in totals.items() if t.cost}
 
-        summary.total_input_tokens = sum(input_tokens)
-        summary.total_output_tokens = sum(output_tokens)
+        summary.total_input_tokens = sum(t.input_tokens for t in selected)
+        summary.total_output_tokens = sum(t.output_tokens for t in selected)
         summary.tokens_by_model = {
-            m: {
-                "input": sum(self._input_tokens.get(m, [])),
-                "output": sum(self._output_tokens.get(m, [])),
-            }
-            for m in set(self._input_tokens.keys()) | set(self._output_tokens.keys())
+            m: {"input": t.input_tokens, "output": t.output_tokens}
+            for m, t in totals.items()
+            if t.input_tokens or t.output_tokens
         }
 
+        calls = sum(t.calls for t in selected)
+        errors = sum(t.errors for t in selected)
         summary.total_calls = calls
         summary.total_errors = errors
         summary.error_rate = errors / calls if calls > 0 else 0.0
 
-        if self._buckets:
-            summary.start_time = self._buckets[0].timestamp
-            summary.end_time = self._buckets[-1].timestamp
+        summary.start_time = start_time
+        summary.end_time = end_time
 
         return summary
 
+    def get_latency_percentile(
+        self, model: str, percentile: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """Get a latency percentile for one model over the rolling window.
+
+        Args:
+            model: Model name
+            percentile: Percentile to compute (0-100)
+            min_samples: Latencies needed before a value is returned
+
+        Returns:
+            Latency in milliseconds, or None with fewer than min_samples
+        """
+        with self._lock:
+            self._cleanup_old_buckets()
+            sketch = self._merged_latencies(model)
+        if not sketch.count or sketch.count < min_samples:
+            return None
+        return sketch.quantile(percentile / 100)
+
+    def get_model_snapshot(self) -> dict[str, dict]:
+        """Get per-model totals and windowed latency for exporters.
+
+        Returns:
+            Model name -> {calls, errors, cost, input_tokens, output_tokens,
+            latency_count, latency_sum, latency} where latency is the
+            merged window sketch (None if no recent latencies)
+        """
+        snapshot = {}
+        with self._lock:
+            self._cleanup_old_buckets()
+            for model, totals in self._totals.items():
+                sketch = self._merged_latencies(model)
+                snapshot[model] = {
+                    "calls": totals.calls,
+                    "errors": totals.errors,
+                    "cost": totals.cost,
+                    "input_tokens": totals.input_tokens,
+                    "output_tokens": totals.output_tokens,
+                    "latency_count": totals.latency_count,
+                    "latency_sum": totals.latency_sum,
+                    "latency": sketch if sketch.count else None,
+                }
+        return snapshot
+
     def get_trend(self, metric: str = "latency") -> list[dict]:
         """Get time-series trend data.
 
@@ -243,16 +319,20 @@ class MetricsCollector:
         Returns:
             List of {timestamp, value} dicts
         """
-        self._cleanup_old_buckets()
+        with self._lock:
+            self._cleanup_old_buckets()
+            buckets = list(self._buckets)
 
         trend = []
-        for bucket in self._buckets:
+        for bucket in buckets:
             if metric == "latency":
-                value = statistics.mean(bucket.latencies) if bucket.latencies else 0
+                count = sum(s.count for s in bucket.latencies.values())
+                total = sum(s.sum for s in bucket.latencies.values())
+                value = total / count if count else 0
             elif metric == "cost":
-                value = sum(bucket.costs)
+                value = bucket.cost
             elif metric == "tokens":
-                value = sum(bucket.input_tokens) + sum(bucket.output_tokens)
+                value = bucket.input_tokens + bucket.output_tokens
             elif metric == "errors":
                 value = bucket.error_count
             elif metric == "calls":
@@ -269,6 +349,19 @@ class MetricsCollector:
 
         return trend
 
+    def _merged_latencies(self, model: Optional[str]) -> QuantileSketch:
+        """Merge the window's latency sketches for one model (or all)."""
+        merged = QuantileSketch(self.relative_accuracy)
+        for bucket in self._buckets:
+            if model:
+                sketch = bucket.latencies.get(model)
+                if sketch is not None:
+                    merged.merge(sketch)
+            else:
+                for sketch in bucket.latencies.values():
+                    merged.merge(sketch)
+        return merged
+
     def _ensure_bucket(self) -> MetricBucket:
         """Ensure current time bucket exists."""
         now = datetime.utcnow()
@@ -287,19 +380,8 @@ class MetricsCollector:
     def _cleanup_old_buckets(self) -> None:
         """Remove buckets older than the window."""
         cutoff = datetime.utcnow() - timedelta(minutes=self.window_minutes)
-        self._buckets = [b for b in self._buckets if b.timestamp >= cutoff]
-
-    @staticmethod
-    def _percentile(sorted_data: list[float], percentile: int) -> float:
-        """Calculate percentile from sorted data."""
-        if not sorted_data:
-            return 0.0
-
-        k = (len(sorted_data) - 1) * percentile / 100
-        f = int(k)
-        c = f + 1 if f + 1 < len(sorted_data) else f
-
-        return sorted_data[f] + (k - f) * (sorted_data[c] - sorted_data[f])
+        while self._buckets and self._buckets[0].timestamp < cutoff:
+            self._buckets.popleft()
 
 
 # Global metrics collector instance
@@ -0,0 +1,119 @@
+"""Prometheus export of per-model agent metrics.
+
+ModelMetricsExporter is a custom prometheus_client collector: on each
+scrape it reads the MetricsCollector, so agent metrics are served from
+the same /metrics endpoint as the HTTP metrics in
+api/middleware/metrics.py without duplicating any state.
+
+Exported series (label `model`):
+- agent_model_latency_milliseconds: summary; quantiles 0.5/0.95/0.99
+  over the collector's rolling window, count and sum over its lifetime
+- agent_model_calls_total, agent_model_errors_total
+- agent_model_cost_usd_total
+- agent_model_tokens_total (label `direction`: input/output)
+
+Usage:
+    from runner.observability.prometheus import register_model_metrics
+
+    register_model_metrics()  # once, at startup
+"""
+
+from typing import Iterator, Optional
+
+try:
+    from prometheus_client import REGISTRY
+    from prometheus_client.core import CounterMetricFamily, Metric
+
+    PROMETHEUS_AVAILABLE = True
+except ImportError:
+    PROMETHEUS_AVAILABLE = False
+
+from runner.observability.metrics import MetricsCollector, get_metrics_collector
+
+EXPORTED_QUANTILES = (0.5, 0.95, 0.99)
+LATENCY_METRIC = "agent_model_latency_milliseconds"
+
+
+class ModelMetricsExporter:
+    """Collector that exposes a MetricsCollector to Prometheus."""
+
+    def __init__(self, metrics: Optional[MetricsCollector] = None):
+        """Initialize the exporter.
+
+        Args:
+            metrics: Collector to export (the global one by default)
+        """
+        self.metrics = metrics or get_metrics_collector()
+
+    def collect(self) -> Iterator["Metric"]:
+        """Build the metric families for one scrape."""
+        snapshot = self.metrics.get_model_snapshot()
+
+        latency = Metric(
+            LATENCY_METRIC, "Agent call latency by model in milliseconds", "summary"
+        )
+        calls = CounterMetricFamily(
+            "agent_model_calls", "Agent calls by model", labels=["model"]
+        )
+        errors = CounterMetricFamily(
+            "agent_model_errors", "Failed agent calls by model", labels=["model"]
+        )
+        cost = CounterMetricFamily(
+            "agent_model_cost_usd", "Agent cost by model in USD", labels=["model"]
+        )
+        tokens = CounterMetricFamily(
+            "agent_model_tokens",
+            "Agent tokens by model and direction",
+            labels=["model", "direction"],
+        )
+
+        for model, data in sorted(snapshot.items()):
+            sketch = data["latency"]
+            if sketch is not None:
+                for q in EXPORTED_QUANTILES:
+                    latency.add_sample(
+                        LATENCY_METRIC,
+                        {"model": model, "quantile": str(q)},
+                        sketch.quantile(q),
+                    )
+            if data["latency_count"]:
+                latency.add_sample(
+                    f"{LATENCY_METRIC}_count",
+                    {"model": model},
+                    data["latency_count"],
+                )
+                latency.add_sample(
+                    f"{LATENCY_METRIC}_sum", {"model": model}, data["latency_sum"]
+                )
+            calls.add_metric([model], data["calls"])
+            errors.add_metric([model], data["errors"])
+            cost.add_metric([model], data["cost"])
+            tokens.add_metric([model, "input"], data["input_tokens"])
+            tokens.add_metric([model, "output"], data["output_tokens"])
+
+        yield latency
+        yield calls
+        yield errors
+        yield cost
+        yield tokens
+
+
+_registered: Optional[ModelMetricsExporter] = None
+
+
+def register_model_metrics(registry=None) -> Optional[ModelMetricsExporter]:
+    """Register the global collector's metrics with Prometheus (once).
+
+    Args:
+        registry: Registry to use (prometheus_client's default by default)
+
+    Returns:
+        The exporter, or None if prometheus_client isn't installed
+    """
+    global _registered
+    if not PROMETHEUS_AVAILABLE:
+        return None
+    if _registered is None:
+        _registered = ModelMetricsExporter()
+        (registry or REGISTRY).register(_registered)
+    return _registered
@@ -0,0 +1,124 @@
+"""Fixed-memory quantile sketch for latency percentiles.
+
+QuantileSketch is a DDSketch: values are counted in logarithmic bins, so
+any quantile is returned within `relative_accuracy` of the true value
+(1% by default) no matter how many values were added. Recording is O(1),
+memory is bounded by `max_bins`, and two sketches merge by adding bin
+counts, which lets MetricsCollector keep one sketch per time bucket and
+combine them for a rolling window.
+
+Usage:
+    sketch = QuantileSketch()
+    for latency_ms in latencies:
+        sketch.add(latency_ms)
+    p95 = sketch.quantile(0.95)
+"""
+
+import math
+from typing import Optional
+
+# Values at or below this are counted as zero (log bins need value > 0)
+MIN_INDEXABLE = 1e-9
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch with bounded relative error."""
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_bins",
+        "_gamma",
+        "_log_gamma",
+        "bins",
+        "zero_count",
+        "count",
+        "sum",
+        "min",
+        "max",
+    )
+
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """Initialize an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of quantiles (0-1)
+            max_bins: Bin limit; the lowest bins are merged beyond it, which
+                only costs accuracy at the low end (not p95/p99)
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self.bins: dict[int, int] = {}
+        self.zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value: float) -> None:
+        """Add one non-negative value."""
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if value <= MIN_INDEXABLE:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        self.bins[key] = self.bins.get(key, 0) + 1
+        if len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Add another sketch's values (same relative_accuracy) to this one."""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different accuracy")
+        for key, count in other.bins.items():
+            self.bins[key] = self.bins.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.sum += other.sum
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        while len(self.bins) > self.max_bins:
+            self._collapse()
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate a quantile.
+
+        Args:
+            q: Quantile (0-1)
+
+        Returns:
+            Estimated value, or None if the sketch is empty
+        """
+        if self.count == 0:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        # Round the rank up: small samples err toward the slower value
+        rank = math.ceil(q * (self.count - 1))
+        seen = self.zero_count
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                value = 2 * self._gamma**key / (self._gamma + 1)
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count else 0.0
+
+    def _collapse(self) -> None:
+        """Fold the lowest bin into the next one."""
+        keys = sorted(self.bins)
+        lowest, next_key = keys[0], keys[1]
+        self.bins[next_key] += self.bins.pop(lowest)
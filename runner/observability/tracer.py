@@ -18,17 +18,31 @@ Usage:
     # Access span data
     print(f"Duration: {span.duration_ms}ms")
     print(f"Cost: ${span.cost:.4f}")
+
+Spans nest: a span started without an explicit parent becomes a child of
+the span current in this thread/context, so a workflow run records
+run -> state -> agent -> http spans under one trace id. The tracer keeps
+the most recent `max_spans` spans in a ring buffer and per-model
+aggregates updated as spans end. With an exporter, finished spans are
+batched to it in the background (see export.py).
 """
 
+import atexit
+import os
+import threading
 import time
 import uuid
+from collections import deque
 from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Any, Optional
 
 import structlog
 
+from runner.observability.export import BatchSpanProcessor, OTLPJsonFileExporter
+
 # Configure structured logging
 structlog.configure(
     processors=[
@@ -49,6 +63,31 @@ structlog.configure(
 
 logger = structlog.get_logger(__name__)
 
+# Global tracer settings
+TRACE_BUFFER_SIZE = int(os.getenv("TRACE_BUFFER_SIZE", "1000"))
+TRACE_EXPORT_FILE = os.getenv("TRACE_EXPORT_FILE")  # OTLP/JSON lines; unset = off
+
+# Span kinds; only agent spans count toward per-model stats
+SPAN_KIND_RUN = "run"
+SPAN_KIND_STATE = "state"
+SPAN_KIND_AGENT = "agent"
+SPAN_KIND_HTTP = "http"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+_current_tracer: ContextVar[Optional["AgentTracer"]] = ContextVar(
+    "current_tracer", default=None
+)
+
+
+def current_span() -> Optional["Span"]:
+    """Get the innermost open span in this thread/context."""
+    return _current_span.get()
+
+
+def current_tracer() -> Optional["AgentTracer"]:
+    """Get the tracer of the innermost open span (None outside any span)."""
+    return _current_tracer.get()
+
 
 # Model pricing for cost calculation (per 1M tokens)
 MODEL_PRICING = {
@@ -81,14 +120,18 @@ class Span:
     for an agent call.
     """
 
-    span_id: str = field(default_factory=lambda: str(uuid.uuid4())[:8])
-    trace_id: str = field(default_factory=lambda: str(uuid.uuid4())[:16])
+    span_id: str = field(default_factory=lambda: uuid.uuid4().hex[:16])
+    trace_id: str = field(default_factory=lambda: uuid.uuid4().hex)
+    parent_span_id: Optional[str] = None
     model: str = ""
     operation: str = "invoke"
+    kind: str = SPAN_KIND_AGENT  # run, state, agent, http
+    name: str = ""
 
     # Timing
     start_time: Optional[float] = None
     end_time: Optional[float] = None
+    start_unix_ns: int = 0  # wall clock, for exporters
 
     # Input/Output (truncated for storage)
     input_preview: str = ""
@@ -167,8 +210,11 @@ class Span:
         return {
             "span_id": self.span_id,
             "trace_id": self.trace_id,
+            "parent_span_id": self.parent_span_id,
             "model": self.model,
             "operation": self.operation,
+            "kind": self.kind,
+            "name": self.name,
             "duration_ms": self.duration_ms,
             "input_preview": self.input_preview,
             "input_length": self.input_length,
@@ -217,6 +263,8 @@ class AgentTracer:
         log_inputs: bool = True,
         log_outputs: bool = True,
         max_preview_length: int = 500,
+        max_spans: int = 1000,
+        exporter=None,
     ):
         """Initialize tracer.
 
@@ -224,11 +272,18 @@ class AgentTracer:
             log_inputs: Whether to log input previews
             log_outputs: Whether to log output previews
             max_preview_length: Max chars to store for previews
+            max_spans: Finished spans kept for get_recent_spans()
+            exporter: Optional span exporter (see export.py); spans are
+                batched to it from a background thread
         """
         self.log_inputs = log_inputs
         self.log_outputs = log_outputs
         self.max_preview_length = max_preview_length
-        self._spans: list[Span] = []
+        self._spans: deque[Span] = deque(maxlen=max_spans)
+        self._totals = self._new_stats()
+        self._by_model: dict[str, dict] = {}
+        self._lock = threading.Lock()
+        self._processor = BatchSpanProcessor(exporter) if exporter else None
 
     @contextmanager
     def trace_call(
@@ -236,33 +291,77 @@ class AgentTracer:
         model: str,
         input_text: str,
         operation: str = "invoke",
+        parent: Optional[Span] = None,
+        kind: str = SPAN_KIND_AGENT,
+        name: str = "",
         **metadata,
     ):
         """Context manager for tracing a call.
 
+        The span is current for the block, so spans started inside it
+        become its children. Setting span.status = "error" in the block
+        ends it as failed without raising.
+
         Args:
             model: Model name
             input_text: The input prompt
             operation: Operation type (invoke, stream, etc.)
+            parent: Parent span (default: the current span)
+            kind: Span kind (run, state, agent, http)
+            name: Display name (exporters default to "<kind> <model>")
             **metadata: Additional metadata
 
         Yields:
             Span object to record output and tokens
         """
-        span = self.start_span(model, input_text, operation, **metadata)
+        span = self.start_span(
+            model,
+            input_text,
+            operation,
+            parent=parent,
+            kind=kind,
+            name=name,
+            **metadata,
+        )
+        span_token = _current_span.set(span)
+        tracer_token = _current_tracer.set(self)
 
         try:
             yield span
-            self.end_span(span, success=True)
+            self.end_span(span, success=span.status != "error")
         except Exception as e:
             self.end_span(span, error=e)
             raise
+        finally:
+            _current_tracer.reset(tracer_token)
+            _current_span.reset(span_token)
+
+    def trace_span(
+        self, kind: str, name: str, parent: Optional[Span] = None, **metadata
+    ):
+        """Context manager for a span that isn't a model call (run, state).
+
+        Args:
+            kind: Span kind
+            name: Span name
+            parent: Parent span (default: the current span)
+            **metadata: Additional metadata
+
+        Returns:
+            Context manager yielding the Span
+        """
+        return self.trace_call(
+            "", "", operation=kind, parent=parent, kind=kind, name=name, **metadata
+        )
 
     def start_span(
         self,
         model: str,
         input_text: str,
         operation: str = "invoke",
+        parent: Optional[Span] = None,
+        kind: str = SPAN_KIND_AGENT,
+        name: str = "",
         **metadata,
     ) -> Span:
         """Start a new span.
@@ -271,23 +370,36 @@ class AgentTracer:
             model: Model name
             input_text: The input prompt
             operation: Operation type
+            parent: Parent span (default: the current span)
+            kind: Span kind (run, state, agent, http)
+            name: Display name
             **metadata: Additional metadata
 
         Returns:
             Span object
         """
+        parent = parent or current_span()
         span = Span(
             model=model,
             operation=operation,
+            kind=kind,
+            name=name,
             start_time=time.monotonic(),
+            start_unix_ns=time.time_ns(),
             metadata=metadata,
         )
+        if parent is not None:
+            span.trace_id = parent.trace_id
+            span.parent_span_id = parent.span_id
 
-        if self.log_inputs:
+        if self.log_inputs and input_text:
             span.set_input(input_text, self.max_preview_length)
+        elif input_text:
+            span.input_length = len(input_text)
 
-        logger.info(
-            "agent_call_start",
+        log = logger.info if kind == SPAN_KIND_AGENT else logger.debug
+        log(
+            "agent_call_start" if kind == SPAN_KIND_AGENT else "span_start",
             span_id=span.span_id,
             trace_id=span.trace_id,
             model=model,
@@ -312,13 +424,29 @@ class AgentTracer:
             error: Optional error that occurred
         """
         span.end_time = time.monotonic()
+        if not self.log_outputs:
+            span.output_preview = ""
 
         if error:
             span.set_error(error)
         else:
             span.status = "success" if success else "error"
 
-        self._spans.append(span)
+        with self._lock:
+            self._spans.append(span)
+            if span.kind == SPAN_KIND_AGENT:
+                self._add_stats(self._totals, span)
+                model_stats = self._by_model.get(span.model)
+                if model_stats is None:
+                    model_stats = self._by_model[span.model] = self._new_stats()
+                self._add_stats(model_stats, span)
+
+        if self._processor is not None:
+            self._processor.on_end(span)
+
+        if span.kind != SPAN_KIND_AGENT:
+            logger.debug("span_end", **span.to_dict())
+            return
 
         log_data = span.to_dict()
 
@@ -342,15 +470,26 @@ class AgentTracer:
         Returns:
             List of recent spans
         """
-        return self._spans[-limit:]
+        with self._lock:
+            spans = list(self._spans)
+        return spans[-limit:]
+
+    def get_trace(self, trace_id: str) -> list[Span]:
+        """Get the buffered spans of one trace, in the order they ended."""
+        with self._lock:
+            return [s for s in self._spans if s.trace_id == trace_id]
 
     def get_stats(self) -> dict:
-        """Get aggregate statistics.
+        """Get aggregate statistics over every agent span since creation.
 
         Returns:
             Dict with aggregate stats
         """
-        if not self._spans:
+        with self._lock:
+            totals = dict(self._totals)
+            by_model = {m: dict(st) for m, st in self._by_model.items()}
+
+        if not totals["calls"]:
             return {
                 "total_calls": 0,
                 "total_tokens": 0,
@@ -359,45 +498,50 @@ class AgentTracer:
                 "error_rate": 0.0,
             }
 
-        total_calls = len(self._spans)
-        total_tokens = sum(s.total_tokens for s in self._spans)
-        total_cost = sum(s.cost for s in self._spans)
-        total_latency = sum(s.duration_ms for s in self._spans)
-        error_count = sum(1 for s in self._spans if s.status == "error")
-
+        total_calls = totals["calls"]
         return {
             "total_calls": total_calls,
-            "total_tokens": total_tokens,
-            "total_cost": total_cost,
-            "avg_latency_ms": total_latency / total_calls,
-            "error_rate": error_count / total_calls,
-            "by_model": self._stats_by_model(),
+            "total_tokens": totals["tokens"],
+            "total_cost": totals["cost"],
+            "avg_latency_ms": totals["total_latency"] / total_calls,
+            "error_rate": totals["errors"] / total_calls,
+            "by_model": self._stats_by_model(by_model),
+        }
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Export spans queued so far (no-op without an exporter)."""
+        if self._processor is None:
+            return True
+        return self._processor.force_flush(timeout)
+
+    def shutdown(self) -> None:
+        """Flush and stop the exporter."""
+        if self._processor is not None:
+            self._processor.shutdown()
+
+    @staticmethod
+    def _new_stats() -> dict:
+        return {
+            "calls": 0,
+            "tokens": 0,
+            "cost": 0.0,
+            "total_latency": 0.0,
+            "errors": 0,
         }
 
-    def _stats_by_model(self) -> dict:
-        """Get stats grouped by model."""
-        by_model: dict[str, dict] = {}
-
-        for span in self._spans:
-            if span.model not in by_model:
-                by_model[span.model] = {
-                    "calls": 0,
-                    "tokens": 0,
-                    "cost": 0.0,
-                    "total_latency": 0.0,
-                    "errors": 0,
-                }
-
-            stats = by_model[span.model]
-            stats["calls"] += 1
-            stats["tokens"] += span.total_tokens
-            stats["cost"] += span.cost
-            stats["total_latency"] += span.duration_ms
-            if span.status == "error":
-                stats["errors"] += 1
-
-        # Calculate averages
-        for model, stats in by_model.items():
+    @staticmethod
+    def _add_stats(stats: dict, span: Span) -> None:
+        stats["calls"] += 1
+        stats["tokens"] += span.total_tokens
+        stats["cost"] += span.cost
+        stats["total_latency"] += span.duration_ms
+        if span.status == "error":
+            stats["errors"] += 1
+
+    @staticmethod
+    def _stats_by_model(by_model: dict[str, dict]) -> dict:
+        """Add averages to per-model running totals."""
+        for stats in by_model.values():
             stats["avg_latency_ms"] = (
                 stats["total_latency"] / stats["calls"] if stats["calls"] > 0 else 0
             )
@@ -407,3 +551,46 @@ class AgentTracer:
             del stats["total_latency"]
 
         return by_model
+
+
+# Global tracer instance
+_global_tracer: Optional[AgentTracer] = None
+_global_tracer_lock = threading.Lock()
+
+
+def get_tracer() -> AgentTracer:
+    """Get the global tracer (exports to TRACE_EXPORT_FILE when set).
+
+    The global tracer doesn't capture prompt or output previews, so agent
+    call logs carry no user content. It is shut down at interpreter exit;
+    long-lived processes should call shutdown_tracer() when they stop.
+    """
+    global _global_tracer
+    if _global_tracer is None:
+        with _global_tracer_lock:
+            if _global_tracer is None:
+                exporter = (
+                    OTLPJsonFileExporter(TRACE_EXPORT_FILE)
+                    if TRACE_EXPORT_FILE
+                    else None
+                )
+                _global_tracer = AgentTracer(
+                    log_inputs=False,
+                    log_outputs=False,
+                    max_spans=TRACE_BUFFER_SIZE,
+                    exporter=exporter,
+                )
+                atexit.register(shutdown_tracer)
+    return _global_tracer
+
+
+def shutdown_tracer() -> None:
+    """Export queued spans and stop the global tracer's exporter thread.
+
+    Safe to call more than once, or before the tracer was created. Spans
+    ended afterwards restart the exporter thread.
+    """
+    with _global_tracer_lock:
+        tracer = _global_tracer
+    if tracer is not None:
+        tracer.shutdown()
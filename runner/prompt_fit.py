@@ -0,0 +1,103 @@
+"""Fit agent prompts into the model's context window before the call.
+
+StateMachine builds prompts from sections (preamble, persona, context,
+input files, reviewer feedback) with no size awareness. fit_prompt()
+estimates each section and, if the prompt would not leave room for the
+reply, trims the lowest-priority sections first: the tail of a section is
+cut, or the section is dropped when too little of it would remain. A note
+marks each cut so the model knows the input is incomplete. Required
+sections (the preamble and persona) are never trimmed; if they alone
+don't fit, the result reports fits=False so the caller can skip a call
+that would fail anyway.
+"""
+
+from dataclasses import dataclass, field
+
+from runner.metrics.estimate import estimate_tokens
+
+SECTION_SEPARATOR = "\n\n"
+MIN_SECTION_TOKENS = 64  # trimmed sections shorter than this are dropped
+TRIM_NOTE = "\n\n[... {tokens} tokens omitted to fit the context window]"
+OMIT_NOTE = "[{name} omitted to fit the context window]"
+
+
+@dataclass
+class PromptSection:
+    """A part of a prompt, trimmed in order of priority when over budget."""
+
+    name: str
+    text: str
+    priority: int = 0  # lower priorities are trimmed first
+    required: bool = False
+
+
+@dataclass
+class FittedPrompt:
+    """A prompt after fitting, with its size estimate."""
+
+    prompt: str
+    estimated_tokens: int
+    budget: int
+    trimmed: list[str] = field(default_factory=list)
+
+    @property
+    def fits(self) -> bool:
+        return self.estimated_tokens <= self.budget
+
+
+def fit_prompt(
+    sections: list[PromptSection], budget: int, family: str = "generic"
+) -> FittedPrompt:
+    """Join prompt sections, trimming low-priority ones to fit a budget.
+
+    Args:
+        sections: Sections in prompt order
+        budget: Maximum prompt tokens (context window minus the reply)
+        family: Tokenizer family for estimates
+
+    Returns:
+        FittedPrompt; trimmed names the sections that were cut or dropped
+    """
+    texts = [s.text for s in sections]
+    sizes = [estimate_tokens(t, family) for t in texts]
+    separator_tokens = estimate_tokens(SECTION_SEPARATOR, family)
+    overhead = separator_tokens * max(0, len(sections) - 1)
+    trimmed: list[str] = []
+
+    # Lowest priority first; the largest of equal priority first
+    order = sorted(
+        (i for i, s in enumerate(sections) if not s.required),
+        key=lambda i: (sections[i].priority, -sizes[i]),
+    )
+    for i in order:
+        overflow = sum(sizes) + overhead - budget
+        if overflow <= 0:
+            break
+        keep = sizes[i] - overflow
+        if keep < MIN_SECTION_TOKENS:
+            texts[i] = OMIT_NOTE.format(name=sections[i].name)
+        else:
+            texts[i] = _truncate(texts[i], sizes[i], keep, family)
+        sizes[i] = estimate_tokens(texts[i], family)
+        trimmed.append(sections[i].name)
+
+    prompt = SECTION_SEPARATOR.join(texts)
+    return FittedPrompt(
+        prompt=prompt,
+        estimated_tokens=sum(sizes) + overhead,
+        budget=budget,
+        trimmed=trimmed,
+    )
+
+
+def _truncate(text: str, tokens: int, keep: int, family: str) -> str:
+    """Cut the tail of a text so it and the trim note fit in keep tokens."""
+    note_tokens = estimate_tokens(TRIM_NOTE.format(tokens=tokens), family)
+    target = max(0, keep - note_tokens)
+    chars = int(len(text) * target / tokens)
+    cut = text[:chars]
+    # Token density varies along the text; shrink until the estimate fits
+    while cut and estimate_tokens(cut, family) > target:
+        cut = cut[: int(len(cut) * 0.9)]
+    omitted = tokens - estimate_tokens(cut, family)
+    return cut + TRIM_NOTE.format(tokens=omitted)
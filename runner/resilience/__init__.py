@@ -35,6 +35,7 @@ from runner.resilience.retry import (
 from runner.resilience.fallback import (
     FallbackChain,
     FallbackResult,
+    HedgePolicy,
 )
 from runner.resilience.rate_limit import (
     RateLimiter,
@@ -52,6 +53,7 @@ __all__ = [
     "with_retry",
     "FallbackChain",
     "FallbackResult",
+    "HedgePolicy",
     "RateLimiter",
     "RateLimitConfig",
     "BudgetEnforcer",
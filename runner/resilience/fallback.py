@@ -15,18 +15,36 @@ Usage:
 
     result = await chain.invoke(prompt)
     print(f"Used model: {result.model_used}")
+
+Hedged requests:
+    By default the next model is only tried after the current one fails,
+    so a slow but healthy primary sets the tail latency. With a
+    HedgePolicy, a duplicate request goes to the next model once the
+    primary has taken longer than a percentile of its recent latency (from
+    MetricsCollector). The first success wins and the other request is
+    cancelled. A hedge budget caps how many duplicates a run may send;
+    calls without a run_id each get their own budget.
+
+    chain = FallbackChain(models, hedge_policy=HedgePolicy(percentile=95))
+    result = await chain.invoke(prompt, run_id=run_id)
 """
 
+import asyncio
 import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from typing import Any, Callable, Optional, TypeVar
 
+from runner.observability.metrics import MetricsCollector, get_metrics_collector
 from runner.resilience.retry import RetryPolicy
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
+MAX_TRACKED_RUNS = 1024  # runs whose hedge budgets are remembered
+
 
 @dataclass
 class FallbackResult:
@@ -37,11 +55,35 @@ class FallbackResult:
     model_used: str
     attempts: list[dict] = field(default_factory=list)
     warning: Optional[str] = None
+    model_index: int = 0  # position of model_used in the chain
+    hedged: bool = False  # a duplicate request was sent
+    cancelled: list[str] = field(default_factory=list)  # hedge losers
 
     @property
     def degraded(self) -> bool:
         """Whether a fallback model was used."""
-        return len(self.attempts) > 1
+        return len(self.attempts) > 1 or self.model_index > 0
+
+
+@dataclass
+class HedgePolicy:
+    """When FallbackChain sends a duplicate request to the next model.
+
+    Attributes:
+        percentile: Latency percentile of the in-flight model to wait for
+        min_samples: Latencies needed before the percentile is trusted
+        default_delay_ms: Delay used with fewer samples (None: don't hedge)
+        min_delay_ms: Lower bound on the delay, so fast models aren't
+            hedged on noise
+        max_hedges: Duplicate requests allowed per run (per invoke() call
+            without a run_id)
+    """
+
+    percentile: float = 95
+    min_samples: int = 20
+    default_delay_ms: Optional[float] = None
+    min_delay_ms: float = 50.0
+    max_hedges: int = 10
 
 
 class FallbackChain:
@@ -68,6 +110,8 @@ class FallbackChain:
         models: list[tuple[str, Any]],
         retry_policy: Optional[RetryPolicy] = None,
         on_fallback: Optional[Callable[[str, str, Exception], None]] = None,
+        hedge_policy: Optional[HedgePolicy] = None,
+        metrics: Optional[MetricsCollector] = None,
     ):
         """Initialize fallback chain.
 
@@ -75,6 +119,10 @@ class FallbackChain:
             models: List of (name, agent) tuples in priority order
             retry_policy: Retry policy for each model attempt
             on_fallback: Callback when falling back (from_model, to_model, error)
+            hedge_policy: Send hedged requests (see HedgePolicy)
+            metrics: Collector for per-model latency; the global collector
+                is used when hedging without one. Each attempt's latency
+                and outcome is recorded here.
         """
         if not models:
             raise ValueError("At least one model required")
@@ -82,30 +130,45 @@ class FallbackChain:
         self.models = models
         self.retry_policy = retry_policy or RetryPolicy(max_retries=1)
         self.on_fallback = on_fallback
+        self.hedge_policy = hedge_policy
+        if metrics is None and hedge_policy is not None:
+            metrics = get_metrics_collector()
+        self.metrics = metrics
+        # Hedges sent per run, least recently hedged first
+        self._hedges: OrderedDict[str, int] = OrderedDict()
+
+    def hedges_used(self, run_id: str) -> int:
+        """Get the number of hedged requests sent for a run."""
+        return self._hedges.get(run_id, 0)
 
     async def invoke(
         self,
         prompt: str,
+        *,
+        run_id: Optional[str] = None,
         **kwargs,
     ) -> FallbackResult:
         """Invoke the chain, trying models in order.
 
         Args:
             prompt: The prompt to send
+            run_id: Run whose hedge budget this call draws on (the call
+                gets its own budget if None)
             **kwargs: Additional arguments passed to agents
 
         Returns:
             FallbackResult with the result and metadata
         """
+        if self.hedge_policy is not None:
+            return await self._invoke_hedged(prompt, run_id, **kwargs)
+
         attempts = []
         last_error: Optional[Exception] = None
 
         for i, (model_name, agent) in enumerate(self.models):
             try:
                 # Apply retry policy to each model
-                result = await self._invoke_with_retry(
-                    agent, prompt, model_name, **kwargs
-                )
+                result = await self._timed_invoke(agent, prompt, model_name, **kwargs)
 
                 attempts.append(
                     {
@@ -119,6 +182,7 @@ class FallbackChain:
                     model_used=model_name,
                     attempts=attempts,
                     warning=f"Used fallback model {model_name}" if i > 0 else None,
+                    model_index=i,
                 )
 
             except Exception as e:
@@ -148,6 +212,162 @@ class FallbackChain:
             warning=f"All models failed. Last error: {last_error}",
         )
 
+    async def _invoke_hedged(
+        self, prompt: str, run_id: Optional[str], **kwargs
+    ) -> FallbackResult:
+        """Invoke the chain, hedging slow requests with the next model.
+
+        At most two requests are in flight: the current model and, once its
+        hedge delay has passed, the next one. Failures fall through to the
+        next model not yet tried, as in invoke().
+        """
+        attempts: list[dict] = []
+        last_error: Optional[Exception] = None
+        pending: dict[asyncio.Task, tuple[int, float]] = {}
+        next_index = 0
+        hedged = False
+        call_hedges = 0
+
+        def launch() -> None:
+            nonlocal next_index
+            model_name, agent = self.models[next_index]
+            task = asyncio.create_task(
+                self._timed_invoke(agent, prompt, model_name, **kwargs)
+            )
+            pending[task] = (next_index, time.monotonic())
+            next_index += 1
+
+        launch()
+        try:
+            while pending:
+                timeout = None
+                if len(pending) == 1 and next_index < len(self.models):
+                    used = call_hedges if run_id is None else self.hedges_used(run_id)
+                    timeout = self._hedge_timeout(*next(iter(pending.values())), used)
+
+                done, _ = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    # The in-flight model is slower than usual: hedge
+                    call_hedges += 1
+                    if run_id is not None:
+                        self._spend_hedge(run_id)
+                    hedged = True
+                    logger.info(
+                        f"Hedging {self.models[next_index - 1][0]} "
+                        f"with {self.models[next_index][0]}"
+                    )
+                    launch()
+                    continue
+
+                for task in done:
+                    index, _ = pending.pop(task)
+                    model_name = self.models[index][0]
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        last_error = e
+                        attempts.append(
+                            {
+                                "model": model_name,
+                                "error": str(e),
+                                "error_type": type(e).__name__,
+                                "success": False,
+                            }
+                        )
+                        logger.warning(f"Model {model_name} failed: {e}")
+                        continue
+
+                    attempts.append({"model": model_name, "success": True})
+                    cancelled = [self.models[i][0] for i, _ in pending.values()]
+                    return FallbackResult(
+                        success=True,
+                        result=result,
+                        model_used=model_name,
+                        attempts=attempts,
+                        warning=(
+                            f"Used fallback model {model_name}" if index > 0 else None
+                        ),
+                        model_index=index,
+                        hedged=hedged,
+                        cancelled=cancelled,
+                    )
+
+                if not pending and next_index < len(self.models):
+                    if self.on_fallback:
+                        self.on_fallback(
+                            attempts[-1]["model"],
+                            self.models[next_index][0],
+                            last_error,
+                        )
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        return FallbackResult(
+            success=False,
+            result=None,
+            model_used="none",
+            attempts=attempts,
+            warning=f"All models failed. Last error: {last_error}",
+            hedged=hedged,
+        )
+
+    def _spend_hedge(self, run_id: str) -> None:
+        """Count a hedge against a run's budget."""
+        self._hedges[run_id] = self._hedges.get(run_id, 0) + 1
+        self._hedges.move_to_end(run_id)
+        while len(self._hedges) > MAX_TRACKED_RUNS:
+            self._hedges.popitem(last=False)
+
+    def _hedge_timeout(
+        self, index: int, started: float, hedges_used: int
+    ) -> Optional[float]:
+        """Seconds until the in-flight request should be hedged.
+
+        Returns:
+            Remaining delay, or None if it shouldn't be hedged (budget spent,
+            or no latency data and no default delay)
+        """
+        policy = self.hedge_policy
+        if hedges_used >= policy.max_hedges:
+            return None
+        delay_ms = self.metrics.get_latency_percentile(
+            self.models[index][0], policy.percentile, policy.min_samples
+        )
+        if delay_ms is None:
+            delay_ms = policy.default_delay_ms
+        if delay_ms is None:
+            return None
+        delay_ms = max(delay_ms, policy.min_delay_ms)
+        return max(0.0, delay_ms / 1000 - (time.monotonic() - started))
+
+    async def _timed_invoke(
+        self,
+        agent: Any,
+        prompt: str,
+        model_name: str,
+        **kwargs,
+    ) -> Any:
+        """Invoke with retries, recording latency and outcome in metrics.
+
+        Cancelled requests (hedge losers) are not recorded.
+        """
+        started = time.monotonic()
+        try:
+            result = await self._invoke_with_retry(agent, prompt, model_name, **kwargs)
+        except Exception:
+            if self.metrics is not None:
+                self.metrics.record_call(model_name, success=False)
+            raise
+        if self.metrics is not None:
+            latency_ms = (time.monotonic() - started) * 1000
+            self.metrics.record_latency(model_name, latency_ms)
+            self.metrics.record_call(model_name, success=True)
+        return result
+
     async def _invoke_with_retry(
         self,
         agent: Any,
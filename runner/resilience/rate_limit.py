@@ -101,6 +101,20 @@ class TokenBucket:
                 await asyncio.sleep(wait)
                 wait_time += wait
 
+    def take(self, tokens: int = 1) -> None:
+        """Deduct tokens without waiting (usage that already happened).
+
+        Args:
+            tokens: Number of tokens used
+        """
+        self._refill()
+        self.tokens = max(0.0, self.tokens - tokens)
+
+    def available(self) -> float:
+        """Fraction of the bucket currently available (0.0-1.0)."""
+        self._refill()
+        return self.tokens / self.capacity if self.capacity else 1.0
+
     def _refill(self) -> None:
         """Refill tokens based on elapsed time."""
         now = time.monotonic()
@@ -209,6 +223,28 @@ class RateLimiter:
 
         return total_wait
 
+    def consume(self, tokens: int = 0) -> None:
+        """Record a request that was made without acquire().
+
+        Args:
+            tokens: Number of tokens the request used
+        """
+        for name, bucket in self._buckets.items():
+            if name in ("rpm", "rpd"):
+                bucket.take(1)
+            elif tokens > 0:
+                bucket.take(tokens)
+
+    def headroom(self) -> float:
+        """Remaining budget as a fraction of the tightest limit.
+
+        Returns:
+            1.0 with no limits or full buckets, 0.0 when a limit is exhausted
+        """
+        if not self._buckets:
+            return 1.0
+        return min(bucket.available() for bucket in self._buckets.values())
+
     @classmethod
     def for_api(cls, api_name: str) -> "RateLimiter":
         """Create a rate limiter with default limits for an API.
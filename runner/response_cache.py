@@ -0,0 +1,243 @@
+"""Prompt-level cache for LLM responses.
+
+States opt in from the workflow YAML:
+
+    story-review:
+      type: single
+      agent: reviewer
+      cache:
+        ttl: 86400   # seconds; `cache: true` uses DEFAULT_TTL
+
+Entries are keyed by a hash of the model ID, the composed prompt and the
+generation params, so any change to the persona, inputs or model config is a
+miss. A process-wide LRU sits in front of the llm_response_cache table; the
+table is optional and only consulted when a backend is passed in.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+from runner.models import TokenUsage
+
+DEFAULT_TTL = 86400  # 24 hours in seconds
+DEFAULT_MAX_ENTRIES = 512
+
+# Agent config keys that change what the provider returns for a prompt
+GENERATION_PARAMS = (
+    "temperature",
+    "top_p",
+    "top_k",
+    "max_tokens",
+    "seed",
+    "system_prompt",
+    "response_format",
+)
+
+
+@dataclass(frozen=True)
+class CachedResponse:
+    """A provider response that can be replayed for an identical prompt."""
+
+    model: str
+    content: str
+    tokens: TokenUsage
+    cost_usd: float
+    expires_at: float  # time.time() epoch seconds
+
+
+def cache_ttl_for_state(state_config: dict) -> Optional[int]:
+    """Get the cache TTL configured for a state.
+
+    Args:
+        state_config: State definition from the workflow YAML
+
+    Returns:
+        TTL in seconds, or None if the state does not opt in
+    """
+    setting = state_config.get("cache")
+    if not setting:
+        return None
+    if setting is True:
+        return DEFAULT_TTL
+    if isinstance(setting, dict):
+        if not setting.get("enabled", True):
+            return None
+        ttl = int(setting.get("ttl", DEFAULT_TTL))
+        return ttl if ttl > 0 else None
+    return None
+
+
+def model_id_for_agent(agent: Any) -> str:
+    """Get the identifier used for an agent's model in cache keys."""
+    config = getattr(agent, "config", {}) or {}
+    return (
+        getattr(agent, "model_id", None)
+        or config.get("model")
+        or getattr(agent, "name", "unknown")
+    )
+
+
+def generation_params_for_agent(agent: Any) -> dict:
+    """Get the generation params from an agent's config."""
+    config = getattr(agent, "config", {}) or {}
+    return {key: config[key] for key in GENERATION_PARAMS if key in config}
+
+
+def make_cache_key(model_id: str, prompt: str, params: Optional[dict] = None) -> str:
+    """Build a cache key from the model, prompt and generation params.
+
+    Args:
+        model_id: Provider model identifier
+        prompt: Fully composed prompt
+        params: Generation params (temperature, max_tokens, ...)
+
+    Returns:
+        Hex SHA-256 digest
+    """
+    payload = json.dumps(
+        {"model": model_id, "params": params or {}, "prompt": prompt},
+        sort_keys=True,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Thread-safe LRU of LLM responses with an optional database tier.
+
+    The backend is any object with the WorkflowStore cache methods
+    (get_cached_response / save_cached_response). Backend errors are
+    swallowed: a cache that cannot be read is a miss, not a failed run.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: str, backend=None) -> Optional[CachedResponse]:
+        """Look up a response, checking memory first and then the backend.
+
+        Args:
+            key: Cache key from make_cache_key()
+            backend: Optional persistent store
+
+        Returns:
+            CachedResponse, or None on a miss
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry.expires_at > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+            if entry:
+                del self._entries[key]
+
+        entry = self._load(key, backend) if backend is not None else None
+        with self._lock:
+            if entry:
+                self._store(key, entry)
+                self.hits += 1
+            else:
+                self.misses += 1
+        return entry
+
+    def put(
+        self,
+        key: str,
+        entry: CachedResponse,
+        backend=None,
+        state_name: Optional[str] = None,
+    ) -> None:
+        """Store a response in memory and, if given, in the backend.
+
+        Args:
+            key: Cache key from make_cache_key()
+            entry: Response to cache
+            backend: Optional persistent store
+            state_name: State that produced the response (for inspection)
+        """
+        with self._lock:
+            self._store(key, entry)
+
+        if backend is None:
+            return
+        try:
+            backend.save_cached_response(
+                cache_key=key,
+                model=entry.model,
+                content=entry.content,
+                expires_at=datetime.utcfromtimestamp(entry.expires_at),
+                state_name=state_name,
+                tokens_input=entry.tokens.input_tokens,
+                tokens_output=entry.tokens.output_tokens,
+                cost_usd=entry.cost_usd,
+            )
+        except Exception:
+            pass
+
+    def clear(self) -> None:
+        """Drop all in-memory entries."""
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def _store(self, key: str, entry: CachedResponse) -> None:
+        """Insert an entry and evict the least recently used. Caller holds lock."""
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    @staticmethod
+    def _load(key: str, backend) -> Optional[CachedResponse]:
+        """Load an unexpired entry from the backend."""
+        try:
+            record = backend.get_cached_response(key)
+            if not record:
+                return None
+
+            # expires_at is stored as naive UTC
+            remaining = (record.expires_at - datetime.utcnow()).total_seconds()
+            if remaining <= 0:
+                return None
+            return CachedResponse(
+                model=record.model,
+                content=record.content,
+                tokens=TokenUsage(
+                    input_tokens=record.tokens_input,
+                    output_tokens=record.tokens_output,
+                ),
+                cost_usd=record.cost_usd,
+                expires_at=time.time() + remaining,
+            )
+        except Exception:
+            return None
+
+
+def build_entry(
+    model_id: str, content: str, tokens: TokenUsage, cost_usd: float, ttl: int
+) -> CachedResponse:
+    """Build a cache entry that expires ttl seconds from now."""
+    return CachedResponse(
+        model=model_id,
+        content=content,
+        tokens=tokens,
+        cost_usd=cost_usd,
+        expires_at=time.time() + ttl,
+    )
+
+
+# Process-wide cache shared by all StateMachine instances
+response_cache = ResponseCache()
@@ -0,0 +1,428 @@
+"""Adaptive agent routing for workflow states.
+
+Agent choice in the workflow YAML is static. A state marked
+`routing: adaptive` instead lists equivalent `candidates`, and the
+ModelRouter picks among them per run by a weighted score (lower is better)
+over:
+
+- rolling p95 latency, from the MetricsCollector
+- error rate over the last `window` calls
+- remaining rate-limit budget, for agents with a `rate_limit:` config
+- cost per call (credit weight, or cost_per_1k when credits aren't set)
+
+Each agent also has a provider circuit. After `failure_threshold`
+consecutive failures, or a rolling error rate above `max_error_rate`, the
+circuit opens and the agent is skipped for `cooldown_s`. It then goes
+half-open: the next run to select it makes a single probe call that closes
+the circuit on success or reopens it on failure. While that probe is in
+flight the circuit ranks as open for other runs (for at most `cooldown_s`,
+in case the probe never reports back). When every candidate is open the
+least-recently opened ones are used anyway, so a state is never left
+without an agent.
+
+Usage:
+    router = ModelRouter()
+    chosen = router.select(["claude-sonnet", "gemini-3-pro"], count=1)
+    router.record("claude-sonnet", latency_ms=1800, success=True)
+"""
+
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from runner.observability.metrics import MetricsCollector, get_metrics_collector
+from runner.resilience.rate_limit import RateLimiter
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+# Credits per agent step for each `credit_weights` tier in the workflow YAML
+CREDIT_TIER_COSTS = {"standard": 1, "premium": 5}
+
+# Normalized latency used for candidates with too few samples
+UNKNOWN_LATENCY_SCORE = 0.5
+
+
+@dataclass
+class RoutingPolicy:
+    """Scoring weights and circuit thresholds for ModelRouter.
+
+    Attributes:
+        latency_weight: Weight of p95 latency (relative to the slowest candidate)
+        error_weight: Weight of the rolling error rate
+        rate_limit_weight: Weight of the used share of the rate-limit budget
+        cost_weight: Weight of cost (relative to the priciest candidate)
+        window: Recent calls kept per agent for error rates
+        min_samples: Calls needed before latency and error rate are scored
+        failure_threshold: Consecutive failures that open the circuit
+        max_error_rate: Rolling error rate that opens the circuit
+        max_p95_ms: p95 latency that opens the circuit (None = never)
+        cooldown_s: Seconds an open circuit is skipped before a probe, and
+            the longest a probe holds a half-open circuit
+    """
+
+    latency_weight: float = 0.4
+    error_weight: float = 0.3
+    rate_limit_weight: float = 0.15
+    cost_weight: float = 0.15
+    window: int = 50
+    min_samples: int = 5
+    failure_threshold: int = 3
+    max_error_rate: float = 0.5
+    max_p95_ms: Optional[float] = None
+    cooldown_s: float = 60.0
+
+
+@dataclass
+class ProviderCircuit:
+    """Health of one agent's provider."""
+
+    state: str = CIRCUIT_CLOSED
+    consecutive_failures: int = 0
+    opened_at: Optional[float] = None
+    probe_started_at: Optional[float] = None  # half-open probe in flight
+    outcomes: deque = field(default_factory=deque)  # recent success flags
+
+    @property
+    def error_rate(self) -> float:
+        if not self.outcomes:
+            return 0.0
+        return 1 - sum(self.outcomes) / len(self.outcomes)
+
+
+@dataclass
+class RouteScore:
+    """Why a candidate ranked where it did."""
+
+    agent: str
+    score: float
+    circuit: str
+    latency_p95: Optional[float] = None
+    error_rate: float = 0.0
+    headroom: float = 1.0
+    cost: float = 0.0
+    probing: bool = False  # half-open with another run's probe in flight
+
+    @property
+    def available(self) -> bool:
+        """Whether the circuit accepts a call from this run."""
+        return self.circuit != CIRCUIT_OPEN and not self.probing
+
+    def to_dict(self) -> dict:
+        return {
+            "agent": self.agent,
+            "score": round(self.score, 4),
+            "circuit": self.circuit,
+            "probing": self.probing,
+            "latency_p95": self.latency_p95,
+            "error_rate": round(self.error_rate, 4),
+            "headroom": round(self.headroom, 4),
+            "cost": self.cost,
+        }
+
+
+class ModelRouter:
+    """Scores equivalent agents and tracks per-provider circuits.
+
+    Thread-safe: fan-out states record outcomes from worker threads.
+    """
+
+    def __init__(
+        self,
+        policy: Optional[RoutingPolicy] = None,
+        metrics: Optional[MetricsCollector] = None,
+    ):
+        """Initialize the router.
+
+        Args:
+            policy: Scoring weights and circuit thresholds
+            metrics: Collector for per-agent latency (global one by default).
+                Every recorded call is added to it.
+        """
+        self.policy = policy or RoutingPolicy()
+        self.metrics = metrics or get_metrics_collector()
+        self._circuits: dict[str, ProviderCircuit] = {}
+        self._rate_limiters: dict[str, RateLimiter] = {}
+        self._lock = threading.Lock()
+
+    def set_rate_limiter(self, agent: str, limiter: RateLimiter) -> None:
+        """Track an agent's rate-limit budget."""
+        with self._lock:
+            self._rate_limiters[agent] = limiter
+
+    def has_rate_limiter(self, agent: str) -> bool:
+        return agent in self._rate_limiters
+
+    def record(
+        self, agent: str, latency_ms: float, success: bool, tokens: int = 0
+    ) -> Optional[str]:
+        """Record a live call and update the agent's circuit.
+
+        Args:
+            agent: Agent name
+            latency_ms: Call duration in milliseconds
+            success: Whether the call succeeded
+            tokens: Tokens used (deducted from the rate-limit budget)
+
+        Returns:
+            The new circuit state if it changed, else None
+        """
+        self.metrics.record_latency(agent, latency_ms)
+        self.metrics.record_call(agent, success=success)
+
+        with self._lock:
+            limiter = self._rate_limiters.get(agent)
+            if limiter is not None:
+                limiter.consume(tokens)
+
+            circuit = self._circuit(agent)
+            before = circuit.state
+            self._refresh(circuit)
+            circuit.probe_started_at = None
+            circuit.outcomes.append(success)
+            while len(circuit.outcomes) > self.policy.window:
+                circuit.outcomes.popleft()
+
+            if success:
+                circuit.consecutive_failures = 0
+                if circuit.state == CIRCUIT_HALF_OPEN:
+                    circuit.state = CIRCUIT_CLOSED
+                    circuit.outcomes.clear()
+            else:
+                circuit.consecutive_failures += 1
+
+            if circuit.state == CIRCUIT_HALF_OPEN and not success:
+                self._open(circuit)
+            elif circuit.state == CIRCUIT_CLOSED and self._should_open(agent, circuit):
+                self._open(circuit)
+
+            return circuit.state if circuit.state != before else None
+
+    def circuit_state(self, agent: str) -> str:
+        """Current circuit state (an open circuit turns half-open after cooldown)."""
+        with self._lock:
+            return self._refresh(self._circuit(agent))
+
+    def score(
+        self, candidates: list[str], costs: Optional[dict[str, float]] = None
+    ) -> list[RouteScore]:
+        """Score candidates, best first; unavailable circuits sort last.
+
+        Open circuits and half-open circuits with a probe in flight are
+        unavailable. Scoring claims nothing; use rank() or select() to
+        route calls.
+
+        Args:
+            candidates: Equivalent agent names, in configured order
+            costs: Relative cost per call by agent (missing = 0)
+
+        Returns:
+            RouteScore per candidate
+        """
+        costs = costs or {}
+        policy = self.policy
+        p95s = {
+            name: self.metrics.get_latency_percentile(
+                name, 95, min_samples=policy.min_samples
+            )
+            for name in candidates
+        }
+        slowest = max((v for v in p95s.values() if v), default=0.0)
+        priciest = max((costs.get(name, 0.0) for name in candidates), default=0.0)
+
+        scores = []
+        with self._lock:
+            for name in candidates:
+                circuit = self._circuit(name)
+                state = self._refresh(circuit)
+                error_rate = (
+                    circuit.error_rate
+                    if len(circuit.outcomes) >= policy.min_samples
+                    else 0.0
+                )
+                limiter = self._rate_limiters.get(name)
+                headroom = limiter.headroom() if limiter else 1.0
+                p95 = p95s[name]
+                latency = p95 / slowest if p95 and slowest else UNKNOWN_LATENCY_SCORE
+                cost = costs.get(name, 0.0)
+                score = (
+                    policy.latency_weight * latency
+                    + policy.error_weight * error_rate
+                    + policy.rate_limit_weight * (1 - headroom)
+                    + policy.cost_weight * (cost / priciest if priciest else 0.0)
+                )
+                scores.append(
+                    RouteScore(
+                        agent=name,
+                        score=score,
+                        circuit=state,
+                        latency_p95=p95,
+                        error_rate=error_rate,
+                        headroom=headroom,
+                        cost=cost,
+                        probing=self._probing(circuit),
+                    )
+                )
+            opened_at = {
+                name: self._circuits[name].opened_at or 0.0 for name in candidates
+            }
+
+        # Stable sort keeps the configured order among equal scores
+        return sorted(
+            scores,
+            key=lambda s: (
+                (0, 0.0, s.score) if s.available else (1, opened_at[s.agent], 0.0)
+            ),
+        )
+
+    def rank(
+        self,
+        candidates: list[str],
+        count: int = 1,
+        costs: Optional[dict[str, float]] = None,
+    ) -> list[RouteScore]:
+        """Score candidates and claim the probe of any half-open one chosen.
+
+        The best `count` candidates are the ones to call. A half-open
+        circuit among them is marked as probing, so concurrent runs rank it
+        as open until this run records the outcome. If another run claimed
+        it first, the candidates are scored again.
+
+        Args:
+            candidates: Equivalent agent names, in configured order
+            count: How many agents the state runs
+            costs: Relative cost per call by agent
+
+        Returns:
+            RouteScore per candidate, best first
+        """
+        for _ in range(len(candidates) + 1):
+            scores = self.score(candidates, costs)
+            with self._lock:
+                if self._claim_probes(scores[:count]):
+                    break
+        return scores
+
+    def select(
+        self,
+        candidates: list[str],
+        count: int = 1,
+        costs: Optional[dict[str, float]] = None,
+    ) -> list[str]:
+        """Pick the best `count` candidates.
+
+        Args:
+            candidates: Equivalent agent names, in configured order
+            count: How many agents the state runs
+            costs: Relative cost per call by agent
+
+        Returns:
+            Agent names, best first
+        """
+        return [s.agent for s in self.rank(candidates, count, costs)[:count]]
+
+    def reset(self) -> None:
+        """Forget circuit history and rate limiters."""
+        with self._lock:
+            self._circuits.clear()
+            self._rate_limiters.clear()
+
+    def _circuit(self, agent: str) -> ProviderCircuit:
+        circuit = self._circuits.get(agent)
+        if circuit is None:
+            circuit = self._circuits[agent] = ProviderCircuit()
+        return circuit
+
+    def _probing(self, circuit: ProviderCircuit) -> bool:
+        """Whether a half-open circuit's probe is in flight and not stale."""
+        return (
+            circuit.state == CIRCUIT_HALF_OPEN
+            and circuit.probe_started_at is not None
+            and time.monotonic() - circuit.probe_started_at < self.policy.cooldown_s
+        )
+
+    def _claim_probes(self, chosen: list[RouteScore]) -> bool:
+        """Mark chosen half-open circuits as probing (caller holds the lock).
+
+        Returns:
+            False, claiming nothing, if one was claimed since it was scored
+        """
+        probes = [
+            self._circuit(s.agent)
+            for s in chosen
+            if s.circuit == CIRCUIT_HALF_OPEN and not s.probing
+        ]
+        for circuit in probes:
+            if self._refresh(circuit) != CIRCUIT_HALF_OPEN or self._probing(circuit):
+                return False
+        now = time.monotonic()
+        for circuit in probes:
+            circuit.probe_started_at = now
+        return True
+
+    def _refresh(self, circuit: ProviderCircuit) -> str:
+        if (
+            circuit.state == CIRCUIT_OPEN
+            and time.monotonic() - circuit.opened_at >= self.policy.cooldown_s
+        ):
+            circuit.state = CIRCUIT_HALF_OPEN
+        return circuit.state
+
+    def _should_open(self, agent: str, circuit: ProviderCircuit) -> bool:
+        policy = self.policy
+        if circuit.consecutive_failures >= policy.failure_threshold:
+            return True
+        if (
+            len(circuit.outcomes) >= policy.min_samples
+            and circuit.error_rate > policy.max_error_rate
+        ):
+            return True
+        if policy.max_p95_ms is not None:
+            p95 = self.metrics.get_latency_percentile(
+                agent, 95, min_samples=policy.min_samples
+            )
+            if p95 is not None and p95 > policy.max_p95_ms:
+                return True
+        return False
+
+    @staticmethod
+    def _open(circuit: ProviderCircuit) -> None:
+        circuit.state = CIRCUIT_OPEN
+        circuit.opened_at = time.monotonic()
+        circuit.consecutive_failures = 0
+
+
+def candidate_costs(candidates: list[str], config: dict) -> dict[str, float]:
+    """Relative cost per call for each candidate.
+
+    Credit weights are used when every candidate has one, so billing and
+    routing agree; otherwise the summed cost_per_1k rates of each agent.
+
+    Args:
+        candidates: Agent names
+        config: Workflow config (reads `credit_weights` and `agents`)
+
+    Returns:
+        Cost by agent name
+    """
+    credit_weights = config.get("credit_weights", {})
+    credits = {}
+    for tier, cost in CREDIT_TIER_COSTS.items():
+        for name in credit_weights.get(tier, []) or []:
+            credits[name] = float(cost)
+    if candidates and all(name in credits for name in candidates):
+        return {name: credits[name] for name in candidates}
+
+    agent_configs = config.get("agents", {})
+    costs = {}
+    for name in candidates:
+        rates = agent_configs.get(name, {}).get("cost_per_1k", {})
+        costs[name] = float(rates.get("input", 0)) + float(rates.get("output", 0))
+    return costs
+
+
+# Global router instance; circuits are shared by all runs in the process
+model_router = ModelRouter()
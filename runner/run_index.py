@@ -0,0 +1,172 @@
+"""Append-only index of run manifests.
+
+Listing runs used to walk every directory under runs/ and parse each
+run_manifest.yaml. With tens of thousands of runs on a shared volume that
+scan dominated the runs page. Instead, WorkflowRunner appends each saved
+manifest to runs/run_index.jsonl (one JSON object per line, last line per
+run_id wins) and readers keep an in-memory copy that is refreshed from the
+last byte they read, so each lookup costs O(new runs).
+
+Runs created before the index existed are imported with backfill(), which
+`python -m runner.runner --reindex-runs` calls. An index file that doesn't
+exist yet is backfilled automatically on first read.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from typing import Optional
+
+import yaml
+
+from runner.logging.log_tail import read_page
+
+INDEX_FILE = "run_index.jsonl"
+MANIFEST_FILE = "run_manifest.yaml"
+
+
+class RunIndex:
+    """Run manifests for one runs directory, newest first."""
+
+    def __init__(self, runs_dir: str):
+        self.runs_dir = runs_dir
+        self.path = os.path.join(runs_dir, INDEX_FILE)
+        self._records: dict[str, dict] = {}
+        self._sorted: Optional[list[dict]] = None
+        self._cursor = 0
+        self._lock = threading.Lock()
+
+    def record(self, manifest: dict) -> None:
+        """Add or replace a run's manifest in the index.
+
+        Args:
+            manifest: Manifest dict (RunManifest.model_dump(mode="json"))
+        """
+        line = _encode(manifest)
+        with self._lock:
+            os.makedirs(self.runs_dir, exist_ok=True)
+            with open(self.path, "a") as f:
+                f.write(line)
+        # Pick up our own line (and anyone else's) through the normal path
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Load index lines written since the last refresh."""
+        if not os.path.exists(self.path):
+            if os.path.isdir(self.runs_dir):
+                self.backfill()
+            return
+
+        with self._lock:
+            if self._cursor > os.path.getsize(self.path):
+                # Index was rewritten; reload from scratch
+                self._records.clear()
+                self._cursor = 0
+            page = read_page(self.path, cursor=self._cursor)
+            self._cursor = page.cursor
+            for manifest in page.entries:
+                run_id = manifest.get("run_id")
+                if run_id:
+                    self._records[run_id] = manifest
+            if page.entries:
+                self._sorted = None
+
+    def get(self, run_id: str) -> Optional[dict]:
+        """Get the indexed manifest for a run."""
+        self.refresh()
+        with self._lock:
+            return self._records.get(run_id)
+
+    def list_runs(
+        self,
+        story: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        """List indexed runs, newest first.
+
+        Args:
+            story: Only runs for this story
+            status: Only runs with this status
+            limit: Maximum number of runs to return
+            offset: Number of matching runs to skip
+
+        Returns:
+            Manifest dicts
+        """
+        self.refresh()
+        with self._lock:
+            if self._sorted is None:
+                # ISO timestamps sort lexically
+                self._sorted = sorted(
+                    self._records.values(),
+                    key=lambda m: str(m.get("started_at") or ""),
+                    reverse=True,
+                )
+            runs = self._sorted
+
+        if story is not None or status is not None:
+            runs = [
+                m
+                for m in runs
+                if (story is None or m.get("story") == story)
+                and (status is None or m.get("status") == status)
+            ]
+        end = None if limit is None else offset + limit
+        return runs[offset:end]
+
+    def backfill(self) -> int:
+        """Import manifests of runs that are not in the index yet.
+
+        Returns:
+            Number of runs added
+        """
+        with self._lock:
+            os.makedirs(self.runs_dir, exist_ok=True)
+            # Create the file first so concurrent readers don't also backfill
+            open(self.path, "a").close()
+        self.refresh()
+
+        with self._lock:
+            known = set(self._records)
+
+        lines = []
+        with os.scandir(self.runs_dir) as entries:
+            for entry in entries:
+                if entry.name in known or not entry.is_dir():
+                    continue
+                manifest = _load_manifest(os.path.join(entry.path, MANIFEST_FILE))
+                if manifest:
+                    manifest.setdefault("run_id", entry.name)
+                    lines.append(_encode(manifest))
+
+        if lines:
+            with self._lock:
+                with open(self.path, "a") as f:
+                    f.writelines(lines)
+            self.refresh()
+        return len(lines)
+
+
+def _encode(manifest: dict) -> str:
+    """Serialize a manifest as one index line."""
+
+    def default(value):
+        # Older manifests were dumped with datetime objects
+        if isinstance(value, datetime):
+            return value.isoformat()
+        return str(value)
+
+    return json.dumps(manifest, default=default) + "\n"
+
+
+def _load_manifest(path: str) -> Optional[dict]:
+    """Read a run_manifest.yaml, or None if missing or unreadable."""
+    try:
+        with open(path) as f:
+            data = yaml.safe_load(f)
+    except (OSError, yaml.YAMLError):
+        return None
+    return data if isinstance(data, dict) else None
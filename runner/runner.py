@@ -9,10 +9,14 @@ import yaml
 from datetime import datetime
 from typing import Optional
 
-from runner.models import RunManifest
+from runner.checkpoint import load_checkpoint
+from runner.models import RunCheckpoint, RunManifest
+from runner.run_index import RunIndex
 from runner.state_machine import StateMachine
 from runner.logging import StateLogger, AgentLogger, SummaryGenerator
 from runner.logging.dev_logger import DevLogger
+from runner.logging.jsonl_sink import run_log_sink
+from runner.observability import shutdown_tracer
 from runner.content.ids import get_system_user_id
 from runner.content.workflow_store import WorkflowStore
 from runner.config import resolve_workflow_config, list_workflow_configs, DEV_MODE
@@ -26,6 +30,7 @@ class WorkflowRunner:
         self.working_dir = working_dir
         self.config = self._load_config()
         self.runs_dir = os.path.join(working_dir, "runs")
+        self.run_index = RunIndex(self.runs_dir)
 
         # Initialize database-backed workflow store (primary storage)
         self.db = WorkflowStore(get_system_user_id())
@@ -148,6 +153,7 @@ class WorkflowRunner:
         run_id: Optional[str] = None,
         approval_callback: Optional[callable] = None,
         log_callback: Optional[callable] = None,
+        checkpoint: Optional[RunCheckpoint] = None,
     ) -> dict:
         """Execute a workflow run.
 
@@ -160,10 +166,14 @@ class WorkflowRunner:
             run_id: Optional run ID (generated if not provided)
             approval_callback: Called when human approval is needed (API mode)
             log_callback: External callback for workflow events (API mode)
+            checkpoint: Continue the checkpointed run instead of starting a
+                new one (see resume())
 
         Returns:
             dict with run results
         """
+        if checkpoint:
+            run_id = checkpoint.run_id
         run_id = run_id or self._generate_run_id(story)
         run_dir = os.path.join(self.runs_dir, run_id)
         session_dir = os.path.join(self.working_dir, "sessions")
@@ -171,7 +181,8 @@ class WorkflowRunner:
         os.makedirs(run_dir, exist_ok=True)
         os.makedirs(session_dir, exist_ok=True)
 
-        self._resolve_story_input(story, input_path, interactive, run_dir)
+        if not checkpoint:
+            self._resolve_story_input(story, input_path, interactive, run_dir)
 
         state_logger = StateLogger(run_dir, run_id, db=self.db)
         agent_logger = AgentLogger(run_dir)
@@ -192,11 +203,23 @@ class WorkflowRunner:
         manifest = RunManifest(
             run_id=run_id,
             story=story,
-            started_at=datetime.utcnow(),
+            started_at=checkpoint.started_at if checkpoint else datetime.utcnow(),
             config_hash=self._get_config_hash(),
         )
 
-        state_logger.log_start(story, manifest.config_hash)
+        if checkpoint:
+            # Replace the finished manifest of the attempt being resumed, so
+            # lookups and log streams see the run as running again
+            self._save_manifest(run_dir, manifest)
+            state_logger.log(
+                {
+                    "event": "workflow_resume",
+                    "state": checkpoint.next_state,
+                    "config_hash": manifest.config_hash,
+                }
+            )
+        else:
+            state_logger.log_start(story, manifest.config_hash)
 
         # External callback passed from API
         external_log_callback = log_callback
@@ -252,12 +275,21 @@ class WorkflowRunner:
             approval_callback=approval_callback,
             database=self.db,  # Primary storage
             dev_logger=dev_logger,  # LLM message visibility (DEV_MODE only)
+            story=story,
         )
-        state_machine.initialize(run_id)
+        if checkpoint:
+            missing = state_machine.restore_checkpoint(checkpoint)
+            if missing:
+                raise ValueError(
+                    f"Cannot resume {run_id}: outputs missing: {', '.join(missing)}"
+                )
+            start_state = checkpoint.next_state
+        else:
+            state_machine.initialize(run_id)
 
         # Save initial story input to database
         story_input_path = os.path.join(run_dir, "input", "story_input.md")
-        if os.path.exists(story_input_path):
+        if not checkpoint and os.path.exists(story_input_path):
             with open(story_input_path) as f:
                 story_content = f.read()
             self.db.save_workflow_output(
@@ -268,44 +300,53 @@ class WorkflowRunner:
                 agent=None,
             )
 
-        error = None
-        if step:
-            state_config = self.config["states"].get(step)
-            if not state_config:
-                raise ValueError(f"Unknown state: {step}")
-            state_result = state_machine.execute_state(step, state_config)
-            final_state = state_result.transition
-        else:
-            run_result = state_machine.run(start_state)
-            final_state = run_result.get("final_state")
-            error = run_result.get("error")
-
-        manifest.completed_at = datetime.utcnow()
-        if final_state == "complete":
-            manifest.status = "complete"
-        elif final_state == "halt":
-            manifest.status = "halted"
-        else:
-            manifest.status = "failed"
-        manifest.final_state = final_state
-
-        if state_machine.token_tracker:
-            summary = state_machine.token_tracker.get_summary()
-            manifest.total_tokens = summary.total_tokens
-            manifest.total_cost_usd = summary.total_cost_usd
-
-        duration = (manifest.completed_at - manifest.started_at).total_seconds()
-        state_logger.log_complete(final_state, duration)
-
-        summary_generator.generate(
-            manifest,
-            token_summary=state_machine.token_tracker.get_summary()
-            if state_machine.token_tracker
-            else None,
-            state_logger=state_logger,
-        )
+        # Buffered log lines are written even if the run raises
+        try:
+            error = None
+            try:
+                if step:
+                    state_config = self.config["states"].get(step)
+                    if not state_config:
+                        raise ValueError(f"Unknown state: {step}")
+                    state_result = state_machine.execute_state(step, state_config)
+                    final_state = state_result.transition
+                else:
+                    run_result = state_machine.run(start_state)
+                    final_state = run_result.get("final_state")
+                    error = run_result.get("error")
+            finally:
+                state_machine.release_agents()
+                # Export the run's spans; the tracer outlives the run in the API
+                state_machine.tracer.flush()
+
+            manifest.completed_at = datetime.utcnow()
+            if final_state == "complete":
+                manifest.status = "complete"
+            elif final_state == "halt":
+                manifest.status = "halted"
+            else:
+                manifest.status = "failed"
+            manifest.final_state = final_state
+
+            if state_machine.token_tracker:
+                summary = state_machine.token_tracker.get_summary()
+                manifest.total_tokens = summary.total_tokens
+                manifest.total_cost_usd = summary.total_cost_usd
+
+            duration = (manifest.completed_at - manifest.started_at).total_seconds()
+            state_logger.log_complete(final_state, duration)
+
+            summary_generator.generate(
+                manifest,
+                token_summary=state_machine.token_tracker.get_summary()
+                if state_machine.token_tracker
+                else None,
+                state_logger=state_logger,
+            )
 
-        self._save_manifest(run_dir, manifest)
+            self._save_manifest(run_dir, manifest)
+        finally:
+            run_log_sink.close_dir(run_dir)
 
         return {
             "run_id": run_id,
@@ -317,29 +358,78 @@ class WorkflowRunner:
             "error": error,
         }
 
+    def resume(
+        self,
+        run_id: str,
+        approval_callback: Optional[callable] = None,
+        log_callback: Optional[callable] = None,
+    ) -> dict:
+        """Resume an interrupted run at the state after the last completed one.
+
+        Completed states are not run again: their outputs are read from the
+        run directory, and retry feedback, circuit breaker counters and
+        token totals are restored from the run's checkpoint.
+
+        Args:
+            run_id: Run to resume
+            approval_callback: Called when human approval is needed (API mode)
+            log_callback: External callback for workflow events (API mode)
+
+        Returns:
+            dict with run results, as from run()
+
+        Raises:
+            ValueError: If the run has no checkpoint or can't be resumed
+        """
+        checkpoint = self.get_checkpoint(run_id)
+        if checkpoint is None:
+            raise ValueError(f"No checkpoint for run {run_id}")
+        if checkpoint.next_state not in self.config["states"]:
+            raise ValueError(
+                f"Cannot resume {run_id}: state '{checkpoint.next_state}' "
+                "is not in the workflow config"
+            )
+        return self.run(
+            checkpoint.story or "",
+            run_id=run_id,
+            approval_callback=approval_callback,
+            log_callback=log_callback,
+            checkpoint=checkpoint,
+        )
+
+    def get_checkpoint(self, run_id: str) -> Optional[RunCheckpoint]:
+        """Get a run's checkpoint, or None if it finished or never started."""
+        return load_checkpoint(os.path.join(self.runs_dir, run_id))
+
     def _save_manifest(self, run_dir: str, manifest: RunManifest):
-        """Save run manifest to YAML (atomic write)."""
+        """Save run manifest to YAML (atomic write) and add it to the index."""
+        data = manifest.model_dump(mode="json")
         manifest_path = os.path.join(run_dir, "run_manifest.yaml")
         tmp_path = manifest_path + ".tmp"
         with open(tmp_path, "w") as f:
-            yaml.dump(manifest.model_dump(mode="json"), f, default_flow_style=False)
+            yaml.dump(data, f, default_flow_style=False)
         os.replace(tmp_path, manifest_path)
+        self.run_index.record(data)
 
-    def list_runs(self) -> list[dict]:
-        """List all runs."""
-        if not os.path.exists(self.runs_dir):
-            return []
-
-        runs = []
-        for run_id in sorted(os.listdir(self.runs_dir), reverse=True):
-            manifest_path = os.path.join(self.runs_dir, run_id, "run_manifest.yaml")
-            if os.path.exists(manifest_path):
-                with open(manifest_path) as f:
-                    runs.append(yaml.safe_load(f))
-        return runs
+    def list_runs(
+        self,
+        story: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> list[dict]:
+        """List runs from the manifest index, newest first."""
+        return self.run_index.list_runs(
+            story=story, status=status, limit=limit, offset=offset
+        )
 
     def get_run(self, run_id: str) -> Optional[dict]:
         """Get details for a specific run."""
+        manifest = self.run_index.get(run_id)
+        if manifest is not None:
+            return manifest
+
+        # Not indexed yet (e.g. index written before this run was backfilled)
         manifest_path = os.path.join(self.runs_dir, run_id, "run_manifest.yaml")
         if not os.path.exists(manifest_path):
             return None
@@ -376,11 +466,21 @@ def main():
         action="store_true",
         help="Prompt to paste content if story not found",
     )
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_ID",
+        help="Resume an interrupted run from its last checkpoint",
+    )
     parser.add_argument(
         "--list-runs",
         action="store_true",
         help="List all runs",
     )
+    parser.add_argument(
+        "--reindex-runs",
+        action="store_true",
+        help="Add runs missing from the run index (one-time backfill)",
+    )
     parser.add_argument(
         "--list-configs",
         action="store_true",
@@ -419,6 +519,11 @@ def main():
 
     runner = WorkflowRunner(config_path, args.working_dir)
 
+    if args.reindex_runs:
+        added = runner.run_index.backfill()
+        print(f"Indexed {added} run(s).")
+        return
+
     if args.list_runs:
         runs = runner.list_runs()
         if not runs:
@@ -434,16 +539,21 @@ def main():
                 )
         return
 
-    if not args.story:
-        parser.error("--story is required unless using --list-runs")
+    if not args.story and not args.resume:
+        parser.error(
+            "--story is required unless using --resume, --list-runs or --reindex-runs"
+        )
 
     try:
-        result = runner.run(
-            args.story,
-            input_path=args.input,
-            step=args.step,
-            interactive=args.interactive,
-        )
+        if args.resume:
+            result = runner.resume(args.resume)
+        else:
+            result = runner.run(
+                args.story,
+                input_path=args.input,
+                step=args.step,
+                interactive=args.interactive,
+            )
 
         print(f"\nRun complete: {result['run_id']}")
         print(f"Final state: {result['final_state']}")
@@ -458,6 +568,8 @@ def main():
     except Exception as e:
         print(f"Error: {e}", file=sys.stderr)
         sys.exit(1)
+    finally:
+        shutdown_tracer()
 
 
 if __name__ == "__main__":
@@ -1,24 +1,40 @@
 """File-based session management for Ollama.
 
 Ollama doesn't have native --resume support like Claude CLI.
-This module stores conversation history in JSON files to maintain
+This module stores conversation history in files to maintain
 context across multiple invocations.
+
+Sessions are append-only JSONL logs (<session_id>.jsonl): a header line
+followed by one line per message. Adding a message appends one line
+instead of rewriting the whole session, and the loaded session is cached
+in memory, so a turn costs O(1) I/O. The log is compacted (rewritten with
+only the messages kept by max_messages) once it holds more than
+COMPACT_FACTOR times that many lines.
+
+Sessions in the older single-JSON format (<session_id>.json) are converted
+to JSONL the first time they are loaded.
 """
 
 import json
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+COMPACT_FACTOR = 2  # compact when the log holds this many times max_messages
+
 
 class FileBasedSessionManager:
-    """Stores conversation history in JSON files for Ollama.
+    """Stores conversation history in JSONL files for Ollama.
 
-    Each session is stored as a separate JSON file containing:
+    Each session is stored as a separate file. The first line is a header:
     - session_id: Unique identifier
     - created_at: ISO timestamp of creation
-    - messages: List of {role, content, timestamp, tokens?}
-    - total_tokens: Cumulative token count
+    - trimmed_tokens: Tokens of messages dropped by compaction
+
+    Each following line is a message: {role, content, timestamp, tokens?}.
+    Sessions are returned as dicts with session_id, created_at, messages
+    and total_tokens (cumulative, including trimmed messages).
     """
 
     def __init__(self, session_dir: str, max_messages: int = 50):
@@ -33,6 +49,12 @@ class FileBasedSessionManager:
         self.max_messages = max_messages
         self.session_id: Optional[str] = None
 
+        # Cached state of the current session's log
+        self._session: Optional[dict] = None
+        self._inode: Optional[int] = None  # compaction replaces the file
+        self._offset = 0  # bytes of the log reflected in _session
+        self._log_lines = 0  # message lines in the log
+
     def create_session(self, session_id: str) -> dict:
         """Create a new session.
 
@@ -49,8 +71,8 @@ class FileBasedSessionManager:
             "messages": [],
             "total_tokens": 0,
         }
-        self._save_session(session)
-        return session
+        self._write_log(session, trimmed_tokens=0)
+        return _copy(session)
 
     def load_session(self, session_id: str) -> Optional[dict]:
         """Load an existing session.
@@ -61,17 +83,11 @@ class FileBasedSessionManager:
         Returns:
             Session dict if found, None otherwise
         """
-        path = self.session_dir / f"{session_id}.json"
-        if not path.exists():
-            return None
-
-        try:
-            with open(path) as f:
-                session = json.load(f)
-                self.session_id = session_id
-                return session
-        except (json.JSONDecodeError, IOError):
+        session = self._load(session_id)
+        if session is None:
             return None
+        self.session_id = session_id
+        return _copy(session)
 
     def has_session(self) -> bool:
         """Check if a session is currently loaded."""
@@ -102,9 +118,10 @@ class FileBasedSessionManager:
                 "No session loaded. Call create_session or load_session first."
             )
 
-        session = self.load_session(self.session_id)
+        session = self._load(self.session_id)
         if not session:
-            session = self.create_session(self.session_id)
+            self.create_session(self.session_id)
+            session = self._session
 
         message = {
             "role": role,
@@ -116,9 +133,13 @@ class FileBasedSessionManager:
             session["total_tokens"] += tokens.get("total", 0)
 
         session["messages"].append(message)
-        session = self._trim_if_needed(session)
-        self._save_session(session)
-        return session
+        self._trim_if_needed(session)
+
+        if self._log_lines + 1 > self.max_messages * COMPACT_FACTOR:
+            self._compact(session)
+        else:
+            self._append(message)
+        return _copy(session)
 
     def get_context_for_ollama(self) -> list[dict]:
         """Get messages formatted for Ollama chat API.
@@ -129,7 +150,7 @@ class FileBasedSessionManager:
         if not self.session_id:
             return []
 
-        session = self.load_session(self.session_id)
+        session = self._load(self.session_id)
         if not session:
             return []
 
@@ -142,7 +163,7 @@ class FileBasedSessionManager:
         if not self.session_id:
             return 0
 
-        session = self.load_session(self.session_id)
+        session = self._load(self.session_id)
         if not session:
             return 0
 
@@ -151,14 +172,20 @@ class FileBasedSessionManager:
     def clear_session(self) -> None:
         """Clear and delete the current session."""
         if self.session_id:
-            path = self.session_dir / f"{self.session_id}.json"
-            if path.exists():
-                path.unlink()
+            for path in (
+                self._log_path(self.session_id),
+                self._json_path(self.session_id),
+            ):
+                if path.exists():
+                    path.unlink()
         self.session_id = None
+        self._session = None
 
     def list_sessions(self) -> list[str]:
         """List all session IDs in the session directory."""
-        return [p.stem for p in self.session_dir.glob("*.json")]
+        ids = {p.stem for p in self.session_dir.glob("*.jsonl")}
+        ids.update(p.stem for p in self.session_dir.glob("*.json"))
+        return sorted(ids)
 
     def _trim_if_needed(self, session: dict) -> dict:
         """Keep session within max_messages limit.
@@ -183,15 +210,147 @@ class FileBasedSessionManager:
         session["messages"] = system_msgs + other_msgs[-keep_count:]
         return session
 
-    def _save_session(self, session: dict) -> None:
-        """Save session to disk.
+    def _log_path(self, session_id: str) -> Path:
+        return self.session_dir / f"{session_id}.jsonl"
+
+    def _json_path(self, session_id: str) -> Path:
+        """Path of a session in the older single-JSON format."""
+        return self.session_dir / f"{session_id}.json"
+
+    def _load(self, session_id: str) -> Optional[dict]:
+        """Get the cached session, reading only what changed on disk.
+
+        Returns:
+            The cached session dict (not a copy), or None if not found
+        """
+        path = self._log_path(session_id)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            self._session = None
+            return self._import_json(session_id)
+
+        cached = self._session
+        if (
+            cached is None
+            or cached["session_id"] != session_id
+            or stat.st_ino != self._inode
+            or stat.st_size < self._offset
+        ):
+            # Not cached, or rewritten by another manager: full read
+            return self._read_log(session_id, path)
+        if stat.st_size > self._offset:
+            # Appended by another manager: read the new lines only
+            self._read_lines(path, cached)
+        return cached
+
+    def _read_log(self, session_id: str, path: Path) -> Optional[dict]:
+        """Read a session log from the start into the cache."""
+        try:
+            with open(path, "rb") as f:
+                inode = os.fstat(f.fileno()).st_ino
+                header = json.loads(f.readline())
+                offset = f.tell()
+        except (OSError, ValueError):
+            self._session = None
+            return None
+        if not isinstance(header, dict):
+            self._session = None
+            return None
+
+        self._session = {
+            "session_id": header.get("session_id", session_id),
+            "created_at": header.get("created_at"),
+            "messages": [],
+            "total_tokens": header.get("trimmed_tokens", 0),
+        }
+        self._inode = inode
+        self._offset = offset
+        self._log_lines = 0
+        self._read_lines(path, self._session)
+        return self._session
+
+    def _read_lines(self, path: Path, session: dict) -> None:
+        """Apply message lines after the cached offset to the session."""
+        with open(path, "rb") as f:
+            f.seek(self._offset)
+            for line in f:
+                if not line.endswith(b"\n"):
+                    break  # write in progress; pick it up next time
+                self._offset += len(line)
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                self._log_lines += 1
+                session["messages"].append(message)
+                session["total_tokens"] += (message.get("tokens") or {}).get("total", 0)
+                if len(session["messages"]) > self.max_messages * COMPACT_FACTOR:
+                    self._trim_if_needed(session)
+        self._trim_if_needed(session)
+
+    def _import_json(self, session_id: str) -> Optional[dict]:
+        """Convert a session in the older JSON format to a JSONL log."""
+        path = self._json_path(session_id)
+        if not path.exists():
+            return None
+        try:
+            with open(path) as f:
+                session = json.load(f)
+        except (json.JSONDecodeError, IOError):
+            return None
+
+        message_tokens = sum(
+            (m.get("tokens") or {}).get("total", 0) for m in session["messages"]
+        )
+        self._write_log(
+            session,
+            trimmed_tokens=session.get("total_tokens", 0) - message_tokens,
+        )
+        path.unlink()
+        return self._session
+
+    def _append(self, message: dict) -> None:
+        """Append one message line to the current session's log."""
+        line = (json.dumps(message) + "\n").encode("utf-8")
+        with open(self._log_path(self.session_id), "ab") as f:
+            f.write(line)
+        self._offset += len(line)
+        self._log_lines += 1
+
+    def _compact(self, session: dict) -> None:
+        """Rewrite the log with only the messages kept in the session."""
+        kept_tokens = sum(
+            (m.get("tokens") or {}).get("total", 0) for m in session["messages"]
+        )
+        self._write_log(session, trimmed_tokens=session["total_tokens"] - kept_tokens)
+
+    def _write_log(self, session: dict, trimmed_tokens: int) -> None:
+        """Atomically write a full session log and cache it.
 
         Args:
             session: Session dict to save
+            trimmed_tokens: Tokens of messages not in session["messages"]
         """
-        path = self.session_dir / f"{session['session_id']}.json"
-        with open(path, "w") as f:
-            json.dump(session, f, indent=2)
+        header = {
+            "session_id": session["session_id"],
+            "created_at": session.get("created_at"),
+            "trimmed_tokens": trimmed_tokens,
+        }
+        lines = [json.dumps(header) + "\n"]
+        lines.extend(json.dumps(m) + "\n" for m in session["messages"])
+        data = "".join(lines).encode("utf-8")
+
+        path = self._log_path(session["session_id"])
+        tmp_path = path.with_suffix(".jsonl.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        self._session = session
+        self._inode = path.stat().st_ino
+        self._offset = len(data)
+        self._log_lines = len(session["messages"])
 
     def add_system_message(self, content: str) -> dict:
         """Add a system message to the current session.
@@ -205,3 +364,8 @@ class FileBasedSessionManager:
             Updated session dict
         """
         return self.add_message("system", content)
+
+
+def _copy(session: dict) -> dict:
+    """Copy a session so callers can't modify the cached one."""
+    return {**session, "messages": list(session["messages"])}
@@ -4,18 +4,52 @@ import os
 import time
 import threading
 from copy import deepcopy
+from datetime import datetime
 from typing import Optional, Callable
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 
 from runner.models import (
     TokenUsage,
+    AgentResult,
     FanOutResult,
     StateResult,
     AuditResult,
+    RunCheckpoint,
 )
-from runner.agents import create_agent, BaseAgent
+from runner.agents import agent_pool, BaseAgent
+from runner.agents.api_base import split_cacheable_prefix
 from runner.metrics import TokenTracker
+from runner.prompt_fit import PromptSection, fit_prompt
+from runner.checkpoint import clear_checkpoint, save_checkpoint
 from runner.circuit_breaker import CircuitBreaker
+from runner.observability.tracer import (
+    SPAN_KIND_AGENT,
+    SPAN_KIND_RUN,
+    SPAN_KIND_STATE,
+    AgentTracer,
+    Span,
+    get_tracer,
+)
+from runner.resilience.rate_limit import RateLimiter
+from runner.routing import ModelRouter, candidate_costs, model_router
+from runner.response_cache import (
+    response_cache,
+    build_entry,
+    cache_ttl_for_state,
+    generation_params_for_agent,
+    make_cache_key,
+    model_id_for_agent,
+)
+
+# Output types whose agent responses are parsed as AuditResult
+AUDIT_OUTPUT_TYPES = ("audit", "review", "final_audit")
+
+# Fan-out quorum policies (state `quorum.policy` in the workflow YAML)
+QUORUM_POLICIES = ("all", "first_reject_wins", "k_of_n")
+
+# Seconds to wait for cancelled fan-out agents to return (settings
+# `cancel_grace_s`), so the tokens and cost they spend are still counted
+CANCEL_GRACE_S = 10.0
 
 
 class StateMachine:
@@ -32,6 +66,9 @@ class StateMachine:
         approval_callback: Optional[Callable[[dict], None]] = None,
         database=None,  # Database for primary storage
         dev_logger=None,  # Dev logger for LLM message visibility
+        story: Optional[str] = None,  # Recorded in checkpoints for resume
+        router: Optional[ModelRouter] = None,  # For `routing: adaptive` states
+        tracer: Optional[AgentTracer] = None,  # run -> state -> agent spans
     ):
         self.config = config
         self.states = config.get("states", {})
@@ -43,11 +80,19 @@ class StateMachine:
         self.approval_callback = approval_callback
         self.db = database  # Primary storage
         self.dev_logger = dev_logger  # Dev logger for LLM visibility
+        self.story = story
 
         self.agents = agents or {}
         self._agent_configs = config.get("agents", {})
+        self._pooled_agents: list[BaseAgent] = []
+        # Invocations still running per agent name (fan-out threads)
+        self._in_flight: dict[str, int] = {}
+        self._in_flight_lock = threading.Lock()
 
         self.circuit_breaker = CircuitBreaker(config)
+        self.router = router or model_router
+        self.tracer = tracer or get_tracer()
+        self._state_span: Optional[Span] = None  # parent of fan-out agent spans
         self.token_tracker: Optional[TokenTracker] = None
         self.retry_feedback: dict[str, str] = {}
         self.current_state: Optional[str] = None
@@ -55,6 +100,9 @@ class StateMachine:
             None  # Track last audit score for circuit breaker decisions
         )
         self.run_id: Optional[str] = None
+        self.started_at: Optional[datetime] = None
+        # Latest output file per completed state and agent (for checkpoints)
+        self.completed_outputs: dict[str, dict[str, str]] = {}
 
         # Approval flow state (for API-driven approval)
         self._approval_event = threading.Event()
@@ -73,9 +121,11 @@ class StateMachine:
     def initialize(self, run_id: str):
         """Initialize for a new run."""
         self.run_id = run_id
+        self.started_at = datetime.utcnow()
         self.token_tracker = TokenTracker(run_id)
         self.circuit_breaker.reset()
         self.retry_feedback.clear()
+        self.completed_outputs = {}
         # Reset approval state
         self._approval_event.clear()
         self._approval_response = None
@@ -86,6 +136,63 @@ class StateMachine:
         # Reset abort state
         self._aborted = False
 
+    def checkpoint(self) -> RunCheckpoint:
+        """Get the resumable state of the run, before current_state runs."""
+        return RunCheckpoint(
+            run_id=self.run_id,
+            story=self.story,
+            started_at=self.started_at or datetime.utcnow(),
+            saved_at=datetime.utcnow(),
+            next_state=self.current_state,
+            retry_feedback=dict(self.retry_feedback),
+            last_audit_score=self.last_audit_score,
+            circuit_breaker=self.circuit_breaker.get_context(),
+            tokens=self.token_tracker.snapshot() if self.token_tracker else {},
+            outputs={
+                state: dict(paths) for state, paths in self.completed_outputs.items()
+            },
+        )
+
+    def restore_checkpoint(self, checkpoint: RunCheckpoint) -> list[str]:
+        """Initialize from a checkpoint so run(checkpoint.next_state) resumes.
+
+        Returns:
+            Output files of completed states that no longer exist
+        """
+        self.initialize(checkpoint.run_id)
+        self.started_at = checkpoint.started_at
+        if self.story is None:
+            self.story = checkpoint.story
+        self.current_state = checkpoint.next_state
+        self.retry_feedback.update(checkpoint.retry_feedback)
+        self.last_audit_score = checkpoint.last_audit_score
+        self.circuit_breaker.restore(checkpoint.circuit_breaker)
+        self.token_tracker.restore(checkpoint.tokens)
+        self.completed_outputs = {
+            state: dict(paths) for state, paths in checkpoint.outputs.items()
+        }
+        return [
+            path
+            for paths in self.completed_outputs.values()
+            for path in paths.values()
+            if not os.path.exists(path)
+        ]
+
+    def save_checkpoint(self) -> None:
+        """Persist the checkpoint to run_dir. A failed write doesn't stop the run."""
+        if not self.run_dir or not self.run_id:
+            return
+        try:
+            save_checkpoint(self.run_dir, self.checkpoint())
+        except OSError as e:
+            self.log_callback(
+                {
+                    "event": "checkpoint_error",
+                    "state": self.current_state,
+                    "error": str(e),
+                }
+            )
+
     def pause(self) -> bool:
         """Pause execution at the next state checkpoint.
 
@@ -163,12 +270,48 @@ class StateMachine:
             return self.agents[name]
 
         agent_config = self._agent_configs.get(name, {})
-        agent = create_agent(name, agent_config, self.session_dir)
+        agent = agent_pool.acquire(name, agent_config, self.session_dir)
+        self._pooled_agents.append(agent)
         self.agents[name] = agent
         return agent
 
+    def release_agents(self) -> None:
+        """Return agents checked out by get_agent() to the shared pool.
+
+        Agents passed in by the caller are left alone. Agents a cancelled
+        fan-out thread is still invoking are discarded rather than
+        released, so no other run can check them out while in use.
+        """
+        with self._in_flight_lock:
+            busy = {
+                id(self.agents[name])
+                for name, count in self._in_flight.items()
+                if count and name in self.agents
+            }
+        for agent in self._pooled_agents:
+            for name, held in list(self.agents.items()):
+                if held is agent:
+                    del self.agents[name]
+            if id(agent) in busy:
+                agent_pool.discard(agent)
+            else:
+                agent_pool.release(agent)
+        self._pooled_agents = []
+
     def run(self, start_state: str = "start") -> dict:
         """Run the workflow from start to completion."""
+        with self.tracer.trace_span(
+            SPAN_KIND_RUN, f"run {self.run_id}", run_id=self.run_id, story=self.story
+        ) as span:
+            result = self._run_states(start_state)
+            span.metadata["final_state"] = result.get("final_state")
+            if result.get("error"):
+                span.status = "error"
+                span.error_message = result["error"]
+        return result
+
+    def _run_states(self, start_state: str) -> dict:
+        """Run states from start_state until a terminal state or a stop."""
         self.current_state = start_state
         final_state = None
         error = None
@@ -242,6 +385,8 @@ class StateMachine:
 
             if state_type == "terminal":
                 final_state = self.current_state
+                if self.run_dir and not state_config.get("error"):
+                    clear_checkpoint(self.run_dir)
                 break
 
             try:
@@ -258,6 +403,9 @@ class StateMachine:
                 final_state = "halt"
                 break
 
+            if self.token_tracker:
+                self.token_tracker.merge()
+            self._record_outputs(result)
             next_state = self._get_next_state(state_config, result)
 
             if next_state is None:
@@ -412,6 +560,8 @@ class StateMachine:
                 }
             )
             self.current_state = next_state
+            if self.states.get(next_state, {}).get("type") != "terminal":
+                self.save_checkpoint()
 
         return {
             "final_state": final_state,
@@ -421,6 +571,16 @@ class StateMachine:
             else None,
         }
 
+    def _record_outputs(self, result: StateResult) -> None:
+        """Remember the output files a completed state wrote."""
+        paths = {
+            agent: out.output_path
+            for agent, out in result.outputs.items()
+            if out.status == "success" and out.output_path
+        }
+        if paths:
+            self.completed_outputs[result.state_name] = paths
+
     def execute_state(self, state_name: str, state_config: dict) -> StateResult:
         """Execute a single state."""
         state = deepcopy(state_config)
@@ -450,18 +610,26 @@ class StateMachine:
 
         start_time = time.time()
 
-        if state_type == "initial":
-            result = self._execute_initial(state)
-        elif state_type == "fan-out":
-            result = self._execute_fanout(state_name, state)
-        elif state_type == "single":
-            result = self._execute_single(state_name, state)
-        elif state_type == "orchestrator-task":
-            result = self._execute_orchestrator_task(state_name, state)
-        elif state_type == "human-approval":
-            result = self._execute_human_approval(state)
-        else:
-            raise ValueError(f"Unknown state type: {state_type}")
+        with self.tracer.trace_span(
+            SPAN_KIND_STATE, state_name, state_type=state_type
+        ) as span:
+            self._state_span = span
+            try:
+                if state_type == "initial":
+                    result = self._execute_initial(state)
+                elif state_type == "fan-out":
+                    result = self._execute_fanout(state_name, state)
+                elif state_type == "single":
+                    result = self._execute_single(state_name, state)
+                elif state_type == "orchestrator-task":
+                    result = self._execute_orchestrator_task(state_name, state)
+                elif state_type == "human-approval":
+                    result = self._execute_human_approval(state)
+                else:
+                    raise ValueError(f"Unknown state type: {state_type}")
+            finally:
+                self._state_span = None
+            span.metadata["transition"] = result.transition
 
         result.duration_s = time.time() - start_time
 
@@ -499,7 +667,7 @@ class StateMachine:
 
     def _execute_fanout(self, state_name: str, state: dict) -> StateResult:
         """Execute fan-out state with parallel agents."""
-        agent_names = state.get("agents", [])
+        agent_names = self._route_agents(state_name, state, state.get("agents", []))
         input_path = state.get("input", "")
         output_template = state.get("output", "output/{agent}.md")
         timeout = self.settings.get("timeout_per_agent", 300)
@@ -533,7 +701,12 @@ class StateMachine:
             persona_slug = personas_map.get(agent_name, shared_persona)
             persona_content = self._load_persona(persona_slug)
             agent_prompts[agent_name] = self._build_prompt(
-                persona_content, input_files, context, input_specs=input_specs
+                persona_content,
+                input_files,
+                context,
+                input_specs=input_specs,
+                agent_name=agent_name,
+                state_name=state_name,
             )
 
         outputs: dict[str, FanOutResult] = {}
@@ -542,9 +715,35 @@ class StateMachine:
 
         parallel = self.settings.get("parallel_fanout", True)
 
+        # Audit fan-outs may stop early once the outcome is decided
+        output_type = state.get("output_type", "")
+        quorum = state.get("quorum") if output_type in AUDIT_OUTPUT_TYPES else None
+        if quorum and quorum.get("policy", "all") not in QUORUM_POLICIES:
+            raise ValueError(
+                f"Unknown quorum policy '{quorum.get('policy')}' in state "
+                f"'{state_name}'. Expected one of {QUORUM_POLICIES}"
+            )
+        decisions: list[str] = []
+
+        def collect(agent_name: str, result: FanOutResult) -> bool:
+            """Record a result; return True once the quorum is reached."""
+            outputs[agent_name] = result
+            if result.tokens:
+                total_tokens.input_tokens += result.tokens.input_tokens
+                total_tokens.output_tokens += result.tokens.output_tokens
+            if not quorum or result.status != "success":
+                return False
+            audit = self._parse_audit_result(result)
+            if audit:
+                decisions.append(audit.decision)
+            return self._quorum_reached(quorum, decisions)
+
         if parallel and len(agent_names) > 1:
-            with ThreadPoolExecutor(max_workers=len(agent_names)) as executor:
-                futures = {}
+            self._warm_prompt_caches(state_name, agent_prompts)
+            cancel_event = threading.Event()
+            executor = ThreadPoolExecutor(max_workers=len(agent_names))
+            futures = {}
+            try:
                 for agent_name in agent_names:
                     output_path = self._resolve_output_path(
                         output_template, agent=agent_name
@@ -555,6 +754,7 @@ class StateMachine:
                         agent_prompts[agent_name],
                         output_path,
                         state_name,
+                        cancel_event,
                     )
                     futures[future] = agent_name
 
@@ -563,12 +763,23 @@ class StateMachine:
                         agent_name = futures[future]
                         try:
                             result = future.result(timeout=timeout)
-                            outputs[agent_name] = result
-                            if result.tokens:
-                                total_tokens.input_tokens += result.tokens.input_tokens
-                                total_tokens.output_tokens += (
-                                    result.tokens.output_tokens
+                            if collect(agent_name, result):
+                                self.log_callback(
+                                    {
+                                        "type": "quorum_reached",
+                                        "state": state_name,
+                                        "policy": quorum.get("policy"),
+                                        "decisions": list(decisions),
+                                    }
+                                )
+                                self._cancel_pending(
+                                    futures,
+                                    outputs,
+                                    cancel_event,
+                                    status="cancelled",
+                                    error="Cancelled: audit quorum reached",
                                 )
+                                break
                         except TimeoutError:
                             outputs[agent_name] = FanOutResult(
                                 agent=agent_name,
@@ -577,19 +788,20 @@ class StateMachine:
                                 duration_s=timeout,
                             )
                 except TimeoutError:
-                    for future, agent_name in futures.items():
-                        if agent_name not in outputs:
-                            future.cancel()
-                            # Kill the actual subprocess (future.cancel doesn't stop running tasks)
-                            agent = self.agents.get(agent_name)
-                            if agent and hasattr(agent, "kill"):
-                                agent.kill()
-                            outputs[agent_name] = FanOutResult(
-                                agent=agent_name,
-                                status="failed",
-                                error=f"Agent timed out after {timeout}s",
-                                duration_s=timeout,
-                            )
+                    self._cancel_pending(
+                        futures,
+                        outputs,
+                        cancel_event,
+                        status="failed",
+                        error=f"Agent timed out after {timeout}s",
+                        duration_s=timeout,
+                    )
+            finally:
+                if cancel_event.is_set():
+                    self._await_cancelled(futures, state_name)
+                # Agents still running after the grace period finish in the
+                # background and discard their output
+                executor.shutdown(wait=not cancel_event.is_set(), cancel_futures=True)
         else:
             for agent_name in agent_names:
                 output_path = self._resolve_output_path(
@@ -598,17 +810,14 @@ class StateMachine:
                 result = self._invoke_agent(
                     agent_name, agent_prompts[agent_name], output_path, state_name
                 )
-                outputs[agent_name] = result
-                if result.tokens:
-                    total_tokens.input_tokens += result.tokens.input_tokens
-                    total_tokens.output_tokens += result.tokens.output_tokens
+                if collect(agent_name, result):
+                    break
 
         success_count = sum(1 for r in outputs.values() if r.status == "success")
         total_count = len(agent_names)
 
         # For audit-type fan-outs, parse and aggregate audit results
-        output_type = state.get("output_type", "")
-        if output_type in ("audit", "review", "final_audit") and success_count > 0:
+        if output_type in AUDIT_OUTPUT_TYPES and success_count > 0:
             audit_results = []
             for name, fan_result in outputs.items():
                 if fan_result.status == "success":
@@ -645,14 +854,22 @@ class StateMachine:
 
     def _execute_single(self, state_name: str, state: dict) -> StateResult:
         """Execute single agent state (quality gates)."""
-        agent_name = state.get("agent", "claude")
+        agent_name = self._route_agents(
+            state_name, state, [state.get("agent", "claude")], count=1
+        )[0]
         input_path = state.get("input", "")
         output_template = state.get("output", f"output/{state_name}.md")
         context = state.get("context", "")
 
         input_files = self._resolve_input_files(input_path)
         persona_content = self._load_persona(state.get("persona", ""))
-        prompt = self._build_prompt(persona_content, input_files, context)
+        prompt = self._build_prompt(
+            persona_content,
+            input_files,
+            context,
+            agent_name=agent_name,
+            state_name=state_name,
+        )
 
         output_path = self._resolve_output_path(output_template)
         result = self._invoke_agent(agent_name, prompt, output_path, state_name)
@@ -660,7 +877,7 @@ class StateMachine:
         if result.status == "success":
             # Only parse as audit result for audit/review output types
             output_type = state.get("output_type", "")
-            if output_type in ("audit", "review", "final_audit"):
+            if output_type in AUDIT_OUTPUT_TYPES:
                 audit = self._parse_audit_result(result)
                 if audit:
                     if audit.decision == "retry":
@@ -841,6 +1058,7 @@ Please make ONLY the requested changes. Do not rewrite the entire post. Keep eve
         fan_out_result = FanOutResult(
             agent=agent_name,
             status="success" if result.success else "failed",
+            output_path=output_path if result.success and output_path else None,
             content=result.content,
             tokens=result.tokens,
             duration_s=duration,
@@ -1009,11 +1227,188 @@ Please make ONLY the requested changes. Do not rewrite the entire post. Keep eve
         state_config = self.states.get(state, {})
         return state_config.get("output_type", state)
 
+    def _quorum_reached(self, quorum: dict, decisions: list[str]) -> bool:
+        """Check whether collected audit decisions already settle the outcome.
+
+        Aggregation is strictest-wins, so a halt always settles it. Policies
+        decide when enough retries have been seen:
+            all: never short-circuit on retry (default)
+            first_reject_wins: the first retry settles it
+            k_of_n: `k` retries settle it
+
+        Args:
+            quorum: State `quorum` config ({"policy": ..., "k": ...})
+            decisions: Decisions parsed so far, in completion order
+
+        Returns:
+            True if outstanding auditors can be cancelled
+        """
+        policy = quorum.get("policy", "all")
+        if "halt" in decisions:
+            return True
+        if policy == "first_reject_wins":
+            return "retry" in decisions
+        if policy == "k_of_n":
+            return decisions.count("retry") >= quorum.get("k", 1)
+        return False
+
+    def _cancel_pending(
+        self,
+        futures: dict,
+        outputs: dict[str, FanOutResult],
+        cancel_event: threading.Event,
+        status: str,
+        error: str,
+        duration_s: float = 0.0,
+    ) -> None:
+        """Cancel fan-out agents that have not produced a result yet."""
+        cancel_event.set()
+        for future, agent_name in futures.items():
+            if agent_name not in outputs:
+                future.cancel()
+                # Kill the actual subprocess (future.cancel doesn't stop running tasks)
+                agent = self.agents.get(agent_name)
+                if agent and hasattr(agent, "kill"):
+                    agent.kill()
+                outputs[agent_name] = FanOutResult(
+                    agent=agent_name,
+                    status=status,
+                    error=error,
+                    duration_s=duration_s,
+                )
+
+    def _await_cancelled(self, futures: dict, state: str) -> None:
+        """Give cancelled fan-out agents a bounded time to return.
+
+        Agents without kill() (API agents) finish their call anyway; their
+        tokens and cost are recorded when they return (_discard_cancelled),
+        so waiting keeps that spend in the run totals. Agents still running
+        after `cancel_grace_s` are abandoned: release_agents() discards
+        them, and anything they spend after the run ends is not counted.
+        """
+        grace = self.settings.get("cancel_grace_s", CANCEL_GRACE_S)
+        running = [future for future in futures if not future.done()]
+        if not running:
+            return
+        _, still_running = wait(running, timeout=max(grace, 0))
+        if still_running:
+            self.log_callback(
+                {
+                    "type": "cancelled_agents_abandoned",
+                    "state": state,
+                    "agents": sorted(futures[f] for f in still_running),
+                    "grace_s": grace,
+                }
+            )
+
+    def _warm_prompt_caches(self, state: str, agent_prompts: dict[str, str]) -> None:
+        """Warm provider prompt caches before a parallel fan-out.
+
+        Agents on the same model whose prompts share a cacheable prefix
+        (same persona) would each pay full prefill when started together.
+        One warm-up write per group lets the rest read the cached prefix.
+        """
+        groups: dict[tuple, list[str]] = {}
+        for agent_name, prompt in agent_prompts.items():
+            try:
+                agent = self.get_agent(agent_name)
+            except Exception:
+                continue
+            if not hasattr(agent, "warm_prompt_cache"):
+                continue
+            prefix, _ = split_cacheable_prefix(prompt)
+            if prefix:
+                key = (
+                    type(agent),
+                    getattr(agent, "model_id", None),
+                    getattr(agent, "system_prompt", None),
+                    prefix,
+                )
+                groups.setdefault(key, []).append(agent_name)
+
+        for names in groups.values():
+            if len(names) < 2:
+                continue
+            agent_name = names[0]
+            agent = self.agents[agent_name]
+            tokens = agent.warm_prompt_cache(agent_prompts[agent_name])
+            if not tokens:
+                continue
+
+            cost = agent.calculate_cost(tokens)
+            if self.token_tracker:
+                self.token_tracker.record(
+                    agent=agent_name,
+                    state=state,
+                    tokens=tokens,
+                    cost=cost,
+                    context_window=agent.context_window,
+                )
+            if cost:
+                self.circuit_breaker.update_cost(cost)
+
     def _invoke_agent(
-        self, agent_name: str, prompt: str, output_path: str, state: str
+        self,
+        agent_name: str,
+        prompt: str,
+        output_path: str,
+        state: str,
+        cancel_event: Optional[threading.Event] = None,
+    ) -> FanOutResult:
+        """Invoke an agent inside an agent span (a child of the state span).
+
+        Fan-out workers run in their own threads, so the state span is
+        passed as the parent explicitly; provider HTTP spans nest under
+        the agent span.
+        """
+        with self._in_flight_lock:
+            self._in_flight[agent_name] = self._in_flight.get(agent_name, 0) + 1
+        try:
+            with self.tracer.trace_call(
+                agent_name,
+                prompt,
+                parent=self._state_span,
+                kind=SPAN_KIND_AGENT,
+                name=f"{state} {agent_name}",
+                state=state,
+            ) as span:
+                result = self._call_agent(
+                    agent_name, prompt, output_path, state, cancel_event
+                )
+                self._finish_agent_span(span, result)
+        finally:
+            with self._in_flight_lock:
+                self._in_flight[agent_name] -= 1
+        return result
+
+    @staticmethod
+    def _finish_agent_span(span: Span, result: FanOutResult) -> None:
+        """Copy an agent result's usage and status onto its span."""
+        if result.tokens:
+            span.set_tokens(result.tokens.input_tokens, result.tokens.output_tokens)
+        span.cost = result.cost_usd or span.cost
+        span.metadata["result"] = result.status
+        if result.status == "failed":
+            span.status = "error"
+            span.error_message = result.error
+
+    def _call_agent(
+        self,
+        agent_name: str,
+        prompt: str,
+        output_path: str,
+        state: str,
+        cancel_event: Optional[threading.Event] = None,
     ) -> FanOutResult:
-        """Invoke an agent and save output to database (primary) and file (secondary)."""
+        """Invoke an agent and save output to database (primary) and file (secondary).
+
+        States with a `cache:` setting replay a stored response for an
+        identical prompt instead of calling the provider. If cancel_event is
+        set by the time the agent returns, its tokens are still recorded but
+        the output is discarded.
+        """
         start_time = time.time()
+        invoked_at: Optional[float] = None
 
         if self.agent_logger:
             self.agent_logger.log_invoke(
@@ -1025,17 +1420,127 @@ Please make ONLY the requested changes. Do not rewrite the entire post. Keep eve
         try:
             agent = self.get_agent(agent_name)
 
-            # Set dev logger for LLM visibility (if enabled)
-            if self.dev_logger and self.run_id:
-                agent.set_dev_logger(self.dev_logger, self.run_id, state)
+            # Don't pay for an upload the provider would reject
+            estimate = (
+                self.token_tracker.get_estimate(agent_name, state)
+                if self.token_tracker
+                else None
+            )
+            if estimate is not None and not estimate.fits:
+                error = (
+                    f"Prompt needs ~{estimate.estimated_tokens} tokens but "
+                    f"{agent_name} allows {estimate.budget}; not sent"
+                )
+                self.log_callback(
+                    {
+                        "type": "prompt_over_budget",
+                        "state": state,
+                        "agent": agent_name,
+                        "estimated_tokens": estimate.estimated_tokens,
+                        "budget": estimate.budget,
+                    }
+                )
+                return FanOutResult(
+                    agent=agent_name,
+                    status="failed",
+                    error=error,
+                    duration_s=time.time() - start_time,
+                )
+
+            cache_ttl = cache_ttl_for_state(self.states.get(state, {}))
+            cache_key = None
+            cached = None
+            if cache_ttl:
+                model_id = model_id_for_agent(agent)
+                cache_key = make_cache_key(
+                    model_id, prompt, generation_params_for_agent(agent)
+                )
+                cached = response_cache.get(cache_key, backend=self.db)
+                # Entries cached before output validation may not parse;
+                # ask the provider again and overwrite them
+                if cached and not self._cacheable_output(state, cached.content):
+                    cached = None
+
+            # Parallel agents may have spent the budget since the last
+            # transition; don't start another paid call past the hard limit
+            if not cached and self.circuit_breaker.hard_cost_limit_reached():
+                total_cost = self.circuit_breaker.total_cost
+                self.log_callback(
+                    {
+                        "type": "cost_limit_reached",
+                        "state": state,
+                        "agent": agent_name,
+                        "rule": "hard_cost_limit",
+                        "total_cost_usd": total_cost,
+                    }
+                )
+                return FanOutResult(
+                    agent=agent_name,
+                    status="failed",
+                    error=f"Cost limit reached (${total_cost:.2f}); not sent",
+                    duration_s=time.time() - start_time,
+                )
+
+            if cached:
+                result = AgentResult(
+                    success=True,
+                    content=cached.content,
+                    tokens=TokenUsage(input_tokens=0, output_tokens=0),
+                    cost_usd=0.0,
+                )
+                self.log_callback(
+                    {
+                        "type": "cache_hit",
+                        "state": state,
+                        "agent": agent_name,
+                        "model": cached.model,
+                    }
+                )
+            else:
+                # Set dev logger for LLM visibility (if enabled)
+                if self.dev_logger and self.run_id:
+                    agent.set_dev_logger(self.dev_logger, self.run_id, state)
+
+                invoked_at = time.time()
+                result = agent.invoke(prompt)
+                # A call cut short by a fan-out cancel (CLI agents are
+                # killed) says nothing about the provider; only completed
+                # calls feed the router
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                if result.success or not cancelled:
+                    self._record_route(
+                        agent_name, invoked_at, result.success, result.tokens
+                    )
+                invoked_at = None
 
-            result = agent.invoke(prompt)
+                # Clear dev logger after invocation
+                if self.dev_logger:
+                    agent.clear_dev_logger()
 
-            # Clear dev logger after invocation
-            if self.dev_logger:
-                agent.clear_dev_logger()
+                if (
+                    cache_key
+                    and result.success
+                    and self._cacheable_output(state, result.content)
+                ):
+                    response_cache.put(
+                        cache_key,
+                        build_entry(
+                            model_id,
+                            result.content,
+                            result.tokens,
+                            result.cost_usd or 0.0,
+                            cache_ttl,
+                        ),
+                        backend=self.db,
+                        state_name=state,
+                    )
             duration = time.time() - start_time
 
+            if cancel_event is not None and cancel_event.is_set():
+                return self._discard_cancelled(
+                    agent_name, state, agent, result, duration
+                )
+
             if result.success:
                 # Determine output type from state name
                 output_type = self._state_to_output_type(state)
@@ -1088,6 +1593,7 @@ Please make ONLY the requested changes. Do not rewrite the entire post. Keep eve
                         tokens=result.tokens,
                         cost=result.cost_usd or 0,
                         context_window=agent.context_window,
+                        cached=cached is not None,
                     )
 
                 if result.cost_usd:
@@ -1133,6 +1639,9 @@ Please make ONLY the requested changes. Do not rewrite the entire post. Keep eve
 
         except Exception as e:
             duration = time.time() - start_time
+            cancelled = cancel_event is not None and cancel_event.is_set()
+            if invoked_at is not None and not cancelled:
+                self._record_route(agent_name, invoked_at, False)
             if self.agent_logger:
                 self.agent_logger.log_complete(
                     agent=agent_name,
@@ -1149,6 +1658,100 @@ Please make ONLY the requested changes. Do not rewrite the entire post. Keep eve
                 error=str(e),
             )
 
+    def _route_agents(
+        self,
+        state_name: str,
+        state: dict,
+        configured: list[str],
+        count: Optional[int] = None,
+    ) -> list[str]:
+        """Choose a state's agents; adaptive states pick among candidates.
+
+        States with `routing: adaptive` rank their `candidates` (default:
+        the configured agents) with the ModelRouter and run the best
+        `count` of them (default: as many as are configured).
+        """
+        if state.get("routing") != "adaptive":
+            return configured
+
+        candidates = list(state.get("candidates") or configured)
+        if count is None:
+            count = state.get("count") or len(configured) or len(candidates)
+
+        for name in candidates:
+            limits = self._agent_configs.get(name, {}).get("rate_limit")
+            if limits and not self.router.has_rate_limiter(name):
+                self.router.set_rate_limiter(name, RateLimiter(**limits))
+
+        scores = self.router.rank(
+            candidates, count, candidate_costs(candidates, self.config)
+        )
+        chosen = [s.agent for s in scores[:count]]
+        self.log_callback(
+            {
+                "type": "route_selected",
+                "state": state_name,
+                "agents": chosen,
+                "scores": [s.to_dict() for s in scores],
+            }
+        )
+        return chosen
+
+    def _record_route(
+        self,
+        agent_name: str,
+        invoked_at: float,
+        success: bool,
+        tokens: Optional[TokenUsage] = None,
+    ) -> None:
+        """Feed a live call's latency and outcome to the router."""
+        used = tokens.input_tokens + tokens.output_tokens if tokens else 0
+        circuit = self.router.record(
+            agent_name, (time.time() - invoked_at) * 1000, success, tokens=used
+        )
+        if circuit:
+            self.log_callback(
+                {
+                    "type": "provider_circuit",
+                    "agent": agent_name,
+                    "circuit": circuit,
+                }
+            )
+
+    def _discard_cancelled(
+        self,
+        agent_name: str,
+        state: str,
+        agent: BaseAgent,
+        result: AgentResult,
+        duration: float,
+    ) -> FanOutResult:
+        """Account for an agent that finished after its fan-out was cancelled."""
+        if result.success and self.token_tracker:
+            self.token_tracker.record(
+                agent=agent_name,
+                state=state,
+                tokens=result.tokens,
+                cost=result.cost_usd or 0,
+                context_window=agent.context_window,
+            )
+        if result.cost_usd:
+            self.circuit_breaker.update_cost(result.cost_usd)
+        if self.agent_logger:
+            self.agent_logger.log_complete(
+                agent=agent_name,
+                state=state,
+                success=False,
+                duration_s=duration,
+                error="Cancelled: result discarded",
+            )
+        return FanOutResult(
+            agent=agent_name,
+            status="cancelled",
+            duration_s=duration,
+            error="Cancelled: result discarded",
+        )
+
     def _get_transitions(self, state_config: dict) -> dict:
         """Get transitions for a state, merging with defaults.
 
@@ -1474,6 +2077,8 @@ Your output will be cross-checked against source material. Fabrications = automa
         input_files: list[str],
         context: str = "",
         input_specs: list[str] = None,
+        agent_name: Optional[str] = None,
+        state_name: Optional[str] = None,
     ) -> str:
         """Build full prompt from persona, database content, and files.
 
@@ -1483,17 +2088,24 @@ Your output will be cross-checked against source material. Fabrications = automa
         message split logic puts it in the user message (not system).
         Non-feedback context goes before input files.
 
+        When agent_name is given, the prompt is fitted to that agent's
+        context window (see runner.prompt_fit): input files are trimmed
+        first, then context, then feedback. The estimate is recorded in the
+        token tracker, and _invoke_agent skips prompts that still don't fit.
+
         Args:
             input_files: Resolved file paths that exist on disk
             input_specs: Original input specs from config (for database lookup even if files don't exist)
+            agent_name: Agent the prompt is for
+            state_name: State the prompt is built in
         """
-        parts = []
+        sections = []
 
         # Always start with strict enforcement preamble
-        parts.append(self.PROMPT_PREAMBLE)
+        sections.append(PromptSection("preamble", self.PROMPT_PREAMBLE, required=True))
 
         if persona:
-            parts.append(persona)
+            sections.append(PromptSection("persona", persona, required=True))
 
         # Separate feedback context from regular context.
         # Feedback markers (from retry_feedback) go AFTER input files
@@ -1507,7 +2119,9 @@ Your output will be cross-checked against source material. Fabrications = automa
             regular_context = None
 
         if regular_context:
-            parts.append(f"## Context\n\n{regular_context}")
+            sections.append(
+                PromptSection("context", f"## Context\n\n{regular_context}", priority=2)
+            )
 
         # Collect all paths to try (both resolved files and original specs)
         paths_to_try = list(input_files) if input_files else []
@@ -1518,7 +2132,9 @@ Your output will be cross-checked against source material. Fabrications = automa
                     paths_to_try.append(spec)
 
         if paths_to_try:
-            parts.append("## Input Files\n")
+            sections.append(
+                PromptSection("input_header", "## Input Files\n", required=True)
+            )
             seen_types = set()  # Avoid duplicate database content
 
             for path in paths_to_try:
@@ -1539,14 +2155,49 @@ Your output will be cross-checked against source material. Fabrications = automa
                         content = f.read()
 
                 if content:
-                    parts.append(f"### {source}\n\n{content}")
+                    sections.append(
+                        PromptSection(
+                            f"input:{source}", f"### {source}\n\n{content}", priority=1
+                        )
+                    )
 
         # Feedback context goes AFTER input files so Ollama splits it into
         # the user message (split markers: ## Reviewer Context, ## USER FEEDBACK)
         if feedback_context:
-            parts.append(feedback_context)
+            sections.append(PromptSection("feedback", feedback_context, priority=3))
+
+        agent = None
+        if agent_name:
+            try:
+                agent = self.get_agent(agent_name)
+            except Exception:
+                pass  # reported when _invoke_agent fails to create it
+        if agent is None or not hasattr(agent, "prompt_token_budget"):
+            return "\n\n".join(section.text for section in sections)
 
-        return "\n\n".join(parts)
+        fitted = fit_prompt(
+            sections, agent.prompt_token_budget(), agent.TOKENIZER_FAMILY
+        )
+        if self.token_tracker:
+            self.token_tracker.record_estimate(
+                agent_name,
+                state_name or "",
+                fitted.estimated_tokens,
+                fitted.budget,
+                fitted.trimmed,
+            )
+        if fitted.trimmed:
+            self.log_callback(
+                {
+                    "type": "prompt_trimmed",
+                    "state": state_name,
+                    "agent": agent_name,
+                    "sections": fitted.trimmed,
+                    "estimated_tokens": fitted.estimated_tokens,
+                    "budget": fitted.budget,
+                }
+            )
+        return fitted.prompt
 
     def _aggregate_audit_results(
         self, audit_results: list[tuple[str, AuditResult]], state: dict
@@ -1638,6 +2289,28 @@ Your output will be cross-checked against source material. Fabrications = automa
                 feedback=f"Audit validation failed: {e}. Ensure output matches schema.",
             )
 
+    def _cacheable_output(self, state: str, content: Optional[str]) -> bool:
+        """Check whether a response may be cached and replayed for a state.
+
+        Audit outputs must validate as an AuditResult; one that doesn't
+        would fail every retry the same way until the cache entry expired.
+        Unlike _parse_audit_result, this has no side effects.
+        """
+        output_type = self.states.get(state, {}).get("output_type", "")
+        if output_type not in AUDIT_OUTPUT_TYPES:
+            return True
+
+        import json
+
+        json_str = self._extract_json(content or "")
+        if not json_str:
+            return False
+        try:
+            AuditResult.model_validate(json.loads(json_str))
+        except ValueError:
+            return False
+        return True
+
     def _extract_json(self, content: str) -> Optional[str]:
         """Extract JSON from content, handling markdown fences and extra braces."""
         import re
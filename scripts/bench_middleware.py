@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-request middleware overhead.
+
+Compares the old stack of five BaseHTTPMiddleware layers (CustomDomain,
+Auth, Workspace, Metrics, UsageEnforcement) with the single pure-ASGI
+RequestPipelineMiddleware, on a trivial JSON route and a streaming route.
+Requests are driven straight through the ASGI interface (no network, no
+HTTP client), so the numbers are middleware + routing cost only. The
+route is public and on a default domain, so no stage touches the database.
+
+Usage:
+    python scripts/bench_middleware.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Ensure we can import from the project
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("JWT_SECRET", "bench-secret")
+
+from unittest.mock import MagicMock  # noqa: E402
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.responses import StreamingResponse  # noqa: E402
+
+from api.middleware import (  # noqa: E402
+    AuthMiddleware,
+    CustomDomainMiddleware,
+    MetricsMiddleware,
+    RequestPipelineMiddleware,
+    UsageEnforcementMiddleware,
+    WorkspaceMiddleware,
+)
+
+
+def build_app(stack: str) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/api/health")
+    async def health():
+        return {"status": "ok"}
+
+    @app.get("/api/health/stream")
+    async def stream():
+        async def chunks():
+            for _ in range(10):
+                yield b"x" * 64
+
+        return StreamingResponse(chunks())
+
+    if stack == "legacy":
+        # Same order as the old api/main.py
+        app.add_middleware(UsageEnforcementMiddleware, usage_service=MagicMock())
+        app.add_middleware(MetricsMiddleware)
+        app.add_middleware(WorkspaceMiddleware)
+        app.add_middleware(AuthMiddleware)
+        app.add_middleware(CustomDomainMiddleware)
+    elif stack == "pipeline":
+        app.add_middleware(RequestPipelineMiddleware, usage_service=MagicMock())
+    return app
+
+
+async def call(app, path: str) -> None:
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [(b"host", b"localhost")],
+        "client": ("127.0.0.1", 1234),
+        "server": ("localhost", 80),
+    }
+
+    body_sent = False
+    disconnected = asyncio.Event()
+
+    async def receive():
+        # Deliver the (empty) body once, then block like an idle client;
+        # returning http.request forever would spin disconnect listeners
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        pass
+
+    await app(scope, receive, send)
+
+
+async def bench(app, path: str, requests: int) -> float:
+    for _ in range(200):  # warm up (builds middleware stack, caches)
+        await call(app, path)
+    start = time.perf_counter()
+    for _ in range(requests):
+        await call(app, path)
+    return (time.perf_counter() - start) / requests * 1e6
+
+
+async def main(requests: int) -> None:
+    print(f"{'stack':<10} {'route':<20} {'us/request':>10} {'overhead':>10}")
+    for path in ("/api/health", "/api/health/stream"):
+        baseline = await bench(build_app("none"), path, requests)
+        for stack in ("none", "legacy", "pipeline"):
+            us = (
+                baseline
+                if stack == "none"
+                else await bench(build_app(stack), path, requests)
+            )
+            print(f"{stack:<10} {path:<20} {us:>10.1f} {us - baseline:>10.1f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
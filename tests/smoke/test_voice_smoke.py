@@ -27,7 +27,10 @@ class TestVoiceServiceSmoke:
 
         assert service.llm_provider == "ollama"
         assert service.model == "llama3.2"
-        assert service.agent is not None
+        from runner.agents import agent_pool
+
+        with agent_pool.checkout(service.llm_provider, service.agent_config) as agent:
+            assert agent is not None
 
     def test_voice_service_uses_provider_specific_model(self, monkeypatch):
         """Voice service picks up provider-specific model env var."""
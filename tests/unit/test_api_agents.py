@@ -12,12 +12,12 @@ from unittest.mock import Mock, patch, MagicMock
 # Skip entire module if SDK dependencies aren't available
 pytest.importorskip("anthropic", reason="anthropic SDK not installed")
 
-from runner.agents.api_base import APIAgent, RateLimitError
+from runner.agents.api_base import APIAgent, RateLimitError, split_cacheable_prefix
 from runner.agents.claude_api import ClaudeAPIAgent
 from runner.agents.openai_api import OpenAIAPIAgent
 from runner.agents.gemini_api import GeminiAPIAgent
 from runner.agents.groq_api import GroqAPIAgent
-from runner.agents.factory import create_agent, get_available_agents
+from runner.agents.factory import AgentPool, create_agent, get_available_agents
 from runner.models import TokenUsage
 
 
@@ -76,6 +76,108 @@ class TestAPIAgentBase:
             assert agent.supports_native_session() is False
 
 
+# =============================================================================
+# Prompt Prefix Caching Tests
+# =============================================================================
+
+CACHEABLE_PROMPT = "PREAMBLE\n\nPersona rules\n\n## Input Files\n\n### story.md\n\nStory"
+
+
+class TestPromptPrefixCaching:
+    """Tests for sending the stable prompt prefix as a cacheable system block."""
+
+    def test_split_cacheable_prefix(self):
+        """The prefix ends at the first per-invocation section."""
+        prefix, rest = split_cacheable_prefix(CACHEABLE_PROMPT)
+        assert prefix == "PREAMBLE\n\nPersona rules"
+        assert rest.startswith("## Input Files")
+
+    def test_split_without_marker(self):
+        """Prompts without a marker are not split."""
+        assert split_cacheable_prefix("Hello") == ("", "Hello")
+
+    def test_claude_sends_cache_control(self):
+        """Claude gets the prefix as a system block with a cache breakpoint."""
+        mock_response = MagicMock()
+        mock_response.content = [MagicMock(type="text", text="ok")]
+        mock_response.usage.input_tokens = 10
+        mock_response.usage.output_tokens = 5
+        mock_response.usage.cache_read_input_tokens = 900
+        mock_response.usage.cache_creation_input_tokens = 0
+
+        with patch.object(ClaudeAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            agent = ClaudeAPIAgent({"model": "sonnet", "cost_per_1k": {"input": 0.003, "output": 0.015}})
+            agent.client = MagicMock()
+            agent.client.messages.create.return_value = mock_response
+
+            result = agent.invoke(CACHEABLE_PROMPT)
+
+        kwargs = agent.client.messages.create.call_args.kwargs
+        assert kwargs["system"] == [
+            {
+                "type": "text",
+                "text": "PREAMBLE\n\nPersona rules",
+                "cache_control": {"type": "ephemeral"},
+            }
+        ]
+        assert [m["role"] for m in kwargs["messages"]] == ["user"]
+        assert result.tokens.input_tokens == 910
+        assert result.tokens.cache_read_tokens == 900
+        # 10 uncached at full rate + 900 cached at 10%
+        assert result.cost_usd == pytest.approx((10 * 0.003 + 900 * 0.0003 + 5 * 0.015) / 1000)
+
+    def test_claude_warm_prompt_cache(self):
+        """Warming issues a 1-token call with the same system blocks."""
+        mock_response = MagicMock()
+        mock_response.usage.input_tokens = 1
+        mock_response.usage.output_tokens = 1
+        mock_response.usage.cache_read_input_tokens = 0
+        mock_response.usage.cache_creation_input_tokens = 900
+
+        with patch.object(ClaudeAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            agent = ClaudeAPIAgent({"model": "sonnet"})
+            agent.client = MagicMock()
+            agent.client.messages.create.return_value = mock_response
+
+            tokens = agent.warm_prompt_cache(CACHEABLE_PROMPT)
+            assert agent.warm_prompt_cache("no prefix") is None
+
+        kwargs = agent.client.messages.create.call_args.kwargs
+        assert kwargs["max_tokens"] == 1
+        assert kwargs["system"][-1]["cache_control"] == {"type": "ephemeral"}
+        assert tokens.cache_write_tokens == 900
+
+    def test_openai_prefix_and_cached_tokens(self):
+        """OpenAI gets the prefix as a leading system message."""
+        mock_response = MagicMock()
+        mock_response.choices = [MagicMock()]
+        mock_response.choices[0].message.content = "ok"
+        mock_response.usage.prompt_tokens = 1200
+        mock_response.usage.completion_tokens = 20
+        mock_response.usage.prompt_tokens_details.cached_tokens = 1024
+
+        with patch.object(OpenAIAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            agent = OpenAIAPIAgent({"model": "gpt4o"})
+            agent.client = MagicMock()
+            agent.client.chat.completions.create.return_value = mock_response
+
+            result = agent.invoke(CACHEABLE_PROMPT)
+
+        messages = agent.client.chat.completions.create.call_args.kwargs["messages"]
+        assert messages[0] == {"role": "system", "content": "PREAMBLE\n\nPersona rules"}
+        assert messages[1]["role"] == "user"
+        assert result.tokens.input_tokens == 1200
+        assert result.tokens.cache_read_tokens == 1024
+
+    def test_gemini_prompt_not_split(self):
+        """Providers without prefix caching keep the single user message."""
+        with patch.object(GeminiAPIAgent, '_get_api_key_from_env', return_value='test-key'), \
+             patch("runner.agents.gemini_api.genai"):
+            agent = GeminiAPIAgent({"model": "flash"})
+            messages = agent._build_messages(CACHEABLE_PROMPT)
+        assert messages == [{"role": "user", "content": CACHEABLE_PROMPT}]
+
+
 # =============================================================================
 # ClaudeAPIAgent Tests
 # =============================================================================
@@ -340,6 +442,79 @@ class TestAgentFactory:
             assert isinstance(agent, GroqAPIAgent)
 
 
+# =============================================================================
+# Agent Pool Tests
+# =============================================================================
+
+class TestAgentPool:
+    """Tests for the process-wide agent pool."""
+
+    def test_reuses_released_agent(self):
+        """Test that a released agent is handed out again for the same config."""
+        pool = AgentPool()
+        with patch.object(GroqAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as first:
+                pass
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as second:
+                pass
+
+        assert second is first
+
+    def test_concurrent_checkouts_get_distinct_agents(self):
+        """Test that an agent is never shared by two callers at once."""
+        pool = AgentPool()
+        with patch.object(GroqAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as first:
+                with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as second:
+                    assert second is not first
+
+        assert pool.idle_count() == 2
+
+    def test_different_config_gets_new_agent(self):
+        """Test that agents are keyed by their config."""
+        pool = AgentPool()
+        with patch.object(GroqAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as first:
+                pass
+            with pool.checkout("groq", {"model": "llama-8b"}, mode="api") as second:
+                pass
+
+        assert second is not first
+
+    def test_release_clears_session_state(self):
+        """Test that history and dev logger don't leak to the next caller."""
+        pool = AgentPool()
+        with patch.object(GroqAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as agent:
+                agent.messages.append({"role": "user", "content": "hi"})
+                agent.set_dev_logger(Mock(), "run-1", "draft")
+
+        assert agent.messages == []
+        assert agent._dev_logger is None
+
+    def test_discarded_agent_not_reused(self):
+        """Test that a discarded agent is never handed out again."""
+        pool = AgentPool()
+        with patch.object(GroqAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            agent = pool.acquire("groq", {"model": "llama-70b"}, mode="api")
+            pool.discard(agent)
+            pool.release(agent)  # late release of a discarded agent is a no-op
+
+            assert pool.idle_count() == 0
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api") as other:
+                assert other is not agent
+
+    def test_idle_agents_are_capped(self):
+        """Test that the pool keeps at most max_idle_per_key idle agents."""
+        pool = AgentPool(max_idle_per_key=1)
+        with patch.object(GroqAPIAgent, '_get_api_key_from_env', return_value='test-key'):
+            with pool.checkout("groq", {"model": "llama-70b"}, mode="api"):
+                with pool.checkout("groq", {"model": "llama-70b"}, mode="api"):
+                    pass
+
+        assert pool.idle_count() == 1
+
+
 # =============================================================================
 # Rate Limit Retry Tests
 # =============================================================================
@@ -0,0 +1,144 @@
+"""Tests for the content-addressed artifact store."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from runner import artifact_store
+from runner.artifact_store import (
+    LocalArtifactStore,
+    S3ArtifactStore,
+    externalize_content,
+    make_ref,
+    parse_ref,
+)
+
+
+class StubClientError(Exception):
+    """Shaped like botocore's ClientError."""
+
+    def __init__(self, code):
+        super().__init__(code)
+        self.response = {"Error": {"Code": code}}
+
+
+class StubS3Client:
+    """In-memory stand-in for the boto3 S3 client calls the store uses."""
+
+    def __init__(self):
+        self.objects = {}
+        self.calls = []
+
+    def list_objects_v2(self, Bucket, Prefix, MaxKeys):
+        self.calls.append("list_objects_v2")
+        keys = [k for (b, k) in self.objects if b == Bucket and k.startswith(Prefix)]
+        return {"KeyCount": min(len(keys), MaxKeys)}
+
+    def get_object(self, Bucket, Key):
+        self.calls.append("get_object")
+        if (Bucket, Key) not in self.objects:
+            raise StubClientError("NoSuchKey")
+        return {"Body": io.BytesIO(self.objects[(Bucket, Key)])}
+
+    def put_object(self, Bucket, Key, Body):
+        self.objects[(Bucket, Key)] = Body
+
+
+@pytest.fixture(params=["local", "s3"])
+def store(request, tmp_path):
+    if request.param == "local":
+        return LocalArtifactStore(str(tmp_path / "artifacts"), compress=False)
+    return S3ArtifactStore("bucket", client=StubS3Client(), compress=False)
+
+
+class TestArtifactStore:
+    def test_round_trip(self, store):
+        ref = store.put_text("hello world")
+
+        assert ref == make_ref(b"hello world")
+        assert store.get_text(ref) == "hello world"
+        assert store.exists(ref)
+
+    def test_identical_content_is_stored_once(self, store):
+        with patch.object(store, "_write", wraps=store._write) as write:
+            first = store.put_text("same draft")
+            second = store.put_text("same draft")
+
+        assert first == second
+        assert write.call_count == 1
+
+    def test_missing_blob(self, store):
+        with pytest.raises(KeyError):
+            store.get(make_ref(b"never stored"))
+
+    def test_rejects_malformed_ref(self, store):
+        with pytest.raises(ValueError):
+            store.get("sha256:../../etc/passwd")
+
+    def test_s3_keys_are_sharded_under_prefix(self):
+        client = StubS3Client()
+        store = S3ArtifactStore("bucket", prefix="runs/", client=client)
+        ref = store.put_text("draft")
+        digest = parse_ref(ref)
+
+        assert ("bucket", f"runs/{digest[:2]}/{digest}") in client.objects
+
+    def test_s3_read_is_one_request(self):
+        client = StubS3Client()
+        store = S3ArtifactStore("bucket", client=client, compress=False)
+        ref = store.put_text("draft")
+        client.calls.clear()
+
+        assert store.get_text(ref) == "draft"
+        assert client.calls == ["get_object"]
+
+    def test_s3_other_errors_propagate(self):
+        client = MagicMock()
+        client.get_object.side_effect = StubClientError("AccessDenied")
+        store = S3ArtifactStore("bucket", client=client, compress=False)
+
+        with pytest.raises(StubClientError):
+            store.get(make_ref(b"draft"))
+
+
+class TestCompression:
+    def test_compressed_blobs_round_trip(self, tmp_path):
+        pytest.importorskip("zstandard")
+        store = LocalArtifactStore(str(tmp_path), compress=True)
+        text = "the same paragraph again. " * 200
+
+        ref = store.put_text(text)
+
+        assert store.get_text(ref) == text
+        digest = parse_ref(ref)
+        assert (tmp_path / digest[:2] / digest).stat().st_size < len(text)
+
+    def test_reads_raw_blobs_with_compression_enabled(self, tmp_path):
+        raw = LocalArtifactStore(str(tmp_path), compress=False)
+        ref = raw.put_text("stored before compression was enabled")
+
+        compressed = LocalArtifactStore(str(tmp_path), compress=True)
+
+        assert compressed.get_text(ref) == "stored before compression was enabled"
+
+
+class TestExternalizeContent:
+    def test_inline_without_store(self):
+        with patch.object(artifact_store, "get_artifact_store", return_value=None):
+            assert externalize_content("x" * 5000) == ("x" * 5000, None, None)
+
+    def test_small_outputs_stay_inline(self, tmp_path):
+        store = LocalArtifactStore(str(tmp_path))
+        with patch.object(artifact_store, "get_artifact_store", return_value=store):
+            assert externalize_content("short audit") == ("short audit", None, None)
+
+    def test_large_outputs_become_references(self, tmp_path):
+        store = LocalArtifactStore(str(tmp_path))
+        body = "draft " * 1000
+        with patch.object(artifact_store, "get_artifact_store", return_value=store):
+            inline, ref, size = externalize_content(body)
+
+        assert inline == ""
+        assert size == len(body)
+        assert store.get_text(ref) == body
@@ -1,6 +1,7 @@
 """Tests for circuit breaker."""
 
 import pytest
+import threading
 import time
 from runner.circuit_breaker import CircuitBreaker
 
@@ -62,7 +63,7 @@ class TestCircuitBreaker:
 
     def test_transition_limit_triggers(self, breaker):
         for i in range(19):
-            result = breaker.check(f"state_{i}", f"state_{i+1}")
+            result = breaker.check(f"state_{i}", f"state_{i + 1}")
             if i < 18:
                 assert result["triggered"] is False
 
@@ -87,6 +88,29 @@ class TestCircuitBreaker:
         assert result["triggered"] is True
         assert result["rule"] == "cost_limit"
 
+    def test_concurrent_cost_updates(self, breaker):
+        def spend():
+            for _ in range(1000):
+                breaker.update_cost(0.001)
+
+        threads = [threading.Thread(target=spend) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert breaker.total_cost == pytest.approx(8.0)
+
+    def test_hard_cost_limit_reached_mid_state(self, breaker):
+        assert breaker.hard_cost_limit_reached() is False
+
+        # The soft limit is an overridable break, not a mid-state stop
+        assert breaker.update_cost(5.00) == 5.00
+        assert breaker.hard_cost_limit_reached() is False
+
+        breaker.update_cost(5.00)
+        assert breaker.hard_cost_limit_reached() is True
+
     def test_get_context(self, breaker):
         breaker.check("start", "draft")
         breaker.check("draft", "audit")
@@ -102,7 +126,7 @@ class TestCircuitBreaker:
 
     def test_safety_limit_transitions(self, breaker):
         for i in range(49):
-            breaker.check(f"s{i}", f"s{i+1}")
+            breaker.check(f"s{i}", f"s{i + 1}")
 
         result = breaker.check_safety_limits()
         assert result["triggered"] is False
@@ -135,6 +159,23 @@ class TestCircuitBreaker:
         assert len(breaker.state_visits) == 0
         assert len(breaker.transition_history) == 0
 
+    def test_restore_from_context(self, breaker):
+        breaker.check("a", "b")
+        breaker.check("b", "a")
+        breaker.update_cost(0.5)
+        context = breaker.get_context()
+
+        restored = CircuitBreaker({})
+        restored.restore(context)
+
+        assert restored.state_visits == {"b": 1, "a": 1}
+        assert restored.transition_history == [("a", "b"), ("b", "a")]
+        assert restored.transition_count == 2
+        assert restored.total_cost == 0.5
+        # Cycle detection sees the restored history
+        restored.check("a", "b")
+        assert restored.check("b", "a")["rule"] == "cycle_detection"
+
 
 class TestCircuitBreakerDefaults:
     def test_default_limits(self):
@@ -12,6 +12,8 @@ from runner.db.models import (
     InvocationRecord as DbInvocationRecord,
     AuditScoreRecord as DbAuditScoreRecord,
     PostIterationRecord as DbPostIterationRecord,
+    AgentDailyRollup,
+    RunDailyRollup,
 )
 from runner.history.models import (
     RunRecord,
@@ -20,6 +22,7 @@ from runner.history.models import (
     PostIterationRecord,
 )
 from runner.history.queries import HistoryQueries
+from runner.history.rollups import HistoryRollups
 from runner.history.service import HistoryService
 
 from tests.db_utils import create_test_engine, drop_test_schema, requires_db
@@ -35,6 +38,8 @@ HISTORY_TABLES = [
     DbInvocationRecord.__table__,
     DbAuditScoreRecord.__table__,
     DbPostIterationRecord.__table__,
+    AgentDailyRollup.__table__,
+    RunDailyRollup.__table__,
 ]
 
 
@@ -384,6 +389,158 @@ class TestHistoryQueries:
             assert "runs" in r
 
 
+class TestHistoryRollups:
+    """Rollups maintained on insert match a rebuild from the records."""
+
+    def _populate(self, service):
+        started = datetime.utcnow() - timedelta(days=2)
+        for i in range(2):
+            run_id = f"rollup-run-{i}"
+            service.insert_run(
+                RunRecord(run_id=run_id, story="post_01", started_at=started)
+            )
+            # The draft state retried claude once
+            for agent in ["claude", "claude", "gemini"]:
+                service.insert_invocation(
+                    InvocationRecord(
+                        run_id=run_id,
+                        agent=agent,
+                        state="draft",
+                        success=True,
+                        total_tokens=1000,
+                        cost_usd=0.01,
+                    )
+                )
+            for target, score in [("claude", 8.0), ("gemini", 6.0)]:
+                service.insert_audit_score(
+                    AuditScoreRecord(
+                        run_id=run_id,
+                        auditor_agent="codex",
+                        target_agent=target,
+                        state="cross-audit",
+                        overall_score=score,
+                        hook_score=score,
+                    )
+                )
+            service.update_run_complete(
+                run_id=run_id,
+                completed_at=started,
+                status="complete",
+                duration_s=60.0,
+                total_tokens=3000,
+                total_cost_usd=0.03,
+                final_score=7.0,
+            )
+
+    def _snapshot(self, user_id):
+        """Query results, rounded so summation order doesn't matter."""
+        queries = HistoryQueries(user_id)
+        return (
+            [
+                (r.agent, round(r.avg_score, 6), r.sample_size)
+                for r in queries.agent_performance()
+            ],
+            [
+                (r.agent, r.invocations, r.total_tokens, round(r.total_cost, 6))
+                for r in queries.cost_by_agent()
+            ],
+            [
+                (r.week, r.runs, r.avg_quality, round(r.total_cost, 6))
+                for r in queries.weekly_summary()
+            ],
+        )
+
+    def test_incremental_matches_rebuild(self, history_env, history_engine):
+        service, user_id = history_env
+        self._populate(service)
+        incremental = self._snapshot(user_id)
+
+        with Session(history_engine) as session:
+            HistoryRollups(session).rebuild()
+
+        assert self._snapshot(user_id) == incremental
+
+    def test_rollup_totals(self, history_env):
+        service, user_id = history_env
+        self._populate(service)
+        queries = HistoryQueries(user_id)
+
+        costs = {r.agent: r for r in queries.cost_by_agent()}
+        assert costs["claude"].invocations == 4
+        assert costs["claude"].total_cost == pytest.approx(0.04)
+
+        performance = {r.agent: r for r in queries.agent_performance()}
+        assert performance["claude"].avg_score == 8.0
+        assert performance["gemini"].avg_hook == 6.0
+        assert performance["gemini"].avg_voice is None
+
+        (day,) = queries.quality_trend()
+        assert day["runs"] == 2
+        assert day["avg_score"] == 7.0
+
+    def test_recompleting_run_replaces_contribution(self, history_env):
+        service, user_id = history_env
+        self._populate(service)
+        service.update_run_complete(
+            run_id="rollup-run-0",
+            completed_at=datetime.utcnow(),
+            status="complete",
+            duration_s=60.0,
+            total_tokens=3000,
+            total_cost_usd=0.03,
+            final_score=9.0,
+        )
+
+        (day,) = HistoryQueries(user_id).quality_trend()
+        assert day["runs"] == 2
+        assert day["avg_score"] == 8.0
+
+    def test_best_agent_counts_each_score_once(self, history_env):
+        service, user_id = history_env
+        self._populate(service)
+
+        queries = HistoryQueries(user_id)
+        results = {r.agent: r for r in queries.best_agent_for_task("draft")}
+
+        assert results["claude"].sample_size == 2
+        assert results["claude"].avg_score == 8.0
+
+    def test_queries_scoped_to_user(self, history_env, history_engine):
+        service, user_id = history_env
+        self._populate(service)
+        with Session(history_engine) as session:
+            other = User(full_name="Other", email="other@example.com")
+            session.add(other)
+            session.commit()
+            session.refresh(other)
+
+        queries = HistoryQueries(other.id)
+        assert queries.cost_by_agent() == []
+        assert queries.best_agent_for_task("draft") == []
+        assert queries.post_iterations("post_01") == []
+
+    def test_invocation_before_run(self, history_env, caplog):
+        """A record that arrives before its run is logged, not rolled up."""
+        service, user_id = history_env
+        invocation = InvocationRecord(
+            run_id="late-run", agent="claude", state="draft", total_tokens=100
+        )
+
+        with pytest.raises(IntegrityError):
+            service.insert_invocation(invocation)
+        assert "late-run not recorded yet" in caplog.text
+        assert HistoryQueries(user_id).cost_by_agent() == []
+
+        service.insert_run(
+            RunRecord(run_id="late-run", story="post_01", started_at=datetime.utcnow())
+        )
+        service.insert_invocation(invocation)
+
+        (costs,) = HistoryQueries(user_id).cost_by_agent()
+        assert costs.invocations == 1
+        assert costs.total_tokens == 100
+
+
 class TestHistoryEdgeCases:
     """Edge case tests for history service and queries."""
 
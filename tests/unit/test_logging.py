@@ -1,10 +1,16 @@
 """Tests for logging system."""
 
+import json
 import pytest
 import os
+import subprocess
+import sys
 from datetime import datetime
 
 from runner.logging import StateLogger, AgentLogger, SummaryGenerator
+from runner.logging import jsonl_sink
+from runner.logging.jsonl_sink import INDEX_EVERY, JsonlSink, run_log_sink
+from runner.logging.log_tail import follow, offset_for_since, read_page
 from runner.models import TokenUsage, RunManifest
 from runner.metrics import TokenTracker
 
@@ -65,6 +71,169 @@ class TestStateLogger:
         entries = logger.read_log()
         assert len(entries) == 3
 
+    def test_terminal_events_are_on_disk(self, run_dir):
+        """Completion is flushed without a reader having to ask for it."""
+        logger = StateLogger(run_dir, "test-run-001")
+        logger.log_start("post_03")
+        logger.log_complete("complete", 12.5)
+
+        with open(logger.log_file) as f:
+            lines = f.read().splitlines()
+        assert len(lines) == 2
+        run_log_sink.close_dir(run_dir)
+
+
+class TestJsonlSink:
+    @pytest.fixture
+    def sink(self):
+        sink = JsonlSink(flush_interval=3600)
+        yield sink
+        sink.close_all()
+
+    def _read(self, path):
+        with open(path) as f:
+            return f.read().splitlines()
+
+    def test_buffers_until_flush(self, sink, tmp_path):
+        path = str(tmp_path / "log.jsonl")
+        sink.write(path, {"n": 1})
+        sink.write(path, {"n": 2})
+
+        assert self._read(path) == []
+        sink.flush(path)
+        assert [json.loads(line) for line in self._read(path)] == [{"n": 1}, {"n": 2}]
+
+    def test_flushes_when_buffer_fills(self, tmp_path):
+        sink = JsonlSink(flush_bytes=32, flush_interval=3600)
+        path = str(tmp_path / "log.jsonl")
+        for i in range(10):
+            sink.write(path, {"event": "tick", "n": i})
+
+        assert len(self._read(path)) >= 8
+        sink.close_all()
+        assert len(self._read(path)) == 10
+
+    def test_close_dir_only_closes_that_run(self, sink, tmp_path):
+        run_a = tmp_path / "run-a"
+        run_b = tmp_path / "run-b"
+        run_a.mkdir()
+        run_b.mkdir()
+        sink.write(str(run_a / "state_log.jsonl"), {"run": "a"})
+        sink.write(str(run_b / "state_log.jsonl"), {"run": "b"})
+
+        sink.close_dir(str(run_a))
+
+        assert len(self._read(run_a / "state_log.jsonl")) == 1
+        assert self._read(run_b / "state_log.jsonl") == []
+        assert len(sink._files) == 1
+
+    def test_evicts_least_recently_used_handle(self, tmp_path):
+        sink = JsonlSink(flush_interval=3600, max_open_files=2)
+        paths = [str(tmp_path / f"{name}.jsonl") for name in "abc"]
+        for path in paths:
+            sink.write(path, {"path": path})
+
+        # The first handle was closed (and flushed) to make room
+        assert len(self._read(paths[0])) == 1
+        assert len(sink._files) == 2
+        sink.close_all()
+
+    def test_buffered_lines_written_at_exit(self, tmp_path):
+        """A process that exits without close_dir() keeps its log lines."""
+        path = tmp_path / "state_log.jsonl"
+        # Load the module alone; importing the runner package is slow
+        module = jsonl_sink.__file__
+        script = (
+            "import importlib.util\n"
+            f"spec = importlib.util.spec_from_file_location('sink', {module!r})\n"
+            "sink = importlib.util.module_from_spec(spec)\n"
+            "spec.loader.exec_module(sink)\n"
+            f"sink.run_log_sink.write({str(path)!r}, {{'n': 1}})\n"
+        )
+        subprocess.run([sys.executable, "-c", script], check=True)
+
+        assert [json.loads(line) for line in self._read(path)] == [{"n": 1}]
+
+    def test_handles_non_string_keys(self, sink, tmp_path):
+        """Entries orjson rejects still serialize through json."""
+        path = str(tmp_path / "log.jsonl")
+        sink.write(path, {"visits": {1: "draft"}})
+        sink.flush(path)
+
+        assert len(self._read(path)) == 1
+
+
+class TestLogTail:
+    @pytest.fixture
+    def sink(self):
+        sink = JsonlSink(flush_interval=3600)
+        yield sink
+        sink.close_all()
+
+    def _write(self, sink, path, count, start=0):
+        for i in range(start, start + count):
+            sink.write(path, {"ts": f"2026-01-01T00:00:{i:04d}Z", "n": i}, index=True)
+        sink.flush(path)
+
+    def test_resumes_from_cursor(self, sink, tmp_path):
+        path = str(tmp_path / "state_log.jsonl")
+        self._write(sink, path, 3)
+        first = read_page(path)
+
+        self._write(sink, path, 2, start=3)
+        second = read_page(path, cursor=first.cursor)
+
+        assert [e["n"] for e in first.entries] == [0, 1, 2]
+        assert [e["n"] for e in second.entries] == [3, 4]
+        assert read_page(path, cursor=second.cursor).entries == []
+
+    def test_leaves_partial_line_for_next_read(self, tmp_path):
+        path = tmp_path / "state_log.jsonl"
+        path.write_bytes(b'{"n": 0}\n{"n": 1')
+
+        page = read_page(str(path))
+
+        assert page.entries == [{"n": 0}]
+        assert page.cursor == len(b'{"n": 0}\n')
+
+    def test_limit(self, sink, tmp_path):
+        path = str(tmp_path / "state_log.jsonl")
+        self._write(sink, path, 5)
+
+        page = read_page(path, limit=2)
+        rest = read_page(path, cursor=page.cursor)
+
+        assert [e["n"] for e in page.entries] == [0, 1]
+        assert [e["n"] for e in rest.entries] == [2, 3, 4]
+
+    def test_since_seeks_with_sparse_index(self, sink, tmp_path):
+        path = str(tmp_path / "state_log.jsonl")
+        self._write(sink, path, INDEX_EVERY * 3)
+        since = f"2026-01-01T00:00:{INDEX_EVERY * 2 + 5:04d}Z"
+
+        page = read_page(path, since=since)
+
+        assert offset_for_since(path, since) > 0
+        assert page.entries[0]["n"] == INDEX_EVERY * 2 + 6
+        assert page.entries[-1]["n"] == INDEX_EVERY * 3 - 1
+
+    def test_missing_file(self, tmp_path):
+        page = read_page(str(tmp_path / "missing.jsonl"), cursor=7)
+
+        assert page.entries == []
+        assert page.cursor == 7
+
+    @pytest.mark.asyncio
+    async def test_follow_stops_when_done(self, sink, tmp_path):
+        path = str(tmp_path / "state_log.jsonl")
+        self._write(sink, path, 2)
+
+        pages = [
+            page async for page in follow(path, done=lambda: True, poll_interval=0.01)
+        ]
+
+        assert [e["n"] for page in pages for e in page.entries] == [0, 1]
+
 
 class TestAgentLogger:
     def test_log_invoke(self, run_dir):
@@ -0,0 +1,291 @@
+"""Tests for adaptive agent routing and provider circuits."""
+
+import threading
+from unittest.mock import patch
+
+from runner.observability.metrics import MetricsCollector
+from runner.resilience.rate_limit import RateLimiter
+from runner.routing import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    ModelRouter,
+    RoutingPolicy,
+    candidate_costs,
+)
+from runner.state_machine import StateMachine
+from tests.conftest import FailingAgent, MockAgent
+
+
+def make_router(**policy) -> ModelRouter:
+    policy.setdefault("min_samples", 2)
+    return ModelRouter(RoutingPolicy(**policy), metrics=MetricsCollector())
+
+
+class TestScoring:
+    def test_prefers_lower_latency(self):
+        router = make_router()
+        for _ in range(3):
+            router.record("slow", 4000, True)
+            router.record("fast", 800, True)
+
+        assert router.select(["slow", "fast"]) == ["fast"]
+
+    def test_unmeasured_candidates_keep_configured_order(self):
+        router = make_router()
+
+        assert router.select(["a", "b", "c"], count=2) == ["a", "b"]
+
+    def test_error_rate_outweighs_small_latency_gain(self):
+        router = make_router(failure_threshold=100, max_error_rate=1.0)
+        for success in (True, False, True, False):
+            router.record("flaky", 1000, success)
+        for _ in range(4):
+            router.record("steady", 1100, True)
+
+        assert router.select(["flaky", "steady"]) == ["steady"]
+
+    def test_cost_breaks_ties(self):
+        router = make_router()
+
+        chosen = router.select(
+            ["premium", "standard"], costs={"premium": 5, "standard": 1}
+        )
+
+        assert chosen == ["standard"]
+
+    def test_exhausted_rate_limit_ranks_last(self):
+        router = make_router()
+        limited = RateLimiter(requests_per_minute=2)
+        router.set_rate_limiter("limited", limited)
+        limited.consume()
+        limited.consume()
+
+        assert router.select(["limited", "other"]) == ["other"]
+
+
+class TestProviderCircuit:
+    def test_consecutive_failures_open_circuit(self):
+        router = make_router(failure_threshold=2)
+
+        assert router.record("bad", 500, False) is None
+        assert router.record("bad", 500, False) == CIRCUIT_OPEN
+        assert router.select(["bad", "good"]) == ["good"]
+
+    def test_half_open_probe_closes_on_success(self):
+        router = make_router(failure_threshold=1, cooldown_s=30)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("bad", 500, False)
+        with patch("runner.routing.time.monotonic", return_value=131.0):
+            assert router.circuit_state("bad") == CIRCUIT_HALF_OPEN
+            assert router.record("bad", 500, True) == CIRCUIT_CLOSED
+
+    def test_half_open_probe_reopens_on_failure(self):
+        router = make_router(failure_threshold=1, cooldown_s=30)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("bad", 500, False)
+        with patch("runner.routing.time.monotonic", return_value=131.0):
+            router.record("bad", 500, False)
+            assert router.circuit_state("bad") == CIRCUIT_OPEN
+
+    def test_half_open_allows_one_probe(self):
+        router = make_router(failure_threshold=1, cooldown_s=30)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("bad", 500, False)
+        with patch("runner.routing.time.monotonic", return_value=131.0):
+            assert router.select(["bad", "good"]) == ["bad"]
+            # The probe is in flight; other runs steer around it
+            (first, second) = router.score(["bad", "good"])
+            assert (first.agent, second.agent) == ("good", "bad")
+            assert second.probing
+            assert router.select(["bad", "good"]) == ["good"]
+
+            assert router.record("bad", 500, True) == CIRCUIT_CLOSED
+            assert router.score(["bad"])[0].available
+
+    def test_failed_probe_reopens_for_everyone(self):
+        router = make_router(failure_threshold=1, cooldown_s=30)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("bad", 500, False)
+        with patch("runner.routing.time.monotonic", return_value=131.0):
+            router.select(["bad", "good"])
+            assert router.record("bad", 500, False) == CIRCUIT_OPEN
+            assert router.select(["bad", "good"]) == ["good"]
+
+    def test_stale_probe_released_after_cooldown(self):
+        """A probe that never reports back stops blocking the circuit."""
+        router = make_router(failure_threshold=1, cooldown_s=30)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("bad", 500, False)
+        with patch("runner.routing.time.monotonic", return_value=131.0):
+            router.select(["bad", "good"])
+        with patch("runner.routing.time.monotonic", return_value=162.0):
+            assert router.select(["bad", "good"]) == ["bad"]
+
+    def test_concurrent_selects_claim_one_probe(self):
+        router = make_router(failure_threshold=1, cooldown_s=30)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("bad", 500, False)
+        barrier = threading.Barrier(8)
+        chosen = []
+
+        def select():
+            barrier.wait()
+            chosen.extend(router.select(["bad", "good"]))
+
+        with patch("runner.routing.time.monotonic", return_value=131.0):
+            threads = [threading.Thread(target=select) for _ in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+
+        assert chosen.count("bad") == 1
+        assert chosen.count("good") == 7
+
+    def test_all_open_still_returns_an_agent(self):
+        router = make_router(failure_threshold=1)
+        with patch("runner.routing.time.monotonic", return_value=100.0):
+            router.record("a", 500, False)
+        with patch("runner.routing.time.monotonic", return_value=110.0):
+            router.record("b", 500, False)
+            assert router.select(["b", "a"]) == ["a"]
+
+    def test_slow_p95_opens_circuit(self):
+        router = make_router(max_p95_ms=2000)
+        router.record("slow", 5000, True)
+
+        assert router.record("slow", 5000, True) == CIRCUIT_OPEN
+
+
+class TestCandidateCosts:
+    def test_credit_weights_used_when_all_listed(self):
+        config = {
+            "credit_weights": {"standard": ["sonnet"], "premium": ["opus"]},
+        }
+
+        assert candidate_costs(["sonnet", "opus"], config) == {
+            "sonnet": 1.0,
+            "opus": 5.0,
+        }
+
+    def test_falls_back_to_token_rates(self):
+        config = {
+            "credit_weights": {"standard": ["sonnet"]},
+            "agents": {"local": {"cost_per_1k": {"input": 0.001, "output": 0.002}}},
+        }
+
+        costs = candidate_costs(["sonnet", "local"], config)
+
+        assert costs == {"sonnet": 0.0, "local": 0.003}
+
+
+class TestAdaptiveStates:
+    def _config(self, tmp_path, state):
+        return {
+            "states": {
+                "start": {"type": "initial", "next": "work"},
+                "work": {
+                    "input": str(tmp_path / "input.md"),
+                    "transitions": {
+                        "success": "complete",
+                        "failure": "halt",
+                        "all_success": "complete",
+                        "partial_success": "complete",
+                        "all_failure": "halt",
+                    },
+                    **state,
+                },
+                "complete": {"type": "terminal"},
+                "halt": {"type": "terminal", "error": True},
+            },
+            "settings": {"timeout_per_agent": 30, "parallel_fanout": False},
+        }
+
+    def test_single_state_steers_around_open_circuit(self, tmp_path):
+        (tmp_path / "input.md").write_text("story")
+        router = make_router(failure_threshold=1)
+        router.record("primary", 500, False)
+        backup = MockAgent(["done"])
+        logs = []
+        sm = StateMachine(
+            self._config(
+                tmp_path,
+                {
+                    "type": "single",
+                    "agent": "primary",
+                    "routing": "adaptive",
+                    "candidates": ["primary", "backup"],
+                    "output": str(tmp_path / "out.md"),
+                },
+            ),
+            agents={"primary": MockAgent(["unused"]), "backup": backup},
+            log_callback=logs.append,
+            router=router,
+        )
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "complete"
+        assert backup.call_count == 1
+        route = next(log for log in logs if log.get("type") == "route_selected")
+        assert route["agents"] == ["backup"]
+
+    def test_fanout_picks_count_and_records_outcomes(self, tmp_path):
+        (tmp_path / "input.md").write_text("story")
+        router = make_router(failure_threshold=1)
+        logs = []
+        sm = StateMachine(
+            self._config(
+                tmp_path,
+                {
+                    "type": "fan-out",
+                    "routing": "adaptive",
+                    "candidates": ["a", "b", "c"],
+                    "count": 2,
+                    "output": str(tmp_path / "{agent}.md"),
+                },
+            ),
+            agents={
+                "a": FailingAgent(["x"], fail_after=0),
+                "b": MockAgent(["y"]),
+                "c": MockAgent(["z"]),
+            },
+            log_callback=logs.append,
+            router=router,
+        )
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "complete"
+        assert router.circuit_state("a") == CIRCUIT_OPEN
+        assert any(
+            log.get("type") == "provider_circuit" and log["agent"] == "a"
+            for log in logs
+        )
+        assert router.select(["a", "b", "c"], count=2) == ["b", "c"]
+
+    def test_static_states_ignore_router(self, tmp_path):
+        (tmp_path / "input.md").write_text("story")
+        router = make_router(failure_threshold=1)
+        router.record("primary", 500, False)
+        primary = MockAgent(["done"])
+        sm = StateMachine(
+            self._config(
+                tmp_path,
+                {
+                    "type": "single",
+                    "agent": "primary",
+                    "output": str(tmp_path / "out.md"),
+                },
+            ),
+            agents={"primary": primary},
+            router=router,
+        )
+        sm.initialize("test-run")
+
+        sm.run()
+
+        assert primary.call_count == 1
@@ -242,6 +242,61 @@ class TestPasswordHashing:
         # bcrypt uses random salt, so hashes should differ
         assert hash1 != hash2
 
+    def test_verify_and_update_rehashes_changed_rounds(self):
+        """Hashes made with other rounds are upgraded on verify."""
+        from passlib.context import CryptContext
+
+        from api.auth.password import PasswordHasher
+
+        old = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+        new = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=5))
+        old_hash = old.hash("TestPass123!")
+
+        matches, new_hash = new.verify_and_update("TestPass123!", old_hash)
+        assert matches is True
+        assert new_hash is not None and "$05$" in new_hash
+        assert new.verify_and_update("TestPass123!", new_hash) == (True, None)
+        assert new.verify_and_update("WrongPass456!", old_hash) == (False, None)
+
+    def test_async_hash_and_verify(self):
+        """Async facade hashes and verifies off the event loop."""
+        import asyncio
+
+        from passlib.context import CryptContext
+
+        from api.auth.password import PasswordHasher
+
+        hasher = PasswordHasher(CryptContext(schemes=["bcrypt"], bcrypt__rounds=4))
+
+        async def run():
+            hashed = await hasher.hash_async("TestPass123!")
+            return await hasher.verify_async("TestPass123!", hashed)
+
+        assert asyncio.run(run()) is True
+        assert hasher.queue_depth == 0
+
+    def test_full_queue_is_shed(self):
+        """Operations beyond workers + max_queue raise RateLimitError."""
+        import threading
+
+        from api.auth.password import PasswordHasher
+        from api.exceptions import RateLimitError
+
+        release = threading.Event()
+        context = MagicMock()
+        context.verify.side_effect = lambda *args: release.wait() or True
+        hasher = PasswordHasher(context, workers=1, max_queue=1)
+
+        running = hasher._submit(context.verify, "a", "b")
+        queued = hasher._submit(context.verify, "a", "b")
+        with pytest.raises(RateLimitError):
+            hasher.verify("a", "b")
+
+        release.set()
+        running.result(timeout=5)
+        queued.result(timeout=5)
+        assert hasher.queue_depth == 0
+
 
 class TestJWTTokens:
     """Tests for JWT token utilities."""
@@ -0,0 +1,140 @@
+"""Tests for the bounded metrics collector and its Prometheus export."""
+
+import random
+from datetime import datetime, timedelta
+from unittest.mock import patch
+
+import pytest
+
+from runner.observability.metrics import MetricsCollector
+from runner.observability.sketch import QuantileSketch
+
+
+class TestQuantileSketch:
+    def test_quantiles_within_relative_accuracy(self):
+        rng = random.Random(7)
+        values = [rng.lognormvariate(7, 1) for _ in range(20000)]
+        sketch = QuantileSketch(relative_accuracy=0.01)
+        for value in values:
+            sketch.add(value)
+
+        ordered = sorted(values)
+        for q in (0.5, 0.95, 0.99):
+            exact = ordered[int(q * (len(ordered) - 1))]
+            assert sketch.quantile(q) == pytest.approx(exact, rel=0.02)
+
+    def test_memory_bounded(self):
+        sketch = QuantileSketch(max_bins=64)
+        for i in range(1, 100000, 7):
+            sketch.add(float(i))
+
+        assert len(sketch.bins) <= 64
+        assert sketch.count == len(range(1, 100000, 7))
+        assert sketch.quantile(0.99) == pytest.approx(99000, rel=0.02)
+
+    def test_merge_matches_single_sketch(self):
+        left, right, combined = QuantileSketch(), QuantileSketch(), QuantileSketch()
+        for i in range(1, 1001):
+            (left if i % 2 else right).add(i)
+            combined.add(i)
+
+        left.merge(right)
+
+        assert left.count == combined.count
+        assert left.sum == combined.sum
+        assert left.quantile(0.95) == combined.quantile(0.95)
+
+    def test_empty_and_zero_values(self):
+        sketch = QuantileSketch()
+        assert sketch.quantile(0.5) is None
+
+        sketch.add(0.0)
+        sketch.add(0.0)
+        sketch.add(10.0)
+        assert sketch.quantile(0.5) == 0.0
+        assert sketch.quantile(1.0) == 10.0
+
+
+class TestMetricsCollector:
+    def test_summary_totals(self):
+        metrics = MetricsCollector()
+        metrics.record_latency("claude", 1000)
+        metrics.record_latency("gemini", 3000)
+        metrics.record_cost("claude", 0.05)
+        metrics.record_tokens("claude", 1000, 500)
+        metrics.record_call("claude")
+        metrics.record_error("gemini")
+
+        summary = metrics.get_summary()
+        assert summary.latency_avg == 2000
+        assert summary.total_cost == pytest.approx(0.05)
+        assert summary.tokens_by_model == {"claude": {"input": 1000, "output": 500}}
+        assert summary.total_calls == 2
+        assert summary.error_rate == 0.5
+
+        claude = metrics.get_summary("claude")
+        assert claude.latency_p95 == 1000
+        assert claude.total_errors == 0
+
+    def test_latency_percentile_min_samples(self):
+        metrics = MetricsCollector()
+        for latency in (100, 200, 300):
+            metrics.record_latency("claude", latency)
+
+        assert metrics.get_latency_percentile("claude", 95, min_samples=5) is None
+        assert metrics.get_latency_percentile("claude", 0) == 100
+        assert metrics.get_latency_percentile("claude", 100) == 300
+
+    def test_old_latencies_leave_window(self):
+        metrics = MetricsCollector(window_minutes=10, bucket_size_minutes=5)
+        start = datetime(2026, 1, 1, 12, 0)
+        with patch("runner.observability.metrics.datetime") as clock:
+            clock.utcnow.return_value = start
+            metrics.record_latency("claude", 9000)
+            clock.utcnow.return_value = start + timedelta(minutes=30)
+            metrics.record_latency("claude", 100)
+
+            assert metrics.get_latency_percentile("claude", 99) == 100
+            assert len(metrics.get_trend("latency")) == 1
+
+        # Lifetime totals keep every call
+        assert metrics.get_summary("claude").latency_avg == 0
+        assert metrics.get_model_snapshot()["claude"]["latency_count"] == 2
+
+    def test_bucket_ring_is_bounded(self):
+        metrics = MetricsCollector(window_minutes=60, bucket_size_minutes=5)
+        start = datetime(2026, 1, 1, 12, 0)
+        with patch("runner.observability.metrics.datetime") as clock:
+            for i in range(100):
+                clock.utcnow.return_value = start + timedelta(minutes=5 * i)
+                metrics.record_latency("claude", 100)
+
+            assert len(metrics._buckets) <= 13
+
+
+class TestPrometheusExport:
+    def test_model_metrics_exported(self):
+        prometheus_client = pytest.importorskip("prometheus_client")
+        from runner.observability.prometheus import ModelMetricsExporter
+
+        metrics = MetricsCollector()
+        for latency in (100, 200, 300):
+            metrics.record_latency("claude", latency)
+        metrics.record_call("claude")
+        metrics.record_error("claude")
+        metrics.record_cost("claude", 0.25)
+        metrics.record_tokens("claude", 1000, 500)
+
+        registry = prometheus_client.CollectorRegistry()
+        registry.register(ModelMetricsExporter(metrics))
+
+        def sample(name, **labels):
+            return registry.get_sample_value(name, {"model": "claude", **labels})
+
+        assert sample("agent_model_latency_milliseconds", quantile="0.99") == 300
+        assert sample("agent_model_latency_milliseconds_count") == 3
+        assert sample("agent_model_latency_milliseconds_sum") == 600
+        assert sample("agent_model_calls_total") == 2
+        assert sample("agent_model_errors_total") == 1
+        assert sample("agent_model_cost_usd_total") == 0.25
+        assert sample("agent_model_tokens_total", direction="output") == 500
@@ -1,10 +1,12 @@
 """Tests for Ollama agent and related components."""
 
+import json
 import tempfile
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from runner.agents import gpu_detect
 from runner.agents.gpu_detect import GPUInfo, detect_gpu, get_model_tier, get_gpu_summary
 from runner.agents.ollama import OllamaAgent, MODEL_TIERS
 from runner.sessions.file_based import FileBasedSessionManager
@@ -84,7 +86,7 @@ class TestGPUDetection:
 
     def test_get_gpu_summary(self):
         """Test GPU summary output."""
-        with patch("runner.agents.gpu_detect.detect_gpu") as mock:
+        with patch("runner.agents.gpu_detect.get_hardware_profile") as mock:
             mock.return_value = GPUInfo(vendor="nvidia", vram_gb=24, name="RTX 3090")
             summary = get_gpu_summary()
 
@@ -94,6 +96,67 @@ class TestGPUDetection:
             assert summary["has_gpu"] is True
 
 
+class TestHardwareProfile:
+    """Tests for the memoized hardware profile."""
+
+    @pytest.fixture(autouse=True)
+    def reset_profile(self, monkeypatch):
+        monkeypatch.setattr(gpu_detect, "_profile", None)
+        for var in ("GPU_VRAM_GB", "GPU_VENDOR", "GPU_NAME", "GPU_PROFILE_FILE"):
+            monkeypatch.delenv(var, raising=False)
+
+    def test_detects_once_per_process(self):
+        """Test that the GPU is probed only on first use."""
+        with patch("runner.agents.gpu_detect.detect_gpu") as mock:
+            mock.return_value = GPUInfo(vendor="nvidia", vram_gb=24)
+            first = gpu_detect.get_hardware_profile()
+            second = gpu_detect.get_hardware_profile()
+
+        assert first is second
+        assert mock.call_count == 1
+
+    def test_env_override_skips_probe(self, monkeypatch):
+        """Test that GPU_VRAM_GB pins the profile without probing."""
+        monkeypatch.setenv("GPU_VRAM_GB", "16")
+        monkeypatch.setenv("GPU_VENDOR", "nvidia")
+        with patch("runner.agents.gpu_detect.detect_gpu") as mock:
+            profile = gpu_detect.get_hardware_profile()
+
+        mock.assert_not_called()
+        assert profile.vendor == "nvidia"
+        assert get_model_tier() == "tier_16gb"
+
+    def test_file_override(self, monkeypatch, tmp_path):
+        """Test that GPU_PROFILE_FILE pins the profile."""
+        path = tmp_path / "gpu.json"
+        path.write_text('{"vendor": "amd", "vram_gb": 8, "name": "RX 7600"}')
+        monkeypatch.setenv("GPU_PROFILE_FILE", str(path))
+        with patch("runner.agents.gpu_detect.detect_gpu") as mock:
+            profile = gpu_detect.get_hardware_profile()
+
+        mock.assert_not_called()
+        assert profile == GPUInfo(vendor="amd", vram_gb=8.0, name="RX 7600")
+
+    def test_unreadable_file_falls_back_to_probe(self, monkeypatch, tmp_path):
+        """Test that a bad override file doesn't break detection."""
+        monkeypatch.setenv("GPU_PROFILE_FILE", str(tmp_path / "missing.json"))
+        with patch("runner.agents.gpu_detect.detect_gpu") as mock:
+            mock.return_value = GPUInfo(vendor="none", vram_gb=0.0)
+            profile = gpu_detect.get_hardware_profile()
+
+        assert profile.vendor == "none"
+
+    def test_refresh_reprobes(self):
+        """Test that refresh_hardware_profile replaces the cached profile."""
+        with patch("runner.agents.gpu_detect.detect_gpu") as mock:
+            mock.return_value = GPUInfo(vendor="none", vram_gb=0.0)
+            gpu_detect.get_hardware_profile()
+            mock.return_value = GPUInfo(vendor="nvidia", vram_gb=48)
+            gpu_detect.refresh_hardware_profile()
+
+        assert gpu_detect.get_hardware_profile().vram_gb == 48
+
+
 class TestFileBasedSession:
     """Tests for file-based session manager."""
 
@@ -198,6 +261,74 @@ class TestFileBasedSession:
         assert "session-2" in sessions
         assert "session-3" in sessions
 
+    def test_add_message_appends_one_line(self, tmp_path):
+        """Test that adding a message appends instead of rewriting."""
+        manager = FileBasedSessionManager(str(tmp_path))
+        manager.create_session("test-session")
+        path = tmp_path / "test-session.jsonl"
+
+        manager.add_message("user", "Hello")
+        before = path.read_bytes()
+        manager.add_message("assistant", "Hi")
+        after = path.read_bytes()
+
+        assert after.startswith(before)
+        assert after.count(b"\n") == before.count(b"\n") + 1
+
+    def test_compaction_bounds_log_and_keeps_total_tokens(self, tmp_path):
+        """Test that compaction trims the log without losing token totals."""
+        manager = FileBasedSessionManager(str(tmp_path), max_messages=3)
+        manager.create_session("test-session")
+        manager.add_system_message("Be brief.")
+        for i in range(20):
+            manager.add_message("user", f"Message {i}", {"total": 5})
+
+        lines = (tmp_path / "test-session.jsonl").read_text().splitlines()
+        assert len(lines) <= 1 + 3 * 2
+
+        reloaded = FileBasedSessionManager(str(tmp_path), max_messages=3)
+        session = reloaded.load_session("test-session")
+        assert session["total_tokens"] == 100
+        assert [m["content"] for m in session["messages"]] == [
+            "Be brief.",
+            "Message 18",
+            "Message 19",
+        ]
+
+    def test_sees_messages_appended_by_other_manager(self, tmp_path):
+        """Test that the cache picks up appends from another manager."""
+        first = FileBasedSessionManager(str(tmp_path))
+        first.create_session("shared")
+        second = FileBasedSessionManager(str(tmp_path))
+        second.load_session("shared")
+
+        second.add_message("user", "from second")
+
+        assert first.get_context_for_ollama() == [
+            {"role": "user", "content": "from second"}
+        ]
+
+    def test_imports_legacy_json_session(self, tmp_path):
+        """Test that sessions in the older JSON format still load."""
+        legacy = {
+            "session_id": "old",
+            "created_at": "2025-01-01T00:00:00",
+            "messages": [
+                {"role": "user", "content": "Hello", "tokens": {"total": 4}},
+            ],
+            "total_tokens": 10,
+        }
+        (tmp_path / "old.json").write_text(json.dumps(legacy))
+        manager = FileBasedSessionManager(str(tmp_path))
+
+        session = manager.load_session("old")
+        manager.add_message("assistant", "Hi", {"total": 2})
+
+        assert session["messages"][0]["content"] == "Hello"
+        assert manager.get_total_tokens() == 12
+        assert not (tmp_path / "old.json").exists()
+        assert manager.list_sessions() == ["old"]
+
     def test_has_session(self, tmp_path):
         """Test has_session check."""
         manager = FileBasedSessionManager(str(tmp_path))
@@ -220,7 +351,7 @@ class TestOllamaAgent:
     @pytest.fixture
     def mock_gpu(self):
         """Mock GPU detection."""
-        with patch("runner.agents.ollama.detect_gpu") as mock:
+        with patch("runner.agents.ollama.get_hardware_profile") as mock:
             mock.return_value = GPUInfo(vendor="nvidia", vram_gb=24)
             yield mock
 
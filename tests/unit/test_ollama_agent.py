@@ -45,7 +45,7 @@ class TestOllamaAgent:
             "timeout": 300,
         }
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_init_with_config(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -59,7 +59,7 @@ class TestOllamaAgent:
         assert agent.timeout == 300
         assert agent.tier == "tier_48gb"
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_model_from_config(self, mock_session, mock_tier, mock_gpu, tmp_path):
@@ -72,7 +72,7 @@ class TestOllamaAgent:
 
         assert agent.model == "llama3.1:8b"
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_custom_model_passes_through(self, mock_session, mock_tier, mock_gpu, tmp_path):
@@ -85,7 +85,7 @@ class TestOllamaAgent:
 
         assert agent.model == "custom:latest"
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_get_model_for_persona(self, mock_session, mock_tier, mock_gpu, tmp_path):
@@ -103,7 +103,7 @@ class TestOllamaAgent:
         coder_model = agent.get_model_for_persona("coder", "coder")
         assert coder_model == MODEL_TIERS["tier_48gb"]["models"]["coder"]
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_cost_is_zero(self, mock_session, mock_tier, mock_gpu, tmp_path):
@@ -116,7 +116,7 @@ class TestOllamaAgent:
         assert agent.cost_per_1k["input"] == 0.0
         assert agent.cost_per_1k["output"] == 0.0
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -152,7 +152,7 @@ class TestOllamaAgent:
         assert result.tokens.output_tokens == 50
         assert result.cost_usd == 0.0  # Local = free
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -175,7 +175,7 @@ class TestOllamaAgent:
         assert result.success is False
         assert "timed out" in result.error.lower()
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.get")
@@ -203,7 +203,7 @@ class TestOllamaAgent:
         assert "qwen3:32b" in models
         assert len(models) == 3
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_session_type(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -216,7 +216,7 @@ class TestOllamaAgent:
         assert agent.session_type == "file"
         assert agent.supports_native_session() is False
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_get_gpu_info(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -238,7 +238,7 @@ class TestOllamaAgent:
         assert info["tier"] == "tier_48gb"
 
     @patch.dict("os.environ", {"OLLAMA_HOST": "http://192.168.1.100:11434"})
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_custom_host_from_env(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -259,7 +259,7 @@ class TestOllamaJsonMode:
         """Basic Ollama agent config."""
         return {"model": "llama3.3:70b", "timeout": 300}
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_json_mode_detected_for_auditor_persona(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -278,7 +278,7 @@ content here"""
 
         assert agent._should_use_json_mode(prompt) is True
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_json_mode_detected_for_json_output_instruction(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -297,7 +297,7 @@ content"""
 
         assert agent._should_use_json_mode(prompt) is True
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_json_mode_detected_for_decision_field(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -313,7 +313,7 @@ content"""
 
         assert agent._should_use_json_mode(prompt) is True
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     def test_json_mode_not_detected_for_writer(self, mock_session, mock_tier, mock_gpu, ollama_config, tmp_path):
@@ -332,7 +332,7 @@ story content here"""
 
         assert agent._should_use_json_mode(prompt) is False
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -371,7 +371,7 @@ content"""
         request_body = call_args[1]["json"]
         assert request_body.get("format") == "json"
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -410,7 +410,7 @@ story content"""
         request_body = call_args[1]["json"]
         assert "format" not in request_body
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -454,7 +454,7 @@ class TestOllamaMessageSplitting:
         """Basic Ollama agent config."""
         return {"model": "llama3.3:70b", "timeout": 300}
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -500,7 +500,7 @@ File content here"""
         assert messages[1]["role"] == "user"
         assert "## Input Files" in messages[1]["content"]
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
@@ -545,7 +545,7 @@ Previous context here"""
         assert messages[1]["role"] == "user"
         assert "## Context" in messages[1]["content"]
 
-    @patch("runner.agents.ollama.detect_gpu")
+    @patch("runner.agents.ollama.get_hardware_profile")
     @patch("runner.agents.ollama.get_model_tier")
     @patch("runner.agents.ollama.FileBasedSessionManager")
     @patch("runner.agents.ollama.requests.post")
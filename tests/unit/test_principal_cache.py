@@ -0,0 +1,155 @@
+"""Tests for the verified-principal cache used by AuthMiddleware."""
+
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from starlette.requests import Request
+
+from api.auth.principal_cache import PrincipalCache, principal_cache, principal_key
+from api.middleware.auth import AuthMiddleware
+
+
+def _user():
+    return SimpleNamespace(id=uuid4(), email="a@example.com")
+
+
+class TestPrincipalKey:
+    def test_uses_jti(self):
+        key = principal_key("local", "u1", {"jti": "abc", "iat": 1})
+
+        assert key == ("local", "u1", "abc")
+
+    def test_falls_back_to_iat(self):
+        assert principal_key("clerk", "user_1", {"iat": 1700}) == (
+            "clerk",
+            "user_1",
+            "1700",
+        )
+
+    def test_none_without_token_id(self):
+        assert principal_key("local", "u1", {"sub": "u1"}) is None
+
+
+class TestPrincipalCache:
+    def test_put_and_get(self):
+        cache = PrincipalCache(ttl=30)
+        user = _user()
+        cache.put(("local", "u1", "j1"), user)
+
+        assert cache.get(("local", "u1", "j1")) is user
+
+    def test_entry_expires_with_token(self):
+        cache = PrincipalCache(ttl=30)
+        cache.put(("local", "u1", "j1"), _user(), {"exp": time.time() - 1})
+
+        assert cache.get(("local", "u1", "j1")) is None
+
+    def test_invalidate_user_drops_all_tokens(self):
+        cache = PrincipalCache(ttl=30)
+        user = _user()
+        other = _user()
+        cache.put(("local", "u1", "j1"), user)
+        cache.put(("local", "u1", "j2"), user)
+        cache.put(("local", "u2", "j3"), other)
+
+        cache.invalidate_user(user.id)
+
+        assert cache.get(("local", "u1", "j1")) is None
+        assert cache.get(("local", "u1", "j2")) is None
+        assert cache.get(("local", "u2", "j3")) is other
+
+    def test_load_racing_invalidation_is_not_cached(self):
+        cache = PrincipalCache(ttl=30)
+        user = _user()
+        epoch = cache.epoch
+
+        cache.invalidate_user(user.id)
+        cache.put(("local", "u1", "j1"), user, epoch=epoch)
+
+        assert cache.get(("local", "u1", "j1")) is None
+
+    def test_evicts_oldest_when_full(self):
+        cache = PrincipalCache(ttl=30, max_entries=2)
+        for jti in ("j1", "j2", "j3"):
+            cache.put(("local", "u1", jti), _user())
+
+        assert len(cache) == 2
+        assert cache.get(("local", "u1", "j1")) is None
+
+    def test_zero_ttl_disables_cache(self):
+        cache = PrincipalCache(ttl=0)
+        cache.put(("local", "u1", "j1"), _user())
+
+        assert cache.get(("local", "u1", "j1")) is None
+
+
+class TestAuthMiddlewareCache:
+    @pytest.fixture(autouse=True)
+    def clear_cache(self):
+        principal_cache.clear()
+        yield
+        principal_cache.clear()
+
+    def _request(self):
+        return Request(
+            {
+                "type": "http",
+                "method": "GET",
+                "path": "/api/items/1",
+                "headers": [(b"authorization", b"Bearer token")],
+                "query_string": b"",
+            }
+        )
+
+    @pytest.mark.asyncio
+    async def test_second_request_skips_user_load(self):
+        user = _user()
+        provider = MagicMock()
+        provider.name = "local"
+        provider.verify_token = AsyncMock(
+            return_value=SimpleNamespace(
+                valid=True, user_id="u1", raw_claims={"sub": "u1", "jti": "j1"}
+            )
+        )
+        provider.get_or_create_user = AsyncMock(return_value=user)
+        middleware = AuthMiddleware(None)
+
+        with (
+            patch("api.middleware.auth.get_provider", return_value=provider),
+            patch("api.middleware.auth.Session") as session_cls,
+        ):
+            first, second = self._request(), self._request()
+            await middleware.resolve(first)
+            await middleware.resolve(second)
+
+        assert first.state.user is user
+        assert second.state.user is user
+        assert provider.verify_token.await_count == 2
+        assert provider.get_or_create_user.await_count == 1
+        assert session_cls.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalidated_user_is_reloaded(self):
+        user = _user()
+        provider = MagicMock()
+        provider.name = "local"
+        provider.verify_token = AsyncMock(
+            return_value=SimpleNamespace(
+                valid=True, user_id="u1", raw_claims={"sub": "u1", "jti": "j1"}
+            )
+        )
+        provider.get_or_create_user = AsyncMock(return_value=user)
+        middleware = AuthMiddleware(None)
+
+        with (
+            patch("api.middleware.auth.get_provider", return_value=provider),
+            patch("api.middleware.auth.Session"),
+        ):
+            await middleware.resolve(self._request())
+            principal_cache.invalidate_user(user.id)
+            await middleware.resolve(self._request())
+
+        assert provider.get_or_create_user.await_count == 2
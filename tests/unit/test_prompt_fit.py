@@ -0,0 +1,177 @@
+"""Tests for pre-flight prompt estimates and context-window fitting."""
+
+import pytest
+from unittest.mock import patch
+
+from runner.agents.claude_api import ClaudeAPIAgent
+from runner.metrics import TokenTracker, estimate_tokens
+from runner.prompt_fit import PromptSection, fit_prompt
+from runner.state_machine import StateMachine
+from tests.conftest import MockAgent
+
+
+@pytest.fixture(autouse=True)
+def heuristic_estimator():
+    """Use the character-count estimator (no tokenizer download in tests)."""
+    with patch("runner.metrics.estimate._get_encoding", return_value=None):
+        yield
+
+
+class BudgetAgent(MockAgent):
+    """Mock agent with a context window."""
+
+    TOKENIZER_FAMILY = "generic"
+
+    def __init__(self, responses, budget):
+        super().__init__(responses)
+        self.budget = budget
+
+    def prompt_token_budget(self) -> int:
+        return self.budget
+
+
+class TestEstimateTokens:
+    def test_heuristic_fallback(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("x" * 35) == 10
+        assert estimate_tokens("x" * 36) == 11
+
+    def test_tokenizer_scaled_by_family(self):
+        class FakeEncoding:
+            def encode_ordinary(self, text):
+                return text.split()
+
+        with patch(
+            "runner.metrics.estimate._get_encoding", return_value=FakeEncoding()
+        ):
+            assert estimate_tokens("a b c d e f g h i j", "openai") == 10
+            assert estimate_tokens("a b c d e f g h i j", "claude") == 12
+
+
+class TestFitPrompt:
+    def test_under_budget_unchanged(self):
+        sections = [PromptSection("a", "alpha"), PromptSection("b", "beta")]
+
+        fitted = fit_prompt(sections, budget=1000)
+
+        assert fitted.prompt == "alpha\n\nbeta"
+        assert fitted.trimmed == []
+        assert fitted.fits
+
+    def test_lowest_priority_trimmed_first(self):
+        sections = [
+            PromptSection("persona", "p" * 350, required=True),
+            PromptSection("input", "i" * 3500, priority=1),
+            PromptSection("feedback", "f" * 700, priority=3),
+        ]
+
+        fitted = fit_prompt(sections, budget=800)
+
+        assert fitted.trimmed == ["input"]
+        assert fitted.fits
+        assert "f" * 700 in fitted.prompt
+        assert "omitted to fit the context window" in fitted.prompt
+
+    def test_small_remainder_dropped(self):
+        sections = [
+            PromptSection("persona", "p" * 3500, required=True),
+            PromptSection("input:notes.md", "i" * 3500, priority=1),
+        ]
+
+        fitted = fit_prompt(sections, budget=1050)
+
+        assert fitted.trimmed == ["input:notes.md"]
+        assert fitted.prompt.endswith(
+            "[input:notes.md omitted to fit the context window]"
+        )
+        assert fitted.fits
+
+    def test_required_sections_never_trimmed(self):
+        sections = [
+            PromptSection("persona", "p" * 7000, required=True),
+            PromptSection("input", "i" * 350, priority=1),
+        ]
+
+        fitted = fit_prompt(sections, budget=1000)
+
+        assert "p" * 7000 in fitted.prompt
+        assert not fitted.fits
+
+
+class TestPromptBudget:
+    def test_reserve_from_max_tokens(self):
+        agent = ClaudeAPIAgent.__new__(ClaudeAPIAgent)
+        agent.config = {"max_tokens": 8000}
+        agent.context_window = 200000
+
+        assert agent.prompt_token_budget() == 192000
+
+    def test_small_window_keeps_most_for_prompt(self):
+        agent = ClaudeAPIAgent.__new__(ClaudeAPIAgent)
+        agent.config = {}
+        agent.context_window = 4096
+
+        assert agent.prompt_token_budget() == 3072
+
+
+class TestStateMachinePromptFitting:
+    def _config(self, tmp_path):
+        return {
+            "states": {
+                "start": {"type": "initial", "next": "review"},
+                "review": {
+                    "type": "single",
+                    "agent": "reviewer",
+                    "input": str(tmp_path / "draft.md"),
+                    "output": str(tmp_path / "review.md"),
+                    "transitions": {"success": "complete", "failure": "halt"},
+                },
+                "complete": {"type": "terminal"},
+                "halt": {"type": "terminal", "error": True},
+            },
+            "settings": {"timeout_per_agent": 30},
+        }
+
+    def test_oversized_input_trimmed(self, tmp_path):
+        (tmp_path / "draft.md").write_text("word " * 20000)
+        agent = BudgetAgent(["ok"], budget=3000)
+        logs = []
+        sm = StateMachine(
+            self._config(tmp_path), agents={"reviewer": agent}, log_callback=logs.append
+        )
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "complete"
+        assert estimate_tokens(agent.prompts_received[0]) <= 3000
+        estimate = sm.token_tracker.get_estimate("reviewer", "review")
+        assert estimate.trimmed_sections == [f"input:{tmp_path / 'draft.md'}"]
+        assert sm.token_tracker.get_summary().prompts_trimmed == 1
+        assert any(log.get("type") == "prompt_trimmed" for log in logs)
+
+    def test_prompt_that_cannot_fit_not_sent(self, tmp_path):
+        (tmp_path / "draft.md").write_text("short draft")
+        agent = BudgetAgent(["ok"], budget=10)
+        sm = StateMachine(self._config(tmp_path), agents={"reviewer": agent})
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "halt"
+        assert agent.call_count == 0
+        assert sm.token_tracker.get_summary().prompts_over_budget == 1
+
+
+class TestRecordEstimate:
+    def test_latest_estimate_per_agent_and_state(self):
+        tracker = TokenTracker("run-001")
+
+        tracker.record_estimate("claude", "draft", 500, 1000)
+        tracker.record_estimate("claude", "draft", 1500, 1000, ["input:a.md"])
+
+        estimate = tracker.get_estimate("claude", "draft")
+        assert estimate.estimated_tokens == 1500
+        assert not estimate.fits
+        assert tracker.get_summary().prompts_trimmed == 1
+        assert tracker.get_summary().prompts_over_budget == 1
@@ -0,0 +1,174 @@
+"""Tests for the single-pass request pipeline middleware."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from uuid import uuid4
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.responses import StreamingResponse
+from httpx import ASGITransport, AsyncClient
+
+from api.middleware.metrics import MetricsMiddleware, route_template
+from api.middleware.pipeline import RequestPipelineMiddleware
+
+
+def _app(usage_service=None):
+    app = FastAPI()
+    app.add_middleware(
+        RequestPipelineMiddleware, usage_service=usage_service or MagicMock()
+    )
+
+    @app.get("/api/health")
+    async def health(request: Request):
+        return {"user": request.state.user}
+
+    @app.get("/api/items/{item_id}")
+    async def item(item_id: str, request: Request):
+        user = request.state.user
+        return {"user": user.email if user else None}
+
+    @app.post("/api/v1/w/{workspace_id}/posts")
+    async def create_post(workspace_id: str, request: Request):
+        return {"workspace_id": str(request.state.workspace_id)}
+
+    @app.get("/api/stream")
+    async def stream():
+        async def chunks():
+            for i in range(3):
+                yield f"chunk-{i}\n"
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    return app
+
+
+async def _request(app, method, path, host="testserver", **kwargs):
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url=f"http://{host}") as client:
+        return await client.request(method, path, **kwargs)
+
+
+class TestRequestPipeline:
+    @pytest.mark.asyncio
+    async def test_public_route_gets_initialized_state(self):
+        response = await _request(_app(), "GET", "/api/health")
+
+        assert response.status_code == 200
+        assert response.json() == {"user": None}
+
+    @pytest.mark.asyncio
+    async def test_resolves_user_from_bearer_token(self):
+        provider = MagicMock()
+        provider.name = "local"
+        provider.verify_token = AsyncMock(
+            return_value=SimpleNamespace(
+                valid=True, user_id="u1", raw_claims={"sub": "u1"}
+            )
+        )
+        provider.get_or_create_user = AsyncMock(
+            return_value=SimpleNamespace(id=uuid4(), email="a@example.com")
+        )
+
+        with (
+            patch("api.middleware.auth.get_provider", return_value=provider),
+            patch("api.middleware.auth.Session"),
+        ):
+            response = await _request(
+                _app(),
+                "GET",
+                "/api/items/1",
+                headers={"Authorization": "Bearer token"},
+            )
+
+        assert response.json() == {"user": "a@example.com"}
+
+    @pytest.mark.asyncio
+    async def test_workspace_route_without_user_is_401(self):
+        response = await _request(_app(), "POST", f"/api/v1/w/{uuid4()}/posts")
+
+        assert response.status_code == 401
+        assert response.json()["error"]["code"] == "AUTHENTICATION_FAILED"
+
+    @pytest.mark.asyncio
+    async def test_usage_limit_short_circuits_route(self):
+        workspace_id = uuid4()
+        usage_service = MagicMock()
+        usage_service.check_limit.return_value = (False, 10, 10)
+
+        async def resolve_workspace(self, request):
+            request.state.workspace_id = workspace_id
+
+        with patch(
+            "api.middleware.workspace.WorkspaceMiddleware.resolve", resolve_workspace
+        ):
+            response = await _request(
+                _app(usage_service), "POST", f"/api/v1/w/{workspace_id}/posts"
+            )
+
+        assert response.status_code == 402
+        assert response.json()["error_code"] == "POST_LIMIT_EXCEEDED"
+
+    @pytest.mark.asyncio
+    async def test_unknown_custom_domain_is_404(self):
+        with patch(
+            "api.middleware.custom_domain.CustomDomainMiddleware._lookup_workspace_by_domain",
+            AsyncMock(return_value=None),
+        ):
+            response = await _request(
+                _app(), "GET", "/api/health", host="unknown.example.org"
+            )
+
+        assert response.status_code == 404
+        assert response.json()["error"] == "custom_domain_not_found"
+
+    @pytest.mark.asyncio
+    async def test_streams_response_body(self):
+        response = await _request(_app(), "GET", "/api/stream")
+
+        assert response.text == "chunk-0\nchunk-1\nchunk-2\n"
+
+    @pytest.mark.asyncio
+    async def test_records_metrics_by_route_template(self):
+        pytest.importorskip("prometheus_client")
+        with patch("api.middleware.pipeline.record_request") as record:
+            await _request(_app(), "GET", "/api/items/42")
+
+        method, path, status_code, _ = record.call_args.args
+        assert (method, path, status_code) == ("GET", "/api/items/{item_id}", 200)
+
+    @pytest.mark.asyncio
+    async def test_records_stage_self_time(self):
+        pytest.importorskip("prometheus_client")
+        with patch("api.middleware.pipeline.record_stage") as record:
+            await _request(_app(), "GET", "/api/health")
+
+        stages = [call.args[0] for call in record.call_args_list]
+        assert stages == ["domain", "auth", "workspace", "usage", "metrics"]
+
+
+class TestRouteTemplate:
+    def test_uses_matched_route(self):
+        route = SimpleNamespace(path="/api/items/{item_id}")
+
+        assert route_template({"route": route, "path": "/api/items/42"}) == (
+            "/api/items/{item_id}"
+        )
+
+    def test_falls_back_to_path_without_route(self):
+        assert route_template({"path": "/nowhere"}) == "/nowhere"
+
+    @pytest.mark.asyncio
+    async def test_standalone_middleware_labels_by_template(self):
+        pytest.importorskip("prometheus_client")
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/api/items/{item_id}")
+        async def item(item_id: str):
+            return {}
+
+        with patch("api.middleware.metrics.record_request") as record:
+            await _request(app, "GET", "/api/items/42")
+
+        assert record.call_args.args[1] == "/api/items/{item_id}"
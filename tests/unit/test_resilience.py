@@ -1,9 +1,12 @@
 """Tests for resilience utilities."""
 
 import asyncio
+import time
 
-from runner.resilience.fallback import FallbackChain
+from runner.observability.metrics import MetricsCollector
+from runner.resilience.fallback import FallbackChain, HedgePolicy
 from runner.resilience.rate_limit import RateLimiter
+from runner.resilience.retry import RetryPolicy
 
 
 class FailingAgent:
@@ -51,3 +54,144 @@ def test_fallback_chain_not_degraded_on_first_success():
     assert result.model_used == "ok"
     assert result.degraded is False
     assert result.attempts == [{"model": "ok", "success": True}]
+
+
+class DelayedAgent:
+    """Fake agent answering after an injected delay."""
+
+    def __init__(self, name: str, delay: float, fail: bool = False):
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = False
+
+    async def invoke(self, prompt: str, **kwargs):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.fail:
+            raise RuntimeError(f"{self.name} failed")
+        return f"{self.name}:{prompt}"
+
+
+def _warm_metrics(model: str, latency_ms: float, samples: int = 20) -> MetricsCollector:
+    metrics = MetricsCollector()
+    for _ in range(samples):
+        metrics.record_latency(model, latency_ms)
+    return metrics
+
+
+def test_hedge_wins_when_primary_is_slow():
+    primary = DelayedAgent("primary", delay=1.0)
+    backup = DelayedAgent("backup", delay=0.01)
+    chain = FallbackChain(
+        [("primary", primary), ("backup", backup)],
+        hedge_policy=HedgePolicy(percentile=95, min_delay_ms=10),
+        metrics=_warm_metrics("primary", 20),
+    )
+
+    started = time.monotonic()
+    result = asyncio.run(chain.invoke("hello", run_id="run-1"))
+
+    assert time.monotonic() - started < 0.5
+    assert result.success is True
+    assert result.model_used == "backup"
+    assert result.hedged is True
+    assert result.degraded is True
+    assert result.cancelled == ["primary"]
+    assert primary.cancelled is True
+    assert chain.hedges_used("run-1") == 1
+
+
+def test_no_hedge_when_primary_is_fast():
+    primary = DelayedAgent("primary", delay=0.01)
+    backup = DelayedAgent("backup", delay=0.01)
+    chain = FallbackChain(
+        [("primary", primary), ("backup", backup)],
+        hedge_policy=HedgePolicy(min_delay_ms=10),
+        metrics=_warm_metrics("primary", 200),
+    )
+
+    result = asyncio.run(chain.invoke("hello"))
+
+    assert result.model_used == "primary"
+    assert result.hedged is False
+    assert result.degraded is False
+    assert backup.calls == 0
+
+
+def test_hedge_budget_limits_duplicates():
+    primary = DelayedAgent("primary", delay=0.1)
+    backup = DelayedAgent("backup", delay=0.01)
+    chain = FallbackChain(
+        [("primary", primary), ("backup", backup)],
+        hedge_policy=HedgePolicy(min_delay_ms=10, max_hedges=1),
+        metrics=_warm_metrics("primary", 20),
+    )
+
+    first = asyncio.run(chain.invoke("a", run_id="run-1"))
+    second = asyncio.run(chain.invoke("b", run_id="run-1"))
+
+    assert first.model_used == "backup"
+    assert second.model_used == "primary"
+    assert second.hedged is False
+    assert backup.calls == 1
+
+
+def test_hedge_budget_is_per_run():
+    primary = DelayedAgent("primary", delay=0.1)
+    backup = DelayedAgent("backup", delay=0.01)
+    chain = FallbackChain(
+        [("primary", primary), ("backup", backup)],
+        hedge_policy=HedgePolicy(min_delay_ms=10, max_hedges=1),
+        # Enough samples that the unhedged calls don't move the p95
+        metrics=_warm_metrics("primary", 20, samples=100),
+    )
+
+    for run_id in ("run-1", "run-2"):
+        assert asyncio.run(chain.invoke("a", run_id=run_id)).hedged is True
+        assert asyncio.run(chain.invoke("b", run_id=run_id)).hedged is False
+
+    assert chain.hedges_used("run-1") == 1
+    assert chain.hedges_used("run-2") == 1
+    # Calls outside a run each get their own budget
+    assert asyncio.run(chain.invoke("c")).hedged is True
+    assert asyncio.run(chain.invoke("d")).hedged is True
+
+
+def test_no_hedge_without_latency_history():
+    primary = DelayedAgent("primary", delay=0.05)
+    backup = DelayedAgent("backup", delay=0.01)
+    chain = FallbackChain(
+        [("primary", primary), ("backup", backup)],
+        hedge_policy=HedgePolicy(min_samples=20),
+        metrics=MetricsCollector(),
+    )
+
+    result = asyncio.run(chain.invoke("hello"))
+
+    assert result.model_used == "primary"
+    assert backup.calls == 0
+    # The call itself feeds the latency history
+    assert chain.metrics.get_latency_percentile("primary", 50) >= 50
+
+
+def test_hedged_chain_falls_back_on_failure():
+    primary = DelayedAgent("primary", delay=0.01, fail=True)
+    backup = DelayedAgent("backup", delay=0.01)
+    chain = FallbackChain(
+        [("primary", primary), ("backup", backup)],
+        retry_policy=RetryPolicy(max_retries=0),
+        hedge_policy=HedgePolicy(),
+        metrics=MetricsCollector(),
+    )
+
+    result = asyncio.run(chain.invoke("hello"))
+
+    assert result.model_used == "backup"
+    assert result.hedged is False
+    assert [a["success"] for a in result.attempts] == [False, True]
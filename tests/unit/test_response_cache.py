@@ -0,0 +1,258 @@
+"""Tests for the prompt-level LLM response cache."""
+
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from runner.models import TokenUsage
+from runner.response_cache import (
+    DEFAULT_TTL,
+    ResponseCache,
+    build_entry,
+    cache_ttl_for_state,
+    make_cache_key,
+)
+from runner.state_machine import StateMachine
+from tests.conftest import MockAgent
+
+
+def _entry(content="ok", ttl=60):
+    return build_entry(
+        "model-a", content, TokenUsage(input_tokens=10, output_tokens=5), 0.01, ttl
+    )
+
+
+class TestCacheKey:
+    """Tests for cache key construction."""
+
+    def test_stable_for_identical_inputs(self):
+        """Same model, prompt and params produce the same key."""
+        assert make_cache_key("m", "prompt", {"temperature": 0, "max_tokens": 10}) == (
+            make_cache_key("m", "prompt", {"max_tokens": 10, "temperature": 0})
+        )
+
+    def test_varies_with_each_component(self):
+        """Changing the model, prompt or params changes the key."""
+        base = make_cache_key("m", "prompt", {"temperature": 0})
+
+        assert make_cache_key("other", "prompt", {"temperature": 0}) != base
+        assert make_cache_key("m", "prompt!", {"temperature": 0}) != base
+        assert make_cache_key("m", "prompt", {"temperature": 0.7}) != base
+
+
+class TestCacheTtlForState:
+    """Tests for reading the per-state cache setting."""
+
+    @pytest.mark.parametrize(
+        "state_config,expected",
+        [
+            ({}, None),
+            ({"cache": False}, None),
+            ({"cache": True}, DEFAULT_TTL),
+            ({"cache": {"ttl": 60}}, 60),
+            ({"cache": {"ttl": 0}}, None),
+            ({"cache": {"enabled": False, "ttl": 60}}, None),
+        ],
+    )
+    def test_settings(self, state_config, expected):
+        assert cache_ttl_for_state(state_config) == expected
+
+
+class TestResponseCache:
+    """Tests for the in-memory LRU and database tier."""
+
+    def test_put_then_get(self):
+        cache = ResponseCache()
+        cache.put("k", _entry("hello"))
+
+        assert cache.get("k").content == "hello"
+        assert cache.hits == 1
+
+    def test_expired_entry_is_miss(self):
+        cache = ResponseCache()
+        cache.put("k", _entry(ttl=-1))
+
+        assert cache.get("k") is None
+        assert cache.misses == 1
+
+    def test_evicts_least_recently_used(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", _entry("a"))
+        cache.put("b", _entry("b"))
+        cache.get("a")
+        cache.put("c", _entry("c"))
+
+        assert cache.get("b") is None
+        assert cache.get("a").content == "a"
+        assert cache.get("c").content == "c"
+
+    def test_falls_back_to_backend(self):
+        """Memory misses are served from the backend and then kept in memory."""
+        cache = ResponseCache()
+        backend = MagicMock()
+        backend.get_cached_response.return_value = SimpleNamespace(
+            model="model-a",
+            content="from db",
+            tokens_input=10,
+            tokens_output=5,
+            cost_usd=0.01,
+            expires_at=datetime.utcnow() + timedelta(hours=1),
+        )
+
+        assert cache.get("k", backend=backend).content == "from db"
+        assert cache.get("k", backend=backend).content == "from db"
+        backend.get_cached_response.assert_called_once_with("k")
+
+    def test_backend_errors_are_misses(self):
+        cache = ResponseCache()
+        backend = MagicMock()
+        backend.get_cached_response.side_effect = RuntimeError("db down")
+        backend.save_cached_response.side_effect = RuntimeError("db down")
+
+        cache.put("k", _entry(), backend=backend)
+        cache.clear()
+
+        assert cache.get("k", backend=backend) is None
+
+    def test_put_writes_through_to_backend(self):
+        cache = ResponseCache()
+        backend = MagicMock()
+
+        cache.put("k", _entry("hello"), backend=backend, state_name="story-review")
+
+        kwargs = backend.save_cached_response.call_args.kwargs
+        assert kwargs["cache_key"] == "k"
+        assert kwargs["content"] == "hello"
+        assert kwargs["state_name"] == "story-review"
+        assert kwargs["expires_at"] > datetime.utcnow()
+
+
+class TestStateMachineCaching:
+    """Tests that cached states skip provider calls."""
+
+    @pytest.fixture
+    def config(self, tmp_path):
+        def build(cache):
+            review = {
+                "type": "single",
+                "agent": "claude",
+                "output": str(tmp_path / "review.md"),
+                "transitions": {"success": "complete"},
+            }
+            if cache is not None:
+                review["cache"] = cache
+            return {
+                "states": {
+                    "start": {"type": "initial", "next": "review"},
+                    "review": review,
+                    "complete": {"type": "terminal"},
+                },
+                "settings": {"timeout_per_agent": 30},
+            }
+
+        return build
+
+    def _run(self, config, agent):
+        sm = StateMachine(config, agents={"claude": agent})
+        sm.initialize(f"run-{time.monotonic_ns()}")
+        result = sm.run()
+        return sm, result
+
+    def test_repeat_run_skips_provider(self, config):
+        agent = MockAgent(["Looks good"])
+        with patch("runner.state_machine.response_cache", ResponseCache()):
+            self._run(config({"ttl": 60}), agent)
+            sm, result = self._run(config({"ttl": 60}), agent)
+
+        assert result["final_state"] == "complete"
+        assert agent.call_count == 1
+        summary = sm.token_tracker.get_summary()
+        assert summary.cache_hits == 1
+        assert summary.total_tokens == 0
+        assert summary.total_cost_usd == 0
+
+    def test_uncached_state_always_invokes(self, config):
+        agent = MockAgent(["Looks good"])
+        with patch("runner.state_machine.response_cache", ResponseCache()):
+            self._run(config(None), agent)
+            sm, _ = self._run(config(None), agent)
+
+        assert agent.call_count == 2
+        assert sm.token_tracker.get_summary().cache_hits == 0
+
+
+class TestAuditOutputCaching:
+    """Tests that audit outputs are only cached once they validate."""
+
+    VALID = '{"score": 9, "decision": "proceed", "feedback": "Good"}'
+
+    @pytest.fixture
+    def sm(self, tmp_path):
+        def build(agent):
+            config = {
+                "states": {
+                    "start": {"type": "initial", "next": "review"},
+                    "review": {
+                        "type": "single",
+                        "agent": "claude",
+                        "output_type": "audit",
+                        "cache": {"ttl": 60},
+                        "transitions": {"proceed": "complete"},
+                    },
+                    "complete": {"type": "terminal"},
+                },
+                "settings": {"timeout_per_agent": 30},
+            }
+            machine = StateMachine(config, agents={"claude": agent})
+            machine.initialize(f"run-{time.monotonic_ns()}")
+            return machine
+
+        return build
+
+    def _call(self, sm, tmp_path):
+        return sm._call_agent("claude", "Review this", str(tmp_path / "r.md"), "review")
+
+    @pytest.mark.parametrize(
+        "invalid",
+        ["Looks fine to me", '{"score": 9, "decision": "ship it"}'],
+    )
+    def test_invalid_output_not_cached(self, sm, tmp_path, invalid):
+        agent = MockAgent([invalid, self.VALID])
+        cache = ResponseCache()
+        with patch("runner.state_machine.response_cache", cache):
+            machine = sm(agent)
+            self._call(machine, tmp_path)
+            result = self._call(machine, tmp_path)
+
+        assert agent.call_count == 2
+        assert result.content == self.VALID
+        assert cache.hits == 0
+
+    def test_valid_output_cached(self, sm, tmp_path):
+        agent = MockAgent([self.VALID])
+        with patch("runner.state_machine.response_cache", ResponseCache()):
+            machine = sm(agent)
+            self._call(machine, tmp_path)
+            result = self._call(machine, tmp_path)
+
+        assert agent.call_count == 1
+        assert result.content == self.VALID
+
+    def test_invalid_cached_entry_is_miss(self, sm, tmp_path):
+        """Entries stored before validation are replaced, not replayed."""
+        agent = MockAgent([self.VALID])
+        cache = ResponseCache()
+        with patch("runner.state_machine.response_cache", cache):
+            machine = sm(agent)
+            with patch.object(machine, "_cacheable_output", return_value=True):
+                agent.responses = ["not json"]
+                self._call(machine, tmp_path)
+            agent.responses = [self.VALID]
+            self._call(machine, tmp_path)
+            result = self._call(machine, tmp_path)
+
+        assert agent.call_count == 2
+        assert result.content == self.VALID
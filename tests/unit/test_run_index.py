@@ -0,0 +1,74 @@
+"""Tests for the append-only run manifest index."""
+
+import pytest
+import yaml
+
+from runner.run_index import INDEX_FILE, RunIndex
+
+
+def _manifest(run_id, story="post_01", status="complete", hour=0):
+    return {
+        "run_id": run_id,
+        "story": story,
+        "status": status,
+        "started_at": f"2026-01-01T{hour:02d}:00:00",
+    }
+
+
+@pytest.fixture
+def runs_dir(tmp_path):
+    path = tmp_path / "runs"
+    path.mkdir()
+    return path
+
+
+class TestRunIndex:
+    def test_lists_newest_first(self, runs_dir):
+        index = RunIndex(str(runs_dir))
+        index.record(_manifest("a", hour=1))
+        index.record(_manifest("b", hour=3))
+        index.record(_manifest("c", hour=2))
+
+        assert [m["run_id"] for m in index.list_runs()] == ["b", "c", "a"]
+
+    def test_filters_and_pages(self, runs_dir):
+        index = RunIndex(str(runs_dir))
+        for hour in range(6):
+            story = "post_01" if hour % 2 else "post_02"
+            index.record(_manifest(f"run-{hour}", story=story, hour=hour))
+        index.record(_manifest("failed", story="post_01", status="failed", hour=9))
+
+        runs = index.list_runs(story="post_01", status="complete", limit=2, offset=1)
+
+        assert [m["run_id"] for m in runs] == ["run-3", "run-1"]
+
+    def test_latest_record_wins(self, runs_dir):
+        index = RunIndex(str(runs_dir))
+        index.record(_manifest("a", status="running"))
+        index.record(_manifest("a", status="complete"))
+
+        assert index.get("a")["status"] == "complete"
+        assert len(index.list_runs()) == 1
+
+    def test_sees_runs_recorded_by_another_process(self, runs_dir):
+        reader = RunIndex(str(runs_dir))
+        writer = RunIndex(str(runs_dir))
+        reader.list_runs()
+
+        writer.record(_manifest("new"))
+
+        assert reader.get("new") is not None
+
+    def test_backfills_existing_runs(self, runs_dir):
+        for run_id in ("old-1", "old-2"):
+            (runs_dir / run_id).mkdir()
+            with open(runs_dir / run_id / "run_manifest.yaml", "w") as f:
+                yaml.dump(_manifest(run_id), f)
+        (runs_dir / "still-running").mkdir()
+
+        index = RunIndex(str(runs_dir))
+
+        # First read imports legacy manifests into a new index file
+        assert {m["run_id"] for m in index.list_runs()} == {"old-1", "old-2"}
+        assert (runs_dir / INDEX_FILE).exists()
+        assert index.backfill() == 0
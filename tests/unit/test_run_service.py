@@ -0,0 +1,182 @@
+"""Tests for RunService artifact browsing."""
+
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+
+import pytest
+
+from api.services.run_service import RunService
+
+
+def _metadata(state_name, output_type, size_bytes):
+    return SimpleNamespace(
+        state_name=state_name,
+        output_type=output_type,
+        size_bytes=size_bytes,
+        created_at=datetime(2026, 1, 1),
+    )
+
+
+class TestListArtifacts:
+    """Tests for metadata-only artifact listing."""
+
+    def test_uses_metadata_projection(self, tmp_path):
+        """Listing reads sizes from the projection, never output bodies."""
+        store = MagicMock()
+        store.get_workflow_output_metadata.return_value = [
+            _metadata("draft", "draft", 120),
+            _metadata("draft", "draft", 300),
+            _metadata("final", "final", 42),
+        ]
+        service = RunService(runs_dir=str(tmp_path), store=store)
+
+        artifacts = service.list_artifacts("run-1")
+
+        assert [(a.name, a.size_bytes) for a in artifacts] == [
+            ("draft_draft.md", 120),
+            ("final_final.md", 42),
+        ]
+        assert artifacts[0].path == "db://run-1/draft/draft"
+        store.get_workflow_outputs.assert_not_called()
+
+
+class TestGetArtifactContent:
+    """Tests for database artifact lookup."""
+
+    def test_direct_lookup(self, tmp_path):
+        """Content is fetched by (run, state, type) in one lookup."""
+        store = MagicMock()
+        store.get_workflow_output.return_value = SimpleNamespace(content="Final post")
+        service = RunService(runs_dir=str(tmp_path), store=store)
+
+        content = service.get_artifact_content("run-1", "db://run-1/final/final")
+
+        assert content == "Final post"
+        store.get_workflow_output.assert_called_once_with("run-1", "final", "final")
+        store.get_workflow_outputs_by_type.assert_not_called()
+
+    def test_missing_output(self, tmp_path):
+        store = MagicMock()
+        store.get_workflow_output.return_value = None
+        service = RunService(runs_dir=str(tmp_path), store=store)
+
+        assert service.get_artifact_content("run-1", "db://run-1/x/final") is None
+
+
+class TestStateLogTail:
+    """Tests for cursor-based state log reads."""
+
+    def _service(self, tmp_path, lines):
+        run_dir = tmp_path / "run-1"
+        run_dir.mkdir()
+        (run_dir / "state_log.jsonl").write_text(
+            "".join(json.dumps(line) + "\n" for line in lines)
+        )
+        return RunService(runs_dir=str(tmp_path), store=MagicMock()), run_dir
+
+    def test_tail_returns_only_new_entries(self, tmp_path):
+        service, run_dir = self._service(
+            tmp_path, [{"ts": "t1", "run_id": "run-1", "event": "workflow_start"}]
+        )
+        first = service.tail_state_log("run-1")
+        with open(run_dir / "state_log.jsonl", "a") as f:
+            f.write(json.dumps({"ts": "t2", "run_id": "run-1", "event": "transition"}))
+            f.write("\n")
+
+        second = service.tail_state_log("run-1", cursor=first.cursor)
+
+        assert [e.event for e in first.entries] == ["workflow_start"]
+        assert [e.event for e in second.entries] == ["transition"]
+
+    def test_get_state_log_skips_malformed(self, tmp_path):
+        service, _ = self._service(
+            tmp_path,
+            [{"event": "missing ts"}, {"ts": "t1", "run_id": "run-1", "event": "ok"}],
+        )
+
+        assert [e.event for e in service.get_state_log("run-1")] == ["ok"]
+
+    @pytest.mark.asyncio
+    async def test_stream_ends_when_run_finishes(self, tmp_path):
+        service, run_dir = self._service(
+            tmp_path, [{"ts": "t1", "run_id": "run-1", "event": "workflow_complete"}]
+        )
+        (run_dir / "run_manifest.yaml").write_text("run_id: run-1\n")
+
+        events = [event async for event in service.stream_log("run-1")]
+
+        assert events[0].startswith("id: ")
+        assert '"workflow_complete"' in events[0]
+        assert events[-1].startswith("event: end")
+
+    @pytest.mark.asyncio
+    async def test_stream_follows_resumed_run(self, tmp_path):
+        """A resumed run's "running" manifest doesn't end the stream."""
+        service, run_dir = self._service(
+            tmp_path, [{"ts": "t1", "run_id": "run-1", "event": "workflow_resume"}]
+        )
+        manifest = run_dir / "run_manifest.yaml"
+        manifest.write_text("run_id: run-1\nstatus: running\n")
+
+        async def collect():
+            return [event async for event in service.stream_log("run-1")]
+
+        task = asyncio.create_task(collect())
+        await asyncio.sleep(0.1)
+        entry = {"ts": "t2", "run_id": "run-1", "event": "complete"}
+        log = run_dir / "state_log.jsonl"
+        log.write_text(log.read_text() + json.dumps(entry) + "\n")
+        manifest.write_text("run_id: run-1\nstatus: complete\n")
+        events = await asyncio.wait_for(task, timeout=5)
+
+        assert '"workflow_resume"' in events[0]
+        assert '"complete"' in events[1]
+        assert events[-1].startswith("event: end")
+
+
+class TestListRuns:
+    """Tests for database-backed run listing."""
+
+    def test_filters_and_paging_go_to_the_query(self, tmp_path):
+        store = MagicMock()
+        store.get_workflow_runs_for_user.return_value = []
+        service = RunService(runs_dir=str(tmp_path), store=store)
+        user_id = "00000000-0000-0000-0000-000000000001"
+
+        service.list_runs(
+            user_id, limit=10, story="post_01", status="complete", offset=20
+        )
+
+        kwargs = store.get_workflow_runs_for_user.call_args.kwargs
+        assert kwargs == {
+            "limit": 10,
+            "story": "post_01",
+            "status": "complete",
+            "offset": 20,
+        }
+
+
+class TestGetRunFallback:
+    """Tests for legacy runs that only exist on disk."""
+
+    def test_reads_from_manifest_index(self, tmp_path):
+        store = MagicMock()
+        store.get_workflow_run.return_value = None
+        service = RunService(runs_dir=str(tmp_path), store=store)
+        service.run_index.record(
+            {
+                "run_id": "legacy",
+                "story": "post_01",
+                "status": "complete",
+                "started_at": "2026-01-01T00:00:00",
+                "total_cost_usd": 0.5,
+            }
+        )
+
+        run = service.get_run("legacy")
+
+        assert run.story == "post_01"
+        assert run.status == "complete"
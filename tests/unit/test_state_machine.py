@@ -3,10 +3,13 @@
 import pytest
 import os
 import threading
+import time
 from unittest.mock import patch, MagicMock
 
 from runner.state_machine import StateMachine
 from runner.models import TokenUsage, AgentResult
+from runner.observability.metrics import MetricsCollector
+from runner.routing import ModelRouter
 from tests.conftest import MockAgent, FailingAgent
 
 
@@ -1542,3 +1545,644 @@ class TestSynthesizerAuditLoop:
         assert agents["synth"].call_count == 2
         # Auditor should have been called twice
         assert agents["auditor"].call_count == 2
+
+
+class WarmableAgent(MockAgent):
+    """MockAgent that records prompt cache warm-ups."""
+
+    def __init__(self, responses: list[str], model_id: str = "model-a"):
+        super().__init__(responses)
+        self.model_id = model_id
+        self.warmed: list[str] = []
+
+    def warm_prompt_cache(self, prompt: str):
+        self.warmed.append(prompt)
+        return TokenUsage(input_tokens=500, output_tokens=1, cache_write_tokens=500)
+
+    def calculate_cost(self, tokens: TokenUsage) -> float:
+        return 0.0
+
+
+class TestPromptCacheWarming:
+    """Tests for warming provider prompt caches before parallel fan-outs."""
+
+    def _prompts(self):
+        prefix = "PREAMBLE\n\nPersona"
+        return {
+            "a": f"{prefix}\n\n## Input Files\n\nA",
+            "b": f"{prefix}\n\n## Input Files\n\nB",
+        }
+
+    def test_warms_once_per_shared_prefix(self):
+        agents = {"a": WarmableAgent(["x"]), "b": WarmableAgent(["x"])}
+        sm = StateMachine({"states": {}}, agents=agents)
+        sm.initialize("test-run")
+
+        sm._warm_prompt_caches("draft", self._prompts())
+
+        assert len(agents["a"].warmed) + len(agents["b"].warmed) == 1
+        assert sm.token_tracker.get_summary().total_input_tokens == 500
+
+    def test_skips_agents_on_different_models(self):
+        agents = {
+            "a": WarmableAgent(["x"], model_id="model-a"),
+            "b": WarmableAgent(["x"], model_id="model-b"),
+        }
+        sm = StateMachine({"states": {}}, agents=agents)
+        sm.initialize("test-run")
+
+        sm._warm_prompt_caches("draft", self._prompts())
+
+        assert agents["a"].warmed == [] and agents["b"].warmed == []
+
+
+class SlowAuditAgent(MockAgent):
+    """Auditor that blocks until killed (or a safety timeout)."""
+
+    def __init__(self, response: str, delay: float = 5.0):
+        super().__init__([response])
+        self.delay = delay
+        self.killed = threading.Event()
+
+    def invoke(self, prompt, input_files=None):
+        self.killed.wait(self.delay)
+        return super().invoke(prompt, input_files)
+
+    def kill(self):
+        self.killed.set()
+
+
+class KilledAuditAgent(SlowAuditAgent):
+    """Auditor that fails when killed, like a CLI agent whose process ends."""
+
+    def invoke(self, prompt, input_files=None):
+        if self.killed.wait(self.delay):
+            return AgentResult(success=False, content="", error="Killed")
+        return MockAgent.invoke(self, prompt, input_files)
+
+
+AUDIT_RETRY = '{"score": 5, "decision": "retry", "feedback": "Fix it"}'
+AUDIT_PROCEED = '{"score": 9, "decision": "proceed", "feedback": "Good"}'
+AUDIT_HALT = '{"score": 1, "decision": "halt", "feedback": "Fabricated"}'
+
+
+class TestFanoutQuorum:
+    """Tests for quorum-based early termination of audit fan-outs."""
+
+    def _config(self, tmp_path, agents, quorum=None, parallel=True):
+        state = {
+            "type": "fan-out",
+            "agents": agents,
+            "output": str(tmp_path / "audits/{agent}.json"),
+            "output_type": "audit",
+            "transitions": {"proceed": "done", "retry": "done", "halt": "done"},
+        }
+        if quorum:
+            state["quorum"] = quorum
+        return {
+            "states": {"audit": state, "done": {"type": "terminal"}},
+            "settings": {"timeout_per_agent": 30, "parallel_fanout": parallel},
+        }
+
+    def _run_audit(self, config, agents):
+        sm = StateMachine(config, agents=agents)
+        sm.initialize("test-run")
+        return sm._execute_fanout("audit", config["states"]["audit"])
+
+    def test_first_reject_wins_cancels_stragglers(self, tmp_path):
+        agents = {"fast": MockAgent([AUDIT_RETRY]), "slow": SlowAuditAgent(AUDIT_PROCEED)}
+        config = self._config(
+            tmp_path, ["fast", "slow"], quorum={"policy": "first_reject_wins"}
+        )
+
+        start = time.monotonic()
+        result = self._run_audit(config, agents)
+
+        assert time.monotonic() - start < 2
+        assert result.transition == "retry"
+        assert agents["slow"].killed.is_set()
+        assert result.outputs["slow"].status == "cancelled"
+        assert not (tmp_path / "audits/slow.json").exists()
+
+    def test_killed_agent_does_not_trip_circuit(self, tmp_path):
+        """Cancelled calls aren't provider failures for the router."""
+        router = ModelRouter(metrics=MetricsCollector())
+        slow = KilledAuditAgent(AUDIT_PROCEED)
+        config = self._config(
+            tmp_path, ["fast", "slow"], quorum={"policy": "first_reject_wins"}
+        )
+
+        for _ in range(3):
+            slow.killed.clear()
+            agents = {"fast": MockAgent([AUDIT_RETRY]), "slow": slow}
+            sm = StateMachine(config, agents=agents, router=router)
+            sm.initialize("test-run")
+            result = sm._execute_fanout("audit", config["states"]["audit"])
+            assert result.outputs["slow"].status == "cancelled"
+
+        assert router.circuit_state("slow") == "closed"
+        assert router.metrics.get_summary("slow").total_errors == 0
+
+    def test_k_of_n_waits_for_k_rejections(self, tmp_path):
+        agents = {
+            "a": MockAgent([AUDIT_RETRY]),
+            "b": MockAgent([AUDIT_RETRY]),
+            "c": MockAgent([AUDIT_PROCEED]),
+        }
+        config = self._config(
+            tmp_path, ["a", "b", "c"], quorum={"policy": "k_of_n", "k": 2}, parallel=False
+        )
+
+        result = self._run_audit(config, agents)
+
+        assert result.transition == "retry"
+        assert agents["c"].call_count == 0
+
+    def test_k_of_n_below_k_runs_everyone(self, tmp_path):
+        agents = {"a": MockAgent([AUDIT_RETRY]), "b": MockAgent([AUDIT_PROCEED])}
+        config = self._config(
+            tmp_path, ["a", "b"], quorum={"policy": "k_of_n", "k": 2}, parallel=False
+        )
+
+        result = self._run_audit(config, agents)
+
+        assert result.transition == "retry"
+        assert agents["b"].call_count == 1
+
+    def test_halt_short_circuits_any_policy(self, tmp_path):
+        agents = {"a": MockAgent([AUDIT_HALT]), "b": MockAgent([AUDIT_PROCEED])}
+        config = self._config(tmp_path, ["a", "b"], quorum={"policy": "all"}, parallel=False)
+
+        result = self._run_audit(config, agents)
+
+        assert result.transition == "halt"
+        assert agents["b"].call_count == 0
+
+    def test_no_quorum_waits_for_all(self, tmp_path):
+        agents = {"a": MockAgent([AUDIT_HALT]), "b": MockAgent([AUDIT_PROCEED])}
+        config = self._config(tmp_path, ["a", "b"], parallel=False)
+
+        result = self._run_audit(config, agents)
+
+        assert result.transition == "halt"
+        assert agents["b"].call_count == 1
+
+    def test_unknown_policy_rejected(self, tmp_path):
+        config = self._config(tmp_path, ["a"], quorum={"policy": "majority"})
+
+        with pytest.raises(ValueError, match="Unknown quorum policy"):
+            self._run_audit(config, {"a": MockAgent([AUDIT_PROCEED])})
+
+
+class UnkillableAuditAgent(MockAgent):
+    """Auditor with no kill() (like API agents) that blocks until released."""
+
+    def __init__(self, response: str):
+        super().__init__([response])
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.running = False
+
+    def invoke(self, prompt, input_files=None):
+        self.running = True
+        self.started.set()
+        self.release.wait(5)
+        try:
+            return super().invoke(prompt, input_files)
+        finally:
+            self.running = False
+
+    def set_dev_logger(self, *args):
+        pass
+
+    def clear_dev_logger(self):
+        pass
+
+
+def reject_after_started(slow: UnkillableAuditAgent) -> MockAgent:
+    """Rejecting auditor that answers once `slow` is mid-call."""
+    fast = MockAgent([AUDIT_RETRY])
+    invoke = fast.invoke
+
+    def invoke_after_slow_starts(prompt, input_files=None):
+        slow.started.wait(2)
+        return invoke(prompt, input_files)
+
+    fast.invoke = invoke_after_slow_starts
+    fast.set_dev_logger = lambda *args: None
+    fast.clear_dev_logger = lambda: None
+    return fast
+
+
+class TestCancelledFanoutAgents:
+    """Agents still running after a quorum cancel never go back to the pool."""
+
+    def test_running_agent_not_returned_to_pool(self, tmp_path):
+        from runner.agents.factory import AgentPool
+
+        slow = UnkillableAuditAgent(AUDIT_PROCEED)
+        fast = reject_after_started(slow)
+        pool = AgentPool()
+        config = TestFanoutQuorum()._config(
+            tmp_path, ["fast", "slow"], quorum={"policy": "first_reject_wins"}
+        )
+        config["settings"]["cancel_grace_s"] = 0.05
+        created = {"fast": fast, "slow": slow}
+
+        with (
+            patch("runner.state_machine.agent_pool", pool),
+            patch(
+                "runner.agents.factory.create_agent",
+                side_effect=lambda name, *args: created[name],
+            ),
+        ):
+            sm = StateMachine(config)
+            sm.initialize("test-run")
+            result = sm._execute_fanout("audit", config["states"]["audit"])
+            sm.release_agents()
+
+            idle = [a for agents in pool._idle.values() for a in agents]
+            assert result.outputs["slow"].status == "cancelled"
+            assert slow.running
+            assert slow not in idle
+            assert fast in idle
+
+            # A later run gets a fresh agent, not the one still in use
+            created["slow"] = UnkillableAuditAgent(AUDIT_PROCEED)
+            assert pool.acquire("slow", {}) is not slow
+
+        slow.release.set()
+
+
+class TestCancelGracePeriod:
+    """Cancelled fan-out agents get a bounded time to return."""
+
+    def _config(self, tmp_path, grace):
+        config = TestFanoutQuorum()._config(
+            tmp_path, ["fast", "slow"], quorum={"policy": "first_reject_wins"}
+        )
+        config["settings"]["cancel_grace_s"] = grace
+        return config
+
+    def _priced(self, agent, cost):
+        invoke = agent.invoke
+
+        def priced_invoke(prompt, input_files=None):
+            result = invoke(prompt, input_files)
+            result.cost_usd = cost
+            return result
+
+        agent.invoke = priced_invoke
+        return agent
+
+    def test_cancelled_spend_is_counted(self, tmp_path):
+        slow = self._priced(UnkillableAuditAgent(AUDIT_PROCEED), 0.50)
+        agents = {"fast": reject_after_started(slow), "slow": slow}
+        config = self._config(tmp_path, grace=5)
+        sm = StateMachine(config, agents=agents)
+        sm.initialize("test-run")
+        threading.Timer(0.2, slow.release.set).start()
+
+        result = sm._execute_fanout("audit", config["states"]["audit"])
+
+        assert result.outputs["slow"].status == "cancelled"
+        assert not slow.running
+        assert sm.circuit_breaker.total_cost == pytest.approx(0.50)
+        sm.token_tracker.merge()
+        assert sm.token_tracker.get_summary().total_cost_usd == pytest.approx(0.50)
+
+    def test_stragglers_abandoned_after_grace(self, tmp_path):
+        slow = UnkillableAuditAgent(AUDIT_PROCEED)
+        agents = {"fast": reject_after_started(slow), "slow": slow}
+        logs = []
+        config = self._config(tmp_path, grace=0.05)
+        sm = StateMachine(config, agents=agents, log_callback=logs.append)
+        sm.initialize("test-run")
+
+        start = time.monotonic()
+        sm._execute_fanout("audit", config["states"]["audit"])
+
+        assert time.monotonic() - start < 2
+        abandoned = [log for log in logs if log["type"] == "cancelled_agents_abandoned"]
+        assert abandoned[0]["agents"] == ["slow"]
+        slow.release.set()
+
+
+class TestCheckpointResume:
+    """Runs checkpoint after each transition and resume without redoing states."""
+
+    def _config(self, tmp_path):
+        return {
+            "states": {
+                "start": {"type": "initial", "next": "draft"},
+                "draft": {
+                    "type": "single",
+                    "agent": "writer",
+                    "output": "workflow/drafts/draft.md",
+                    "transitions": {"success": "review"},
+                },
+                "review": {
+                    "type": "single",
+                    "agent": "reviewer",
+                    "input": "workflow/drafts/draft.md",
+                    "output": "workflow/review.md",
+                    "transitions": {"success": "complete"},
+                },
+                "complete": {"type": "terminal"},
+                "halt": {"type": "terminal", "error": True},
+            },
+            "settings": {"timeout_per_agent": 30},
+        }
+
+    def _interrupted_run(self, tmp_path):
+        """Run until the transition into review, then stop like a crash."""
+        agents = {"writer": MockAgent(["Draft text"]), "reviewer": MockAgent(["ok"])}
+
+        def stop_before_review(event):
+            if event.get("event") == "transition" and event["to"] == "review":
+                sm.abort()
+
+        sm = StateMachine(
+            self._config(tmp_path),
+            agents=agents,
+            run_dir=str(tmp_path),
+            log_callback=stop_before_review,
+            story="post_01",
+        )
+        sm.initialize("test-run")
+        sm.run()
+        return sm, agents
+
+    def test_checkpoint_saved_after_transition(self, tmp_path):
+        from runner.checkpoint import load_checkpoint
+
+        sm, _ = self._interrupted_run(tmp_path)
+
+        checkpoint = load_checkpoint(str(tmp_path))
+        assert checkpoint.run_id == "test-run"
+        assert checkpoint.story == "post_01"
+        assert checkpoint.next_state == "review"
+        assert checkpoint.outputs == {
+            "draft": {"writer": str(tmp_path / "drafts/draft.md")}
+        }
+        assert checkpoint.circuit_breaker["transition_count"] == 2
+        assert checkpoint.tokens["total_output_tokens"] == 100
+
+    def test_resume_skips_completed_states(self, tmp_path):
+        from runner.checkpoint import load_checkpoint
+
+        _, first_agents = self._interrupted_run(tmp_path)
+        agents = {"writer": MockAgent(["Redraft"]), "reviewer": MockAgent(["ok"])}
+
+        sm = StateMachine(self._config(tmp_path), agents=agents, run_dir=str(tmp_path))
+        missing = sm.restore_checkpoint(load_checkpoint(str(tmp_path)))
+        result = sm.run(sm.current_state)
+
+        assert missing == []
+        assert result["final_state"] == "complete"
+        assert agents["writer"].call_count == 0
+        assert agents["reviewer"].call_count == 1
+        assert "Draft text" in agents["reviewer"].prompts_received[0]
+        # Totals include the calls made before the interruption
+        assert result["token_summary"].total_output_tokens == 200
+        assert sm.circuit_breaker.transition_count == 3
+        # Finished runs leave no checkpoint behind
+        assert load_checkpoint(str(tmp_path)) is None
+
+    def test_restore_reports_missing_outputs(self, tmp_path):
+        from runner.checkpoint import load_checkpoint
+
+        self._interrupted_run(tmp_path)
+        os.remove(tmp_path / "drafts/draft.md")
+
+        sm = StateMachine(self._config(tmp_path), run_dir=str(tmp_path))
+        missing = sm.restore_checkpoint(load_checkpoint(str(tmp_path)))
+
+        assert missing == [str(tmp_path / "drafts/draft.md")]
+
+
+class TestFanoutCostAccounting:
+    """Fan-out agents share cost and token totals without losing updates."""
+
+    def _config(self, tmp_path, max_cost_hard=10.00):
+        return {
+            "states": {
+                "start": {"type": "initial", "next": "draft"},
+                "draft": {
+                    "type": "fan-out",
+                    "agents": ["a", "b", "c"],
+                    "output": str(tmp_path / "{agent}.md"),
+                    "transitions": {
+                        "all_success": "complete",
+                        "partial_success": "complete",
+                        "all_failure": "halt",
+                    },
+                },
+                "complete": {"type": "terminal"},
+                "halt": {"type": "terminal", "error": True},
+            },
+            "circuit_breaker": {
+                "safety_limits": {"max_cost_hard": max_cost_hard},
+            },
+            "settings": {"timeout_per_agent": 30, "parallel_fanout": False},
+        }
+
+    def _priced_agent(self, cost):
+        agent = MockAgent(["draft"])
+        invoke = agent.invoke
+
+        def priced_invoke(prompt, input_files=None):
+            result = invoke(prompt, input_files)
+            result.cost_usd = cost
+            return result
+
+        agent.invoke = priced_invoke
+        return agent
+
+    def test_parallel_totals_match(self, tmp_path):
+        config = self._config(tmp_path)
+        config["settings"]["parallel_fanout"] = True
+        agents = {name: self._priced_agent(0.25) for name in ("a", "b", "c")}
+        sm = StateMachine(config, agents=agents)
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "complete"
+        assert sm.circuit_breaker.total_cost == pytest.approx(0.75)
+        assert result["token_summary"].total_cost_usd == pytest.approx(0.75)
+        assert result["token_summary"].total_output_tokens == 300
+
+    def test_calls_stop_once_hard_cost_limit_reached(self, tmp_path):
+        agents = {name: self._priced_agent(0.60) for name in ("a", "b", "c")}
+        logs = []
+        sm = StateMachine(
+            self._config(tmp_path, max_cost_hard=1.00),
+            agents=agents,
+            log_callback=logs.append,
+        )
+        sm.initialize("test-run")
+
+        sm.run()
+
+        assert agents["a"].call_count == 1
+        assert agents["b"].call_count == 1
+        assert agents["c"].call_count == 0
+        assert sm.circuit_breaker.total_cost == pytest.approx(1.20)
+        assert any(log.get("type") == "cost_limit_reached" for log in logs)
+
+
+
+class TestCostLimitOverride:
+    """A soft cost_limit break that was overridden doesn't block later calls."""
+
+    def _config(self, tmp_path):
+        return {
+            "states": {
+                "start": {"type": "initial", "next": "draft"},
+                "draft": {
+                    "type": "single",
+                    "agent": "writer",
+                    "output": str(tmp_path / "draft.md"),
+                    "transitions": {"success": "audit"},
+                },
+                "audit": {
+                    "type": "single",
+                    "agent": "auditor",
+                    "output": str(tmp_path / "audit.json"),
+                    "output_type": "audit",
+                    "transitions": {
+                        "proceed": "review",
+                        "retry": "draft",
+                        "halt": "halt",
+                    },
+                },
+                "review": {
+                    "type": "single",
+                    "agent": "reviewer",
+                    "output": str(tmp_path / "review.md"),
+                    "transitions": {"success": "complete"},
+                },
+                "complete": {"type": "terminal"},
+                "halt": {"type": "terminal", "error": True},
+            },
+            "circuit_breaker": {
+                "rules": [{"name": "cost_limit", "limit": 1.00}],
+            },
+            "settings": {"timeout_per_agent": 30},
+        }
+
+    def _agents(self, score):
+        auditor = MockAgent(
+            [f'{{"score": {score}, "decision": "proceed", "feedback": "ok"}}']
+        )
+        invoke = auditor.invoke
+
+        def priced_invoke(prompt, input_files=None):
+            result = invoke(prompt, input_files)
+            result.cost_usd = 2.00
+            return result
+
+        auditor.invoke = priced_invoke
+        return {
+            "writer": MockAgent(["draft"]),
+            "auditor": auditor,
+            "reviewer": MockAgent(["review"]),
+        }
+
+    def test_auto_proceed_keeps_calling_agents(self, tmp_path):
+        agents = self._agents(score=9)
+        logs = []
+        sm = StateMachine(self._config(tmp_path), agents=agents, log_callback=logs.append)
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "complete"
+        assert agents["reviewer"].call_count == 1
+        assert any(log.get("event") == "circuit_break_auto_skip" for log in logs)
+        assert not any(log.get("type") == "cost_limit_reached" for log in logs)
+
+    def test_approved_break_keeps_calling_agents(self, tmp_path):
+        agents = self._agents(score=5)
+        approvals = []
+        sm = StateMachine(
+            self._config(tmp_path),
+            agents=agents,
+            approval_callback=approvals.append,
+        )
+        sm.initialize("test-run")
+        done = threading.Event()
+
+        def approve():
+            while not done.is_set():
+                if sm.awaiting_approval:
+                    sm.submit_approval("approved")
+                time.sleep(0.01)
+
+        thread = threading.Thread(target=approve)
+        thread.start()
+        try:
+            result = sm.run()
+        finally:
+            done.set()
+            thread.join()
+
+        assert result["final_state"] == "complete"
+        assert agents["reviewer"].call_count == 1
+        assert approvals
+
+    def test_hard_limit_still_stops_calls(self, tmp_path):
+        config = self._config(tmp_path)
+        config["circuit_breaker"]["safety_limits"] = {"max_cost_hard": 1.50}
+        agents = self._agents(score=9)
+        sm = StateMachine(config, agents=agents)
+        sm.initialize("test-run")
+
+        result = sm.run()
+
+        assert result["final_state"] == "halt"
+        assert agents["reviewer"].call_count == 0
+
+class TestStateMachineTracing:
+    """A run is traced as run -> state -> agent spans."""
+
+    def test_run_trace_hierarchy(self, basic_config, mock_agents):
+        from runner.observability.export import InMemorySpanExporter
+        from runner.observability.tracer import AgentTracer
+
+        exporter = InMemorySpanExporter()
+        tracer = AgentTracer(exporter=exporter)
+        sm = StateMachine(basic_config, agents=mock_agents, tracer=tracer)
+        sm.initialize("test-run")
+
+        sm.run()
+        assert tracer.flush()
+
+        spans = {(s.kind, s.name): s for s in exporter.spans}
+        run = spans[("run", "run test-run")]
+        draft = spans[("state", "draft")]
+        agents = [s for s in exporter.spans if s.kind == "agent"]
+
+        assert run.parent_span_id is None
+        assert run.metadata["final_state"] == "complete"
+        assert draft.parent_span_id == run.span_id
+        assert {s.model for s in agents} == {"claude", "gemini"}
+        assert all(s.parent_span_id == draft.span_id for s in agents)
+        assert {s.trace_id for s in exporter.spans} == {run.trace_id}
+        tracer.shutdown()
+
+    def test_parallel_fanout_agents_parented_to_state(self, basic_config, mock_agents):
+        from runner.observability.tracer import AgentTracer
+
+        basic_config["settings"]["parallel_fanout"] = True
+        tracer = AgentTracer()
+        sm = StateMachine(basic_config, agents=mock_agents, tracer=tracer)
+        sm.initialize("test-run")
+
+        sm.run()
+
+        draft = next(s for s in tracer.get_recent_spans() if s.name == "draft")
+        agents = [s for s in tracer.get_recent_spans() if s.kind == "agent"]
+        assert len(agents) == 2
+        assert all(s.parent_span_id == draft.span_id for s in agents)
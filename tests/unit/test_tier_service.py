@@ -3,6 +3,8 @@
 Tests feature flag checks, credit calculations, and workflow config selection.
 """
 
+import time
+
 import pytest
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
@@ -305,3 +307,138 @@ class TestUsageSummaryCredits:
         tier = TierInfo(name="Starter", slug="starter")
         assert tier.name == "Starter"
         assert tier.slug == "starter"
+
+
+class TestEntitlementCache:
+    """Tests for the per-workspace entitlement snapshot cache."""
+
+    def _make_service(self, features=None, ttl=300):
+        from api.services.tier_service import EntitlementSnapshot, TierService
+
+        service = TierService(cache_ttl=ttl)
+        tier = MagicMock(slug="pro", id=uuid4())
+        tier.name = "Pro"
+        loads = []
+
+        def fake_load(workspace_id, version):
+            loads.append(workspace_id)
+            return EntitlementSnapshot(
+                version=version,
+                loaded_at=time.monotonic(),
+                tier=tier,
+                features=dict(features or {}),
+            )
+
+        service._load_entitlements = fake_load
+        return service, loads
+
+    def test_repeated_checks_load_once(self):
+        """Feature checks for the same workspace share one snapshot."""
+        service, loads = self._make_service(
+            {"voice_transcription": (True, None), "premium_workflow": (True, {"text_limit": 75000})}
+        )
+        workspace_id = uuid4()
+
+        assert service.has_feature(workspace_id, "voice_transcription") is True
+        assert service.has_feature(workspace_id, "youtube_transcription") is False
+        assert service.get_text_limit(workspace_id) == 75000
+        assert service.get_features_summary(workspace_id)["voice_transcription"] is True
+        assert len(loads) == 1
+
+    def test_invalidate_workspace_reloads(self):
+        """invalidate_workspace forces a reload for that workspace."""
+        service, loads = self._make_service()
+        workspace_id = uuid4()
+
+        service.get_tier_slug(workspace_id)
+        service.invalidate_workspace(workspace_id)
+        service.get_tier_slug(workspace_id)
+
+        assert len(loads) == 2
+
+    def test_invalidate_workspace_keeps_others_cached(self):
+        """Invalidating one workspace doesn't reload another."""
+        service, loads = self._make_service()
+        first, second = uuid4(), uuid4()
+
+        service.get_tier_slug(first)
+        service.get_tier_slug(second)
+        service.invalidate_workspace(first)
+        service.get_tier_slug(first)
+        service.get_tier_slug(second)
+
+        assert loads == [first, second, first]
+
+    def test_load_across_invalidation_not_cached(self):
+        """A snapshot loaded while its workspace was invalidated is dropped."""
+        service, loads = self._make_service()
+        workspace_id = uuid4()
+        load = service._load_entitlements
+
+        def invalidating_load(workspace_id, version):
+            service.invalidate_workspace(workspace_id)
+            return load(workspace_id, version)
+
+        service._load_entitlements = invalidating_load
+        service.get_tier_slug(workspace_id)
+        service._load_entitlements = load
+        service.get_tier_slug(workspace_id)
+
+        assert len(loads) == 2
+
+    def test_invalidate_all_reloads_every_workspace(self):
+        """invalidate_all drops every cached snapshot."""
+        service, loads = self._make_service()
+        first, second = uuid4(), uuid4()
+
+        service.get_tier_slug(first)
+        service.get_tier_slug(second)
+        service.invalidate_all()
+        service.get_tier_slug(first)
+        service.get_tier_slug(second)
+
+        assert len(loads) == 4
+
+    def test_expired_snapshot_reloads(self):
+        """Snapshots older than the TTL are reloaded."""
+        service, loads = self._make_service(ttl=0)
+        workspace_id = uuid4()
+
+        service.get_tier_slug(workspace_id)
+        service.get_tier_slug(workspace_id)
+
+        assert len(loads) == 2
+
+    def test_feature_config_is_copied(self):
+        """Mutating a returned config does not change the cached snapshot."""
+        service, _ = self._make_service({"premium_workflow": (True, {"text_limit": 1})})
+        workspace_id = uuid4()
+
+        config = service.get_feature_config(workspace_id, "premium_workflow")
+        config["text_limit"] = 999
+
+        assert service.get_feature_config(workspace_id, "premium_workflow") == {
+            "text_limit": 1
+        }
+
+    def test_billing_webhook_invalidates_workspace(self):
+        """Subscription webhooks invalidate the cached entitlements."""
+        from api.services.billing_service import BillingService
+
+        workspace_id = uuid4()
+        subscription = MagicMock(workspace_id=workspace_id)
+        session = MagicMock()
+        session.exec.return_value.first.return_value = subscription
+        stripe_sub = MagicMock(
+            id="sub_123",
+            status="canceled",
+            current_period_start=0,
+            current_period_end=0,
+            cancel_at_period_end=False,
+        )
+
+        with patch("api.services.billing_service.tier_service") as mock_tier_service, \
+             patch("api.services.billing_service.usage_meter"):
+            BillingService()._handle_subscription_updated(session, stripe_sub)
+
+        mock_tier_service.invalidate_workspace.assert_called_once_with(workspace_id)
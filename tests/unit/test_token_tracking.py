@@ -1,5 +1,7 @@
 """Tests for token tracking and cost calculation."""
 
+import threading
+
 import pytest
 from runner.models import TokenUsage
 from runner.metrics import (
@@ -9,6 +11,7 @@ from runner.metrics import (
     get_default_cost,
     format_cost,
     estimate_run_cost,
+    with_cache_rates,
 )
 
 
@@ -27,6 +30,32 @@ class TestCostCalculation:
         cost = calculate_cost(tokens, {"input": 0.003, "output": 0.015})
         assert cost == 0.0
 
+    def test_calculate_cost_with_cache_rates(self):
+        tokens = TokenUsage(
+            input_tokens=3000,
+            output_tokens=0,
+            cache_read_tokens=1000,
+            cache_write_tokens=1000,
+        )
+        rates = {"input": 0.01, "output": 0.0, "cache_read": 0.001, "cache_write": 0.02}
+
+        cost = calculate_cost(tokens, rates)
+
+        assert cost == pytest.approx(0.01 + 0.001 + 0.02)
+
+    def test_calculate_cost_cache_falls_back_to_input_rate(self):
+        tokens = TokenUsage(input_tokens=2000, output_tokens=0, cache_read_tokens=1000)
+        cost = calculate_cost(tokens, {"input": 0.01, "output": 0.0})
+        assert cost == pytest.approx(0.02)
+
+    def test_with_cache_rates(self):
+        rates = with_cache_rates({"input": 0.01, "output": 0.05}, 0.1, 1.25)
+        assert rates["cache_read"] == pytest.approx(0.001)
+        assert rates["cache_write"] == pytest.approx(0.0125)
+
+        explicit = with_cache_rates({"input": 0.01, "cache_read": 0.002}, 0.1, 1.0)
+        assert explicit["cache_read"] == 0.002
+
     def test_get_default_cost_claude(self):
         cost = get_default_cost("claude")
         assert cost["input"] == 0.003
@@ -121,6 +150,56 @@ class TestTokenTracker:
         assert summary.by_state["draft"] == 300
         assert summary.by_state["audit"] == 150
 
+    def test_snapshot_restore(self):
+        tracker = TokenTracker("run-001")
+        tokens = TokenUsage(input_tokens=100, output_tokens=50)
+        tracker.record("claude", "draft", tokens, cost=0.005)
+        tracker.record("gemini", "audit", tokens, cost=0.003, cached=True)
+
+        restored = TokenTracker("run-001")
+        restored.restore(tracker.snapshot())
+        restored.record("claude", "final", tokens, cost=0.001)
+
+        summary = restored.get_summary()
+        assert summary.total_tokens == 450
+        assert summary.total_cost_usd == pytest.approx(0.009)
+        assert summary.cache_hits == 1
+        assert summary.by_state == {"draft": 150, "audit": 150, "final": 150}
+        assert summary.by_agent["claude"].invocations == 2
+
+    def test_concurrent_records_all_counted(self):
+        tracker = TokenTracker("run-001")
+        tokens = TokenUsage(input_tokens=10, output_tokens=5)
+
+        def record_many(agent):
+            for _ in range(500):
+                tracker.record(agent, "draft", tokens, cost=0.001)
+
+        threads = [
+            threading.Thread(target=record_many, args=(f"agent-{i}",)) for i in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        summary = tracker.get_summary()
+        assert summary.total_tokens == 4 * 500 * 15
+        assert summary.total_cost_usd == pytest.approx(2.0)
+        assert summary.by_state["draft"] == 4 * 500 * 15
+        assert all(s.invocations == 500 for s in summary.by_agent.values())
+
+    def test_summary_merged_at_boundaries(self):
+        tracker = TokenTracker("run-001")
+        tokens = TokenUsage(input_tokens=100, output_tokens=50)
+
+        tracker.record("claude", "draft", tokens, cost=0.005)
+        assert tracker.summary.total_tokens == 0
+        assert tracker.sessions["claude"].cumulative_total == 150
+
+        tracker.merge()
+        assert tracker.summary.total_tokens == 150
+
     def test_check_context_health_healthy(self):
         tracker = TokenTracker("run-001")
         tokens = TokenUsage(input_tokens=1000, output_tokens=500)
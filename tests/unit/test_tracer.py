@@ -0,0 +1,243 @@
+"""Tests for the bounded tracer and its OTLP export."""
+
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from runner.observability.export import (
+    BatchSpanProcessor,
+    InMemorySpanExporter,
+    OTLPJsonFileExporter,
+    span_to_otlp,
+)
+from runner.observability import tracer as tracer_module
+from runner.observability.tracer import (
+    SPAN_KIND_HTTP,
+    SPAN_KIND_RUN,
+    SPAN_KIND_STATE,
+    AgentTracer,
+    current_span,
+    get_tracer,
+    shutdown_tracer,
+)
+
+
+class TestAgentTracer:
+    def test_span_buffer_is_bounded(self):
+        tracer = AgentTracer(max_spans=10)
+        for i in range(25):
+            with tracer.trace_call("claude", f"prompt {i}"):
+                pass
+
+        spans = tracer.get_recent_spans(limit=100)
+        assert len(spans) == 10
+        assert spans[-1].input_preview == "prompt 24"
+
+    def test_stats_cover_evicted_spans(self):
+        tracer = AgentTracer(max_spans=5)
+        for _ in range(8):
+            with tracer.trace_call("claude", "hi") as span:
+                span.set_tokens(100, 50)
+        with pytest.raises(RuntimeError):
+            with tracer.trace_call("gemini", "hi"):
+                raise RuntimeError("boom")
+
+        stats = tracer.get_stats()
+        assert stats["total_calls"] == 9
+        assert stats["total_tokens"] == 8 * 150
+        assert stats["error_rate"] == pytest.approx(1 / 9)
+        assert stats["by_model"]["claude"]["calls"] == 8
+        assert stats["by_model"]["gemini"]["error_rate"] == 1.0
+
+    def test_structural_spans_not_in_stats(self):
+        tracer = AgentTracer()
+        with tracer.trace_span(SPAN_KIND_RUN, "run"):
+            with tracer.trace_call("claude", "hi"):
+                pass
+
+        assert tracer.get_stats()["total_calls"] == 1
+
+    def test_nested_spans_share_trace(self):
+        tracer = AgentTracer()
+        with tracer.trace_span(SPAN_KIND_RUN, "run") as run:
+            with tracer.trace_span(SPAN_KIND_STATE, "draft") as state:
+                with tracer.trace_call("claude", "hi") as agent:
+                    assert current_span() is agent
+            assert current_span() is run
+        assert current_span() is None
+
+        assert state.parent_span_id == run.span_id
+        assert agent.parent_span_id == state.span_id
+        assert agent.trace_id == run.trace_id
+        assert [s.span_id for s in tracer.get_trace(run.trace_id)] == [
+            agent.span_id,
+            state.span_id,
+            run.span_id,
+        ]
+
+    def test_explicit_parent_across_threads(self):
+        tracer = AgentTracer()
+        with tracer.trace_span(SPAN_KIND_STATE, "draft") as state:
+            children = []
+
+            def worker():
+                with tracer.trace_call("claude", "hi", parent=state) as span:
+                    children.append(span)
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join()
+
+        assert children[0].parent_span_id == state.span_id
+        assert children[0].trace_id == state.trace_id
+
+
+class TestSpanExport:
+    def test_exporter_receives_batches(self):
+        exporter = InMemorySpanExporter()
+        tracer = AgentTracer(exporter=exporter)
+        for _ in range(3):
+            with tracer.trace_call("claude", "hi"):
+                pass
+
+        assert tracer.flush()
+        assert len(exporter.spans) == 3
+        tracer.shutdown()
+
+    def test_full_queue_drops_spans(self):
+        release = threading.Event()
+
+        class BlockingExporter(InMemorySpanExporter):
+            def export(self, spans):
+                release.wait(5)
+                super().export(spans)
+
+        exporter = BlockingExporter()
+        processor = BatchSpanProcessor(
+            exporter, max_queue_size=2, max_batch_size=1, schedule_delay_s=0.01
+        )
+        tracer = AgentTracer()
+        spans = [tracer.start_span("claude", "hi") for _ in range(10)]
+        for span in spans:
+            processor.on_end(span)
+
+        assert processor.dropped > 0
+        release.set()
+        processor.shutdown()
+        assert len(exporter.spans) + processor.dropped == 10
+
+    def test_export_errors_are_swallowed(self):
+        exporter = MagicMock()
+        exporter.export.side_effect = OSError("disk full")
+        processor = BatchSpanProcessor(exporter)
+        processor.on_end(AgentTracer().start_span("claude", "hi"))
+
+        assert processor.force_flush()
+        processor.shutdown()
+
+    def test_otlp_json_file(self, tmp_path):
+        path = tmp_path / "traces" / "spans.jsonl"
+        tracer = AgentTracer(exporter=OTLPJsonFileExporter(str(path)))
+        with tracer.trace_span(SPAN_KIND_STATE, "draft"):
+            with tracer.trace_call("claude", "hi") as span:
+                span.set_tokens(100, 50)
+        tracer.shutdown()
+
+        request = json.loads(path.read_text().splitlines()[0])
+        scope = request["resourceSpans"][0]["scopeSpans"][0]
+        agent, state = scope["spans"]
+        assert agent["parentSpanId"] == state["spanId"]
+        assert agent["traceId"] == state["traceId"]
+        assert "parentSpanId" not in state
+        assert state["name"] == "draft"
+        attributes = {a["key"]: a["value"] for a in agent["attributes"]}
+        assert attributes["gen_ai.usage.input_tokens"] == {"intValue": "100"}
+        assert attributes["gen_ai.request.model"] == {"stringValue": "claude"}
+
+    def test_error_status_and_client_kind(self):
+        tracer = AgentTracer()
+        with pytest.raises(TimeoutError):
+            with tracer.trace_call("claude", "", kind=SPAN_KIND_HTTP) as span:
+                raise TimeoutError("slow")
+
+        otlp = span_to_otlp(span)
+        assert otlp["status"] == {"code": 2, "message": "slow"}
+        assert otlp["kind"] == 3
+        assert int(otlp["endTimeUnixNano"]) >= int(otlp["startTimeUnixNano"])
+
+
+class TestGlobalTracer:
+    @pytest.fixture
+    def global_tracer(self, tmp_path, monkeypatch):
+        path = tmp_path / "spans.jsonl"
+        monkeypatch.setattr(tracer_module, "TRACE_EXPORT_FILE", str(path))
+        monkeypatch.setattr(tracer_module, "_global_tracer", None)
+        monkeypatch.setattr(tracer_module.atexit, "register", MagicMock())
+        yield get_tracer(), path
+        shutdown_tracer()
+
+    def test_previews_off_by_default(self, global_tracer):
+        tracer, _ = global_tracer
+        with tracer.trace_call("claude", "secret prompt") as span:
+            span.set_output("secret output")
+
+        assert span.input_preview == ""
+        assert span.output_preview == ""
+        assert span.input_length == len("secret prompt")
+
+    def test_shutdown_exports_queued_spans(self, global_tracer):
+        tracer, path = global_tracer
+        with tracer.trace_call("claude", "hi"):
+            pass
+
+        shutdown_tracer()
+
+        request = json.loads(path.read_text().splitlines()[0])
+        assert len(request["resourceSpans"][0]["scopeSpans"][0]["spans"]) == 1
+        tracer_module.atexit.register.assert_called_once_with(shutdown_tracer)
+
+    def test_shutdown_without_tracer_is_noop(self, monkeypatch):
+        monkeypatch.setattr(tracer_module, "_global_tracer", None)
+        shutdown_tracer()
+
+
+class TestHttpSpans:
+    def test_api_call_traced_under_agent_span(self):
+        pytest.importorskip("anthropic")
+        from runner.agents.claude_api import ClaudeAPIAgent
+
+        response = MagicMock()
+        response.content = [MagicMock(type="text", text="ok")]
+        response.usage.input_tokens = 10
+        response.usage.output_tokens = 5
+        response.usage.cache_read_input_tokens = 0
+        response.usage.cache_creation_input_tokens = 0
+
+        with patch.object(
+            ClaudeAPIAgent, "_get_api_key_from_env", return_value="test-key"
+        ):
+            agent = ClaudeAPIAgent({"model": "sonnet"})
+        agent.client = MagicMock()
+        agent.client.messages.create.return_value = response
+
+        tracer = AgentTracer()
+        with tracer.trace_call("claude", "hi") as parent:
+            agent.invoke("hi")
+
+        http = [s for s in tracer.get_recent_spans() if s.kind == SPAN_KIND_HTTP]
+        assert len(http) == 1
+        assert http[0].parent_span_id == parent.span_id
+        assert http[0].output_tokens == 5
+
+    def test_untraced_call_has_no_span(self):
+        pytest.importorskip("anthropic")
+        from runner.agents.claude_api import ClaudeAPIAgent
+
+        with patch.object(
+            ClaudeAPIAgent, "_get_api_key_from_env", return_value="test-key"
+        ):
+            agent = ClaudeAPIAgent({"model": "sonnet"})
+
+        assert agent._trace_http(0).__enter__() is None
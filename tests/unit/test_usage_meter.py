@@ -0,0 +1,172 @@
+"""Tests for the in-process usage meter."""
+
+import threading
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from uuid import uuid4
+
+from api.services.usage_meter import MeterEntry, UsageMeter
+
+
+def _loader(used=0, limit=5, period_end=None):
+    """Build a counting loader that returns a fresh MeterEntry."""
+    calls = []
+
+    def load(workspace_id):
+        calls.append(workspace_id)
+        return MeterEntry(
+            usage_id=uuid4(),
+            period_end=period_end or datetime.utcnow() + timedelta(days=10),
+            used={"post": used, "storage": 0, "api_call": 0},
+            limits={"post": limit, "storage": 0, "api_call": 0},
+        )
+
+    return load, calls
+
+
+class TestUsageMeterCheck:
+    """Tests for limit checks served from cached counters."""
+
+    def test_within_limit(self):
+        """Checks under the limit pass and report current usage."""
+        meter = UsageMeter()
+        load, _ = _loader(used=3, limit=5)
+
+        assert meter.check(uuid4(), "post", 2, load) == (True, 3, 5)
+
+    def test_over_limit(self):
+        """Checks that would exceed the limit fail."""
+        meter = UsageMeter()
+        load, _ = _loader(used=5, limit=5)
+
+        assert meter.check(uuid4(), "post", 1, load) == (False, 5, 5)
+
+    def test_zero_limit_is_unlimited(self):
+        """A limit of 0 means unlimited."""
+        meter = UsageMeter()
+        load, _ = _loader(used=500, limit=0)
+
+        assert meter.check(uuid4(), "post", 1, load) == (True, 500, 0)
+
+    def test_unknown_resource_allowed(self):
+        """Unknown resource types are allowed without loading."""
+        meter = UsageMeter()
+        load, calls = _loader()
+
+        assert meter.check(uuid4(), "widgets", 1, load) == (True, 0, 0)
+        assert calls == []
+
+
+class TestUsageMeterCaching:
+    """Tests for entry caching and reconciliation."""
+
+    def test_repeated_checks_load_once(self):
+        """Steady-state checks do not reload the entry."""
+        meter = UsageMeter()
+        load, calls = _loader()
+        workspace_id = uuid4()
+
+        for _ in range(10):
+            meter.check(workspace_id, "post", 1, load)
+
+        assert len(calls) == 1
+
+    def test_record_updates_cached_counter(self):
+        """record() applies counters returned by the database."""
+        meter = UsageMeter()
+        load, _ = _loader(used=0, limit=5)
+        workspace_id = uuid4()
+
+        meter.get(workspace_id, load)
+        meter.record(workspace_id, "post", 5)
+
+        assert meter.check(workspace_id, "post", 1, load) == (False, 5, 5)
+
+    def test_record_without_entry_is_ignored(self):
+        """record() for an uncached workspace is a no-op."""
+        meter = UsageMeter()
+
+        meter.record(uuid4(), "post", 5)
+
+    def test_stale_entry_reconciles(self):
+        """Entries older than the reconcile interval are reloaded."""
+        meter = UsageMeter(reconcile_interval=0)
+        load, calls = _loader()
+        workspace_id = uuid4()
+
+        meter.check(workspace_id, "post", 1, load)
+        meter.check(workspace_id, "post", 1, load)
+
+        assert len(calls) == 2
+
+    def test_period_rollover_reconciles(self):
+        """Entries past their billing period end are reloaded."""
+        meter = UsageMeter()
+        load, calls = _loader(period_end=datetime.utcnow() - timedelta(seconds=1))
+        workspace_id = uuid4()
+
+        meter.check(workspace_id, "post", 1, load)
+        meter.check(workspace_id, "post", 1, load)
+
+        assert len(calls) == 2
+
+    def test_invalidate(self):
+        """invalidate() drops one workspace or all of them."""
+        meter = UsageMeter()
+        load, calls = _loader()
+        first, second = uuid4(), uuid4()
+
+        meter.get(first, load)
+        meter.get(second, load)
+        meter.invalidate(first)
+        meter.get(first, load)
+        meter.get(second, load)
+        assert len(calls) == 3
+
+        meter.invalidate()
+        meter.get(first, load)
+        meter.get(second, load)
+        assert len(calls) == 5
+
+    def test_concurrent_checks(self):
+        """Concurrent checks and records do not corrupt counters."""
+        meter = UsageMeter()
+        load, _ = _loader(used=0, limit=0)
+        workspace_id = uuid4()
+        meter.get(workspace_id, load)
+
+        def worker(n):
+            for i in range(200):
+                meter.record(workspace_id, "post", n * 1000 + i)
+                meter.check(workspace_id, "post", 1, load)
+
+        threads = [threading.Thread(target=worker, args=(n,)) for n in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        within, current, _ = meter.check(workspace_id, "post", 1, load)
+        assert within is True
+        assert current % 1000 == 199
+
+
+class TestUsageServiceUsesMeter:
+    """Tests that UsageService reads limits from the shared meter."""
+
+    def test_check_limit_served_from_meter(self):
+        """check_limit does not touch the database once the entry is cached."""
+        from api.services.usage_service import UsageService
+
+        meter = UsageMeter()
+        load, calls = _loader(used=1, limit=5)
+        service = UsageService()
+        service._load_meter_entry = load
+
+        with patch("api.services.usage_service.usage_meter", meter):
+            workspace_id = uuid4()
+            assert service.check_limit(workspace_id, "post") == (True, 1, 5)
+            assert service.can_afford(workspace_id, 4) == (True, 1, 5)
+            assert service.can_afford(workspace_id, 5) == (False, 1, 5)
+
+        assert len(calls) == 1
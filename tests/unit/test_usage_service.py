@@ -0,0 +1,175 @@
+"""Database tests for credit reservations in the usage service.
+
+Run with: pytest tests/unit/test_usage_service.py -v
+"""
+
+import importlib
+import threading
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+# Skip all tests if sqlmodel is not installed
+pytest.importorskip("sqlmodel")
+
+from sqlmodel import Session, SQLModel
+
+from api.services.usage_meter import UsageMeter
+from api.services.usage_service import UsageLimitExceeded, UsageService
+from runner.content.repository import UserRepository
+from runner.content.workspace_repository import WorkspaceRepository
+from runner.db.models import (
+    CreditReservation,
+    ReservationStatus,
+    UsageTracking,
+    UserCreate,
+    WorkspaceCreate,
+)
+from tests.db_utils import create_test_engine, drop_test_schema, requires_db
+
+pytestmark = requires_db  # Skip all tests in this module if DB not available
+
+usage_service_module = importlib.import_module("api.services.usage_service")
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """Create a PostgreSQL engine and point the usage service at it."""
+    engine, schema_name, database_url = create_test_engine()
+    SQLModel.metadata.create_all(engine)
+    monkeypatch.setattr(usage_service_module, "engine", engine)
+    monkeypatch.setattr(usage_service_module, "usage_meter", UsageMeter())
+    yield engine
+    SQLModel.metadata.drop_all(engine)
+    engine.dispose()
+    drop_test_schema(database_url, schema_name)
+
+
+@pytest.fixture
+def workspace_id(engine):
+    """Create a workspace on the free tier (5 posts per period)."""
+    with Session(engine) as session:
+        user = UserRepository(session).create(
+            UserCreate(full_name="Test User", email="test@example.com")
+        )
+        workspace = WorkspaceRepository(session).create(
+            WorkspaceCreate(name="Test", slug="test", owner_id=user.id)
+        )
+        return workspace.id
+
+
+@pytest.fixture
+def service():
+    return UsageService()
+
+
+def _posts_created(engine, service, workspace_id) -> int:
+    usage_id = service.get_or_create_usage_period(workspace_id).id
+    with Session(engine) as session:
+        return session.get(UsageTracking, usage_id).posts_created
+
+
+def _add_legacy_reservation(engine, service, workspace_id, **fields) -> str:
+    """Insert a pending reservation that never charged the counter."""
+    key = f"legacy-{uuid.uuid4()}"
+    with Session(engine) as session:
+        session.add(
+            CreditReservation(
+                workspace_id=workspace_id,
+                usage_tracking_id=service.get_or_create_usage_period(workspace_id).id,
+                resource_type="post",
+                amount=1,
+                status=ReservationStatus.pending,
+                idempotency_key=key,
+                expires_at=fields.get(
+                    "expires_at", datetime.utcnow() + timedelta(minutes=15)
+                ),
+            )
+        )
+        session.commit()
+    return key
+
+
+class TestReserveCredit:
+    """Reservations charge the counter up front."""
+
+    def test_concurrent_reserve_at_limit(self, engine, service, workspace_id):
+        """Concurrent reservations never push the counter past the limit."""
+        service.check_limit(workspace_id, "post")
+        reserved = []
+        rejected = []
+        barrier = threading.Barrier(10)
+
+        def reserve(i):
+            barrier.wait()
+            try:
+                reserved.append(service.reserve_credit(workspace_id, "post", f"k{i}"))
+            except UsageLimitExceeded:
+                rejected.append(i)
+
+        threads = [threading.Thread(target=reserve, args=(i,)) for i in range(10)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(reserved) == 5
+        assert len(rejected) == 5
+        assert _posts_created(engine, service, workspace_id) == 5
+
+    def test_reserve_is_idempotent(self, engine, service, workspace_id):
+        first = service.reserve_credit(workspace_id, "post", "same-key")
+        second = service.reserve_credit(workspace_id, "post", "same-key")
+
+        assert first.id == second.id
+        assert first.charged is True
+        assert _posts_created(engine, service, workspace_id) == 1
+
+
+class TestConfirmUsage:
+    def test_confirm_is_idempotent(self, engine, service, workspace_id):
+        service.reserve_credit(workspace_id, "post", "key")
+
+        assert service.confirm_usage("key") is True
+        assert service.confirm_usage("key") is False
+        assert _posts_created(engine, service, workspace_id) == 1
+
+    def test_confirm_charges_legacy_reservation(self, engine, service, workspace_id):
+        """A reservation made before up-front charging is charged on confirm."""
+        key = _add_legacy_reservation(engine, service, workspace_id)
+
+        assert service.confirm_usage(key) is True
+        assert _posts_created(engine, service, workspace_id) == 1
+
+
+class TestRefunds:
+    def test_release_refunds(self, engine, service, workspace_id):
+        service.reserve_credit(workspace_id, "post", "key")
+
+        assert service.release_reservation("key") is True
+        assert service.release_reservation("key") is False
+        assert _posts_created(engine, service, workspace_id) == 0
+        assert service.check_limit(workspace_id, "post", 5)[0] is True
+
+    def test_expire_refunds(self, engine, service, workspace_id):
+        service.reserve_credit(workspace_id, "post", "key", expires_minutes=-1)
+
+        assert service.expire_reservations(workspace_id) == 1
+        assert service.expire_reservations(workspace_id) == 0
+        assert _posts_created(engine, service, workspace_id) == 0
+        assert service.confirm_usage("key") is False
+
+    def test_legacy_reservation_refunds_nothing(self, engine, service, workspace_id):
+        """Uncharged reservations don't push the counter negative."""
+        released = _add_legacy_reservation(engine, service, workspace_id)
+        _add_legacy_reservation(
+            engine,
+            service,
+            workspace_id,
+            expires_at=datetime.utcnow() - timedelta(minutes=1),
+        )
+
+        assert service.release_reservation(released) is True
+        assert service.expire_reservations(workspace_id) == 1
+        assert _posts_created(engine, service, workspace_id) == 0